@@ -0,0 +1,162 @@
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Callable, Dict, Iterator, List
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from models.appointment import Appointment
+from models.archive import MedicalRecordArchive
+from models.doctor import Doctor
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+from models.patient_name_trigram import PatientNameTrigram
+from repositories.stats_repository import StatsRepository
+from schemas.appointment import AppointmentStatus
+from utils.trigrams import name_trigrams
+
+# Rows per INSERT batch; large enough to amortise the statement, small enough for memory
+BATCH_SIZE = 20000
+
+# Seeded appointments are laid back to back per doctor from this time
+SCHEDULE_START = datetime(2024, 1, 1, 8, 0)
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "Kwame", "Ama",
+    "Kofi", "Akosua", "Yaw", "Abena", "David", "Elizabeth", "William", "Barbara", "Richard", "Susan",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Mensah", "Owusu", "Boateng", "Asante", "Osei",
+    "Garcia", "Miller", "Davis", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Martin", "Lee",
+]
+SPECIALTIES = ["Cardiology", "Dermatology", "Neurology", "Oncology", "Pediatrics", "Radiology", "Surgery"]
+
+
+# Volumes is how many rows of each entity a benchmark database holds
+@dataclass
+class Volumes:
+    patients: int = 10000
+    doctors: int = 2000
+    appointments: int = 100000
+    medical_records: int = 50000
+    archived_medical_records: int = 5000
+
+
+def _batches(rows: Iterator[Dict], size: int = BATCH_SIZE) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _patients(rng: random.Random, count: int, now: datetime) -> Iterator[Dict]:
+    for id in range(1, count + 1):
+        yield {
+            "id": id,
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "age": rng.randint(1, 95),
+            "gender": rng.choice(("F", "M")),
+            "contact_information": f"+233 {rng.randint(200000000, 599999999)}",
+            "address": f"{rng.randint(1, 999)} Ring Road",
+            "emergency_contact": f"+233 {rng.randint(200000000, 599999999)}",
+            "date_created": now,
+        }
+
+
+def _doctors(rng: random.Random, count: int, now: datetime) -> Iterator[Dict]:
+    for id in range(1, count + 1):
+        yield {
+            "id": id,
+            "full_name": f"Dr {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "specialty": rng.choice(SPECIALTIES),
+            "years_of_experience": rng.randint(1, 40),
+            "contact_information": f"+233 {rng.randint(200000000, 599999999)}",
+            "date_created": now,
+        }
+
+
+# Appointments are dealt round robin to doctors and laid back to back, so no two overlap
+def _appointments(rng: random.Random, volumes: Volumes, now: datetime) -> Iterator[Dict]:
+    statuses = [AppointmentStatus.SCHEDULED] * 6 + [AppointmentStatus.COMPLETED] * 3 + [AppointmentStatus.CANCELLED]
+    for id in range(1, volumes.appointments + 1):
+        slot = (id - 1) // volumes.doctors
+        yield {
+            "id": id,
+            "patient_id": rng.randint(1, volumes.patients),
+            "doctor_id": (id - 1) % volumes.doctors + 1,
+            "date_time": SCHEDULE_START + timedelta(minutes=30 * slot),
+            "duration_minutes": 30,
+            "status": rng.choice(statuses),
+            "date_created": now,
+        }
+
+
+def _medical_records(rng: random.Random, volumes: Volumes, now: datetime) -> Iterator[Dict]:
+    for id in range(1, volumes.medical_records + 1):
+        yield {
+            "id": id,
+            "patient_id": rng.randint(1, volumes.patients),
+            "diagnosis": rng.choice(("Hypertension", "Malaria", "Asthma", "Diabetes", "Migraine")),
+            "prescriptions": rng.choice(("Amlodipine 5mg", "Artemether", "Salbutamol", "Metformin", "Rest")),
+            "treatment_date": SCHEDULE_START + timedelta(hours=rng.randint(0, 24 * 365)),
+            "doctor_notes": "Follow up in two weeks",
+            "date_created": now,
+        }
+
+
+# Archived records take the ids after the live ones and belong to the lower half of the
+# patients, which benchmark deletes leave live
+def _archived_medical_records(rng: random.Random, volumes: Volumes, now: datetime) -> Iterator[Dict]:
+    archived = replace(volumes, patients=volumes.patients // 2, medical_records=volumes.archived_medical_records)
+    for row in _medical_records(rng, archived, now):
+        yield {**row, "id": volumes.medical_records + row["id"], "version": 1, "date_deleted": now, "archived_at": now}
+
+
+# A restore puts a row back under its own id, so new rows must be numbered past the archive:
+# a soft-deleted live record above it, not yet archived, keeps them there
+def _archive_fence(volumes: Volumes, now: datetime) -> Dict:
+    return {
+        "id": volumes.medical_records + volumes.archived_medical_records + 1, "patient_id": 1,
+        "diagnosis": "Malaria", "prescriptions": "Rest", "treatment_date": SCHEDULE_START,
+        "doctor_notes": "Follow up in two weeks", "date_created": now, "date_deleted": now,
+    }
+
+
+# This function fills an empty, migrated database with deterministic synthetic data.
+# Rows go in through Core executemany batches, bypassing the ORM, and the patient
+# name trigram index is filled alongside the patients and the statistics summary tables
+# are rebuilt at the end. Progress goes to report.
+def seed_database(engine: Engine, volumes: Volumes, seed: int = 42, report: Callable[[str], None] = print) -> None:
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1, 0, 0)
+    tables = [
+        (Patient, _patients(rng, volumes.patients, now)),
+        (Doctor, _doctors(rng, volumes.doctors, now)),
+        (Appointment, _appointments(rng, volumes, now)),
+        (MedicalRecord, chain(_medical_records(rng, volumes, now), [_archive_fence(volumes, now)])),
+        (MedicalRecordArchive, _archived_medical_records(rng, volumes, now)),
+    ]
+    with engine.begin() as connection:
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        for model, rows in tables:
+            started, total = time.perf_counter(), 0
+            for batch in _batches(rows):
+                connection.execute(insert(model), batch)
+                if model is Patient:
+                    connection.execute(insert(PatientNameTrigram), [
+                        {"trigram": trigram, "patient_id": row["id"]}
+                        for row in batch for trigram in name_trigrams(row["full_name"])
+                    ])
+                total += len(batch)
+            report(f"Seeded {total} {model.__table__.name} in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        with Session(bind=connection) as db:
+            StatsRepository(db).rebuild()
+        report(f"Rebuilt the statistics summary tables in {time.perf_counter() - started:.1f}s")
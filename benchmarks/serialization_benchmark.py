@@ -0,0 +1,102 @@
+import os
+
+# Rows are built in memory, so any URL that lets the models import will do
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+from models.appointment import Appointment
+from models.patient import Patient
+from schemas.appointment import AppointmentResponse, AppointmentStatus
+from schemas.patient import PatientResponse
+from utils.serialization import _adapter
+
+# Measures the per-row cost of turning a list page of ORM rows into response bytes.
+#   standard  model_validate in the service, then FastAPI's response_model validation,
+#             dict conversion and stdlib json encoding (JSON_FAST_PATH=0)
+#   fast      model_validate in the service, then one pydantic-core dump_json
+# Run from the repository root: python -m benchmarks.serialization_benchmark
+
+
+def _patients(count: int) -> List[Patient]:
+    now = datetime(2025, 1, 1, 9, 0)
+    return [
+        Patient(
+            id=index, full_name=f"Patient {index}", age=30 + index % 50, gender="F",
+            contact_information="+1 555 0100", address=f"{index} Main Street",
+            emergency_contact="+1 555 0199", version=1, date_created=now, date_updated=None, date_deleted=None
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def _appointments(count: int) -> List[Appointment]:
+    now = datetime(2025, 1, 1, 9, 0)
+    return [
+        Appointment(
+            id=index, patient_id=index, doctor_id=index % 7 + 1, date_time=now + timedelta(minutes=30 * index),
+            duration_minutes=30, status=AppointmentStatus.SCHEDULED,
+            version=1, date_created=now, date_updated=None, date_deleted=None
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+# The standard path: the steps of fastapi.routing.serialize_response for a returned
+# list and a response_model, followed by JSONResponse rendering
+def _standard(rows: List[Any], response_type: Any) -> Callable[[], bytes]:
+    field = create_model_field("Response", List[response_type], mode="serialization")
+
+    def run() -> bytes:
+        items = [response_type.model_validate(row) for row in rows]
+        value, _ = field.validate(items, {}, loc=("response",))
+        return JSONResponse(field.serialize(value, by_alias=True)).body
+
+    return run
+
+
+# The fast path used by utils.serialization.json_response
+def _fast(rows: List[Any], response_type: Any) -> Callable[[], bytes]:
+    adapter = _adapter(List[response_type])
+
+    def run() -> bytes:
+        items = [response_type.model_validate(row) for row in rows]
+        return adapter.dump_json(items)
+
+    return run
+
+
+# This function times one path and returns the best per-row cost in microseconds
+def _per_row_us(run: Callable[[], bytes], rows: int, repeat: int, number: int) -> float:
+    return min(timeit.repeat(run, repeat=repeat, number=number)) / number / rows * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare list page serialization paths")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = [
+        ("get_all_patients", _patients, PatientResponse),
+        ("get_all_appointments", _appointments, AppointmentResponse),
+    ]
+    print(f"{'endpoint':<22}{'rows':>6}{'standard us/row':>18}{'fast us/row':>14}{'speedup':>10}")
+    for label, build, response_type in cases:
+        for page_size in args.page_sizes:
+            rows = build(page_size)
+            standard, fast = _standard(rows, response_type), _fast(rows, response_type)
+            assert json.loads(standard()) == json.loads(fast()), f"{label} outputs differ"
+            before = _per_row_us(standard, page_size, args.repeat, args.number)
+            after = _per_row_us(fast, page_size, args.repeat, args.number)
+            print(f"{label:<22}{page_size:>6}{before:>18.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
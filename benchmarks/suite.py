@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Benchmark suite: boots main.app against a seeded SQLite file and drives every router
+# endpoint through an in-process ASGI client at fixed concurrency levels, reporting
+# throughput and latency percentiles as JSON that can be diffed between runs.
+#
+#   python -m benchmarks.suite --output baseline.json
+#   python -m benchmarks.suite --patients 1000000 --appointments 10000000 --compare baseline.json
+#
+# The seeded database is cached per volume and seed under benchmarks/.data and copied
+# before every run, so writes made by one run never leak into the next.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+# A request to send: (method, url, JSON body or None), optionally followed by headers
+Request = Union[Tuple[str, str, Optional[Any]], Tuple[str, str, Optional[Any], Dict[str, str]]]
+
+# The profiling endpoints and the X-Profile-Token trigger need a token; main sets this
+# one when PROFILE_TOKEN is not set already
+BENCHMARK_PROFILE_TOKEN = "benchmark"
+
+
+# Scenarios build the i-th request for one endpoint. Writes use i to pick distinct rows
+# and far-future times, so every request of a run succeeds against the seeded data.
+# fixtures holds values the suite only learns while running, such as a saved profile's id.
+def _scenarios(volumes, fixtures: Dict[str, Any]) -> List[Tuple[str, Callable[[int], Request]]]:
+    from utils.pagination import encode_cursor
+    from utils.profiling import PROFILE_TOKEN_HEADER
+
+    patient = lambda i: i * 7919 % (volumes.patients // 2) + 1
+    doctor = lambda i: i * 31 % (volumes.doctors // 2) + 1
+    appointment = lambda i: i * 7919 % (volumes.appointments // 2) + 1
+    record = lambda i: i * 7919 % (volumes.medical_records // 2) + 1
+    # Deletes walk down from the top of each table, away from the rows reads and updates use
+    top = lambda count, i: count - i % (count // 2)
+    unique_time = lambda base, i: (datetime(base, 1, 1) + timedelta(hours=i)).isoformat()
+    # Archived records follow the live ones: lookups use the lower half, restores walk down from the top
+    archived_record = lambda i: volumes.medical_records + i * 7919 % (volumes.archived_medical_records // 2) + 1
+    restored_record = lambda i: volumes.medical_records + top(volumes.archived_medical_records, i)
+    profiled = {PROFILE_TOKEN_HEADER: os.environ["PROFILE_TOKEN"]}
+
+    def patient_body(i: int) -> Dict:
+        return {
+            "full_name": f"Bench Patient {i}", "age": 40, "gender": "F",
+            "contact_information": "+233 200000000", "address": "1 Ring Road", "emergency_contact": "+233 200000001",
+        }
+
+    def doctor_body(i: int) -> Dict:
+        return {"full_name": f"Dr Bench {i}", "specialty": "Cardiology", "years_of_experience": 10, "contact_information": "+233 1"}
+
+    def appointment_body(i: int, base: int) -> Dict:
+        return {"patient_id": patient(i), "doctor_id": doctor(i), "date_time": unique_time(base, i), "status": "Scheduled"}
+
+    def record_body(i: int) -> Dict:
+        return {
+            "patient_id": patient(i), "diagnosis": "Malaria", "prescriptions": "Artemether",
+            "treatment_date": "2025-01-01T09:00:00", "doctor_notes": "Bench",
+        }
+
+    middle_patient = encode_cursor(volumes.patients // 2)
+    return [
+        ("GET /", lambda i: ("GET", "/", None)),
+        ("POST /patients/", lambda i: ("POST", "/patients/", patient_body(i))),
+        ("POST /patients/bulk", lambda i: ("POST", "/patients/bulk", [patient_body(i * 50 + k) for k in range(50)])),
+        ("GET /patients/search", lambda i: ("GET", f"/patients/search?q={['smi', 'mens', 'kwa', 'owu'][i % 4]}", None)),
+        ("GET /patients/{id}", lambda i: ("GET", f"/patients/{patient(i)}", None)),
+        ("GET /patients/{id}/timeline", lambda i: ("GET", f"/patients/{patient(i)}/timeline", None)),
+        ("GET /patients/{id}/audit", lambda i: ("GET", f"/patients/{patient(i)}/audit", None)),
+        ("GET /patients/", lambda i: ("GET", f"/patients/?page={i % 50 + 1}&page_size=100", None)),
+        ("GET /patients/?total", lambda i: ("GET", f"/patients/?page={i % 50 + 1}&page_size=100&total=envelope", None)),
+        ("GET /patients/?cursor", lambda i: ("GET", f"/patients/?page_size=100&cursor={middle_patient}", None)),
+        ("PUT /patients/{id}", lambda i: ("PUT", f"/patients/{patient(i)}", patient_body(i))),
+        ("DELETE /patients/{id}", lambda i: ("DELETE", f"/patients/{top(volumes.patients, i)}", None)),
+        ("POST /doctors/", lambda i: ("POST", "/doctors/", doctor_body(i))),
+        ("POST /doctors/bulk", lambda i: ("POST", "/doctors/bulk", [doctor_body(i * 50 + k) for k in range(50)])),
+        ("GET /doctors/{id}", lambda i: ("GET", f"/doctors/{doctor(i)}", None)),
+        (
+            "GET /doctors/{id}/availability",
+            lambda i: ("GET", f"/doctors/{doctor(i)}/availability?from=2024-01-01T08:00:00&to=2024-01-08T08:00:00", None),
+        ),
+        ("GET /doctors/", lambda i: ("GET", f"/doctors/?page={i % 5 + 1}&page_size=20", None)),
+        ("GET /doctors/?specialty", lambda i: ("GET", "/doctors/?specialty=Cardiology&page_size=20", None)),
+        ("PUT /doctors/{id}", lambda i: ("PUT", f"/doctors/{doctor(i)}", doctor_body(i))),
+        ("DELETE /doctors/{id}", lambda i: ("DELETE", f"/doctors/{top(volumes.doctors, i)}", None)),
+        ("POST /appointments/", lambda i: ("POST", "/appointments/", appointment_body(i, 2200))),
+        (
+            "POST /appointments/bulk",
+            lambda i: ("POST", "/appointments/bulk", [appointment_body(i * 50 + k, 2300) for k in range(50)]),
+        ),
+        (
+            "GET /appointments/export",
+            lambda i: ("GET", "/appointments/export?date_from=2024-01-01T08:00:00&date_to=2024-01-01T08:30:00", None),
+        ),
+        ("GET /appointments/{id}", lambda i: ("GET", f"/appointments/{appointment(i)}", None)),
+        ("GET /appointments/", lambda i: ("GET", f"/appointments/?page={i % 50 + 1}&page_size=100", None)),
+        ("GET /appointments/?status", lambda i: ("GET", "/appointments/?status=Completed&page_size=100", None)),
+        (
+            "GET /appointments/?status&total",
+            lambda i: ("GET", "/appointments/?status=Completed&page_size=100&total=header", None),
+        ),
+        ("PUT /appointments/{id}", lambda i: ("PUT", f"/appointments/{appointment(i)}", appointment_body(i, 2100))),
+        ("DELETE /appointments/{id}", lambda i: ("DELETE", f"/appointments/{top(volumes.appointments, i)}", None)),
+        ("POST /medical-records/", lambda i: ("POST", "/medical-records/", record_body(i))),
+        (
+            "POST /medical-records/bulk",
+            lambda i: ("POST", "/medical-records/bulk", [record_body(i * 50 + k) for k in range(50)]),
+        ),
+        ("GET /medical-records/export", lambda i: ("GET", f"/medical-records/export?patient_id={patient(i)}", None)),
+        ("GET /medical-records/{id}", lambda i: ("GET", f"/medical-records/{record(i)}", None)),
+        ("GET /medical-records/", lambda i: ("GET", f"/medical-records/?page={i % 50 + 1}&page_size=100", None)),
+        ("GET /medical-records/?patient_id", lambda i: ("GET", f"/medical-records/?patient_id={patient(i)}", None)),
+        ("PUT /medical-records/{id}", lambda i: ("PUT", f"/medical-records/{record(i)}", record_body(i))),
+        ("DELETE /medical-records/{id}", lambda i: ("DELETE", f"/medical-records/{top(volumes.medical_records, i)}", None)),
+        ("GET /stats/appointments", lambda i: ("GET", "/stats/appointments?from=2024-01-01&to=2024-01-31", None)),
+        (
+            "GET /stats/doctors/{id}/appointments",
+            lambda i: ("GET", f"/stats/doctors/{doctor(i)}/appointments?from=2024-01-01&to=2024-01-31", None),
+        ),
+        (
+            "GET /stats/patients/{id}/medical-records",
+            lambda i: ("GET", f"/stats/patients/{patient(i)}/medical-records", None),
+        ),
+        (
+            "GET /admin/archive/medical-records/{id}",
+            lambda i: ("GET", f"/admin/archive/medical-records/{archived_record(i)}", None),
+        ),
+        (
+            "POST /admin/archive/medical-records/{id}/restore",
+            lambda i: ("POST", f"/admin/archive/medical-records/{restored_record(i)}/restore", None),
+        ),
+        ("GET /internal/db-pool", lambda i: ("GET", "/internal/db-pool", None)),
+        ("GET /internal/cache", lambda i: ("GET", "/internal/cache", None)),
+        ("GET /internal/audit-log", lambda i: ("GET", "/internal/audit-log", None)),
+        # The download runs before the profiled requests, whose saves would prune its profile
+        (
+            "GET /internal/profiles/{id}",
+            lambda i: ("GET", f"/internal/profiles/{fixtures['profile_id']}", None, profiled),
+        ),
+        ("GET /internal/profiles", lambda i: ("GET", "/internal/profiles", None, profiled)),
+        ("GET /patients/{id} profiled", lambda i: ("GET", f"/patients/{patient(i)}", None, profiled)),
+        ("GET /metrics", lambda i: ("GET", "/metrics", None)),
+    ]
+
+
+# This function sends one built request
+async def _send(client, request: Request):
+    method, url, body, *headers = request
+    return await client.request(method, url, json=body, headers=headers[0] if headers else None)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# This function sends count requests for one scenario from concurrency workers
+# and summarises their latencies; offset keeps request numbers unique across levels.
+async def _run_scenario(client, build: Callable[[int], Request], count: int, concurrency: int, offset: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    next_request = iter(range(offset, offset + count))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in next_request:
+            request = build(i)
+            started = time.perf_counter()
+            response = await _send(client, request)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 1),
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+        "p90_ms": round(_percentile(ordered, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+async def _run_suite(volumes, levels: List[int], requests: int, warmup: int, only: Optional[str]) -> Dict:
+    import httpx
+    from main import app
+
+    fixtures: Dict[str, Any] = {}
+    scenarios = [(name, build) for name, build in _scenarios(volumes, fixtures) if not only or only in name]
+    results: Dict[str, Dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        offset = 0
+        for concurrency in levels:
+            level = results[f"c{concurrency}"] = {}
+            # Profiled requests of the previous level have pruned the last primed profile
+            fixtures["profile_id"] = await _prime_profile(client)
+            for name, build in scenarios:
+                for i in range(warmup):
+                    await _send(client, build(offset + i))
+                offset += warmup
+                level[name] = await _run_scenario(client, build, requests, concurrency, offset)
+                offset += requests
+                print(f"c={concurrency:<4}{name:<50}{level[name]['throughput_rps']:>10} req/s"
+                      f"  p50 {level[name]['p50_ms']:>8} ms  p99 {level[name]['p99_ms']:>8} ms"
+                      f"  errors {level[name]['errors']}")
+    return results
+
+
+# This function profiles one request and returns the id of the saved profile
+async def _prime_profile(client) -> str:
+    from utils.profiling import PROFILE_ID_HEADER, PROFILE_TOKEN_HEADER
+
+    response = await client.get("/", headers={PROFILE_TOKEN_HEADER: os.environ["PROFILE_TOKEN"]})
+    return response.headers[PROFILE_ID_HEADER]
+
+
+# This function prints the change of every scenario against a previous run
+def _compare(results: Dict, baseline: Dict) -> None:
+    print(f"\n{'scenario':<58}{'req/s':>10}{'p50':>10}{'p99':>10}")
+    for level, scenarios in results.items():
+        for name, current in scenarios.items():
+            previous = baseline.get("results", {}).get(level, {}).get(name)
+            if previous is None:
+                continue
+            change = lambda key: f"{(current[key] - previous[key]) / previous[key] * 100:+.1f}%" if previous[key] else "n/a"
+            print(f"{level + ' ' + name:<58}{change('throughput_rps'):>10}{change('p50_ms'):>10}{change('p99_ms'):>10}")
+
+
+# This function returns the cached seeded database for the volumes, building it if needed
+def _seeded_database(volumes, seed: int, reseed: bool) -> str:
+    from sqlalchemy import create_engine
+    from migrations.runner import upgrade
+    from benchmarks.seed import seed_database
+
+    v = volumes
+    path = os.path.join(
+        DATA_DIR,
+        f"seed-{v.patients}p-{v.doctors}d-{v.appointments}a-{v.medical_records}r-{v.archived_medical_records}x-{seed}.db",
+    )
+    if os.path.exists(path) and not reseed:
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    building = path + ".building"
+    if os.path.exists(building):
+        os.remove(building)
+    engine = create_engine(f"sqlite:///{building}")
+    upgrade(engine)
+    seed_database(engine, volumes, seed)
+    engine.dispose()
+    os.replace(building, path)
+    return path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the API benchmark suite")
+    parser.add_argument("--patients", type=int, default=10000)
+    parser.add_argument("--doctors", type=int, default=2000)
+    parser.add_argument("--appointments", type=int, default=100000)
+    parser.add_argument("--medical-records", type=int, default=50000)
+    parser.add_argument("--archived-medical-records", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reseed", action="store_true", help="rebuild the cached seeded database")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", help="run only scenarios whose name contains this text")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="print the change against a previous JSON result")
+    args = parser.parse_args(argv)
+
+    # The app reads DATABASE_URL when its modules are imported, so point it at the
+    # working copy before importing anything from the application
+    working = os.path.join(DATA_DIR, "run.db")
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{working}"
+    os.environ.setdefault("PROFILE_TOKEN", BENCHMARK_PROFILE_TOKEN)
+    os.environ.setdefault("PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+    logging.getLogger("middleware").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    from benchmarks.seed import Volumes
+
+    volumes = Volumes(
+        args.patients, args.doctors, args.appointments, args.medical_records, args.archived_medical_records
+    )
+    shutil.copyfile(_seeded_database(volumes, args.seed, args.reseed), working)
+    results = asyncio.run(_run_suite(volumes, args.concurrency, args.requests, args.warmup, args.only))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db_mode": os.getenv("DB_MODE", "sync"),
+            "volumes": asdict(volumes),
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as previous:
+            _compare(results, json.load(previous))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,57 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from routers import patients, doctors, appointments, medical_records
+from routers import patients, doctors, appointments, medical_records, internal, metrics, stats, archive
 from middleware.log_request_time import log_request_time
+from middleware.query_stats import track_request_queries
+from middleware.profiling import profile_request
+from models.async_database import DB_MODE, dispose_async_engine
 from utils.exceptions import add_exception_handlers
+from utils.audit_log import audit_writer
+from utils.entity_cache import init_entity_cache
+from models.file_database import STORAGE_BACKEND, close_file_store, get_file_store
 
-app = FastAPI(title="Patient Medical Record Management System")
+
+# Build the entity cache backend and open the file store at startup, so a configuration
+# that cannot serve several workers fails at once. Write out queued audit records, close
+# the file store and release pooled connections when the application shuts down.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_entity_cache()
+    if STORAGE_BACKEND == "file":
+        get_file_store()
+    yield
+    close_file_store()
+    audit_writer.close()
+    await dispose_async_engine()
+
+
+app = FastAPI(title="Patient Medical Record Management System", lifespan=lifespan)
 
 app.middleware("http")(log_request_time)
+app.middleware("http")(track_request_queries)
+app.middleware("http")(profile_request)
+
+# The file store only backs the sync repositories
+if STORAGE_BACKEND == "file" and DB_MODE == "async":
+    raise ValueError("STORAGE_BACKEND=file requires DB_MODE=sync")
+
+# In async mode the async routers replace the sync ones; each serves the same routes
+# under the same path templates, so clients and the /metrics labels do not change.
+if DB_MODE == "async":
+    from routers import async_patients, async_doctors, async_appointments, async_medical_records, async_stats, async_archive
+
+    entity_routers = [async_patients, async_doctors, async_appointments, async_medical_records, async_stats, async_archive]
+else:
+    entity_routers = [patients, doctors, appointments, medical_records, stats, archive]
 
 # Include routers for different functionalities
-app.include_router(patients.router)
-app.include_router(doctors.router)
-app.include_router(appointments.router)
-app.include_router(medical_records.router)
+for module in entity_routers:
+    app.include_router(module.router)
+app.include_router(internal.router)
+app.include_router(metrics.router)
 
 add_exception_handlers(app)
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to the Patient Medical Record Management System"}
\ No newline at end of file
+    return {"message": "Welcome to the Patient Medical Record Management System"}
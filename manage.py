@@ -0,0 +1,149 @@
+import argparse
+import sys
+from models.database import engine
+
+
+# Apply pending schema migrations, optionally stopping at a target version
+def migrate(args: argparse.Namespace) -> int:
+    from migrations.runner import upgrade, current_version
+
+    applied = upgrade(engine, args.to)
+    for version in applied:
+        print(f"Applied migration {version}")
+    print(f"Schema is at version {current_version(engine)}")
+    return 0
+
+
+# Explain the repository queries and fail when any of them falls back to a full scan
+def explain(args: argparse.Namespace) -> int:
+    from migrations.explain import check_query_plans
+
+    try:
+        problems = check_query_plans(engine)
+    except ValueError as error:
+        print(f"Cannot check query plans: {error}")
+        return 2
+    for problem in problems:
+        print(f"Full scan: {problem}")
+    if problems:
+        return 1
+    print("All repository queries use an index")
+    return 0
+
+
+# Recompute the statistics summary tables from the live rows, repairing any drift
+def rebuild_stats(args: argparse.Namespace) -> int:
+    from sqlalchemy.orm import Session
+    from services.stats_service import StatsService
+
+    with Session(engine) as db:
+        rebuilt = StatsService(db).rebuild()
+    for table, rows in rebuilt.items():
+        print(f"Rebuilt {table}: {rows} rows")
+    return 0
+
+
+# Move rows soft-deleted before the retention window into the archive tables
+def archive(args: argparse.Namespace) -> int:
+    from datetime import timedelta
+    from sqlalchemy.orm import Session
+    from services.archive_service import ARCHIVE_BATCH_SIZE, ARCHIVE_PAUSE, ARCHIVE_RETENTION_DAYS, ArchiveService
+
+    with Session(engine) as db:
+        run = ArchiveService(db).archive_deleted(
+            timedelta(days=args.retention_days if args.retention_days is not None else ARCHIVE_RETENTION_DAYS),
+            args.batch_size or ARCHIVE_BATCH_SIZE,
+            args.pause_ms / 1000 if args.pause_ms is not None else ARCHIVE_PAUSE,
+            args.max_batches,
+            report=print,
+        )
+    for table, rows in run.archived.items():
+        print(f"Archived {table}: {rows} rows deleted before {run.cutoff:%Y-%m-%d %H:%M}")
+    return 0
+
+
+# Recompute the audit log's hash chain and fail at the first entry that does not match
+def verify_audit(args: argparse.Namespace) -> int:
+    from sqlalchemy.orm import Session
+    from repositories.audit_repository import AuditRepository
+
+    with Session(engine) as db:
+        broken = AuditRepository(db).verify()
+    if broken == 0:
+        print("Audit chain head does not match the last entry")
+        return 1
+    if broken is not None:
+        print(f"Audit chain broken at entry {broken}")
+        return 1
+    print("Audit chain is intact")
+    return 0
+
+
+# Import the data/*.json files of the old JSON file storage into the file store
+def load_json(args: argparse.Namespace) -> int:
+    from models.file_database import FileSession, close_file_store, get_file_store
+    from services.json_import_service import JsonImportService
+
+    try:
+        loaded = JsonImportService(FileSession(get_file_store())).load(args.data_dir)
+    finally:
+        close_file_store()
+    for file_name, rows in loaded.items():
+        print(f"Loaded {file_name}: {rows} rows")
+    return 0
+
+
+# Compact the file store's logs, dropping superseded row versions.
+# Like load-json, it fails while a running application has the store open.
+def compact_store(args: argparse.Namespace) -> int:
+    from models.file_database import close_file_store, get_file_store
+
+    try:
+        compacted = get_file_store().compact(force=args.force)
+        stats = get_file_store().stats()
+    finally:
+        close_file_store()
+    for table, table_stats in stats.items():
+        state = "compacted" if table in compacted else "left as is"
+        print(f"{table}: {state}, {table_stats['rows']} rows in {table_stats['bytes']} bytes")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Patient Medical Record Management System tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_parser.add_argument("--to", type=int, default=None, help="Stop at this migration version")
+    migrate_parser.set_defaults(handler=migrate)
+
+    explain_parser = commands.add_parser("explain", help="Fail if a repository query does a full table scan")
+    explain_parser.set_defaults(handler=explain)
+
+    rebuild_parser = commands.add_parser("rebuild-stats", help="Recompute the statistics summary tables")
+    rebuild_parser.set_defaults(handler=rebuild_stats)
+
+    archive_parser = commands.add_parser("archive", help="Move long soft-deleted rows into the archive tables")
+    archive_parser.add_argument("--retention-days", type=int, default=None, help="Archive rows deleted this many days ago")
+    archive_parser.add_argument("--batch-size", type=int, default=None, help="Rows moved per transaction")
+    archive_parser.add_argument("--pause-ms", type=float, default=None, help="Pause between batches")
+    archive_parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    archive_parser.set_defaults(handler=archive)
+
+    verify_audit_parser = commands.add_parser("verify-audit", help="Check the audit log's hash chain")
+    verify_audit_parser.set_defaults(handler=verify_audit)
+
+    load_json_parser = commands.add_parser("load-json", help="Import data/*.json into the file store")
+    load_json_parser.add_argument("--data-dir", default="data", help="Directory holding the JSON files")
+    load_json_parser.set_defaults(handler=load_json)
+
+    compact_parser = commands.add_parser("compact-store", help="Compact the file store's logs")
+    compact_parser.add_argument("--force", action="store_true", help="Compact every log, however little is superseded")
+    compact_parser.set_defaults(handler=compact_store)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
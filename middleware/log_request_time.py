@@ -1,15 +1,27 @@
 from fastapi import Request
 import time
 import logging
+from utils.request_metrics import UNMATCHED_ROUTE, request_metrics
 
-# This middleware logs the time taken to process each request.
+# This middleware logs the time taken to process each request and records it
+# in the per-route latency histograms served by /metrics.
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Middleware to log request time
+# Durations come from the monotonic clock. Requests are labelled with the matched
+# route template rather than the raw path, and unhandled errors count as 500s.
 async def log_request_time(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    duration = time.time() - start_time
-    logger.info(f"Request: {request.method} {request.url.path} completed in {duration:.2f} seconds")
-    return response
\ No newline at end of file
+    method = request.method
+    request_metrics.started(method)
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        duration = time.perf_counter() - start_time
+        route = request.scope.get("route")
+        request_metrics.finished(method, route.path if route is not None else UNMATCHED_ROUTE, status, duration)
+        logger.info(f"Request: {method} {request.url.path} completed in {duration:.2f} seconds")
@@ -0,0 +1,21 @@
+import asyncio
+from fastapi import Request
+from utils.profiling import PROFILE_ID_HEADER, begin_profile, save_profile, should_profile
+
+# Middleware to profile a request on demand: opted-in requests run under the sampling
+# profiler, the result is saved and its id is returned in the X-Profile-Id header.
+# A request past the PROFILE_MAX_ACTIVE running profiles is served unprofiled, without
+# the header. Saving joins the sampler thread and writes a file, so it runs off the loop.
+async def profile_request(request: Request, call_next):
+    if not should_profile(request):
+        return await call_next(request)
+    profile = begin_profile(request)
+    if profile is None:
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        profile.stop()
+        await asyncio.to_thread(save_profile, profile)
+    response.headers[PROFILE_ID_HEADER] = profile.id
+    return response
@@ -0,0 +1,41 @@
+from fastapi import Request
+import json
+import logging
+from typing import AsyncIterator
+from utils.query_stats import QueryStats, check_repeats, track_queries
+from utils.request_metrics import UNMATCHED_ROUTE
+
+# This middleware counts the SQL statements each request runs, reports them in a
+# Server-Timing header and writes one structured (JSON) log line per request.
+# The header goes out with the response head, so it only covers the statements run
+# until then. A streamed body (the exports) runs its queries while it is sent; the
+# collector still records them, and the log line and the N+1 check wait for the end
+# of the body, so they cover the whole request.
+logger = logging.getLogger(__name__)
+
+# Middleware to collect per-request query statistics
+# In test mode (QUERY_STATS_STRICT=1) a statement repeated past QUERY_REPEAT_LIMIT
+# fails the request with RepeatedQueryError, so N+1 patterns break the tests.
+async def track_request_queries(request: Request, call_next):
+    # The endpoint runs in a task that copied the collector in, so queries made while
+    # its body streams are recorded after this block has exited
+    with track_queries(strict=False) as stats:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = stats.server_timing()
+    response.body_iterator = _report_after_body(response.body_iterator, request, response.status_code, stats)
+    return response
+
+
+# Pass the body through, then log the request's statements and check them for repeats
+async def _report_after_body(body: AsyncIterator[bytes], request: Request, status: int, stats: QueryStats):
+    async for chunk in body:
+        yield chunk
+    route = request.scope.get("route")
+    logger.info(json.dumps({
+        "event": "request_queries",
+        "method": request.method,
+        "route": route.path if route is not None else UNMATCHED_ROUTE,
+        "status": status,
+        **stats.as_log_fields(),
+    }))
+    check_repeats(stats)
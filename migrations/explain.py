@@ -0,0 +1,213 @@
+import re
+import warnings
+from datetime import date, datetime
+from typing import Callable, Dict, List, Set, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.orm import Session
+from repositories.patient_repository import PatientRepository
+from repositories.patient_search_repository import PatientSearchRepository
+from repositories.patient_timeline_repository import TimelineCursor
+from repositories.doctor_repository import DoctorRepository
+from repositories.appointment_repository import AppointmentRepository
+from repositories.medical_record_repository import MedicalRecordRepository
+from repositories.stats_repository import StatsRepository
+from repositories.archive_repository import ArchiveRepository
+from repositories.audit_repository import AuditRepository
+from models.archive import ARCHIVE_MODELS
+from schemas.appointment import AppointmentStatus
+from schemas.timeline import TimelineKind
+from utils.total_count import CountStrategy
+
+# Representative repository reads covering every hot filter and keyset path.
+# Each entry is run once and every statement it issues is explained.
+QUERY_CHECKS: List[Tuple[str, Callable[[Session], object]]] = [
+    ("patients.get_version", lambda db: PatientRepository(db).get_version(1)),
+    ("patients.get_by_id", lambda db: PatientRepository(db).get_by_id(1)),
+    ("patients.get_all", lambda db: PatientRepository(db).get_all(1, 10)),
+    ("patients.get_all_versions", lambda db: PatientRepository(db).get_all_versions(1, 10)),
+    ("patients.get_many", lambda db: PatientRepository(db).get_many([1, 2, 3])),
+    ("patients.get_all(cursor)", lambda db: PatientRepository(db).get_all(1, 10, None, 100)),
+    ("patients.get_timeline", lambda db: PatientRepository(db).get_timeline(1, 20)),
+    (
+        "patients.get_timeline(cursor)",
+        lambda db: PatientRepository(db).get_timeline(1, 20, TimelineCursor(datetime(2025, 1, 1), TimelineKind.APPOINTMENT, 100)),
+    ),
+    ("patients.search", lambda db: PatientSearchRepository(db).search("john smi")),
+    ("doctors.get_version", lambda db: DoctorRepository(db).get_version(1)),
+    ("doctors.get_by_id", lambda db: DoctorRepository(db).get_by_id(1)),
+    ("doctors.get_all", lambda db: DoctorRepository(db).get_all(1, 10)),
+    ("doctors.get_all_versions", lambda db: DoctorRepository(db).get_all_versions(1, 10)),
+    ("doctors.get_many", lambda db: DoctorRepository(db).get_many([1, 2, 3])),
+    ("doctors.get_all(specialty)", lambda db: DoctorRepository(db).get_all(1, 10, "cardio")),
+    ("appointments.get_version", lambda db: AppointmentRepository(db).get_version(1)),
+    ("appointments.get_by_id", lambda db: AppointmentRepository(db).get_by_id(1)),
+    ("appointments.get_all", lambda db: AppointmentRepository(db).get_all(1, 10)),
+    ("appointments.get_all_versions", lambda db: AppointmentRepository(db).get_all_versions(1, 10)),
+    ("appointments.get_many", lambda db: AppointmentRepository(db).get_many([1, 2, 3])),
+    ("appointments.get_all(status)", lambda db: AppointmentRepository(db).get_all(1, 10, AppointmentStatus.SCHEDULED)),
+    (
+        "appointments.get_all(cursor)",
+        lambda db: AppointmentRepository(db).get_all(1, 10, None, (datetime(2025, 1, 1), 100)),
+    ),
+    (
+        "appointments.get_doctor_intervals",
+        lambda db: AppointmentRepository(db).get_doctor_intervals(1, datetime(2025, 1, 1), datetime(2025, 1, 2)),
+    ),
+    (
+        "appointments.check_booking",
+        lambda db: AppointmentRepository(db).check_booking(1, 1, (datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 10)), 1),
+    ),
+    ("medical_records.get_version", lambda db: MedicalRecordRepository(db).get_version(1)),
+    ("medical_records.get_by_id", lambda db: MedicalRecordRepository(db).get_by_id(1)),
+    ("medical_records.get_all", lambda db: MedicalRecordRepository(db).get_all(1, 10)),
+    ("medical_records.get_all_versions", lambda db: MedicalRecordRepository(db).get_all_versions(1, 10)),
+    ("medical_records.get_many", lambda db: MedicalRecordRepository(db).get_many([1, 2, 3])),
+    ("medical_records.get_all(patient_id)", lambda db: MedicalRecordRepository(db).get_all(1, 10, 1)),
+    ("patients.count", lambda db: PatientRepository(db).count(None, CountStrategy.EXACT)),
+    (
+        "appointments.count(status)",
+        lambda db: AppointmentRepository(db).count(AppointmentStatus.SCHEDULED, CountStrategy.EXACT),
+    ),
+    ("medical_records.count(patient_id)", lambda db: MedicalRecordRepository(db).count(1, CountStrategy.EXACT)),
+    (
+        "stats.get_appointment_counts",
+        lambda db: StatsRepository(db).get_appointment_counts(date(2025, 1, 1), date(2025, 1, 31)),
+    ),
+    (
+        "stats.get_appointment_counts(doctor_id)",
+        lambda db: StatsRepository(db).get_appointment_counts(date(2025, 1, 1), date(2025, 1, 31), 1),
+    ),
+    ("stats.get_patient_record_count", lambda db: StatsRepository(db).get_patient_record_count(1)),
+    ("audit.get_for_patient", lambda db: AuditRepository(db).get_for_patient(1, 50)),
+    ("audit.get_for_patient(cursor)", lambda db: AuditRepository(db).get_for_patient(1, 50, 100)),
+] + [
+    (
+        f"archive.expired_ids({model.__tablename__})",
+        lambda db, model=model: ArchiveRepository(db).expired_ids(model, datetime(2025, 1, 1), 500),
+    )
+    for model in ARCHIVE_MODELS
+]
+
+
+# Dialects whose query plans the check can read
+PLAN_DIALECTS = ("sqlite", "mysql")
+
+
+# This function fails with a clear message for a database the check cannot read plans of
+def _check_dialect(dialect: str) -> None:
+    if dialect not in PLAN_DIALECTS:
+        raise ValueError(f"Query plan checks support {' and '.join(PLAN_DIALECTS)}, not {dialect}")
+
+
+# This function returns the plan steps that read a whole table for one statement.
+# Only index seeks pass. SQLite reports them as "SEARCH"; every "SCAN <table>" reads the
+# whole table, including "SCAN <table> USING [COVERING] INDEX", which walks a whole
+# index. MySQL reports access type ALL for a table scan and index for a full index scan.
+# Scans of derived tables (grouped subqueries) are not table scans and are ignored.
+def _full_scans(connection: Connection, statement: str, parameters, tables: Set[str]) -> List[str]:
+    dialect = connection.dialect.name
+    _check_dialect(dialect)
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return [
+            row[-1] for row in rows
+            if row[-1].startswith("SCAN ") and row[-1].split()[1] in tables
+        ]
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().fetchall()
+    return [
+        f"{row['table']}: type={row['type']}" for row in rows
+        if row["type"] in ("ALL", "index") and row["table"] in tables
+    ]
+
+
+# A LIKE on a qualified column, its operand a bound parameter or a string literal, with
+# the lower() that ILIKE compiles to on SQLite and MySQL around either side
+LIKE_PREDICATE = re.compile(
+    r"(?:lower\()?(\w+)\.(\w+)\)?\s+(?:NOT\s+)?I?LIKE\s+(?:lower\()?(\?|%s|'[^']*')", re.IGNORECASE
+)
+
+
+# This function returns the index each table of the statement is read through
+def _indexes_used(connection: Connection, statement: str, parameters) -> Dict[str, str]:
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        used = {}
+        for row in rows:
+            match = re.match(r"(?:SEARCH|SCAN) (\w+) USING (?:COVERING )?INDEX (\w+)", row[-1])
+            if match:
+                used[match.group(1)] = match.group(2)
+        return used
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().fetchall()
+    return {row["table"]: row["key"] for row in rows if row["key"]}
+
+
+# This function returns the non-sargable predicates of one statement: a LIKE whose pattern
+# starts with a wildcard, on a column of the index its table is read through. The plan
+# still says the index is used, but it can only seek the columns before that one and then
+# tests the pattern on every entry left; ix_doctors_live_specialty served '%x%' that way.
+# index_columns maps each index name to the columns it covers.
+def _non_sargable(
+    connection: Connection, statement: str, parameters, index_columns: Dict[str, Set[str]]
+) -> List[str]:
+    placeholder = "?" if connection.dialect.paramstyle == "qmark" else "%s"
+    leading = []
+    for match in LIKE_PREDICATE.finditer(statement):
+        table, column, operand = match.groups()
+        if operand.startswith("'"):
+            pattern = operand[1:-1]
+        else:
+            pattern = str(parameters[statement[:match.start(3)].count(placeholder)])
+        if pattern.startswith(("%", "_")):
+            leading.append((table, column))
+    if not leading:
+        return []
+    used = _indexes_used(connection, statement, parameters)
+    return [
+        f"{table}.{column}: LIKE with a leading wildcard cannot seek {used[table]}"
+        for table, column in leading
+        if table in used and column in index_columns.get(used[table], ())
+    ]
+
+
+# This function runs every query check and returns a description of each full scan and
+# each non-sargable predicate found.
+# Everything runs inside a rolled back transaction so the check never changes data.
+# Raises ValueError for a database other than those in PLAN_DIALECTS.
+def check_query_plans(engine: Engine) -> List[str]:
+    _check_dialect(engine.dialect.name)
+    problems = []
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        tables = set(inspector.get_table_names())
+        # SQLite reflection skips expression indexes with a warning; they cover no plain column
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", SAWarning)
+            index_columns = {
+                index["name"]: {column for column in index["column_names"] if column}
+                for table in tables
+                for index in inspector.get_indexes(table)
+            }
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(connection, "before_cursor_execute", capture)
+        try:
+            with Session(bind=connection) as db:
+                for label, run in QUERY_CHECKS:
+                    captured.clear()
+                    run(db)
+                    statements = list(captured)
+                    for statement, parameters in statements:
+                        for scan in _full_scans(connection, statement, parameters, tables):
+                            problems.append(f"{label}: {scan}")
+                        for predicate in _non_sargable(connection, statement, parameters, index_columns):
+                            problems.append(f"{label}: {predicate}")
+        finally:
+            event.remove(connection, "before_cursor_execute", capture)
+            connection.rollback()
+    return problems
@@ -0,0 +1,66 @@
+import importlib
+import pkgutil
+from datetime import datetime
+from types import ModuleType
+from typing import List, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Engine
+
+# Table that records which schema migrations have been applied
+metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# This function discovers the migration modules in migrations/versions.
+# Each module exposes a version number, a description and an upgrade(connection) function.
+def load_migrations() -> List[ModuleType]:
+    from migrations import versions
+
+    modules = [
+        importlib.import_module(f"migrations.versions.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module: module.version)
+    seen = set()
+    for module in modules:
+        if module.version in seen:
+            raise ValueError(f"Duplicate migration version {module.version}")
+        seen.add(module.version)
+    return modules
+
+
+# This function returns the highest applied migration version, or 0 for an empty database.
+def current_version(engine: Engine) -> int:
+    metadata.create_all(bind=engine, tables=[schema_migrations])
+    with engine.connect() as connection:
+        versions = connection.execute(select(schema_migrations.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+# This function applies every pending migration up to the target version.
+# Each migration runs in its own transaction together with its schema_migrations row.
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    applied = []
+    version = current_version(engine)
+    for module in load_migrations():
+        if module.version <= version:
+            continue
+        if target is not None and module.version > target:
+            break
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(
+                    version=module.version,
+                    description=module.description,
+                    applied_at=datetime.now(),
+                )
+            )
+        applied.append(module.version)
+    return applied
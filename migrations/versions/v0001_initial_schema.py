@@ -0,0 +1,73 @@
+from sqlalchemy import Column, DateTime, Enum, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+version = 1
+description = "Initial patients, doctors, appointments and medical_records tables"
+
+# Tables as they were first created with Base.metadata.create_all.
+# They are frozen here so later model changes only show up in later migrations.
+metadata = MetaData()
+
+Table(
+    "patients",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("full_name", String(100), nullable=False),
+    Column("age", Integer, nullable=False),
+    Column("gender", String(10), nullable=False),
+    Column("contact_information", String(20), nullable=False),
+    Column("address", String(200), nullable=False),
+    Column("emergency_contact", String(20), nullable=False),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+)
+
+Table(
+    "doctors",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("full_name", String(100), nullable=False),
+    Column("specialty", String(100), nullable=False),
+    Column("years_of_experience", Integer, nullable=False),
+    Column("contact_information", String(20), nullable=False),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+)
+
+Table(
+    "appointments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("patient_id", Integer, nullable=False),
+    Column("doctor_id", Integer, nullable=False),
+    Column("date_time", DateTime, nullable=False),
+    Column(
+        "status",
+        Enum("SCHEDULED", "COMPLETED", "CANCELLED", name="appointmentstatus"),
+        nullable=False,
+    ),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+)
+
+Table(
+    "medical_records",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("patient_id", Integer, nullable=False),
+    Column("diagnosis", String(200), nullable=False),
+    Column("prescriptions", String(500), nullable=False),
+    Column("treatment_date", DateTime, nullable=False),
+    Column("doctor_notes", String(500), nullable=False),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+)
+
+
+# Existing deployments already have these tables, so creation is skipped when present
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
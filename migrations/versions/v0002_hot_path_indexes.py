@@ -0,0 +1,28 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+version = 2
+description = "Composite indexes for the repository filter and keyset paths"
+
+# Every list query filters date_deleted IS NULL and orders by its keyset columns,
+# so the live-row filter leads each index and the keyset columns follow it.
+INDEXES = [
+    ("patients", "ix_patients_live_id", ["date_deleted", "id"]),
+    ("doctors", "ix_doctors_live_id", ["date_deleted", "id"]),
+    ("doctors", "ix_doctors_live_specialty", ["date_deleted", "specialty"]),
+    ("appointments", "ix_appointments_doctor_time", ["doctor_id", "date_time", "date_deleted"]),
+    ("appointments", "ix_appointments_live_time", ["date_deleted", "date_time", "id"]),
+    ("appointments", "ix_appointments_status_live_time", ["status", "date_deleted", "date_time", "id"]),
+    ("medical_records", "ix_medical_records_live_id", ["date_deleted", "id"]),
+    ("medical_records", "ix_medical_records_patient_live_id", ["patient_id", "date_deleted", "id"]),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    inspector = inspect(connection)
+    for table, name, columns in INDEXES:
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        if name in existing:
+            continue
+        connection.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
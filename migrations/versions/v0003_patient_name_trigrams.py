@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, insert, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Connection
+from utils.trigrams import name_trigrams
+
+version = 3
+description = "Trigram index table for patient name search"
+
+BACKFILL_BATCH_SIZE = 1000
+
+metadata = MetaData()
+patient_name_trigrams = Table(
+    "patient_name_trigrams",
+    metadata,
+    Column(
+        "trigram",
+        String(3).with_variant(mysql.VARCHAR(3, collation="utf8mb4_bin"), "mysql"),
+        primary_key=True,
+    ),
+    Column("patient_id", Integer, primary_key=True),
+    Index("ix_patient_name_trigrams_patient_id", "patient_id"),
+)
+
+
+# Creates the table and indexes the names of every live patient, walking patients by id
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
+    last_id = 0
+    while True:
+        patients = connection.execute(
+            text(
+                "SELECT id, full_name FROM patients "
+                "WHERE date_deleted IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not patients:
+            break
+        rows = [
+            {"trigram": gram, "patient_id": patient_id}
+            for patient_id, full_name in patients
+            for gram in name_trigrams(full_name)
+        ]
+        if rows:
+            connection.execute(insert(patient_name_trigrams), rows)
+        last_id = patients[-1][0]
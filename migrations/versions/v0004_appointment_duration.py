@@ -0,0 +1,13 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+version = 4
+description = "Appointment durations for interval based conflict checks"
+
+
+# Existing appointments get the 30 minute default through the server default
+def upgrade(connection: Connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("appointments")}
+    if "duration_minutes" not in columns:
+        connection.execute(text("ALTER TABLE appointments ADD COLUMN duration_minutes INTEGER NOT NULL DEFAULT 30"))
@@ -0,0 +1,22 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+version = 5
+description = "Patient and time indexes for the patient timeline"
+
+# The timeline reads one patient's live rows newest first and seeks by time, so the
+# patient leads each index, the live-row filter follows and the time and id keyset ends it.
+INDEXES = [
+    ("appointments", "ix_appointments_patient_live_time", ["patient_id", "date_deleted", "date_time", "id"]),
+    ("medical_records", "ix_medical_records_patient_live_time", ["patient_id", "date_deleted", "treatment_date", "id"]),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    inspector = inspect(connection)
+    for table, name, columns in INDEXES:
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        if name in existing:
+            continue
+        connection.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
@@ -0,0 +1,58 @@
+from sqlalchemy import Column, Date, Enum, Integer, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+version = 6
+description = "Summary count tables for the dashboard statistics"
+
+metadata = MetaData()
+
+Table(
+    "appointment_counts",
+    metadata,
+    Column("doctor_id", Integer, primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column(
+        "status",
+        Enum("SCHEDULED", "COMPLETED", "CANCELLED", name="appointmentstatus"),
+        primary_key=True,
+    ),
+    Column("total", Integer, nullable=False),
+)
+
+Table(
+    "appointment_day_counts",
+    metadata,
+    Column("day", Date, primary_key=True),
+    Column(
+        "status",
+        Enum("SCHEDULED", "COMPLETED", "CANCELLED", name="appointmentstatus"),
+        primary_key=True,
+    ),
+    Column("total", Integer, nullable=False),
+)
+
+Table(
+    "patient_record_counts",
+    metadata,
+    Column("patient_id", Integer, primary_key=True),
+    Column("total", Integer, nullable=False),
+)
+
+# Each table is filled from the live rows it summarises
+BACKFILL = [
+    "INSERT INTO appointment_counts (doctor_id, day, status, total) "
+    "SELECT doctor_id, DATE(date_time), status, COUNT(*) FROM appointments "
+    "WHERE date_deleted IS NULL GROUP BY doctor_id, DATE(date_time), status",
+    "INSERT INTO appointment_day_counts (day, status, total) "
+    "SELECT DATE(date_time), status, COUNT(*) FROM appointments "
+    "WHERE date_deleted IS NULL GROUP BY DATE(date_time), status",
+    "INSERT INTO patient_record_counts (patient_id, total) "
+    "SELECT patient_id, COUNT(*) FROM medical_records "
+    "WHERE date_deleted IS NULL GROUP BY patient_id",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
+    for statement in BACKFILL:
+        connection.execute(text(statement))
@@ -0,0 +1,77 @@
+from sqlalchemy import Column, DateTime, Enum, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+version = 7
+description = "Archive tables for soft-deleted rows past their retention window"
+
+# Each archive mirrors its live table's columns and records when the row was archived.
+# Rows are only looked up by primary key, so there are no secondary indexes.
+metadata = MetaData()
+
+Table(
+    "patients_archive",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("full_name", String(100), nullable=False),
+    Column("age", Integer, nullable=False),
+    Column("gender", String(10), nullable=False),
+    Column("contact_information", String(20), nullable=False),
+    Column("address", String(200), nullable=False),
+    Column("emergency_contact", String(20), nullable=False),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+    Column("archived_at", DateTime, nullable=False),
+)
+
+Table(
+    "doctors_archive",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("full_name", String(100), nullable=False),
+    Column("specialty", String(100), nullable=False),
+    Column("years_of_experience", Integer, nullable=False),
+    Column("contact_information", String(20), nullable=False),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+    Column("archived_at", DateTime, nullable=False),
+)
+
+Table(
+    "appointments_archive",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("patient_id", Integer, nullable=False),
+    Column("doctor_id", Integer, nullable=False),
+    Column("date_time", DateTime, nullable=False),
+    Column("duration_minutes", Integer, nullable=False),
+    Column(
+        "status",
+        Enum("SCHEDULED", "COMPLETED", "CANCELLED", name="appointmentstatus"),
+        nullable=False,
+    ),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+    Column("archived_at", DateTime, nullable=False),
+)
+
+Table(
+    "medical_records_archive",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("patient_id", Integer, nullable=False),
+    Column("diagnosis", String(200), nullable=False),
+    Column("prescriptions", String(500), nullable=False),
+    Column("treatment_date", DateTime, nullable=False),
+    Column("doctor_notes", String(500), nullable=False),
+    Column("date_created", DateTime, nullable=False),
+    Column("date_updated", DateTime, nullable=True),
+    Column("date_deleted", DateTime, nullable=True),
+    Column("archived_at", DateTime, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, Text
+from sqlalchemy.dialects.mysql import DATETIME
+from sqlalchemy.engine import Connection
+
+version = 8
+description = "Hash-chained audit log of patient and medical record changes"
+
+metadata = MetaData()
+
+# The hashed timestamps keep their microseconds on MySQL, whose plain DATETIME drops them
+timestamp = DateTime().with_variant(DATETIME(fsp=6), "mysql")
+
+Table(
+    "audit_events",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("patient_id", Integer, nullable=False),
+    Column("entity", String(20), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("action", String(10), nullable=False),
+    Column("changes", Text, nullable=True),
+    Column("occurred_at", timestamp, nullable=False),
+    Column("recorded_at", timestamp, nullable=False),
+    Column("previous_hash", String(64), nullable=False),
+    Column("hash", String(64), nullable=False),
+    Index("ix_audit_events_patient_id", "patient_id", "id"),
+)
+
+audit_chain_head = Table(
+    "audit_chain_head",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("hash", String(64), nullable=False),
+)
+
+
+# The chain head starts at the genesis hash, before any entry
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
+    connection.execute(audit_chain_head.insert().values(id=1, hash="0" * 64))
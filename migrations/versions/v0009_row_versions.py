@@ -0,0 +1,21 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+version = 9
+description = "Row version counters for conditional GET validators"
+
+# The archives mirror the live tables' columns, so a restored row keeps its version
+TABLES = [
+    "patients", "doctors", "appointments", "medical_records",
+    "patients_archive", "doctors_archive", "appointments_archive", "medical_records_archive",
+]
+
+
+# Existing rows start at version 1 through the server default
+def upgrade(connection: Connection) -> None:
+    inspector = inspect(connection)
+    for table in TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "version" not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
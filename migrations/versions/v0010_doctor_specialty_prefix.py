@@ -0,0 +1,30 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+version = 10
+description = "Expression index for the doctor specialty prefix filter"
+
+# The specialty filter became a case-insensitive prefix range over lower(specialty).
+# The old (date_deleted, specialty) index could not seek its former '%x%' pattern, and
+# cannot seek lower(specialty) either, so it is replaced rather than kept alongside.
+INDEX = "ix_doctors_live_specialty_prefix"
+OLD_INDEX = "ix_doctors_live_specialty"
+
+
+# SQLAlchemy skips expression indexes when it reflects a SQLite table, so there the names
+# come straight from the index list pragma
+def _index_names(connection: Connection) -> set:
+    if connection.dialect.name == "sqlite":
+        return {row[1] for row in connection.exec_driver_sql("PRAGMA index_list(doctors)")}
+    return {index["name"] for index in inspect(connection).get_indexes("doctors")}
+
+
+def upgrade(connection: Connection) -> None:
+    existing = _index_names(connection)
+    if INDEX not in existing:
+        # The doubled parentheses are the functional key part syntax MySQL requires
+        connection.execute(text(f"CREATE INDEX {INDEX} ON doctors (date_deleted, (lower(specialty)))"))
+    if OLD_INDEX in existing:
+        on_table = " ON doctors" if connection.dialect.name == "mysql" else ""
+        connection.execute(text(f"DROP INDEX {OLD_INDEX}{on_table}"))
@@ -2,30 +2,33 @@ from datetime import datetime
 from typing import Optional
 from schemas.appointment import AppointmentStatus
 from.base import BaseModel
-from sqlalchemy import Column, Integer, DateTime, Enum
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, DateTime, Enum, Index
 from models.database import Base
 from datetime import datetime
-import enum
 
 
-# AppointmentStatus Enum to represent the status of an appointment
-class AppointmentStatus(enum.Enum):
-    SCHEDULED = "Scheduled"
-    COMPLETED = "Completed"
-    CANCELLED = "Cancelled"
-
 # Appointment model to represent the appointment entity in the database
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_doctor_time", "doctor_id", "date_time", "date_deleted"),
+        Index("ix_appointments_live_time", "date_deleted", "date_time", "id"),
+        Index("ix_appointments_status_live_time", "status", "date_deleted", "date_time", "id"),
+        Index("ix_appointments_patient_live_time", "patient_id", "date_deleted", "date_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, nullable=False)
     doctor_id = Column(Integer, nullable=False)
     date_time = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=False, default=30, server_default="30")
+    # Uses the schema enum so API values map onto the members stored (by name) in the column
     status = Column(Enum(AppointmentStatus), nullable=False)
-    date_created = Column(DateTime, nullable=False, default=func.now())
-    date_updated = Column(DateTime, nullable=True, onupdate=func.now())
+    # Incremented by every write; conditional GETs derive their ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Timestamps are set client side so writes never reload the row to learn them
+    date_created = Column(DateTime, nullable=False, default=datetime.now)
+    date_updated = Column(DateTime, nullable=True, onupdate=datetime.now)
     date_deleted = Column(DateTime, nullable=True)
 
 
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Date, Enum, Integer
+from models.database import Base
+from schemas.appointment import AppointmentStatus
+
+
+# AppointmentCount model to hold how many live appointments a doctor has per day and status
+# Maintained by the appointment repositories in the same transaction as each write.
+class AppointmentCount(Base):
+    __tablename__ = "appointment_counts"
+
+    doctor_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(AppointmentStatus), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
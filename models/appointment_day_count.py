@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Date, Enum, Integer
+from models.database import Base
+from schemas.appointment import AppointmentStatus
+
+
+# AppointmentDayCount model to hold how many live appointments all doctors have per day and status
+# Maintained by the appointment repositories in the same transaction as each write.
+class AppointmentDayCount(Base):
+    __tablename__ = "appointment_day_counts"
+
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(AppointmentStatus), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,43 @@
+from typing import Dict, List, Type
+from sqlalchemy import Column, DateTime, Table
+from models.database import Base
+from models.appointment import Appointment
+from models.doctor import Doctor
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+
+
+# Archive tables hold soft-deleted rows moved out of the live tables once their
+# retention window has passed. Each one mirrors its live table's columns, without the
+# defaults or secondary indexes, and adds the time the row was archived.
+def _archive_table(model: Type) -> Table:
+    columns: List[Column] = [
+        Column(column.name, column.type.copy(), primary_key=column.primary_key, nullable=column.nullable)
+        for column in model.__table__.columns
+    ]
+    return Table(f"{model.__tablename__}_archive", Base.metadata, *columns, Column("archived_at", DateTime, nullable=False))
+
+
+class PatientArchive(Base):
+    __table__ = _archive_table(Patient)
+
+
+class DoctorArchive(Base):
+    __table__ = _archive_table(Doctor)
+
+
+class AppointmentArchive(Base):
+    __table__ = _archive_table(Appointment)
+
+
+class MedicalRecordArchive(Base):
+    __table__ = _archive_table(MedicalRecord)
+
+
+# The archive model of each live model, children before the rows they refer to
+ARCHIVE_MODELS: Dict[Type, Type] = {
+    MedicalRecord: MedicalRecordArchive,
+    Appointment: AppointmentArchive,
+    Patient: PatientArchive,
+    Doctor: DoctorArchive,
+}
@@ -0,0 +1,94 @@
+from typing import AsyncIterator, List, Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from utils.pool_metrics import engine_options, instrument_pool
+from utils.replicas import ReplicaSet, RoutingSession, replica_urls
+from models.database import DATABASE_URL
+import os
+
+# DB_MODE selects which database stack serves the CRUD routes: "sync" (default) or "async"
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+
+# Async drivers used in place of the blocking ones from DATABASE_URL
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+}
+
+_engine: Optional[AsyncEngine] = None
+_replica_engines: List[AsyncEngine] = []
+_replicas: Optional[ReplicaSet] = None
+_session_factory: Optional[async_sessionmaker] = None
+
+
+# This function derives the async database URL.
+# ASYNC_DATABASE_URL wins when set; otherwise the driver in DATABASE_URL is swapped.
+def async_database_url() -> str:
+    explicit = os.getenv("ASYNC_DATABASE_URL")
+    if explicit:
+        return explicit
+    return _with_async_driver(DATABASE_URL)
+
+
+# A database URL with its blocking driver swapped for the async one; also used for the replicas
+def _with_async_driver(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+# The engine is created on first use so the sync mode never needs the async drivers installed
+def get_async_engine() -> AsyncEngine:
+    global _engine, _replica_engines, _replicas, _session_factory
+    if _engine is None:
+        _engine = _create_engine(async_database_url())
+        _replica_engines = [_create_engine(_with_async_driver(url)) for url in replica_urls()]
+        _replicas = ReplicaSet([replica.sync_engine for replica in _replica_engines])
+        _session_factory = async_sessionmaker(
+            _engine,
+            sync_session_class=RoutingSession,
+            replicas=_replicas,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+    return _engine
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    url = make_url(database_url)
+    engine = create_async_engine(url, **engine_options(url, use_async=True))
+    instrument_pool(engine.sync_engine.pool)
+    return engine
+
+
+# A new async session, for work that outlives a request's dependencies
+def async_session() -> AsyncSession:
+    get_async_engine()
+    return _session_factory()
+
+
+# Dependency to get the async database session
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with async_session() as db:
+        yield db
+
+
+# Dispose of the async engine's pool, called when the application shuts down
+async def dispose_async_engine() -> None:
+    global _engine, _replica_engines, _replicas, _session_factory
+    if _engine is not None:
+        for engine in [_engine, *_replica_engines]:
+            await engine.dispose()
+        _engine, _replica_engines, _replicas, _session_factory = None, [], None, None
+
+
+# The async engine, if it has been created, for reporting pool metrics
+def current_async_engine() -> Optional[AsyncEngine]:
+    return _engine
+
+
+# The async replica set, if the async engine has been created, for reporting replica health
+def current_async_replicas() -> Optional[ReplicaSet]:
+    return _replicas
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from models.database import Base
+
+# Hash the chain starts from, before the first audit entry
+GENESIS_HASH = "0" * 64
+
+
+# AuditChainHead model to hold the hash of the newest audit entry in its single row.
+# Writers lock the row for each batch they append, so writers in several worker
+# processes extend one chain instead of forking it.
+class AuditChainHead(Base):
+    __tablename__ = "audit_chain_head"
+
+    id = Column(Integer, primary_key=True)
+    hash = Column(String(64), nullable=False)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.mysql import DATETIME
+from models.database import Base
+
+# The hashes cover the timestamps to the microsecond, so they are stored with microseconds;
+# a plain DATETIME on MySQL would drop the fraction and break every hash on reload
+AuditTimestamp = DateTime().with_variant(DATETIME(fsp=6), "mysql")
+
+
+# AuditEvent model to hold one entry of the append-only audit log of patient and medical record changes.
+# Entries form a hash chain: each hash covers the entry and the hash before it, so editing,
+# inserting or removing an entry breaks the chain from that point on.
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_patient_id", "patient_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    patient_id = Column(Integer, nullable=False)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(10), nullable=False)
+    # The row after the change as canonical JSON, exactly the text the hash covers; NULL for deletes
+    changes = Column(Text, nullable=True)
+    occurred_at = Column(AuditTimestamp, nullable=False)
+    recorded_at = Column(AuditTimestamp, nullable=False)
+    previous_hash = Column(String(64), nullable=False)
+    hash = Column(String(64), nullable=False)
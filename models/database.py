@@ -1,7 +1,10 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from utils.pool_metrics import engine_options, instrument_pool
+from utils.replicas import ReplicaSet, RoutingSession, replica_urls
 import os
 
 # Load .env file explicitly from the project root
@@ -13,9 +16,25 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL environment variable not set. Check your .env file.")
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create the SQLAlchemy engine with pool settings taken from the environment
+engine = create_engine(DATABASE_URL, **engine_options(make_url(DATABASE_URL)))
+instrument_pool(engine.pool)
+
+# Read replicas from REPLICA_DATABASE_URLS serve the read-only service methods;
+# with none configured every query goes to the primary engine above
+replicas = ReplicaSet([create_engine(url, **engine_options(make_url(url))) for url in replica_urls()])
+for replica in replicas.engines:
+    instrument_pool(replica.pool)
+
+# Objects keep their loaded values after commit so responses are built without a reload
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    replicas=replicas,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
 Base = declarative_base()
 
 # Dependency to get the database session
@@ -26,5 +45,5 @@ def get_db():
     finally:
         db.close()
 
-# Create all tables in the database, uncomment if needed
-# Base.metadata.create_all(bind=engine)
\ No newline at end of file
+# Tables are created and evolved by the versioned migrations in migrations/versions.
+# Run `python manage.py migrate` to bring a database up to date.
@@ -1,22 +1,29 @@
 from datetime import datetime
 from typing import Optional
 from .base import BaseModel
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
 from models.database import Base
 from datetime import datetime
 
 # Doctor model to represent the doctor entity in the database
 class Doctor(Base):
     __tablename__ = "doctors"
+    __table_args__ = (
+        Index("ix_doctors_live_id", "date_deleted", "id"),
+        # The specialty filter is a case-insensitive prefix, a range over lower(specialty)
+        Index("ix_doctors_live_specialty_prefix", "date_deleted", text("lower(specialty)")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(100), nullable=False)
     specialty = Column(String(100), nullable=False)
     years_of_experience = Column(Integer, nullable=False)
     contact_information = Column(String(20), nullable=False)
-    date_created = Column(DateTime, nullable=False, default=func.now())
-    date_updated = Column(DateTime, nullable=True, onupdate=func.now())
+    # Incremented by every write; conditional GETs derive their ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Timestamps are set client side so writes never reload the row to learn them
+    date_created = Column(DateTime, nullable=False, default=datetime.now)
+    date_updated = Column(DateTime, nullable=True, onupdate=datetime.now)
     date_deleted = Column(DateTime, nullable=True)
 
    
\ No newline at end of file
@@ -0,0 +1,266 @@
+import fcntl
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import HTTPException
+from models.database import get_db
+from utils.audit_log import discard_rolled_back, queue_committed
+from utils.file_manager import CommitLog, FileManager
+
+# STORAGE_BACKEND selects where the patient, doctor, appointment and medical record
+# repositories keep their rows: "sql" (default) or "file", the embedded append-log store
+# for small sites without a database server. The file store only backs the sync stack,
+# in a single worker process: it locks its directory, and a second process opening it
+# fails. The audit log stays on the SQL database, so file mode still needs DATABASE_URL:
+# audit records staged in a file store transaction are queued for it when the transaction
+# commits. Statistics, archive and exports read the SQL entity tables, so they answer
+# 501 in file mode (see require_sql_storage).
+#   FILE_STORE_DIR               directory holding one <table>.log per table and the
+#                                commits.log of committed transactions (default data/store)
+#   FILE_STORE_FSYNC_MS          0 (default) fsyncs every commit before it returns; above 0,
+#                                commits return at once and are fsynced together this often,
+#                                trading that window of durability for fewer fsyncs
+#   FILE_STORE_COMPACT_SECONDS   how often the logs are checked for compaction (default 300)
+#   FILE_STORE_COMPACT_RATIO     share of superseded bytes that triggers a compaction (default 0.5)
+#   FILE_STORE_COMPACT_MIN_BYTES superseded bytes below which a log is never compacted (default 1 MiB)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sql").lower()
+FILE_STORE_DIR = os.getenv("FILE_STORE_DIR", os.path.join(os.path.dirname(__file__), "..", "data", "store"))
+FILE_STORE_FSYNC_MS = float(os.getenv("FILE_STORE_FSYNC_MS", "0"))
+FILE_STORE_COMPACT_SECONDS = float(os.getenv("FILE_STORE_COMPACT_SECONDS", "300"))
+FILE_STORE_COMPACT_RATIO = float(os.getenv("FILE_STORE_COMPACT_RATIO", "0.5"))
+FILE_STORE_COMPACT_MIN_BYTES = int(os.getenv("FILE_STORE_COMPACT_MIN_BYTES", str(1024 * 1024)))
+
+TABLES = ("patients", "doctors", "appointments", "medical_records")
+
+
+# FileStore holds the log of each table, the commit log, and a maintenance thread that
+# fsyncs batched commits and compacts logs once enough of them is superseded. Write
+# transactions take the store's write lock, so they run one at a time, as on SQLite.
+# A transaction appends one batch to each table log it changed and is committed by a
+# single record in the commit log, written once those batches are durable; replay drops
+# the batches of a transaction that has no commit record, in every table.
+class FileStore:
+    def __init__(
+        self,
+        directory: str,
+        fsync_interval: float = FILE_STORE_FSYNC_MS / 1000,
+        compact_interval: float = FILE_STORE_COMPACT_SECONDS,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.compact_interval = compact_interval
+        self._lock_fd = _lock_directory(directory)
+        self.commits = CommitLog(os.path.join(directory, "commits.log"))
+        self.tables = {
+            table: FileManager(os.path.join(directory, f"{table}.log"), self.commits.last) for table in TABLES
+        }
+        self.write_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._next_txid = self.commits.last + 1
+        self._unsynced: Optional[int] = None
+        self._failed: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._maintain, name="file-store", daemon=True)
+        self._thread.start()
+
+    # Append one transaction's staged rows to their table logs and commit it with one
+    # commit log record. The caller holds the write lock, so transaction ids follow the
+    # commit order. With batched fsyncs the record is left to sync(), after the batches.
+    def write(self, staged: Dict[str, Dict[int, Dict]]) -> None:
+        txid = self._next_txid
+        self._next_txid += 1
+        fsync = not self.fsync_interval
+        try:
+            for table, rows in staged.items():
+                self.tables[table].append(rows.values(), txid, fsync=fsync)
+            with self._commit_lock:
+                if fsync:
+                    self.commits.append(txid)
+                else:
+                    self._unsynced = txid
+        except BaseException as error:
+            # The logs may hold part of the transaction, which only a replay drops
+            self._failed = error
+            raise
+
+    # Refuse new sessions after a failed write until the process restarts
+    def check(self) -> None:
+        if self._failed is not None:
+            raise RuntimeError("The file store failed to write a commit; restart to recover it") from self._failed
+
+    # Make batched commits durable: the table logs first, then the commit record of the
+    # last transaction they hold
+    def sync(self) -> None:
+        with self._commit_lock:
+            txid, self._unsynced = self._unsynced, None
+            for log in self.tables.values():
+                log.sync()
+            if txid is not None:
+                self.commits.append(txid)
+
+    # Compact every log that is worth it, or every log with force. A compacted table log
+    # is one batch of the last committed transaction, so pending commits are synced first.
+    def compact(self, force: bool = False) -> List[str]:
+        compacted = []
+        for table, log in self.tables.items():
+            if force or log.should_compact(FILE_STORE_COMPACT_RATIO, FILE_STORE_COMPACT_MIN_BYTES):
+                with self.write_lock:
+                    self.sync()
+                    log.compact(self.commits.last)
+                compacted.append(table)
+        if force or self.commits.should_compact(FILE_STORE_COMPACT_MIN_BYTES):
+            self.sync()
+            with self._commit_lock:
+                self.commits.compact()
+        return compacted
+
+    def stats(self) -> Dict[str, Dict]:
+        return {table: log.stats() for table, log in self.tables.items()}
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        if self._failed is None:
+            self.sync()
+        for log in self.tables.values():
+            log.close()
+        self.commits.close()
+        os.close(self._lock_fd)
+
+    def _maintain(self) -> None:
+        tick = self.fsync_interval or self.compact_interval
+        next_compaction = time.monotonic() + self.compact_interval
+        while not self._stop.wait(tick):
+            self.sync()
+            if time.monotonic() >= next_compaction:
+                self.compact()
+                next_compaction = time.monotonic() + self.compact_interval
+
+
+# FileSession is the unit of work of the file repositories, standing in for a SQLAlchemy
+# Session: UnitOfWork commits and rolls it back the same way. Writes are staged in the
+# session and read back by it until commit writes them to the store as one transaction.
+# The first write or for_update() takes the store's write lock until commit or rollback.
+class FileSession:
+    def __init__(self, store: FileStore):
+        store.check()
+        self.store = store
+        self.info: Dict[str, Any] = {}
+        self._staged: Dict[str, Dict[int, Dict]] = {}
+        self._locked = False
+
+    # Lock the store for writing, as SELECT ... FOR UPDATE would lock the rows read
+    def for_update(self) -> None:
+        if not self._locked:
+            self.store.write_lock.acquire()
+            self._locked = True
+
+    # Reserve ids for count new rows of the table
+    def allocate_ids(self, table: str, count: int) -> range:
+        return self.store.tables[table].allocate_ids(count)
+
+    # Stage the new state of a row, to be written on commit
+    def stage(self, table: str, row: Dict) -> None:
+        self.for_update()
+        self._staged.setdefault(table, {})[row["id"]] = row
+
+    # Retrieve a row by ID as this session sees it, deleted or not
+    def get(self, table: str, id: int) -> Optional[Dict]:
+        staged = self._staged.get(table, {})
+        if id in staged:
+            return staged[id]
+        return self.store.tables[table].read(id)
+
+    # Every row of the table as this session sees it, in id order after after_id
+    def scan(self, table: str, after_id: Optional[int] = None) -> Iterator[Dict]:
+        staged = self._staged.get(table, {})
+        ids = self.store.tables[table].ids(after_id)
+        if staged:
+            ids = sorted(set(ids).union(id for id in staged if after_id is None or id > after_id))
+        for id in ids:
+            row = self.get(table, id)
+            if row is not None:
+                yield row
+
+    def commit(self) -> None:
+        try:
+            if self._staged:
+                self.store.write(self._staged)
+        finally:
+            self._staged = {}
+            self._release()
+        queue_committed(self)
+
+    def rollback(self) -> None:
+        self._staged = {}
+        self._release()
+        discard_rolled_back(self)
+
+    def close(self) -> None:
+        self.rollback()
+        self.info.clear()
+
+    def _release(self) -> None:
+        if self._locked:
+            self._locked = False
+            self.store.write_lock.release()
+
+
+# Lock the store's directory for this process. Each process keeps the logs' indexes in
+# memory, so a second process appending to the same logs would corrupt them; it fails
+# here instead, when the application starts.
+def _lock_directory(directory: str) -> int:
+    fd = os.open(os.path.join(directory, "LOCK"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        raise RuntimeError(
+            f"The file store in {directory} is open in another process; "
+            "STORAGE_BACKEND=file supports a single worker"
+        )
+    return fd
+
+
+_store: Optional[FileStore] = None
+_store_lock = threading.Lock()
+
+
+# The process's file store, opened on first use so the SQL backend never creates it
+def get_file_store() -> FileStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FileStore(FILE_STORE_DIR)
+        return _store
+
+
+# Dependency to get a file store session
+def get_file_db() -> Iterator[FileSession]:
+    db = FileSession(get_file_store())
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency to get the session the entity repositories use under STORAGE_BACKEND
+get_entity_db = get_file_db if STORAGE_BACKEND == "file" else get_db
+
+
+# Dependency of the endpoints that read the SQL entity tables directly: statistics,
+# archive and exports. In file mode those tables do not hold the entities.
+def require_sql_storage() -> None:
+    if STORAGE_BACKEND == "file":
+        raise HTTPException(status_code=501, detail="Not available with STORAGE_BACKEND=file")
+
+
+# Close the file store, fsyncing what batched commits left pending, when the application shuts down
+def close_file_store() -> None:
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
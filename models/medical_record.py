@@ -3,8 +3,7 @@ from typing import Optional
 from .base import BaseModel
 
 # This class represents a medical record in the health app.
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from models.database import Base
 from datetime import datetime
 
@@ -12,6 +11,11 @@ from datetime import datetime
 # MedicalRecord model to represent the medical record entity in the database
 class MedicalRecord(Base):
     __tablename__ = "medical_records"
+    __table_args__ = (
+        Index("ix_medical_records_live_id", "date_deleted", "id"),
+        Index("ix_medical_records_patient_live_id", "patient_id", "date_deleted", "id"),
+        Index("ix_medical_records_patient_live_time", "patient_id", "date_deleted", "treatment_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, nullable=False)
@@ -19,7 +23,10 @@ class MedicalRecord(Base):
     prescriptions = Column(String(500), nullable=False)
     treatment_date = Column(DateTime, nullable=False)
     doctor_notes = Column(String(500), nullable=False)
-    date_created = Column(DateTime, nullable=False, default=func.now())
-    date_updated = Column(DateTime, nullable=True, onupdate=func.now())
+    # Incremented by every write; conditional GETs derive their ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Timestamps are set client side so writes never reload the row to learn them
+    date_created = Column(DateTime, nullable=False, default=datetime.now)
+    date_updated = Column(DateTime, nullable=True, onupdate=datetime.now)
     date_deleted = Column(DateTime, nullable=True)
    
\ No newline at end of file
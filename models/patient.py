@@ -1,8 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from .base import BaseModel
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from models.database import Base
 from datetime import datetime
 
@@ -10,6 +9,9 @@ from datetime import datetime
 # Patient model to represent the patient entity in the database
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (
+        Index("ix_patients_live_id", "date_deleted", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(100), nullable=False)
@@ -18,8 +20,11 @@ class Patient(Base):
     contact_information = Column(String(20), nullable=False)
     address = Column(String(200), nullable=False)
     emergency_contact = Column(String(20), nullable=False)
-    date_created = Column(DateTime, nullable=False, default=func.now())
-    date_updated = Column(DateTime, nullable=True, onupdate=func.now())
+    # Incremented by every write; conditional GETs derive their ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Timestamps are set client side so writes never reload the row to learn them
+    date_created = Column(DateTime, nullable=False, default=datetime.now)
+    date_updated = Column(DateTime, nullable=True, onupdate=datetime.now)
     date_deleted = Column(DateTime, nullable=True)
 
 
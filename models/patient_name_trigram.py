@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Index
+from sqlalchemy.dialects import mysql
+from models.database import Base
+
+# Trigrams are compared byte for byte; MySQL's default accent and case
+# insensitive collations would otherwise fold distinct trigrams together.
+TrigramType = String(3).with_variant(mysql.VARCHAR(3, collation="utf8mb4_bin"), "mysql")
+
+
+# PatientNameTrigram model to index patient names for substring and prefix search
+# Each row links one trigram of a live patient's name to that patient.
+class PatientNameTrigram(Base):
+    __tablename__ = "patient_name_trigrams"
+    __table_args__ = (
+        Index("ix_patient_name_trigrams_patient_id", "patient_id"),
+    )
+
+    trigram = Column(TrigramType, primary_key=True)
+    patient_id = Column(Integer, primary_key=True)
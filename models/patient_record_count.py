@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer
+from models.database import Base
+
+
+# PatientRecordCount model to hold how many live medical records each patient has
+# Maintained by the medical record repositories in the same transaction as each write.
+class PatientRecordCount(Base):
+    __tablename__ = "patient_record_counts"
+
+    patient_id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
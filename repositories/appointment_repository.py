@@ -1,27 +1,192 @@
-from typing import List, Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from sqlalchemy.sql import func
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Query, Session, aliased
+from sqlalchemy import and_, exists, false, null, or_, select, tuple_
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.sql import Select
 from models.appointment import Appointment, AppointmentStatus
+from models.doctor import Doctor
+from models.patient import Patient
 from schemas.appointment import AppointmentCreate, AppointmentUpdate
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows
+from repositories.write_path import insert_many, soft_delete, update_live
+from repositories.stats_repository import (
+    CountDeltas, appointment_count_key, appointment_total_statement, apply_count_deltas,
+)
+from utils.scheduling import MAX_APPOINTMENT_MINUTES, Interval, interval_end, naive
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+
+
+# BookingCheck is everything needed to validate a booking, read in one round trip:
+# whether the patient exists, the stored duration of the appointment being changed
+# (None when it does not exist) and the doctor's bookings around the requested time
+class BookingCheck(NamedTuple):
+    patient_found: bool
+    current_duration: Optional[int]
+    intervals: List[Interval]
+
+
+# This function builds the booking validation query.
+# It selects the doctor's live row FOR UPDATE, so concurrent bookings for the same
+# doctor serialise until the transaction commits, and outer joins the bookings that
+# could overlap window. The patient and current appointment lookups are scalar
+# subqueries on primary keys. No row comes back when the doctor does not exist.
+def booking_check_statement(
+    patient_id: int,
+    doctor_id: int,
+    window: Optional[Tuple[datetime, datetime]] = None,
+    current_id: Optional[int] = None
+) -> Select:
+    booked = aliased(Appointment)
+    current = aliased(Appointment)
+    patient_found = exists().where(Patient.id == patient_id, Patient.date_deleted.is_(None))
+    current_duration = (
+        select(current.duration_minutes)
+        .where(current.id == current_id, current.date_deleted.is_(None))
+        .scalar_subquery()
+        if current_id is not None else null()
+    )
+    if window is not None:
+        lookback = timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+        overlaps = and_(
+            booked.doctor_id == Doctor.id,
+            booked.date_time > naive(window[0]) - lookback,
+            booked.date_time < naive(window[1]),
+            booked.status != AppointmentStatus.CANCELLED,
+            booked.date_deleted.is_(None)
+        )
+    else:
+        overlaps = false()
+    return (
+        select(
+            patient_found.label("patient_found"),
+            current_duration.label("current_duration"),
+            booked.id.label("booked_id"),
+            booked.date_time.label("booked_start"),
+            booked.duration_minutes.label("booked_minutes")
+        )
+        .select_from(Doctor)
+        .outerjoin(booked, overlaps)
+        .where(Doctor.id == doctor_id, Doctor.date_deleted.is_(None))
+        .with_for_update()
+    )
+
+
+# This function turns the rows of booking_check_statement into a BookingCheck
+def read_booking_check(rows: Sequence[Row]) -> Optional[BookingCheck]:
+    if not rows:
+        return None
+    intervals = [
+        (row.booked_start, interval_end(row.booked_start, row.booked_minutes), row.booked_id)
+        for row in rows if row.booked_id is not None
+    ]
+    return BookingCheck(bool(rows[0].patient_found), rows[0].current_duration, intervals)
+
+
+# This function builds the query for the booked intervals of several doctors that could
+# overlap the given windows, or returns None when there are no windows
+def intervals_statement(windows: Dict[int, List[Tuple[datetime, datetime]]]) -> Optional[Select]:
+    lookback = timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+    conditions = [
+        and_(
+            Appointment.doctor_id == doctor_id,
+            Appointment.date_time > naive(start) - lookback,
+            Appointment.date_time < naive(end)
+        )
+        for doctor_id, ranges in windows.items()
+        for start, end in ranges
+    ]
+    if not conditions:
+        return None
+    return select(
+        Appointment.id, Appointment.doctor_id, Appointment.date_time, Appointment.duration_minutes
+    ).where(
+        or_(*conditions),
+        Appointment.status != AppointmentStatus.CANCELLED,
+        Appointment.date_deleted.is_(None)
+    )
+
+
+# This function groups the rows of intervals_statement into intervals per doctor
+def read_intervals(rows: Sequence[Row]) -> Dict[int, List[Interval]]:
+    intervals: Dict[int, List[Interval]] = {}
+    for row in rows:
+        intervals.setdefault(row.doctor_id, []).append(
+            (row.date_time, interval_end(row.date_time, row.duration_minutes), row.id)
+        )
+    return intervals
+
+
+# This function builds the export query: every column of the live appointments matching
+# the status filter and date range, in list order
+def export_statement(
+    status_filter: Optional[AppointmentStatus] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Select:
+    query = select(*Appointment.__table__.columns).where(Appointment.date_deleted.is_(None))
+    if status_filter:
+        query = query.where(Appointment.status == status_filter)
+    if date_from:
+        query = query.where(Appointment.date_time >= date_from)
+    if date_to:
+        query = query.where(Appointment.date_time < date_to)
+    return query.order_by(Appointment.date_time, Appointment.id)
 
 
 # AppointmentRepository class to handle database operations for appointments
 class AppointmentRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.cache = get_entity_cache(Appointment)
 
     # Create a new appointment
     def create(self, appointment_data: AppointmentCreate) -> Appointment:
-        db_appointment = Appointment(**appointment_data.dict())
+        db_appointment = Appointment(**appointment_data.model_dump())
         self.db.add(db_appointment)
-        self.db.commit()
-        self.db.refresh(db_appointment)
+        self.db.flush()
+        apply_count_deltas(self.db, CountDeltas.for_appointments(added=[db_appointment]))
         return db_appointment
 
+    # Insert a batch with one multi-row INSERT per INSERT_BATCH_SIZE rows
+    def bulk_create(self, appointments: List[AppointmentCreate]) -> List[Appointment]:
+        db_appointments = insert_many(self.db, Appointment, [item.model_dump() for item in appointments])
+        apply_count_deltas(self.db, CountDeltas.for_appointments(added=db_appointments))
+        return db_appointments
+
     # Retrieve an appointment by ID
+    # Served from the entity cache when possible; the cached copy is read-only
     def get_by_id(self, id: int) -> Optional[Appointment]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_appointment = self._get_live(id)
+        if db_appointment is not None:
+            self.cache.put(db_appointment)
+        return db_appointment
+
+    # Version of a live row (see repositories/versions.py), or None if it does not exist.
+    # It is read from the database even when the row is cached, with one primary key read.
+    def get_version(self, id: int) -> Optional[RowVersion]:
+        result = self.db.execute(version_statement(Appointment, id))
+        return read_version(result.first())
+
+    # Retrieve live appointments by ID, as a dict of the ones found.
+    # Cached rows come from one batch cache read and the rest from one IN query.
+    def get_many(self, ids: List[int]) -> Dict[int, Appointment]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            for db_appointment in self.db.query(Appointment).filter(Appointment.id.in_(missing), Appointment.date_deleted.is_(None)):
+                self.cache.put(db_appointment)
+                found[db_appointment.id] = db_appointment
+        return found
+
+    # Load a live row from the database, bypassing the cache
+    def _get_live(self, id: int) -> Optional[Appointment]:
         return self.db.query(Appointment).filter(and_(Appointment.id == id, Appointment.date_deleted.is_(None))).first()
 
 # Retrieve all appointments with optional filters
@@ -29,40 +194,105 @@ class AppointmentRepository:
         self,
         page: int = 1,
         page_size: int = 10,
-        status_filter: Optional[AppointmentStatus] = None
+        status_filter: Optional[AppointmentStatus] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[Appointment]:
-        query = self.db.query(Appointment).filter(Appointment.date_deleted.is_(None))
+        return self._list_query([Appointment], page, page_size, status_filter, after).all()
+
+    # (id, version) of each row get_all would return, read without loading the rows;
+    # conditional list requests compare these before anything is serialized
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        status_filter: Optional[AppointmentStatus] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Tuple[int, int]]:
+        return [tuple(row) for row in self._list_query([Appointment.id, Appointment.version], page, page_size, status_filter, after)]
+
+    # The get_all query selecting the given columns
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        status_filter: Optional[AppointmentStatus],
+        after: Optional[Tuple[datetime, int]]
+    ) -> Query:
+        query = self.db.query(*columns).filter(Appointment.date_deleted.is_(None))
         if status_filter:
             query = query.filter(Appointment.status == status_filter)
-        return query.offset((page - 1) * page_size).limit(page_size).all()
+        query = query.order_by(Appointment.date_time, Appointment.id)
+        # Keyset pagination on (date_time, id) so deep pages do not scan skipped rows
+        if after is not None:
+            return query.filter(tuple_(Appointment.date_time, Appointment.id) > after).limit(page_size)
+        return query.offset((page - 1) * page_size).limit(page_size)
+
+    # Count live appointments under the same filter as get_all, with the endpoint's strategy
+    def count(
+        self, status_filter: Optional[AppointmentStatus] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(Appointment.id).where(Appointment.date_deleted.is_(None))
+        if status_filter:
+            query = query.where(Appointment.status == status_filter)
+        return count_rows(
+            self.db, query, ("appointments", status_filter), strategy, summary=appointment_total_statement(status_filter)
+        )
+
+# Stream live appointments as plain row mappings through a server-side cursor
+    def stream(
+        self,
+        status_filter: Optional[AppointmentStatus] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[RowMapping]:
+        query = export_statement(status_filter, date_from, date_to)
+        return self.db.execute(query, execution_options={"yield_per": batch_size}).mappings()
 
 # Update an existing appointment
     def update(self, id: int, appointment_data: AppointmentUpdate) -> Optional[Appointment]:
-        db_appointment = self.get_by_id(id)
-        if not db_appointment:
+        update_data = appointment_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db, id)
+        before = self.db.execute(appointment_count_key(id)).first()
+        if before is None:
             return None
-        update_data = appointment_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_appointment, key, value)
-        self.db.commit()
-        self.db.refresh(db_appointment)
+        db_appointment = update_live(self.db, Appointment, id, update_data)
+        apply_count_deltas(self.db, CountDeltas.for_appointments(removed=[before], added=[db_appointment]))
         return db_appointment
 
 # Delete an appointment by marking it as deleted
     def delete(self, id: int) -> bool:
-        db_appointment = self.get_by_id(id)
-        if not db_appointment:
+        before = self.db.execute(appointment_count_key(id)).first()
+        if before is None or not soft_delete(self.db, Appointment, id):
             return False
-        db_appointment.date_deleted = func.now()
-        self.db.commit()
+        apply_count_deltas(self.db, CountDeltas.for_appointments(removed=[before]))
+        self.cache.invalidate_on_commit(self.db, id)
         return True
 
-# Retrieve an appointment by doctor ID and time
-    def get_by_doctor_and_time(self, doctor_id: int, date_time: datetime) -> Optional[Appointment]:
-        return self.db.query(Appointment).filter(
-            and_(
-                Appointment.doctor_id == doctor_id,
-                Appointment.date_time == date_time,
-                Appointment.date_deleted.is_(None)
-            )
-        ).first()
\ No newline at end of file
+# Validate a booking in a single query; returns None when the doctor does not exist
+# window is the time range to collect possibly overlapping bookings for, or None to skip them
+    def check_booking(
+        self,
+        patient_id: int,
+        doctor_id: int,
+        window: Optional[Tuple[datetime, datetime]] = None,
+        current_id: Optional[int] = None
+    ) -> Optional[BookingCheck]:
+        statement = booking_check_statement(patient_id, doctor_id, window, current_id)
+        return read_booking_check(self.db.execute(statement).all())
+
+# Retrieve the booked intervals of a doctor that could overlap [window_start, window_end)
+# Seeks the (doctor_id, date_time) index from MAX_APPOINTMENT_MINUTES before the window,
+# so the range read stays small however long the doctor's history is.
+    def get_doctor_intervals(self, doctor_id: int, window_start: datetime, window_end: datetime) -> List[Interval]:
+        return self.get_intervals_for_windows({doctor_id: [(window_start, window_end)]}).get(doctor_id, [])
+
+# Retrieve booked intervals for several doctors and windows in a single query
+    def get_intervals_for_windows(
+        self, windows: Dict[int, List[Tuple[datetime, datetime]]]
+    ) -> Dict[int, List[Interval]]:
+        statement = intervals_statement(windows)
+        if statement is None:
+            return {}
+        return read_intervals(self.db.execute(statement).all())
@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any, List, Optional, Type
+from sqlalchemy import DateTime, delete, insert, literal, select
+from sqlalchemy.orm import Session
+from models.archive import ARCHIVE_MODELS
+from models.appointment import Appointment
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+from repositories.patient_search_repository import PatientSearchRepository
+from repositories.stats_repository import CountDeltas, apply_count_deltas
+
+
+# A live row of model carrying the archived row's columns, marked updated now
+def restored_row(model: Type, archived: Any) -> Any:
+    values = {column.name: getattr(archived, column.name) for column in model.__table__.columns}
+    values.update(version=archived.version + 1, date_updated=datetime.now(), date_deleted=None)
+    return model(**values)
+
+
+# ArchiveRepository class to move soft-deleted rows between the live tables and their archives.
+# Archiving works on primary keys: the expired ids are read first and the copy and delete
+# then lock only those rows, so no range lock blocks live inserts next to them.
+class ArchiveRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Ids of up to limit rows soft-deleted before cutoff.
+    # The live tables' indexes lead with date_deleted, so this reads the first entries of
+    # an index range; it is left unordered so no sort runs over the whole expired range.
+    def expired_ids(self, model: Type, cutoff: datetime, limit: int) -> List[int]:
+        return list(self.db.scalars(select(model.id).where(model.date_deleted < cutoff).limit(limit)))
+
+    # Copy the rows to the model's archive table and delete them from the live table
+    def archive(self, model: Type, ids: List[int]) -> int:
+        archive = ARCHIVE_MODELS[model].__table__
+        columns = list(model.__table__.columns)
+        self.db.execute(
+            insert(archive).from_select(
+                [column.name for column in columns] + ["archived_at"],
+                select(*columns, literal(datetime.now(), DateTime)).where(model.id.in_(ids)),
+            )
+        )
+        return self.db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+
+    # Retrieve an archived row by ID
+    def get(self, model: Type, id: int) -> Optional[Any]:
+        return self.db.get(ARCHIVE_MODELS[model], id)
+
+    # Move an archived row back into its live table as a live row, updating the search
+    # index and summary counts the way a create would. Returns None if it is not archived.
+    def restore(self, model: Type, id: int) -> Optional[Any]:
+        archived = self.get(model, id)
+        if archived is None:
+            return None
+        row = restored_row(model, archived)
+        self.db.delete(archived)
+        self.db.add(row)
+        self.db.flush()
+        if model is Patient:
+            PatientSearchRepository(self.db).index(row.id, row.full_name)
+        elif model is Appointment:
+            apply_count_deltas(self.db, CountDeltas.for_appointments(added=[row]))
+        elif model is MedicalRecord:
+            apply_count_deltas(self.db, CountDeltas.for_medical_records(added=[row]))
+        return row
@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncMappingResult, AsyncSession
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.sql import Select
+from models.appointment import Appointment, AppointmentStatus
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows_async
+from repositories.write_path import insert_many_async, soft_delete_async, update_live_async
+from repositories.stats_repository import (
+    CountDeltas, appointment_count_key, appointment_total_statement, apply_count_deltas_async,
+)
+from repositories.appointment_repository import (
+    BookingCheck, booking_check_statement, export_statement, intervals_statement, read_booking_check, read_intervals,
+)
+from schemas.appointment import AppointmentCreate, AppointmentUpdate
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+from utils.scheduling import Interval
+
+
+# AsyncAppointmentRepository class mirrors AppointmentRepository on an AsyncSession
+class AsyncAppointmentRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Shared with the sync repository so async writes invalidate its cached rows
+        self.cache = get_entity_cache(Appointment)
+
+    async def create(self, appointment_data: AppointmentCreate) -> Appointment:
+        db_appointment = Appointment(**appointment_data.model_dump())
+        self.db.add(db_appointment)
+        await self.db.flush()
+        await apply_count_deltas_async(self.db, CountDeltas.for_appointments(added=[db_appointment]))
+        return db_appointment
+
+    async def bulk_create(self, appointments: List[AppointmentCreate]) -> List[Appointment]:
+        db_appointments = await insert_many_async(self.db, Appointment, [item.model_dump() for item in appointments])
+        await apply_count_deltas_async(self.db, CountDeltas.for_appointments(added=db_appointments))
+        return db_appointments
+
+    async def get_by_id(self, id: int) -> Optional[Appointment]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_appointment = await self._get_live(id)
+        if db_appointment is not None:
+            self.cache.put(db_appointment)
+        return db_appointment
+
+    async def get_version(self, id: int) -> Optional[RowVersion]:
+        result = await self.db.execute(version_statement(Appointment, id))
+        return read_version(result.first())
+
+    async def get_many(self, ids: List[int]) -> Dict[int, Appointment]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            result = await self.db.execute(select(Appointment).filter(Appointment.id.in_(missing), Appointment.date_deleted.is_(None)))
+            for db_appointment in result.scalars():
+                self.cache.put(db_appointment)
+                found[db_appointment.id] = db_appointment
+        return found
+
+    async def _get_live(self, id: int) -> Optional[Appointment]:
+        result = await self.db.execute(
+            select(Appointment).filter(and_(Appointment.id == id, Appointment.date_deleted.is_(None)))
+        )
+        return result.scalars().first()
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        status_filter: Optional[AppointmentStatus] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Appointment]:
+        result = await self.db.execute(self._list_query([Appointment], page, page_size, status_filter, after))
+        return list(result.scalars().all())
+
+    async def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        status_filter: Optional[AppointmentStatus] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Tuple[int, int]]:
+        result = await self.db.execute(self._list_query([Appointment.id, Appointment.version], page, page_size, status_filter, after))
+        return [tuple(row) for row in result]
+
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        status_filter: Optional[AppointmentStatus],
+        after: Optional[Tuple[datetime, int]]
+    ) -> Select:
+        query = select(*columns).filter(Appointment.date_deleted.is_(None))
+        if status_filter:
+            query = query.filter(Appointment.status == status_filter)
+        query = query.order_by(Appointment.date_time, Appointment.id)
+        if after is not None:
+            query = query.filter(tuple_(Appointment.date_time, Appointment.id) > after).limit(page_size)
+        else:
+            query = query.offset((page - 1) * page_size).limit(page_size)
+        return query
+
+    async def count(
+        self, status_filter: Optional[AppointmentStatus] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(Appointment.id).where(Appointment.date_deleted.is_(None))
+        if status_filter:
+            query = query.where(Appointment.status == status_filter)
+        return await count_rows_async(
+            self.db, query, ("appointments", status_filter), strategy, summary=appointment_total_statement(status_filter)
+        )
+
+    async def stream(
+        self,
+        status_filter: Optional[AppointmentStatus] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> AsyncMappingResult:
+        query = export_statement(status_filter, date_from, date_to)
+        result = await self.db.stream(query, execution_options={"yield_per": batch_size})
+        return result.mappings()
+
+    async def update(self, id: int, appointment_data: AppointmentUpdate) -> Optional[Appointment]:
+        update_data = appointment_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        before = (await self.db.execute(appointment_count_key(id))).first()
+        if before is None:
+            return None
+        db_appointment = await update_live_async(self.db, Appointment, id, update_data)
+        await apply_count_deltas_async(self.db, CountDeltas.for_appointments(removed=[before], added=[db_appointment]))
+        return db_appointment
+
+    async def delete(self, id: int) -> bool:
+        before = (await self.db.execute(appointment_count_key(id))).first()
+        if before is None or not await soft_delete_async(self.db, Appointment, id):
+            return False
+        await apply_count_deltas_async(self.db, CountDeltas.for_appointments(removed=[before]))
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        return True
+
+    # Validate a booking in a single query; returns None when the doctor does not exist
+    async def check_booking(
+        self,
+        patient_id: int,
+        doctor_id: int,
+        window: Optional[Tuple[datetime, datetime]] = None,
+        current_id: Optional[int] = None
+    ) -> Optional[BookingCheck]:
+        statement = booking_check_statement(patient_id, doctor_id, window, current_id)
+        return read_booking_check((await self.db.execute(statement)).all())
+
+    async def get_doctor_intervals(self, doctor_id: int, window_start: datetime, window_end: datetime) -> List[Interval]:
+        return (await self.get_intervals_for_windows({doctor_id: [(window_start, window_end)]})).get(doctor_id, [])
+
+    async def get_intervals_for_windows(
+        self, windows: Dict[int, List[Tuple[datetime, datetime]]]
+    ) -> Dict[int, List[Interval]]:
+        statement = intervals_statement(windows)
+        if statement is None:
+            return {}
+        return read_intervals((await self.db.execute(statement)).all())
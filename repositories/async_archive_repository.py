@@ -0,0 +1,39 @@
+from typing import Any, Optional, Type
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.archive import ARCHIVE_MODELS
+from models.appointment import Appointment
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+from models.patient_name_trigram import PatientNameTrigram
+from repositories.archive_repository import restored_row
+from repositories.patient_search_repository import index_rows
+from repositories.stats_repository import CountDeltas, apply_count_deltas_async
+
+
+# AsyncArchiveRepository class mirrors the lookup and restore of ArchiveRepository on an
+# AsyncSession. Archiving itself stays with the sync repository and manage.py.
+class AsyncArchiveRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, model: Type, id: int) -> Optional[Any]:
+        return await self.db.get(ARCHIVE_MODELS[model], id)
+
+    async def restore(self, model: Type, id: int) -> Optional[Any]:
+        archived = await self.get(model, id)
+        if archived is None:
+            return None
+        row = restored_row(model, archived)
+        await self.db.delete(archived)
+        self.db.add(row)
+        await self.db.flush()
+        if model is Patient:
+            rows = index_rows(row.id, row.full_name)
+            if rows:
+                await self.db.execute(insert(PatientNameTrigram), rows)
+        elif model is Appointment:
+            await apply_count_deltas_async(self.db, CountDeltas.for_appointments(added=[row]))
+        elif model is MedicalRecord:
+            await apply_count_deltas_async(self.db, CountDeltas.for_medical_records(added=[row]))
+        return row
@@ -0,0 +1,14 @@
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.audit_event import AuditEvent
+from repositories.audit_repository import patient_entries_statement
+
+
+# AsyncAuditRepository class mirrors the reads of AuditRepository on an AsyncSession.
+# Entries are appended by the audit writer thread, which always uses the sync engine.
+class AsyncAuditRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_for_patient(self, patient_id: int, page_size: int, before_id: Optional[int] = None) -> List[AuditEvent]:
+        return list(await self.db.scalars(patient_entries_statement(patient_id, page_size, before_id)))
@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from sqlalchemy.sql import Select
+from models.doctor import Doctor
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows_async
+from repositories.write_path import insert_many_async, soft_delete_async, update_live_async
+from schemas.doctor import DoctorCreate, DoctorUpdate
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+from repositories.doctor_repository import specialty_filter_clause
+
+
+# AsyncDoctorRepository class mirrors DoctorRepository on an AsyncSession
+class AsyncDoctorRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Shared with the sync repository so async writes invalidate its cached rows
+        self.cache = get_entity_cache(Doctor)
+
+    async def create(self, doctor_data: DoctorCreate) -> Doctor:
+        db_doctor = Doctor(**doctor_data.model_dump())
+        self.db.add(db_doctor)
+        await self.db.flush()
+        return db_doctor
+
+    async def bulk_create(self, doctors: List[DoctorCreate]) -> List[Doctor]:
+        return await insert_many_async(self.db, Doctor, [item.model_dump() for item in doctors])
+
+    async def get_by_id(self, id: int) -> Optional[Doctor]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_doctor = await self._get_live(id)
+        if db_doctor is not None:
+            self.cache.put(db_doctor)
+        return db_doctor
+
+    async def get_version(self, id: int) -> Optional[RowVersion]:
+        result = await self.db.execute(version_statement(Doctor, id))
+        return read_version(result.first())
+
+    async def get_many(self, ids: List[int]) -> Dict[int, Doctor]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            result = await self.db.execute(select(Doctor).filter(Doctor.id.in_(missing), Doctor.date_deleted.is_(None)))
+            for db_doctor in result.scalars():
+                self.cache.put(db_doctor)
+                found[db_doctor.id] = db_doctor
+        return found
+
+    async def _get_live(self, id: int) -> Optional[Doctor]:
+        result = await self.db.execute(
+            select(Doctor).filter(and_(Doctor.id == id, Doctor.date_deleted.is_(None)))
+        )
+        return result.scalars().first()
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        specialty_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Doctor]:
+        result = await self.db.execute(self._list_query([Doctor], page, page_size, specialty_filter, after_id))
+        return list(result.scalars().all())
+
+    async def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        specialty_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        result = await self.db.execute(self._list_query([Doctor.id, Doctor.version], page, page_size, specialty_filter, after_id))
+        return [tuple(row) for row in result]
+
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        specialty_filter: Optional[str],
+        after_id: Optional[int]
+    ) -> Select:
+        query = select(*columns).filter(Doctor.date_deleted.is_(None))
+        if specialty_filter:
+            query = query.filter(specialty_filter_clause(specialty_filter))
+        query = query.order_by(Doctor.id)
+        if after_id is not None:
+            query = query.filter(Doctor.id > after_id).limit(page_size)
+        else:
+            query = query.offset((page - 1) * page_size).limit(page_size)
+        return query
+
+    async def count(
+        self, specialty_filter: Optional[str] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(Doctor.id).where(Doctor.date_deleted.is_(None))
+        if specialty_filter:
+            query = query.where(specialty_filter_clause(specialty_filter))
+        return await count_rows_async(self.db, query, ("doctors", specialty_filter), strategy)
+
+    async def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        ids = set(ids)
+        if not ids:
+            return set()
+        result = await self.db.execute(select(Doctor.id).filter(Doctor.id.in_(ids), Doctor.date_deleted.is_(None)))
+        return set(result.scalars())
+
+    async def update(self, id: int, doctor_data: DoctorUpdate) -> Optional[Doctor]:
+        update_data = doctor_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        db_doctor = await update_live_async(self.db, Doctor, id, update_data)
+        return db_doctor
+
+    async def delete(self, id: int) -> bool:
+        if not await soft_delete_async(self.db, Doctor, id):
+            return False
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        return True
@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncMappingResult, AsyncSession
+from sqlalchemy import and_, select
+from sqlalchemy.sql import Select
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows_async
+from repositories.write_path import insert_many_async, insert_with_parent_async, soft_delete_async, update_live_async
+from repositories.stats_repository import CountDeltas, apply_count_deltas_async, record_count_key, record_count_statement
+from repositories.medical_record_repository import export_statement, live_patient_guard
+from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+
+
+# AsyncMedicalRecordRepository class mirrors MedicalRecordRepository on an AsyncSession
+class AsyncMedicalRecordRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Shared with the sync repository so async writes invalidate its cached rows
+        self.cache = get_entity_cache(MedicalRecord)
+
+    async def create(self, record_data: MedicalRecordCreate) -> Optional[MedicalRecord]:
+        db_record = await insert_with_parent_async(self.db, MedicalRecord, record_data.model_dump(), "patient_id", Patient)
+        if db_record is not None:
+            await apply_count_deltas_async(self.db, CountDeltas.for_medical_records(added=[db_record]))
+        return db_record
+
+    async def bulk_create(self, records: List[MedicalRecordCreate]) -> List[MedicalRecord]:
+        db_records = await insert_many_async(self.db, MedicalRecord, [item.model_dump() for item in records])
+        await apply_count_deltas_async(self.db, CountDeltas.for_medical_records(added=db_records))
+        return db_records
+
+    async def get_by_id(self, id: int) -> Optional[MedicalRecord]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_record = await self._get_live(id)
+        if db_record is not None:
+            self.cache.put(db_record)
+        return db_record
+
+    async def get_version(self, id: int) -> Optional[RowVersion]:
+        result = await self.db.execute(version_statement(MedicalRecord, id))
+        return read_version(result.first())
+
+    async def get_many(self, ids: List[int]) -> Dict[int, MedicalRecord]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            result = await self.db.execute(select(MedicalRecord).filter(MedicalRecord.id.in_(missing), MedicalRecord.date_deleted.is_(None)))
+            for db_record in result.scalars():
+                self.cache.put(db_record)
+                found[db_record.id] = db_record
+        return found
+
+    async def _get_live(self, id: int) -> Optional[MedicalRecord]:
+        result = await self.db.execute(
+            select(MedicalRecord).filter(and_(MedicalRecord.id == id, MedicalRecord.date_deleted.is_(None)))
+        )
+        return result.scalars().first()
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        patient_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[MedicalRecord]:
+        result = await self.db.execute(self._list_query([MedicalRecord], page, page_size, patient_id, after_id))
+        return list(result.scalars().all())
+
+    async def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        patient_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        result = await self.db.execute(self._list_query([MedicalRecord.id, MedicalRecord.version], page, page_size, patient_id, after_id))
+        return [tuple(row) for row in result]
+
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        patient_id: Optional[int],
+        after_id: Optional[int]
+    ) -> Select:
+        query = select(*columns).filter(MedicalRecord.date_deleted.is_(None))
+        if patient_id:
+            query = query.filter(MedicalRecord.patient_id == patient_id)
+        query = query.order_by(MedicalRecord.id)
+        if after_id is not None:
+            query = query.filter(MedicalRecord.id > after_id).limit(page_size)
+        else:
+            query = query.offset((page - 1) * page_size).limit(page_size)
+        return query
+
+    async def count(
+        self, patient_id: Optional[int] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(MedicalRecord.id).where(MedicalRecord.date_deleted.is_(None))
+        if patient_id:
+            query = query.where(MedicalRecord.patient_id == patient_id)
+        summary = record_count_statement(patient_id) if patient_id else None
+        return await count_rows_async(self.db, query, ("medical_records", patient_id), strategy, summary=summary)
+
+    async def stream(
+        self,
+        patient_id: Optional[int] = None,
+        treatment_from: Optional[datetime] = None,
+        treatment_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> AsyncMappingResult:
+        query = export_statement(patient_id, treatment_from, treatment_to)
+        result = await self.db.stream(query, execution_options={"yield_per": batch_size})
+        return result.mappings()
+
+    async def update(self, id: int, record_data: MedicalRecordUpdate) -> Optional[MedicalRecord]:
+        update_data = record_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        before = (await self.db.execute(record_count_key(id))).first() if "patient_id" in update_data else None
+        db_record = await update_live_async(
+            self.db, MedicalRecord, id, update_data, *live_patient_guard(update_data.get("patient_id"))
+        )
+        if db_record is not None and before is not None:
+            await apply_count_deltas_async(self.db, CountDeltas.for_medical_records(removed=[before], added=[db_record]))
+        return db_record
+
+    async def delete(self, id: int) -> Optional[int]:
+        before = (await self.db.execute(record_count_key(id))).first()
+        if before is None or not await soft_delete_async(self.db, MedicalRecord, id):
+            return None
+        await apply_count_deltas_async(self.db, CountDeltas.for_medical_records(removed=[before]))
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        return before.patient_id
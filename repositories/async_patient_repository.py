@@ -0,0 +1,155 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, insert, select
+from sqlalchemy.sql import Select
+from sqlalchemy.engine import RowMapping
+from models.patient import Patient
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows_async
+from repositories.write_path import insert_many_async, soft_delete_async, update_live_async
+from models.patient_name_trigram import PatientNameTrigram
+from schemas.patient import PatientCreate, PatientUpdate
+from repositories.patient_search_repository import index_rows, remove_statement, search_statement
+from repositories.patient_timeline_repository import TimelineCursor, timeline_statement
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+
+
+# AsyncPatientRepository class mirrors PatientRepository on an AsyncSession
+class AsyncPatientRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Shared with the sync repository so async writes invalidate its cached rows
+        self.cache = get_entity_cache(Patient)
+
+    async def create(self, patient_data: PatientCreate) -> Patient:
+        db_patient = Patient(**patient_data.model_dump())
+        self.db.add(db_patient)
+        await self.db.flush()
+        await self._index(db_patient.id, db_patient.full_name)
+        return db_patient
+
+    async def bulk_create(self, patients: List[PatientCreate]) -> List[Patient]:
+        db_patients = await insert_many_async(self.db, Patient, [item.model_dump() for item in patients])
+        rows = [row for patient in db_patients for row in index_rows(patient.id, patient.full_name)]
+        if rows:
+            await self.db.execute(insert(PatientNameTrigram), rows)
+        return db_patients
+
+    async def get_by_id(self, id: int) -> Optional[Patient]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_patient = await self._get_live(id)
+        if db_patient is not None:
+            self.cache.put(db_patient)
+        return db_patient
+
+    async def get_version(self, id: int) -> Optional[RowVersion]:
+        result = await self.db.execute(version_statement(Patient, id))
+        return read_version(result.first())
+
+    async def get_many(self, ids: List[int]) -> Dict[int, Patient]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            result = await self.db.execute(select(Patient).filter(Patient.id.in_(missing), Patient.date_deleted.is_(None)))
+            for db_patient in result.scalars():
+                self.cache.put(db_patient)
+                found[db_patient.id] = db_patient
+        return found
+
+    async def _get_live(self, id: int) -> Optional[Patient]:
+        result = await self.db.execute(
+            select(Patient).filter(and_(Patient.id == id, Patient.date_deleted.is_(None)))
+        )
+        return result.scalars().first()
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        name_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Patient]:
+        result = await self.db.execute(self._list_query([Patient], page, page_size, name_filter, after_id))
+        return list(result.scalars().all())
+
+    async def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        name_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        result = await self.db.execute(self._list_query([Patient.id, Patient.version], page, page_size, name_filter, after_id))
+        return [tuple(row) for row in result]
+
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        name_filter: Optional[str],
+        after_id: Optional[int]
+    ) -> Select:
+        query = select(*columns).filter(Patient.date_deleted.is_(None))
+        if name_filter:
+            query = query.filter(Patient.full_name.ilike(f"%{name_filter}%"))
+        query = query.order_by(Patient.id)
+        if after_id is not None:
+            query = query.filter(Patient.id > after_id).limit(page_size)
+        else:
+            query = query.offset((page - 1) * page_size).limit(page_size)
+        return query
+
+    async def count(
+        self, name_filter: Optional[str] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(Patient.id).where(Patient.date_deleted.is_(None))
+        if name_filter:
+            query = query.where(Patient.full_name.ilike(f"%{name_filter}%"))
+        return await count_rows_async(self.db, query, ("patients", name_filter), strategy)
+
+    async def search(self, query: str, limit: int = 10) -> List[Tuple[Patient, int]]:
+        statement = search_statement(query, limit)
+        if statement is None:
+            return []
+        result = await self.db.execute(statement)
+        return [(patient, hits) for patient, hits in result.all()]
+
+    async def get_timeline(
+        self, patient_id: int, page_size: int = 10, after: Optional[TimelineCursor] = None
+    ) -> List[RowMapping]:
+        result = await self.db.execute(timeline_statement(patient_id, page_size, after))
+        return list(result.mappings())
+
+    async def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        ids = set(ids)
+        if not ids:
+            return set()
+        result = await self.db.execute(select(Patient.id).filter(Patient.id.in_(ids), Patient.date_deleted.is_(None)))
+        return set(result.scalars())
+
+    async def update(self, id: int, patient_data: PatientUpdate) -> Optional[Patient]:
+        update_data = patient_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        db_patient = await update_live_async(self.db, Patient, id, update_data)
+        if db_patient is not None and "full_name" in update_data:
+            await self._index(db_patient.id, db_patient.full_name)
+        return db_patient
+
+    async def delete(self, id: int) -> bool:
+        if not await soft_delete_async(self.db, Patient, id):
+            return False
+        await self.db.execute(remove_statement(id))
+        self.cache.invalidate_on_commit(self.db.sync_session, id)
+        return True
+
+    # Keep the name trigram index in step with the patient, inside the same transaction
+    async def _index(self, patient_id: int, full_name: str) -> None:
+        await self.db.execute(remove_statement(patient_id))
+        rows = index_rows(patient_id, full_name)
+        if rows:
+            await self.db.execute(insert(PatientNameTrigram), rows)
@@ -0,0 +1,21 @@
+from datetime import date
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.appointment import AppointmentStatus
+from repositories.stats_repository import appointment_counts_statement, record_count_statement
+
+
+# AsyncStatsRepository class mirrors the reads of StatsRepository on an AsyncSession.
+# Rebuilding the summary tables stays with the sync repository and manage.py.
+class AsyncStatsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_appointment_counts(
+        self, date_from: date, date_to: date, doctor_id: Optional[int] = None
+    ) -> List[Tuple[date, AppointmentStatus, int]]:
+        result = await self.db.execute(appointment_counts_statement(date_from, date_to, doctor_id))
+        return [tuple(row) for row in result]
+
+    async def get_patient_record_count(self, patient_id: int) -> int:
+        return await self.db.scalar(record_count_statement(patient_id)) or 0
@@ -0,0 +1,98 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from models.audit_chain_head import GENESIS_HASH, AuditChainHead
+from models.audit_event import AuditEvent
+
+# Id of the single chain head row
+_HEAD_ID = 1
+
+
+# AuditRecord holds one change as the services stage it, before the writer chains it.
+# changes is already canonical JSON, so the text hashed is the text stored.
+class AuditRecord(NamedTuple):
+    patient_id: int
+    entity: str
+    entity_id: int
+    action: str
+    changes: Optional[str]
+    occurred_at: datetime
+
+
+# This function hashes one entry together with the hash of the entry before it
+def entry_hash(previous_hash: str, record: AuditRecord, recorded_at: datetime) -> str:
+    content = json.dumps(
+        [
+            previous_hash, record.patient_id, record.entity, record.entity_id, record.action,
+            record.changes, record.occurred_at.isoformat(), recorded_at.isoformat(),
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+# Statement reading one page of a patient's audit entries, newest first, after the cursor's entry id
+def patient_entries_statement(patient_id: int, page_size: int, before_id: Optional[int] = None) -> Select:
+    query = select(AuditEvent).where(AuditEvent.patient_id == patient_id)
+    if before_id is not None:
+        query = query.where(AuditEvent.id < before_id)
+    return query.order_by(AuditEvent.id.desc()).limit(page_size)
+
+
+# AuditRepository class to append to and read the audit log.
+# The log is append-only: there is no update or delete here.
+class AuditRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Append a batch of records to the chain with one locked read of the chain head,
+    # one multi-row insert and one head update. Returns the new head hash.
+    def append(self, records: List[AuditRecord]) -> str:
+        previous = self.db.scalar(
+            select(AuditChainHead.hash).where(AuditChainHead.id == _HEAD_ID).with_for_update()
+        )
+        recorded_at = datetime.now()
+        rows = []
+        for record in records:
+            digest = entry_hash(previous, record, recorded_at)
+            rows.append({
+                **record._asdict(), "recorded_at": recorded_at, "previous_hash": previous, "hash": digest,
+            })
+            previous = digest
+        self.db.execute(insert(AuditEvent), rows)
+        self.db.execute(update(AuditChainHead).where(AuditChainHead.id == _HEAD_ID).values(hash=previous))
+        return previous
+
+    # Retrieve a patient's audit entries, newest first, after the cursor's entry id
+    def get_for_patient(self, patient_id: int, page_size: int, before_id: Optional[int] = None) -> List[AuditEvent]:
+        return list(self.db.scalars(patient_entries_statement(patient_id, page_size, before_id)))
+
+    # Walk the whole chain in order and return the id of the first entry whose hashes do
+    # not match, 0 when the head does not match the last entry, or None if the chain is intact
+    def verify(self, batch_size: int = 1000) -> Optional[int]:
+        previous = GENESIS_HASH
+        for entry in self._entries(batch_size):
+            record = AuditRecord(
+                entry.patient_id, entry.entity, entry.entity_id, entry.action, entry.changes, entry.occurred_at
+            )
+            if entry.previous_hash != previous or entry.hash != entry_hash(previous, record, entry.recorded_at):
+                return entry.id
+            previous = entry.hash
+        head = self.db.scalar(select(AuditChainHead.hash).where(AuditChainHead.id == _HEAD_ID))
+        return None if head == previous else 0
+
+    def _entries(self, batch_size: int) -> Iterator[AuditEvent]:
+        after_id = 0
+        while True:
+            batch = list(self.db.scalars(
+                select(AuditEvent).where(AuditEvent.id > after_id).order_by(AuditEvent.id).limit(batch_size)
+            ))
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1].id
+            self.db.expunge_all()
@@ -0,0 +1,166 @@
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable, Optional, Set
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import TextClause
+from utils.total_count import COUNT_EXACT_LIMIT, CountStrategy, TotalCount, count_cache
+
+# Shared row counting for the sync and async repositories' list totals.
+# query selects the rows a list endpoint pages through, without ordering or paging;
+# key is (table, filter value) and names the count in the count cache, a None filter
+# value being the whole table. summary, when the repository has one, reads the same
+# total from the summary count tables, which the writes keep exact.
+#
+# A stale cached count is served as it is while a background refresh counts again:
+# on a worker thread for the sync repositories, in a task on the event loop for the
+# async ones. Each refresh opens its own connection, as the request's session is gone
+# by the time it runs. A whole table that has no cached count yet starts from the
+# database's own row estimate, where the dialect keeps one, instead of a full COUNT.
+
+logger = logging.getLogger(__name__)
+
+# One thread refreshes the sync repositories' stale counts, one count at a time
+_refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="count-refresh")
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+# COUNT(*) over the query, stopping after limit rows when a limit is given
+def count_statement(query: Select, limit: Optional[int] = None) -> Select:
+    if limit is not None:
+        query = query.limit(limit)
+    return select(func.count()).select_from(query.subquery())
+
+
+# The statement reading the planner's row estimate of a table, or None on dialects that
+# keep none (SQLite). Estimates include soft-deleted rows and lag behind recent writes,
+# so they only stand in until the first exact count is cached.
+def table_estimate_statement(dialect: str, table: str) -> Optional[TextClause]:
+    if dialect == "postgresql":
+        return text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)").bindparams(table=table)
+    if dialect == "mysql":
+        return text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        ).bindparams(table=table)
+    return None
+
+
+# The estimate statement for key when it names a whole table
+def _estimate_statement(dialect: str, key: Hashable) -> Optional[TextClause]:
+    table, filter_value = key
+    return table_estimate_statement(dialect, table) if filter_value is None else None
+
+
+# A usable estimate: PostgreSQL reports -1 for a table that was never analyzed
+def _estimate(value: Optional[int]) -> Optional[int]:
+    return int(value) if value is not None and value >= 0 else None
+
+
+# Count the query again on a connection of its own and cache the total
+def _refresh(bind: Engine, query: Select, key: Hashable) -> None:
+    try:
+        with bind.connect() as connection:
+            total = connection.scalar(count_statement(query))
+    except Exception:
+        count_cache.abandon(key)
+        logger.exception("Refreshing the count of %s failed", key)
+        return
+    except BaseException:
+        count_cache.abandon(key)
+        raise
+    count_cache.store(key, total)
+
+
+# Async counterpart of _refresh
+async def _refresh_async(engine: AsyncEngine, query: Select, key: Hashable) -> None:
+    try:
+        async with engine.connect() as connection:
+            total = await connection.scalar(count_statement(query))
+    except Exception:
+        count_cache.abandon(key)
+        logger.exception("Refreshing the count of %s failed", key)
+        return
+    except BaseException:
+        count_cache.abandon(key)
+        raise
+    count_cache.store(key, total)
+
+
+# Count the query's rows with the given strategy (see CountStrategy)
+def count_rows(
+    db: Session, query: Select, key: Hashable, strategy: CountStrategy, summary: Optional[Select] = None
+) -> TotalCount:
+    if strategy is CountStrategy.EXACT:
+        return TotalCount(db.scalar(count_statement(query)), False)
+    if summary is not None:
+        return TotalCount(db.scalar(summary) or 0, False)
+    if strategy is CountStrategy.AUTO and not count_cache.known_large(key):
+        bounded = db.scalar(count_statement(query, COUNT_EXACT_LIMIT + 1))
+        if bounded <= COUNT_EXACT_LIMIT:
+            return TotalCount(bounded, False)
+    cached, refresh = count_cache.lookup(key)
+    if cached is not None:
+        if refresh:
+            _refresher.submit(_refresh, db.get_bind(), query, key)
+        return TotalCount(cached, True)
+    estimate_statement = _estimate_statement(db.get_bind().dialect.name, key)
+    estimate = _estimate(db.scalar(estimate_statement)) if estimate_statement is not None else None
+    if estimate is not None:
+        _refresher.submit(_refresh, db.get_bind(), query, key)
+        return TotalCount(estimate, True)
+    try:
+        total = db.scalar(count_statement(query))
+    except BaseException:
+        count_cache.abandon(key)
+        raise
+    count_cache.store(key, total)
+    return TotalCount(total, False)
+
+
+# Async counterpart of count_rows
+async def count_rows_async(
+    db: AsyncSession, query: Select, key: Hashable, strategy: CountStrategy, summary: Optional[Select] = None
+) -> TotalCount:
+    if strategy is CountStrategy.EXACT:
+        return TotalCount(await db.scalar(count_statement(query)), False)
+    if summary is not None:
+        return TotalCount(await db.scalar(summary) or 0, False)
+    if strategy is CountStrategy.AUTO and not count_cache.known_large(key):
+        bounded = await db.scalar(count_statement(query, COUNT_EXACT_LIMIT + 1))
+        if bounded <= COUNT_EXACT_LIMIT:
+            return TotalCount(bounded, False)
+    cached, refresh = count_cache.lookup(key)
+    if cached is not None:
+        if refresh:
+            _refresh_later(db.bind, query, key)
+        return TotalCount(cached, True)
+    estimate_statement = _estimate_statement(db.bind.dialect.name, key)
+    estimate = _estimate(await db.scalar(estimate_statement)) if estimate_statement is not None else None
+    if estimate is not None:
+        _refresh_later(db.bind, query, key)
+        return TotalCount(estimate, True)
+    try:
+        total = await db.scalar(count_statement(query))
+    except BaseException:
+        count_cache.abandon(key)
+        raise
+    count_cache.store(key, total)
+    return TotalCount(total, False)
+
+
+# Run an async refresh as a task the loop keeps a reference to until it finishes.
+# The task starts from an empty context, so its query is not counted in the request's stats.
+def _refresh_later(engine: AsyncEngine, query: Select, key: Hashable) -> None:
+    task = asyncio.get_running_loop().create_task(_refresh_async(engine, query, key), context=contextvars.Context())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+# Wait until the sync refreshes queued so far have finished, for tests
+def wait_for_refreshes() -> None:
+    _refresher.submit(lambda: None).result()
@@ -1,45 +1,137 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from sqlalchemy.sql import func
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import and_, func, select
+from sqlalchemy.sql import ColumnElement
 from models.doctor import Doctor
 from schemas.doctor import DoctorCreate, DoctorUpdate
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows
+from repositories.write_path import insert_many, soft_delete, update_live
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+
+
+# Doctors whose specialty starts with the filter, case-insensitively. Written as a range
+# over lower(specialty) so it seeks the ix_doctors_live_specialty_prefix expression index;
+# a LIKE '%filter%' could only walk every live doctor's index entry.
+def specialty_filter_clause(specialty_filter: str) -> ColumnElement:
+    low = specialty_filter.lower()
+    high = low[:-1] + chr(ord(low[-1]) + 1)
+    specialty = func.lower(Doctor.specialty)
+    return and_(specialty >= low, specialty < high)
+
 
 class DoctorRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.cache = get_entity_cache(Doctor)
 
     def create(self, doctor_data: DoctorCreate) -> Doctor:
-        db_doctor = Doctor(**doctor_data.dict())
+        db_doctor = Doctor(**doctor_data.model_dump())
         self.db.add(db_doctor)
-        self.db.commit()
-        self.db.refresh(db_doctor)
+        self.db.flush()
         return db_doctor
 
+    # Insert a batch with one multi-row INSERT per INSERT_BATCH_SIZE rows
+    def bulk_create(self, doctors: List[DoctorCreate]) -> List[Doctor]:
+        db_doctors = insert_many(self.db, Doctor, [item.model_dump() for item in doctors])
+        return db_doctors
+
+    # Served from the entity cache when possible; the cached copy is read-only
     def get_by_id(self, id: int) -> Optional[Doctor]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_doctor = self._get_live(id)
+        if db_doctor is not None:
+            self.cache.put(db_doctor)
+        return db_doctor
+
+    # Version of a live row (see repositories/versions.py), or None if it does not exist.
+    # It is read from the database even when the row is cached, with one primary key read.
+    def get_version(self, id: int) -> Optional[RowVersion]:
+        result = self.db.execute(version_statement(Doctor, id))
+        return read_version(result.first())
+
+    # Retrieve live doctors by ID, as a dict of the ones found.
+    # Cached rows come from one batch cache read and the rest from one IN query.
+    def get_many(self, ids: List[int]) -> Dict[int, Doctor]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            for db_doctor in self.db.query(Doctor).filter(Doctor.id.in_(missing), Doctor.date_deleted.is_(None)):
+                self.cache.put(db_doctor)
+                found[db_doctor.id] = db_doctor
+        return found
+
+    # Load a live row from the database, bypassing the cache
+    def _get_live(self, id: int) -> Optional[Doctor]:
         return self.db.query(Doctor).filter(and_(Doctor.id == id, Doctor.date_deleted.is_(None))).first()
 
-    def get_all(self, page: int = 1, page_size: int = 10, specialty_filter: Optional[str] = None) -> List[Doctor]:
-        query = self.db.query(Doctor).filter(Doctor.date_deleted.is_(None))
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        specialty_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Doctor]:
+        return self._list_query([Doctor], page, page_size, specialty_filter, after_id).all()
+
+    # (id, version) of each row get_all would return, read without loading the rows;
+    # conditional list requests compare these before anything is serialized
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        specialty_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        return [tuple(row) for row in self._list_query([Doctor.id, Doctor.version], page, page_size, specialty_filter, after_id)]
+
+    # The get_all query selecting the given columns
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        specialty_filter: Optional[str],
+        after_id: Optional[int]
+    ) -> Query:
+        query = self.db.query(*columns).filter(Doctor.date_deleted.is_(None))
         if specialty_filter:
-            query = query.filter(Doctor.specialty.ilike(f"%{specialty_filter}%"))
-        return query.offset((page - 1) * page_size).limit(page_size).all()
+            query = query.filter(specialty_filter_clause(specialty_filter))
+        query = query.order_by(Doctor.id)
+        # Keyset pagination: seek past the last id instead of scanning skipped rows
+        if after_id is not None:
+            return query.filter(Doctor.id > after_id).limit(page_size)
+        return query.offset((page - 1) * page_size).limit(page_size)
+
+    # Count live doctors under the same filter as get_all, with the endpoint's strategy
+    def count(
+        self, specialty_filter: Optional[str] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(Doctor.id).where(Doctor.date_deleted.is_(None))
+        if specialty_filter:
+            query = query.where(specialty_filter_clause(specialty_filter))
+        return count_rows(self.db, query, ("doctors", specialty_filter), strategy)
+
+    # Return which of the given ids belong to live doctors, in a single IN query
+    def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        ids = set(ids)
+        if not ids:
+            return set()
+        rows = self.db.query(Doctor.id).filter(Doctor.id.in_(ids), Doctor.date_deleted.is_(None)).all()
+        return {row.id for row in rows}
 
     def update(self, id: int, doctor_data: DoctorUpdate) -> Optional[Doctor]:
-        db_doctor = self.get_by_id(id)
-        if not db_doctor:
-            return None
-        update_data = doctor_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_doctor, key, value)
-        self.db.commit()
-        self.db.refresh(db_doctor)
+        update_data = doctor_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db, id)
+        db_doctor = update_live(self.db, Doctor, id, update_data)
         return db_doctor
 
     def delete(self, id: int) -> bool:
-        db_doctor = self.get_by_id(id)
-        if not db_doctor:
+        if not soft_delete(self.db, Doctor, id):
             return False
-        db_doctor.date_deleted = func.now()
-        self.db.commit()
+        self.cache.invalidate_on_commit(self.db, id)
         return True
\ No newline at end of file
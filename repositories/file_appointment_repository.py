@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from models.appointment import Appointment, AppointmentStatus
+from schemas.appointment import AppointmentCreate, AppointmentUpdate
+from repositories.appointment_repository import BookingCheck
+from repositories.file_repository import FileRepository
+from repositories.file_doctor_repository import FileDoctorRepository
+from repositories.file_patient_repository import FilePatientRepository
+from utils.scheduling import MAX_APPOINTMENT_MINUTES, Interval, interval_end, naive
+from utils.total_count import CountStrategy, TotalCount
+
+
+# FileAppointmentRepository class mirrors AppointmentRepository on the file store
+class FileAppointmentRepository(FileRepository):
+    model = Appointment
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.patients = FilePatientRepository(db)
+        self.doctors = FileDoctorRepository(db)
+
+    def create(self, appointment_data: AppointmentCreate) -> Appointment:
+        return self._insert([appointment_data.model_dump()])[0]
+
+    def bulk_create(self, appointments: List[AppointmentCreate]) -> List[Appointment]:
+        return self._insert([item.model_dump() for item in appointments])
+
+    # Live appointments in (date_time, id) order, after the keyset cursor when given
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        status_filter: Optional[AppointmentStatus] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Appointment]:
+        appointments = sorted(self._filtered(status_filter), key=lambda appointment: (appointment.date_time, appointment.id))
+        if after is not None:
+            position = (naive(after[0]), after[1])
+            appointments = (item for item in appointments if (item.date_time, item.id) > position)
+        return self._page(appointments, page, page_size, after is not None)
+
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        status_filter: Optional[AppointmentStatus] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Tuple[int, datetime]]:
+        return self._versions(self.get_all(page, page_size, status_filter, after))
+
+    def count(
+        self, status_filter: Optional[AppointmentStatus] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        return self._count(self._filtered(status_filter))
+
+    def update(self, id: int, appointment_data: AppointmentUpdate) -> Optional[Appointment]:
+        return self._update(id, appointment_data.model_dump(exclude_unset=True))
+
+    # Validate a booking; returns None when the doctor does not exist.
+    # Takes the store's write lock first, as the SQL version locks the doctor's row, so
+    # no other booking can land between this check and the commit.
+    def check_booking(
+        self,
+        patient_id: int,
+        doctor_id: int,
+        window: Optional[Tuple[datetime, datetime]] = None,
+        current_id: Optional[int] = None
+    ) -> Optional[BookingCheck]:
+        self.db.for_update()
+        if self.doctors.get_by_id(doctor_id) is None:
+            return None
+        current = self.get_by_id(current_id) if current_id is not None else None
+        intervals = self.get_doctor_intervals(doctor_id, *window) if window is not None else []
+        return BookingCheck(
+            self.patients.get_by_id(patient_id) is not None,
+            current.duration_minutes if current is not None else None,
+            intervals,
+        )
+
+    # Retrieve the booked intervals of a doctor that could overlap [window_start, window_end)
+    def get_doctor_intervals(self, doctor_id: int, window_start: datetime, window_end: datetime) -> List[Interval]:
+        return self.get_intervals_for_windows({doctor_id: [(window_start, window_end)]}).get(doctor_id, [])
+
+    # Retrieve booked intervals for several doctors and windows in one scan of the log
+    def get_intervals_for_windows(
+        self, windows: Dict[int, List[Tuple[datetime, datetime]]]
+    ) -> Dict[int, List[Interval]]:
+        if not windows:
+            return {}
+        lookback = timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+        ranges = {
+            doctor_id: [(naive(start) - lookback, naive(end)) for start, end in doctor_windows]
+            for doctor_id, doctor_windows in windows.items()
+        }
+        intervals: Dict[int, List[Interval]] = {}
+        for appointment in self._live():
+            if appointment.status == AppointmentStatus.CANCELLED or appointment.doctor_id not in ranges:
+                continue
+            if any(low < appointment.date_time < high for low, high in ranges[appointment.doctor_id]):
+                intervals.setdefault(appointment.doctor_id, []).append(
+                    (appointment.date_time, interval_end(appointment.date_time, appointment.duration_minutes), appointment.id)
+                )
+        return intervals
+
+    def _filtered(self, status_filter: Optional[AppointmentStatus]):
+        appointments = self._live()
+        if not status_filter:
+            return appointments
+        return (appointment for appointment in appointments if appointment.status == status_filter)
@@ -0,0 +1,51 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+from models.doctor import Doctor
+from schemas.doctor import DoctorCreate, DoctorUpdate
+from repositories.file_repository import FileRepository
+from utils.total_count import CountStrategy, TotalCount
+
+
+# FileDoctorRepository class mirrors DoctorRepository on the file store
+class FileDoctorRepository(FileRepository):
+    model = Doctor
+
+    def create(self, doctor_data: DoctorCreate) -> Doctor:
+        return self._insert([doctor_data.model_dump()])[0]
+
+    def bulk_create(self, doctors: List[DoctorCreate]) -> List[Doctor]:
+        return self._insert([item.model_dump() for item in doctors])
+
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        specialty_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Doctor]:
+        return self._page(self._filtered(specialty_filter, after_id), page, page_size, after_id is not None)
+
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        specialty_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, datetime]]:
+        return self._versions(self.get_all(page, page_size, specialty_filter, after_id))
+
+    def count(
+        self, specialty_filter: Optional[str] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        return self._count(self._filtered(specialty_filter))
+
+    def update(self, id: int, doctor_data: DoctorUpdate) -> Optional[Doctor]:
+        return self._update(id, doctor_data.model_dump(exclude_unset=True))
+
+    # Live doctors whose specialty starts with the filter, case-insensitively, as the SQL repository matches it
+    def _filtered(self, specialty_filter: Optional[str], after_id: Optional[int] = None):
+        doctors = self._live(after_id)
+        if not specialty_filter:
+            return doctors
+        needle = specialty_filter.lower()
+        return (doctor for doctor in doctors if doctor.specialty.lower().startswith(needle))
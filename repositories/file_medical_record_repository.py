@@ -0,0 +1,67 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+from models.medical_record import MedicalRecord
+from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate
+from repositories.file_repository import FileRepository
+from repositories.file_patient_repository import FilePatientRepository
+from utils.total_count import CountStrategy, TotalCount
+
+
+# FileMedicalRecordRepository class mirrors MedicalRecordRepository on the file store.
+# Writes hold the store's write lock, so the patient checked live stays live until commit.
+class FileMedicalRecordRepository(FileRepository):
+    model = MedicalRecord
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.patients = FilePatientRepository(db)
+
+    # Insert a record for a live patient; returns None if the patient is not live
+    def create(self, record_data: MedicalRecordCreate) -> Optional[MedicalRecord]:
+        self.db.for_update()
+        if self.patients.get_by_id(record_data.patient_id) is None:
+            return None
+        return self._insert([record_data.model_dump()])[0]
+
+    def bulk_create(self, records: List[MedicalRecordCreate]) -> List[MedicalRecord]:
+        return self._insert([item.model_dump() for item in records])
+
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        patient_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[MedicalRecord]:
+        return self._page(self._filtered(patient_id, after_id), page, page_size, after_id is not None)
+
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        patient_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, datetime]]:
+        return self._versions(self.get_all(page, page_size, patient_id, after_id))
+
+    def count(self, patient_id: Optional[int] = None, strategy: CountStrategy = CountStrategy.AUTO) -> TotalCount:
+        return self._count(self._filtered(patient_id))
+
+    # Update a live record; returns None if it is not live or would move to a patient who is not
+    def update(self, id: int, record_data: MedicalRecordUpdate) -> Optional[MedicalRecord]:
+        update_data = record_data.model_dump(exclude_unset=True)
+        self.db.for_update()
+        if update_data.get("patient_id") is not None and self.patients.get_by_id(update_data["patient_id"]) is None:
+            return None
+        return self._update(id, update_data)
+
+    # Soft delete a live record, returning the patient it belonged to or None if it was not live
+    def delete(self, id: int) -> Optional[int]:
+        record = self._soft_delete(id)
+        return record.patient_id if record is not None else None
+
+    def _filtered(self, patient_id: Optional[int], after_id: Optional[int] = None):
+        records = self._live(after_id)
+        if not patient_id:
+            return records
+        return (record for record in records if record.patient_id == patient_id)
@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from models.patient import Patient
+from schemas.patient import PatientCreate, PatientUpdate
+from schemas.timeline import TimelineKind
+from repositories.file_repository import FileRepository
+from repositories.patient_timeline_repository import TimelineCursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.trigrams import name_trigrams, query_trigrams, query_words
+
+
+# FilePatientRepository class mirrors PatientRepository on the file store
+class FilePatientRepository(FileRepository):
+    model = Patient
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.search_index = FilePatientSearch(self)
+
+    def create(self, patient_data: PatientCreate) -> Patient:
+        return self._insert([patient_data.model_dump()])[0]
+
+    def bulk_create(self, patients: List[PatientCreate]) -> List[Patient]:
+        return self._insert([item.model_dump() for item in patients])
+
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        name_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Patient]:
+        return self._page(self._filtered(name_filter, after_id), page, page_size, after_id is not None)
+
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        name_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, datetime]]:
+        return self._versions(self.get_all(page, page_size, name_filter, after_id))
+
+    def count(self, name_filter: Optional[str] = None, strategy: CountStrategy = CountStrategy.AUTO) -> TotalCount:
+        return self._count(self._filtered(name_filter))
+
+    # Read one page of the patient's appointments and medical records, newest first,
+    # as the rows timeline_statement returns
+    def get_timeline(self, patient_id: int, page_size: int = 10, after: Optional[TimelineCursor] = None) -> List[Dict[str, Any]]:
+        entries = []
+        for row in self.db.scan("appointments"):
+            if row["patient_id"] == patient_id and row["date_deleted"] is None:
+                entries.append({
+                    "kind": TimelineKind.APPOINTMENT.value, "id": row["id"], "time": datetime.fromisoformat(row["date_time"]),
+                    "doctor_id": row["doctor_id"], "duration_minutes": row["duration_minutes"], "status": row["status"],
+                })
+        for row in self.db.scan("medical_records"):
+            if row["patient_id"] == patient_id and row["date_deleted"] is None:
+                entries.append({
+                    "kind": TimelineKind.MEDICAL_RECORD.value, "id": row["id"],
+                    "time": datetime.fromisoformat(row["treatment_date"]), "diagnosis": row["diagnosis"],
+                    "prescriptions": row["prescriptions"], "doctor_notes": row["doctor_notes"],
+                })
+        key = lambda entry: (entry["time"], entry["kind"], entry["id"])
+        if after is not None:
+            cursor = (after.time, after.kind.value, after.id)
+            entries = [entry for entry in entries if key(entry) < cursor]
+        entries.sort(key=key, reverse=True)
+        return entries[:page_size]
+
+    def update(self, id: int, patient_data: PatientUpdate) -> Optional[Patient]:
+        return self._update(id, patient_data.model_dump(exclude_unset=True))
+
+    # Live patients whose name contains the filter, case-insensitively, as ILIKE matches it
+    def _filtered(self, name_filter: Optional[str], after_id: Optional[int] = None):
+        patients = self._live(after_id)
+        if not name_filter:
+            return patients
+        needle = name_filter.lower()
+        return (patient for patient in patients if needle in patient.full_name.lower())
+
+
+# FilePatientSearch class matches and ranks names the way PatientSearchRepository does,
+# computing each live patient's trigrams on the fly instead of reading an index table
+class FilePatientSearch:
+    def __init__(self, repository: FilePatientRepository):
+        self.repository = repository
+
+    # Search live patients by name substring or prefix, best matches first
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Patient, int]]:
+        prefix, required = query_trigrams(query)
+        grams = prefix | required
+        if not grams:
+            return []
+        words = query_words(query)
+        matches = []
+        for patient in self.repository._live():
+            trigrams = name_trigrams(patient.full_name)
+            name = patient.full_name.lower()
+            if required <= trigrams and all(word in name for word in words):
+                hits = len(grams & trigrams)
+                if hits:
+                    matches.append((patient, hits))
+        matches.sort(key=lambda match: (-match[1], match[0].full_name, match[0].id))
+        return matches[:limit]
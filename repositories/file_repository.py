@@ -0,0 +1,138 @@
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+from sqlalchemy import DateTime, Enum
+from models.file_database import FileSession
+from utils.conditional import RowVersion, version_of
+from utils.scheduling import naive
+from utils.total_count import TotalCount
+
+
+# FileRepository holds what the file store repositories share. They implement the same
+# methods as the SQL repositories the services use, on the rows of one table's log,
+# and return detached model instances, so services and schemas cannot tell them apart.
+# Rows are stored as JSON objects of the model's columns, with datetimes in ISO format
+# and enums by value. Filters and list pages are evaluated by scanning the log in id
+# order, which suits the small data sets the file store is meant for.
+class FileRepository:
+    model: Type = None
+
+    def __init__(self, db: FileSession):
+        self.db = db
+        self.table = self.model.__tablename__
+        columns = self.model.__table__.columns
+        self._datetimes = [column.key for column in columns if isinstance(column.type, DateTime)]
+        self._enums = {column.key: column.type.enum_class for column in columns if isinstance(column.type, Enum)}
+
+    # Retrieve a live row by ID
+    def get_by_id(self, id: int) -> Optional[Any]:
+        row = self.db.get(self.table, id)
+        if row is None or row["date_deleted"] is not None:
+            return None
+        return self._instance(row)
+
+    # Version of a live row, or None if it does not exist
+    def get_version(self, id: int) -> Optional[RowVersion]:
+        instance = self.get_by_id(id)
+        return version_of(instance) if instance is not None else None
+
+    # Retrieve live rows by ID, as a dict of the ones found
+    def get_many(self, ids: List[int]) -> Dict[int, Any]:
+        found = {}
+        for id in ids:
+            instance = self.get_by_id(id)
+            if instance is not None:
+                found[id] = instance
+        return found
+
+    # Return which of the given ids belong to live rows
+    def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        return {id for id in set(ids) if self.get_by_id(id) is not None}
+
+    # Soft delete a live row; returns False if there is none
+    def delete(self, id: int) -> bool:
+        return self._soft_delete(id) is not None
+
+    # Store rows with the ids and timestamps they already have, as an import does.
+    # Rows whose id is already stored are skipped; returns how many were stored.
+    def load(self, rows: List[Dict[str, Any]]) -> int:
+        stored = 0
+        for row in rows:
+            if self.db.get(self.table, row["id"]) is None:
+                self.db.stage(self.table, self._dump({column.key: row[column.key] for column in self.model.__table__.columns}))
+                stored += 1
+        return stored
+
+    # Live rows in id order after after_id
+    def _live(self, after_id: Optional[int] = None) -> Iterator[Any]:
+        for row in self.db.scan(self.table, after_id):
+            if row["date_deleted"] is None:
+                yield self._instance(row)
+
+    # One page of rows: the first page_size after a keyset cursor, or the page by number
+    def _page(self, rows: Iterable[Any], page: int, page_size: int, keyset: bool) -> List[Any]:
+        start = 0 if keyset else (page - 1) * page_size
+        return list(islice(rows, start, start + page_size))
+
+    # Counts are exact: a scan of the log costs about what the cache would save
+    def _count(self, rows: Iterable[Any]) -> TotalCount:
+        return TotalCount(sum(1 for _ in rows), False)
+
+    def _versions(self, rows: List[Any]) -> List[Tuple[int, int]]:
+        return [(row.id, row.version) for row in rows]
+
+    # Insert new rows from their column values; all of them get the same creation time
+    def _insert(self, values: List[Dict[str, Any]]) -> List[Any]:
+        self.db.for_update()
+        now = datetime.now()
+        rows = []
+        for id, item in zip(self.db.allocate_ids(self.table, len(values)), values):
+            row = self._dump({**item, "id": id, "version": 1, "date_created": now, "date_updated": None, "date_deleted": None})
+            self.db.stage(self.table, row)
+            rows.append(self._instance(row))
+        return rows
+
+    # Update a live row with the given column values; returns None if there is none
+    def _update(self, id: int, values: Dict[str, Any]) -> Optional[Any]:
+        self.db.for_update()
+        instance = self.get_by_id(id)
+        if instance is None:
+            return None
+        row = self._dump({**self._values(instance), **values, "version": instance.version + 1, "date_updated": datetime.now()})
+        self.db.stage(self.table, row)
+        return self._instance(row)
+
+    def _soft_delete(self, id: int) -> Optional[Any]:
+        self.db.for_update()
+        instance = self.get_by_id(id)
+        if instance is None:
+            return None
+        row = {**self._values(instance), "version": instance.version + 1, "date_deleted": datetime.now()}
+        self.db.stage(self.table, self._dump(row))
+        return instance
+
+    def _values(self, instance: Any) -> Dict[str, Any]:
+        return {column.key: getattr(instance, column.key) for column in self.model.__table__.columns}
+
+    # A log row as a detached model instance. Rows logged before rows had a version
+    # counter start at version 1, as the migration starts SQL rows.
+    def _instance(self, row: Dict[str, Any]) -> Any:
+        values = {"version": 1, **row}
+        for key in self._datetimes:
+            if values.get(key) is not None:
+                values[key] = datetime.fromisoformat(values[key])
+        for key, enum_class in self._enums.items():
+            if values.get(key) is not None:
+                values[key] = enum_class(values[key])
+        return self.model(**values)
+
+    # Column values as a log row; datetimes are stored naive, as the DateTime columns store them
+    def _dump(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(values)
+        for key in self._datetimes:
+            if row.get(key) is not None:
+                row[key] = naive(row[key]).isoformat()
+        for key in self._enums:
+            if row.get(key) is not None:
+                row[key] = self._enums[key](row[key]).value
+        return row
@@ -1,45 +1,172 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from sqlalchemy.sql import func
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import and_, exists, select
+from sqlalchemy.sql import ColumnElement, Select
+from sqlalchemy.engine import RowMapping
 from models.medical_record import MedicalRecord
+from models.patient import Patient
 from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows
+from repositories.write_path import insert_many, insert_with_parent, soft_delete, update_live
+from repositories.stats_repository import CountDeltas, apply_count_deltas, record_count_key, record_count_statement
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
+
+
+# This function returns the WHERE guard that keeps a record update from pointing at a
+# missing or deleted patient; empty when the update leaves patient_id alone
+def live_patient_guard(patient_id: Optional[int]) -> List[ColumnElement]:
+    if patient_id is None:
+        return []
+    return [exists().where(Patient.id == patient_id, Patient.date_deleted.is_(None))]
+
+
+# This function builds the export query: every column of the live records matching the
+# patient filter and treatment date range, in id order
+def export_statement(
+    patient_id: Optional[int] = None,
+    treatment_from: Optional[datetime] = None,
+    treatment_to: Optional[datetime] = None
+) -> Select:
+    query = select(*MedicalRecord.__table__.columns).where(MedicalRecord.date_deleted.is_(None))
+    if patient_id:
+        query = query.where(MedicalRecord.patient_id == patient_id)
+    if treatment_from:
+        query = query.where(MedicalRecord.treatment_date >= treatment_from)
+    if treatment_to:
+        query = query.where(MedicalRecord.treatment_date < treatment_to)
+    return query.order_by(MedicalRecord.id)
+
 
 class MedicalRecordRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.cache = get_entity_cache(MedicalRecord)
 
-    def create(self, record_data: MedicalRecordCreate) -> MedicalRecord:
-        db_record = MedicalRecord(**record_data.dict())
-        self.db.add(db_record)
-        self.db.commit()
-        self.db.refresh(db_record)
+    # Insert in one statement guarded by the patient being live; returns None if it is not
+    def create(self, record_data: MedicalRecordCreate) -> Optional[MedicalRecord]:
+        db_record = insert_with_parent(self.db, MedicalRecord, record_data.model_dump(), "patient_id", Patient)
+        if db_record is not None:
+            apply_count_deltas(self.db, CountDeltas.for_medical_records(added=[db_record]))
         return db_record
 
+    # Insert a batch with one multi-row INSERT per INSERT_BATCH_SIZE rows
+    def bulk_create(self, records: List[MedicalRecordCreate]) -> List[MedicalRecord]:
+        db_records = insert_many(self.db, MedicalRecord, [item.model_dump() for item in records])
+        apply_count_deltas(self.db, CountDeltas.for_medical_records(added=db_records))
+        return db_records
+
+    # Served from the entity cache when possible; the cached copy is read-only
     def get_by_id(self, id: int) -> Optional[MedicalRecord]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_record = self._get_live(id)
+        if db_record is not None:
+            self.cache.put(db_record)
+        return db_record
+
+    # Version of a live row (see repositories/versions.py), or None if it does not exist.
+    # It is read from the database even when the row is cached, with one primary key read.
+    def get_version(self, id: int) -> Optional[RowVersion]:
+        result = self.db.execute(version_statement(MedicalRecord, id))
+        return read_version(result.first())
+
+    # Retrieve live medical records by ID, as a dict of the ones found.
+    # Cached rows come from one batch cache read and the rest from one IN query.
+    def get_many(self, ids: List[int]) -> Dict[int, MedicalRecord]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            for db_record in self.db.query(MedicalRecord).filter(MedicalRecord.id.in_(missing), MedicalRecord.date_deleted.is_(None)):
+                self.cache.put(db_record)
+                found[db_record.id] = db_record
+        return found
+
+    # Load a live row from the database, bypassing the cache
+    def _get_live(self, id: int) -> Optional[MedicalRecord]:
         return self.db.query(MedicalRecord).filter(and_(MedicalRecord.id == id, MedicalRecord.date_deleted.is_(None))).first()
 
-    def get_all(self, page: int = 1, page_size: int = 10, patient_id: Optional[int] = None) -> List[MedicalRecord]:
-        query = self.db.query(MedicalRecord).filter(MedicalRecord.date_deleted.is_(None))
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        patient_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[MedicalRecord]:
+        return self._list_query([MedicalRecord], page, page_size, patient_id, after_id).all()
+
+    # (id, version) of each row get_all would return, read without loading the rows;
+    # conditional list requests compare these before anything is serialized
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        patient_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        return [tuple(row) for row in self._list_query([MedicalRecord.id, MedicalRecord.version], page, page_size, patient_id, after_id)]
+
+    # The get_all query selecting the given columns
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        patient_id: Optional[int],
+        after_id: Optional[int]
+    ) -> Query:
+        query = self.db.query(*columns).filter(MedicalRecord.date_deleted.is_(None))
         if patient_id:
             query = query.filter(MedicalRecord.patient_id == patient_id)
-        return query.offset((page - 1) * page_size).limit(page_size).all()
+        query = query.order_by(MedicalRecord.id)
+        # Keyset pagination: seek past the last id instead of scanning skipped rows
+        if after_id is not None:
+            return query.filter(MedicalRecord.id > after_id).limit(page_size)
+        return query.offset((page - 1) * page_size).limit(page_size)
+
+    # Count live medical records under the same filter as get_all, with the endpoint's strategy
+    def count(
+        self, patient_id: Optional[int] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(MedicalRecord.id).where(MedicalRecord.date_deleted.is_(None))
+        if patient_id:
+            query = query.where(MedicalRecord.patient_id == patient_id)
+        summary = record_count_statement(patient_id) if patient_id else None
+        return count_rows(self.db, query, ("medical_records", patient_id), strategy, summary=summary)
+
+    # Stream live records as plain row mappings through a server-side cursor
+    # Rows are fetched batch_size at a time and never become ORM objects.
+    def stream(
+        self,
+        patient_id: Optional[int] = None,
+        treatment_from: Optional[datetime] = None,
+        treatment_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[RowMapping]:
+        query = export_statement(patient_id, treatment_from, treatment_to)
+        return self.db.execute(query, execution_options={"yield_per": batch_size}).mappings()
 
     def update(self, id: int, record_data: MedicalRecordUpdate) -> Optional[MedicalRecord]:
-        db_record = self.get_by_id(id)
-        if not db_record:
-            return None
-        update_data = record_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_record, key, value)
-        self.db.commit()
-        self.db.refresh(db_record)
+        update_data = record_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db, id)
+        # Only a change of patient moves the counts, so the old patient is read just then
+        before = self.db.execute(record_count_key(id)).first() if "patient_id" in update_data else None
+        db_record = update_live(
+            self.db, MedicalRecord, id, update_data, *live_patient_guard(update_data.get("patient_id"))
+        )
+        if db_record is not None and before is not None:
+            apply_count_deltas(self.db, CountDeltas.for_medical_records(removed=[before], added=[db_record]))
         return db_record
 
-    def delete(self, id: int) -> bool:
-        db_record = self.get_by_id(id)
-        if not db_record:
-            return False
-        db_record.date_deleted = func.now()
-        self.db.commit()
-        return True
\ No newline at end of file
+    # Soft delete a live record, returning the patient it belonged to or None if it was not live
+    def delete(self, id: int) -> Optional[int]:
+        before = self.db.execute(record_count_key(id)).first()
+        if before is None or not soft_delete(self.db, MedicalRecord, id):
+            return None
+        apply_count_deltas(self.db, CountDeltas.for_medical_records(removed=[before]))
+        self.cache.invalidate_on_commit(self.db, id)
+        return before.patient_id
\ No newline at end of file
@@ -1,45 +1,138 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from sqlalchemy.sql import func
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import and_, select
+from sqlalchemy.engine import RowMapping
 from models.patient import Patient
 from schemas.patient import PatientCreate, PatientUpdate
+from repositories.patient_search_repository import PatientSearchRepository
+from utils.entity_cache import get_entity_cache
+from utils.total_count import CountStrategy, TotalCount
+from repositories.counting import count_rows
+from repositories.write_path import insert_many, soft_delete, update_live
+from repositories.patient_timeline_repository import TimelineCursor, timeline_statement
+from repositories.versions import read_version, version_statement
+from utils.conditional import RowVersion
 
 class PatientRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.cache = get_entity_cache(Patient)
+        self.search_index = PatientSearchRepository(db)
 
     def create(self, patient_data: PatientCreate) -> Patient:
-        db_patient = Patient(**patient_data.dict())
+        db_patient = Patient(**patient_data.model_dump())
         self.db.add(db_patient)
-        self.db.commit()
-        self.db.refresh(db_patient)
+        self.db.flush()
+        self.search_index.index(db_patient.id, db_patient.full_name)
         return db_patient
 
+    # Insert a batch with one multi-row INSERT per INSERT_BATCH_SIZE rows
+    def bulk_create(self, patients: List[PatientCreate]) -> List[Patient]:
+        db_patients = insert_many(self.db, Patient, [item.model_dump() for item in patients])
+        self.search_index.index_many([(patient.id, patient.full_name) for patient in db_patients])
+        return db_patients
+
+    # Served from the entity cache when possible; the cached copy is read-only
     def get_by_id(self, id: int) -> Optional[Patient]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        db_patient = self._get_live(id)
+        if db_patient is not None:
+            self.cache.put(db_patient)
+        return db_patient
+
+    # Version of a live row (see repositories/versions.py), or None if it does not exist.
+    # It is read from the database even when the row is cached, with one primary key read.
+    def get_version(self, id: int) -> Optional[RowVersion]:
+        result = self.db.execute(version_statement(Patient, id))
+        return read_version(result.first())
+
+    # Retrieve live patients by ID, as a dict of the ones found.
+    # Cached rows come from one batch cache read and the rest from one IN query.
+    def get_many(self, ids: List[int]) -> Dict[int, Patient]:
+        found = self.cache.get_many(ids)
+        missing = [id for id in ids if id not in found]
+        if missing:
+            for db_patient in self.db.query(Patient).filter(Patient.id.in_(missing), Patient.date_deleted.is_(None)):
+                self.cache.put(db_patient)
+                found[db_patient.id] = db_patient
+        return found
+
+    # Load a live row from the database, bypassing the cache
+    def _get_live(self, id: int) -> Optional[Patient]:
         return self.db.query(Patient).filter(and_(Patient.id == id, Patient.date_deleted.is_(None))).first()
 
-    def get_all(self, page: int = 1, page_size: int = 10, name_filter: Optional[str] = None) -> List[Patient]:
-        query = self.db.query(Patient).filter(Patient.date_deleted.is_(None))
+    def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        name_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Patient]:
+        return self._list_query([Patient], page, page_size, name_filter, after_id).all()
+
+    # (id, version) of each row get_all would return, read without loading the rows;
+    # conditional list requests compare these before anything is serialized
+    def get_all_versions(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        name_filter: Optional[str] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        return [tuple(row) for row in self._list_query([Patient.id, Patient.version], page, page_size, name_filter, after_id)]
+
+    # The get_all query selecting the given columns
+    def _list_query(
+        self,
+        columns: list,
+        page: int,
+        page_size: int,
+        name_filter: Optional[str],
+        after_id: Optional[int]
+    ) -> Query:
+        query = self.db.query(*columns).filter(Patient.date_deleted.is_(None))
         if name_filter:
             query = query.filter(Patient.full_name.ilike(f"%{name_filter}%"))
-        return query.offset((page - 1) * page_size).limit(page_size).all()
+        query = query.order_by(Patient.id)
+        # Keyset pagination: seek past the last id instead of scanning skipped rows
+        if after_id is not None:
+            return query.filter(Patient.id > after_id).limit(page_size)
+        return query.offset((page - 1) * page_size).limit(page_size)
+
+    # Count live patients under the same filter as get_all, with the endpoint's strategy
+    def count(
+        self, name_filter: Optional[str] = None, strategy: CountStrategy = CountStrategy.AUTO
+    ) -> TotalCount:
+        query = select(Patient.id).where(Patient.date_deleted.is_(None))
+        if name_filter:
+            query = query.where(Patient.full_name.ilike(f"%{name_filter}%"))
+        return count_rows(self.db, query, ("patients", name_filter), strategy)
+
+    # Read one page of the patient's appointments and medical records, newest first
+    def get_timeline(self, patient_id: int, page_size: int = 10, after: Optional[TimelineCursor] = None) -> List[RowMapping]:
+        return list(self.db.execute(timeline_statement(patient_id, page_size, after)).mappings())
+
+    # Return which of the given ids belong to live patients, in a single IN query
+    def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        ids = set(ids)
+        if not ids:
+            return set()
+        rows = self.db.query(Patient.id).filter(Patient.id.in_(ids), Patient.date_deleted.is_(None)).all()
+        return {row.id for row in rows}
 
     def update(self, id: int, patient_data: PatientUpdate) -> Optional[Patient]:
-        db_patient = self.get_by_id(id)
-        if not db_patient:
-            return None
-        update_data = patient_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_patient, key, value)
-        self.db.commit()
-        self.db.refresh(db_patient)
+        update_data = patient_data.model_dump(exclude_unset=True)
+        self.cache.invalidate_on_commit(self.db, id)
+        db_patient = update_live(self.db, Patient, id, update_data)
+        if db_patient is not None and "full_name" in update_data:
+            self.search_index.index(db_patient.id, db_patient.full_name)
         return db_patient
 
     def delete(self, id: int) -> bool:
-        db_patient = self.get_by_id(id)
-        if not db_patient:
+        if not soft_delete(self.db, Patient, id):
             return False
-        db_patient.date_deleted = func.now()
-        self.db.commit()
+        self.search_index.remove(id)
+        self.cache.invalidate_on_commit(self.db, id)
         return True
\ No newline at end of file
@@ -0,0 +1,76 @@
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.sql import Delete, Select
+from models.patient import Patient
+from models.patient_name_trigram import PatientNameTrigram
+from utils.trigrams import name_trigrams, query_trigrams, query_words
+
+
+# Statement that drops every trigram of a patient
+def remove_statement(patient_id: int) -> Delete:
+    return delete(PatientNameTrigram).where(PatientNameTrigram.patient_id == patient_id)
+
+
+# Rows to insert for the trigrams of a patient's current name
+def index_rows(patient_id: int, full_name: str) -> List[dict]:
+    return [{"trigram": gram, "patient_id": patient_id} for gram in name_trigrams(full_name)]
+
+
+# Statement that searches live patients by name substring or prefix
+# Candidates must contain every required trigram of the query (see query_trigrams);
+# only those whose name contains every query word are kept, and they are ranked by how
+# many query trigrams they share, so names starting with the query come first.
+def search_statement(query: str, limit: int) -> Optional[Select]:
+    prefix, required = query_trigrams(query)
+    grams = prefix | required
+    if not grams:
+        return None
+    candidates = (
+        select(PatientNameTrigram.patient_id, func.count(PatientNameTrigram.trigram).label("hits"))
+        .where(PatientNameTrigram.trigram.in_(grams))
+        .group_by(PatientNameTrigram.patient_id)
+        .having(func.sum(PatientNameTrigram.trigram.in_(required)) >= len(required))
+        .subquery()
+    )
+    return (
+        select(Patient, candidates.c.hits)
+        .join(candidates, candidates.c.patient_id == Patient.id)
+        .where(
+            Patient.date_deleted.is_(None),
+            and_(*(Patient.full_name.icontains(word, autoescape=True) for word in query_words(query))),
+        )
+        .order_by(candidates.c.hits.desc(), Patient.full_name, Patient.id)
+        .limit(limit)
+    )
+
+
+# PatientSearchRepository class to maintain and query the patient name trigram index
+# It does not commit; callers write the index in the same transaction as the patient.
+class PatientSearchRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Replace the indexed trigrams for a patient with the trigrams of its current name
+    def index(self, patient_id: int, full_name: str) -> None:
+        self.remove(patient_id)
+        rows = index_rows(patient_id, full_name)
+        if rows:
+            self.db.execute(insert(PatientNameTrigram), rows)
+
+    # Index a batch of newly inserted patients with one multi-row insert
+    def index_many(self, patients: List[Tuple[int, str]]) -> None:
+        rows = [row for patient_id, full_name in patients for row in index_rows(patient_id, full_name)]
+        if rows:
+            self.db.execute(insert(PatientNameTrigram), rows)
+
+    # Drop every trigram of a patient, used when the patient is deleted
+    def remove(self, patient_id: int) -> None:
+        self.db.execute(remove_statement(patient_id))
+
+    # Search live patients by name substring or prefix, best matches first
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Patient, int]]:
+        statement = search_statement(query, limit)
+        if statement is None:
+            return []
+        return [(patient, hits) for patient, hits in self.db.execute(statement).all()]
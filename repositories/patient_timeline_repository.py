@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+from sqlalchemy import String, and_, literal, null, or_, select, type_coerce, union_all
+from sqlalchemy.sql import ColumnElement, Select
+from models.appointment import Appointment
+from models.medical_record import MedicalRecord
+from schemas.timeline import TimelineKind
+
+# The union branches: model, kind, time column and the columns only that kind has
+_BRANCHES = [
+    (Appointment, TimelineKind.APPOINTMENT, Appointment.date_time, [
+        Appointment.doctor_id, Appointment.duration_minutes, Appointment.status,
+    ]),
+    (MedicalRecord, TimelineKind.MEDICAL_RECORD, MedicalRecord.treatment_date, [
+        MedicalRecord.diagnosis, MedicalRecord.prescriptions, MedicalRecord.doctor_notes,
+    ]),
+]
+
+
+# TimelineCursor is the keyset position of the last entry of a timeline page
+class TimelineCursor(NamedTuple):
+    time: datetime
+    kind: TimelineKind
+    id: int
+
+
+# The seek predicate of one branch: entries of this kind that sort after the cursor.
+# Within a branch the kind is constant, so the (time, kind, id) comparison reduces to
+# a range on the indexed time column.
+def _seek(kind: TimelineKind, time_column, id_column, after: TimelineCursor) -> ColumnElement:
+    if kind < after.kind:
+        return time_column <= after.time
+    if kind > after.kind:
+        return time_column < after.time
+    # The leading bound keeps the index range seek; the OR alone would not use it
+    return and_(
+        time_column <= after.time,
+        or_(time_column < after.time, and_(time_column == after.time, id_column < after.id)),
+    )
+
+
+# Statement that reads one page of a patient's timeline, newest first, in a single
+# UNION ALL of live appointments and medical records. Columns of the other kind are
+# typed NULLs. Each branch seeks past the cursor and stops at page_size on its
+# (patient_id, date_deleted, time, id) index, so the union holds at most two pages
+# whatever the length of the patient's history.
+def timeline_statement(patient_id: int, page_size: int, after: Optional[TimelineCursor] = None) -> Select:
+    specific = [column for _, _, _, columns in _BRANCHES for column in columns]
+    selects = []
+    for model, kind, time_column, columns in _BRANCHES:
+        query = (
+            select(
+                literal(kind.value, String).label("kind"),
+                model.id.label("id"),
+                time_column.label("time"),
+                *[
+                    (column if column in columns else type_coerce(null(), column.type)).label(column.key)
+                    for column in specific
+                ],
+            )
+            .where(model.patient_id == patient_id, model.date_deleted.is_(None))
+            .order_by(time_column.desc(), model.id.desc())
+            .limit(page_size)
+        )
+        if after is not None:
+            query = query.where(_seek(kind, time_column, model.id, after))
+        selects.append(select(query.subquery()))
+    timeline = union_all(*selects).subquery("timeline")
+    return (
+        select(timeline)
+        .order_by(timeline.c.time.desc(), timeline.c.kind.desc(), timeline.c.id.desc())
+        .limit(page_size)
+    )
@@ -0,0 +1,169 @@
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert, Select
+from models.appointment import Appointment
+from models.appointment_count import AppointmentCount
+from models.appointment_day_count import AppointmentDayCount
+from models.medical_record import MedicalRecord
+from models.patient_record_count import PatientRecordCount
+from schemas.appointment import AppointmentStatus
+
+# The key columns of each summary table, in the order CountDeltas keys are written
+SUMMARY_KEYS: Dict[Type, Tuple[str, ...]] = {
+    AppointmentCount: ("doctor_id", "day", "status"),
+    AppointmentDayCount: ("day", "status"),
+    PatientRecordCount: ("patient_id",),
+}
+
+
+# CountDeltas collects how one write changes the summary counts.
+# Rows leaving the counts (deleted, or as they were before an update) subtract one and
+# rows entering them add one; deltas that cancel out, such as an update that keeps the
+# doctor, day and status, are dropped before anything is written. Rows are ORM
+# instances or the rows read by appointment_count_key and record_count_key.
+class CountDeltas:
+    def __init__(self):
+        self.changes: Counter = Counter()
+
+    @classmethod
+    def for_appointments(cls, removed: Iterable = (), added: Iterable = ()) -> "CountDeltas":
+        deltas = cls()
+        for rows, delta in ((removed, -1), (added, 1)):
+            for row in rows:
+                day = row.date_time.date()
+                deltas.changes[(AppointmentCount, (row.doctor_id, day, row.status))] += delta
+                deltas.changes[(AppointmentDayCount, (day, row.status))] += delta
+        return deltas
+
+    @classmethod
+    def for_medical_records(cls, removed: Iterable = (), added: Iterable = ()) -> "CountDeltas":
+        deltas = cls()
+        for rows, delta in ((removed, -1), (added, 1)):
+            for row in rows:
+                deltas.changes[(PatientRecordCount, (row.patient_id,))] += delta
+        return deltas
+
+    # One list of parameter rows per summary table, without the zero deltas
+    def rows(self) -> Dict[Type, List[dict]]:
+        rows: Dict[Type, List[dict]] = {}
+        # Sorted so concurrent writers lock summary rows in the same order
+        for (model, key), delta in sorted(self.changes.items(), key=lambda item: (item[0][0].__tablename__, item[0][1])):
+            if delta:
+                rows.setdefault(model, []).append({**dict(zip(SUMMARY_KEYS[model], key)), "total": delta})
+        return rows
+
+
+# Statement that locks a live appointment and reads the columns its counts are keyed by
+def appointment_count_key(id: int) -> Select:
+    return (
+        select(Appointment.doctor_id, Appointment.date_time, Appointment.status)
+        .where(Appointment.id == id, Appointment.date_deleted.is_(None))
+        .with_for_update()
+    )
+
+
+# Statement that locks a live medical record and reads the patient its count is kept for
+def record_count_key(id: int) -> Select:
+    return (
+        select(MedicalRecord.patient_id)
+        .where(MedicalRecord.id == id, MedicalRecord.date_deleted.is_(None))
+        .with_for_update()
+    )
+
+
+# This function builds the upsert that adds each row's total to the stored count,
+# creating the summary row at that total when it does not exist yet.
+def _increment_statement(dialect: str, model: Type) -> Insert:
+    if dialect in ("sqlite", "postgresql"):
+        statement = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(model)
+        return statement.on_conflict_do_update(
+            index_elements=list(SUMMARY_KEYS[model]),
+            set_={"total": model.total + statement.excluded.total},
+        )
+    if dialect == "mysql":
+        statement = mysql.insert(model)
+        return statement.on_duplicate_key_update(total=model.total + statement.inserted.total)
+    raise NotImplementedError(f"Summary counts are not supported for the {dialect} dialect")
+
+
+# Apply the deltas with one executemany upsert per summary table, inside the caller's transaction
+def apply_count_deltas(db: Session, deltas: CountDeltas) -> None:
+    dialect = db.get_bind().dialect.name
+    for model, rows in deltas.rows().items():
+        db.execute(_increment_statement(dialect, model), rows)
+
+
+# Async counterpart of apply_count_deltas
+async def apply_count_deltas_async(db: AsyncSession, deltas: CountDeltas) -> None:
+    dialect = db.get_bind().dialect.name
+    for model, rows in deltas.rows().items():
+        await db.execute(_increment_statement(dialect, model), rows)
+
+
+# Statement reading the counts per day and status between date_from and date_to
+# inclusive, from the per-doctor table for one doctor or the per-day table for all
+def appointment_counts_statement(date_from: date, date_to: date, doctor_id: Optional[int] = None) -> Select:
+    model = AppointmentDayCount if doctor_id is None else AppointmentCount
+    query = select(model.day, model.status, model.total).where(
+        model.day >= date_from, model.day <= date_to, model.total != 0
+    )
+    if doctor_id is not None:
+        query = query.where(AppointmentCount.doctor_id == doctor_id)
+    return query.order_by(model.day, model.status)
+
+
+# Statement summing the live appointments, of one status or of all, from the per-day counts
+def appointment_total_statement(status: Optional[AppointmentStatus] = None) -> Select:
+    query = select(func.sum(AppointmentDayCount.total))
+    if status is not None:
+        query = query.where(AppointmentDayCount.status == status)
+    return query
+
+
+# Statement reading the stored medical record count of a patient; no row means none
+def record_count_statement(patient_id: int) -> Select:
+    return select(PatientRecordCount.total).where(PatientRecordCount.patient_id == patient_id)
+
+
+# StatsRepository class to read and rebuild the summary count tables
+# Reads are primary key lookups or short range seeks whatever the size of the history.
+class StatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Counts per day and status between date_from and date_to inclusive, for one doctor or all
+    def get_appointment_counts(
+        self, date_from: date, date_to: date, doctor_id: Optional[int] = None
+    ) -> List[Tuple[date, AppointmentStatus, int]]:
+        return [tuple(row) for row in self.db.execute(appointment_counts_statement(date_from, date_to, doctor_id))]
+
+    # Number of live medical records of a patient
+    def get_patient_record_count(self, patient_id: int) -> int:
+        return self.db.scalar(record_count_statement(patient_id)) or 0
+
+    # Recompute every summary table from the live rows, repairing any drift.
+    # Runs in the caller's transaction, so readers see either the old or the new counts.
+    def rebuild(self) -> Dict[str, int]:
+        day = func.date(Appointment.date_time)
+        sources = [
+            (AppointmentCount, select(Appointment.doctor_id, day, Appointment.status, func.count())
+                .where(Appointment.date_deleted.is_(None))
+                .group_by(Appointment.doctor_id, day, Appointment.status)),
+            (AppointmentDayCount, select(day, Appointment.status, func.count())
+                .where(Appointment.date_deleted.is_(None))
+                .group_by(day, Appointment.status)),
+            (PatientRecordCount, select(MedicalRecord.patient_id, func.count())
+                .where(MedicalRecord.date_deleted.is_(None))
+                .group_by(MedicalRecord.patient_id)),
+        ]
+        rebuilt = {}
+        for model, source in sources:
+            self.db.execute(delete(model))
+            result = self.db.execute(insert(model).from_select([*SUMMARY_KEYS[model], "total"], source))
+            rebuilt[model.__tablename__] = result.rowcount
+        return rebuilt
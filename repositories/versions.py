@@ -0,0 +1,23 @@
+from typing import Optional, Type
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+from utils.conditional import RowVersion
+
+# Shared row version reads for the sync and async repositories' conditional GETs.
+# A row's version is its version counter, which every write path increments, with the
+# time it last changed (date_updated, or date_created if it was never updated) for
+# Last-Modified; the same rule as utils.conditional.version_of. Versions are always read
+# from the database: a cached row may be behind a write made through another worker.
+
+
+# Single-row read of one live row's version columns
+def version_statement(model: Type, id: int) -> Select:
+    return select(model.version, func.coalesce(model.date_updated, model.date_created)).where(
+        model.id == id, model.date_deleted.is_(None)
+    )
+
+
+# The version read by version_statement, or None if no live row matched
+def read_version(row: Optional[Row]) -> Optional[RowVersion]:
+    return RowVersion(*row) if row is not None else None
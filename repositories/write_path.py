@@ -0,0 +1,201 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from sqlalchemy import insert, literal, select, text, update
+from sqlalchemy.engine import Connection, CursorResult
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Insert, Update
+
+# Shared single-statement write helpers for the sync and async repositories.
+# They only execute statements; the service's unit of work commits.
+
+# Rows per multi-row INSERT of insert_many; keeps each statement under SQLite's bound parameter limit
+INSERT_BATCH_SIZE = 500
+
+
+# UPDATE restricted to one live (not soft-deleted) row and any extra guard conditions.
+# Every write increments the row's version counter, which conditional GETs compare.
+def _live_update(model: Type, id: int, values: Dict[str, Any], *guards: ColumnElement) -> Update:
+    return (
+        update(model)
+        .where(model.id == id, model.date_deleted.is_(None), *guards)
+        .values(**values, version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Update one live row with a single UPDATE and return it
+# Dialects with UPDATE ... RETURNING get the new row back in the same round trip;
+# others (MySQL) need one primary key read afterwards. Guards are extra WHERE conditions,
+# such as an EXISTS on a parent row. Returns None if no live row matched.
+def update_live(db: Session, model: Type, id: int, values: Dict[str, Any], *guards: ColumnElement) -> Optional[Any]:
+    statement = _live_update(model, id, values, *guards)
+    if db.get_bind().dialect.update_returning:
+        return db.scalars(statement.returning(model), execution_options={"populate_existing": True}).first()
+    if db.execute(statement).rowcount == 0:
+        return None
+    return db.get(model, id, populate_existing=True)
+
+
+# INSERT ... SELECT of one row that only inserts while the parent row is live.
+# values[foreign_key] names the parent; the SELECT reads it from the parent table so a
+# missing or soft-deleted parent inserts nothing, and on MySQL the read share-locks the
+# parent row until commit so it cannot be deleted underneath the new child.
+def _insert_with_parent(model: Type, values: Dict[str, Any], foreign_key: str, parent: Type) -> Insert:
+    columns = model.__table__.c
+    source = select(
+        *(parent.id if key == foreign_key else literal(value, columns[key].type) for key, value in values.items())
+    ).where(parent.id == values[foreign_key], parent.date_deleted.is_(None))
+    return insert(model).from_select(list(values), source)
+
+
+# The id of the row inserted by _insert_with_parent, or None if the guard stopped it
+def _inserted_id(result: CursorResult, returning: bool) -> Optional[int]:
+    if returning:
+        return result.scalar()
+    return result.lastrowid if result.rowcount else None
+
+
+# The inserted row as a detached instance, built from the values that were written
+def _inserted_row(model: Type, id: Optional[int], values: Dict[str, Any]) -> Optional[Any]:
+    if id is None:
+        return None
+    return model(id=id, version=1, date_updated=None, date_deleted=None, **values)
+
+
+# Insert one row in a single statement if its parent row is live; returns None otherwise.
+# The creation timestamp is set here because Core inserts skip the ORM defaults.
+def insert_with_parent(db: Session, model: Type, values: Dict[str, Any], foreign_key: str, parent: Type) -> Optional[Any]:
+    values = {**values, "date_created": datetime.now()}
+    statement = _insert_with_parent(model, values, foreign_key, parent)
+    returning = db.get_bind().dialect.insert_returning
+    if returning:
+        statement = statement.returning(model.id)
+    return _inserted_row(model, _inserted_id(db.execute(statement), returning), values)
+
+
+# Connection.info key caching whether a multi-row INSERT's ids can be derived from lastrowid
+_CONSECUTIVE_IDS = "write_path_consecutive_ids"
+
+# The MySQL settings that decide whether one INSERT's ids are consecutive
+_ID_VARIABLES = text(
+    "SHOW VARIABLES WHERE Variable_name IN ('auto_increment_increment', 'innodb_autoinc_lock_mode', 'wsrep_on')"
+)
+
+
+# Whether the MySQL settings keep the ids of one multi-row INSERT consecutive, so that
+# lastrowid (the first id) gives them all. An increment above 1 leaves gaps; the
+# interleaved lock mode (2, MySQL 8's default) may hand other statements ids in between;
+# Galera (wsrep_on) offsets ids per node and requires the interleaved mode anyway.
+def consecutive_ids(variables: Dict[str, str]) -> bool:
+    return (
+        variables.get("auto_increment_increment") == "1"
+        and variables.get("innodb_autoinc_lock_mode") in ("0", "1")
+        and variables.get("wsrep_on", "OFF") != "ON"
+    )
+
+
+# Whether insert_many still has to read the MySQL id settings of the connection; they
+# are read once per connection, as auto_increment_increment can be set per session
+def _reads_id_variables(connection: Union[Connection, AsyncConnection]) -> bool:
+    dialect = connection.dialect
+    return not dialect.insert_returning and dialect.name == "mysql" and _CONSECUTIVE_IDS not in connection.info
+
+
+# Rows per INSERT for insert_many: INSERT_BATCH_SIZE where the ids of a multi-row INSERT
+# are known, from RETURNING or from consecutive MySQL ids; one row at a time otherwise,
+# each statement's lastrowid then being its row's id. Other dialects without RETURNING
+# report the last id of a multi-row INSERT, if any, so they insert one row at a time.
+def _batch_size(connection: Union[Connection, AsyncConnection]) -> int:
+    if connection.dialect.insert_returning or connection.info.get(_CONSECUTIVE_IDS):
+        return INSERT_BATCH_SIZE
+    return 1
+
+
+# Multi-row INSERT statements for values, batch_size rows each, returning the ids where
+# the dialect supports it. Every row gets the same creation timestamp.
+def _insert_batches(
+    db: Any, model: Type, values: List[Dict[str, Any]], batch_size: int
+) -> List[Tuple[Insert, List[Dict[str, Any]]]]:
+    now = datetime.now()
+    rows = [{**item, "date_created": now} for item in values]
+    returning = db.get_bind().dialect.insert_returning
+    batches = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        statement = insert(model).values(batch)
+        batches.append((statement.returning(model.id) if returning else statement, batch))
+    return batches
+
+
+# The ids of the rows of one INSERT, in the order of its VALUES. A single statement
+# gives its rows ascending ids in that order, so RETURNING ids are sorted rather than
+# trusted to come back in order. Without RETURNING, lastrowid is the first id of the
+# statement and _batch_size only puts several rows in it when the ids are consecutive.
+def _batch_ids(result: CursorResult, returning: bool) -> List[int]:
+    if returning:
+        return sorted(result.scalars())
+    return list(range(result.lastrowid, result.lastrowid + result.rowcount))
+
+
+# Insert rows with one multi-row INSERT per INSERT_BATCH_SIZE rows (see _batch_size)
+# and return them as detached instances with their generated ids
+def insert_many(db: Session, model: Type, values: List[Dict[str, Any]]) -> List[Any]:
+    connection = db.connection()
+    if _reads_id_variables(connection):
+        connection.info[_CONSECUTIVE_IDS] = consecutive_ids(dict(connection.execute(_ID_VARIABLES).all()))
+    returning = connection.dialect.insert_returning
+    inserted = []
+    for statement, batch in _insert_batches(db, model, values, _batch_size(connection)):
+        ids = _batch_ids(db.execute(statement), returning)
+        inserted.extend(_inserted_row(model, id, row) for id, row in zip(ids, batch))
+    return inserted
+
+
+# Soft delete one live row with a single UPDATE; returns False if no live row matched
+def soft_delete(db: Session, model: Type, id: int) -> bool:
+    return db.execute(_live_update(model, id, {"date_deleted": datetime.now()})).rowcount > 0
+
+
+# Async counterpart of update_live
+async def update_live_async(
+    db: AsyncSession, model: Type, id: int, values: Dict[str, Any], *guards: ColumnElement
+) -> Optional[Any]:
+    statement = _live_update(model, id, values, *guards)
+    if db.get_bind().dialect.update_returning:
+        result = await db.scalars(statement.returning(model), execution_options={"populate_existing": True})
+        return result.first()
+    if (await db.execute(statement)).rowcount == 0:
+        return None
+    return await db.get(model, id, populate_existing=True)
+
+
+# Async counterpart of insert_with_parent
+async def insert_with_parent_async(
+    db: AsyncSession, model: Type, values: Dict[str, Any], foreign_key: str, parent: Type
+) -> Optional[Any]:
+    values = {**values, "date_created": datetime.now()}
+    statement = _insert_with_parent(model, values, foreign_key, parent)
+    returning = db.get_bind().dialect.insert_returning
+    if returning:
+        statement = statement.returning(model.id)
+    return _inserted_row(model, _inserted_id(await db.execute(statement), returning), values)
+
+
+# Async counterpart of insert_many
+async def insert_many_async(db: AsyncSession, model: Type, values: List[Dict[str, Any]]) -> List[Any]:
+    connection = await db.connection()
+    if _reads_id_variables(connection):
+        connection.info[_CONSECUTIVE_IDS] = consecutive_ids(dict((await connection.execute(_ID_VARIABLES)).all()))
+    returning = connection.dialect.insert_returning
+    inserted = []
+    for statement, batch in _insert_batches(db, model, values, _batch_size(connection)):
+        ids = _batch_ids(await db.execute(statement), returning)
+        inserted.extend(_inserted_row(model, id, row) for id, row in zip(ids, batch))
+    return inserted
+
+
+# Async counterpart of soft_delete
+async def soft_delete_async(db: AsyncSession, model: Type, id: int) -> bool:
+    result = await db.execute(_live_update(model, id, {"date_deleted": datetime.now()}))
+    return result.rowcount > 0
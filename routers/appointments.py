@@ -1,15 +1,26 @@
-from fastapi import APIRouter, Depends, Query, Response
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from datetime import datetime
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentResponse, AppointmentStatus
 from services.appointment_service import AppointmentService
-from models.database import get_db
+from models.file_database import get_entity_db, require_sql_storage
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from schemas.export import ExportFormat
+from services.export_service import ExportService
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
 
 # Router for appointment-related endpoints
-router = APIRouter(prefix="/appointments", tags=["Appointments"])
+router = APIRouter(prefix="/appointments", tags=["Appointments"], route_class=ProfiledRoute)
 
 # Dependency to get the AppointmentService instance
-def get_appointment_service(db: Session = Depends(get_db)):
+def get_appointment_service(db: Session = Depends(get_entity_db)):
     return AppointmentService(db)
 
 # Endpoint to create a new appointment
@@ -23,20 +34,76 @@ def create_appointment(
     response.set_cookie(key="session_id", value=f"session_{result.id}")
     return result
 
+# Endpoint to create a batch of appointments in one transaction
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_appointments(
+    appointments: List[AppointmentCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: AppointmentService = Depends(get_appointment_service)
+):
+    return service.bulk_create_appointments(appointments)
+
+# Endpoint to stream every matching appointment as NDJSON or CSV
+# date_from is inclusive and date_to exclusive
+# Exports read the SQL tables, so they answer 501 with STORAGE_BACKEND=file
+@router.get("/export", dependencies=[Depends(require_sql_storage)])
+def export_appointments(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    status: Optional[AppointmentStatus] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None)
+):
+    stream = ExportService().export_appointments(format, status, date_from, date_to)
+    return StreamingResponse(
+        stream,
+        media_type="text/csv" if format == ExportFormat.CSV else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename=appointments.{format.value}"}
+    )
+
 # Endpoint to retrieve an appointment by ID
+# A conditional request is answered from the row version alone when it is unchanged
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
-def get_appointment(appointment_id: int, service: AppointmentService = Depends(get_appointment_service)):
-    return service.get_appointment(appointment_id)
+def get_appointment(
+    appointment_id: int,
+    request: Request,
+    service: AppointmentService = Depends(get_appointment_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("appointments", appointment_id, service.get_appointment_version(appointment_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_appointment(appointment_id)
+    set_validators(response, entity_validators("appointments", result.id, version_of(result)))
+    return result
 
 # Endpoint to retrieve all appointments with optional filters
-@router.get("/", response_model=List[AppointmentResponse])
+# With total, small filtered sets are counted exactly and large ones are cached
+# Without total, a conditional request is checked against the page's row versions first
+# ids=1,2,3 looks those rows up instead, in that order, and ignores the paging parameters
+@router.get("/", response_model=Union[List[AppointmentResponse], Page[AppointmentResponse], ByIds[AppointmentResponse]])
 def get_all_appointments(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     status: Optional[AppointmentStatus] = Query(None),
-    service: AppointmentService = Depends(get_appointment_service)
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: AppointmentService = Depends(get_appointment_service),
+    response: Response = None
 ):
-    return service.get_all_appointments(page, page_size, status)
+    if ids is not None:
+        return json_response(service.get_appointments_by_ids(parse_ids(ids, MAX_IDS)), ByIds[AppointmentResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("appointments", service.get_all_appointments_versions(page, page_size, status, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_all_appointments(page, page_size, status, cursor)
+    if total is None:
+        set_validators(response, list_validators("appointments", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "date_time", "id")
+    total_count = service.count_appointments(status, CountStrategy.AUTO) if total else None
+    return list_response(result, AppointmentResponse, response, total, total_count)
 
 # Endpoint to update an existing appointment
 @router.put("/{appointment_id}", response_model=AppointmentResponse)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from schemas.archive import ArchivedEntity, ArchivedRow, RestoredRow
+from services.archive_service import ArchiveService
+from models.database import get_db
+from models.file_database import require_sql_storage
+
+# Admin endpoints for rows the archiver moved out of the live tables.
+# The archiver itself runs from `python manage.py archive`, outside the request path.
+# They read the SQL tables, so they answer 501 with STORAGE_BACKEND=file.
+router = APIRouter(prefix="/admin/archive", tags=["Archive"], dependencies=[Depends(require_sql_storage)])
+
+# Dependency to get the ArchiveService instance
+def get_archive_service(db: Session = Depends(get_db)):
+    return ArchiveService(db)
+
+# Endpoint to look up an archived patient, doctor, appointment or medical record by ID
+@router.get("/{entity}/{id}", response_model=ArchivedRow)
+def get_archived(entity: ArchivedEntity, id: int, service: ArchiveService = Depends(get_archive_service)):
+    return service.get_archived(entity, id)
+
+# Endpoint to restore an archived row as a live row with its original ID
+@router.post("/{entity}/{id}/restore", response_model=RestoredRow)
+def restore_archived(entity: ArchivedEntity, id: int, service: ArchiveService = Depends(get_archive_service)):
+    return service.restore(entity, id)
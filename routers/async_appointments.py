@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentResponse, AppointmentStatus
+from services.async_appointment_service import AsyncAppointmentService
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from schemas.export import ExportFormat
+from services.async_export_service import AsyncExportService
+from models.async_database import get_async_db
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
+
+# Async counterpart of routers/appointments.py, mounted in its place when DB_MODE=async
+router = APIRouter(prefix="/appointments", tags=["Appointments"], route_class=ProfiledRoute)
+
+# Dependency to get the AsyncAppointmentService instance
+def get_appointment_service(db: AsyncSession = Depends(get_async_db)):
+    return AsyncAppointmentService(db)
+
+@router.post("/", response_model=AppointmentResponse)
+async def create_appointment(
+    appointment: AppointmentCreate,
+    service: AsyncAppointmentService = Depends(get_appointment_service),
+    response: Response = None
+):
+    result = await service.create_appointment(appointment)
+    response.set_cookie(key="session_id", value=f"session_{result.id}")
+    return result
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_appointments(
+    appointments: List[AppointmentCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: AsyncAppointmentService = Depends(get_appointment_service)
+):
+    return await service.bulk_create_appointments(appointments)
+
+@router.get("/export")
+async def export_appointments(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    status: Optional[AppointmentStatus] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None)
+):
+    stream = AsyncExportService().export_appointments(format, status, date_from, date_to)
+    return StreamingResponse(
+        stream,
+        media_type="text/csv" if format == ExportFormat.CSV else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename=appointments.{format.value}"}
+    )
+
+@router.get("/{appointment_id}", response_model=AppointmentResponse)
+async def get_appointment(
+    appointment_id: int,
+    request: Request,
+    service: AsyncAppointmentService = Depends(get_appointment_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("appointments", appointment_id, await service.get_appointment_version(appointment_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_appointment(appointment_id)
+    set_validators(response, entity_validators("appointments", result.id, version_of(result)))
+    return result
+
+@router.get("/", response_model=Union[List[AppointmentResponse], Page[AppointmentResponse], ByIds[AppointmentResponse]])
+async def get_all_appointments(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    status: Optional[AppointmentStatus] = Query(None),
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: AsyncAppointmentService = Depends(get_appointment_service),
+    response: Response = None
+):
+    if ids is not None:
+        return json_response(await service.get_appointments_by_ids(parse_ids(ids, MAX_IDS)), ByIds[AppointmentResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("appointments", await service.get_all_appointments_versions(page, page_size, status, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_all_appointments(page, page_size, status, cursor)
+    if total is None:
+        set_validators(response, list_validators("appointments", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "date_time", "id")
+    total_count = await service.count_appointments(status, CountStrategy.AUTO) if total else None
+    return list_response(result, AppointmentResponse, response, total, total_count)
+
+@router.put("/{appointment_id}", response_model=AppointmentResponse)
+async def update_appointment(
+    appointment_id: int,
+    appointment: AppointmentUpdate,
+    service: AsyncAppointmentService = Depends(get_appointment_service)
+):
+    return await service.update_appointment(appointment_id, appointment)
+
+@router.delete("/{appointment_id}")
+async def delete_appointment(appointment_id: int, service: AsyncAppointmentService = Depends(get_appointment_service)):
+    await service.delete_appointment(appointment_id)
+    return {"message": "Appointment deleted successfully"}
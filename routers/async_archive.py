@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.archive import ArchivedEntity, ArchivedRow, RestoredRow
+from services.async_archive_service import AsyncArchiveService
+from models.async_database import get_async_db
+
+# Async counterpart of routers/archive.py, mounted in its place when DB_MODE=async
+router = APIRouter(prefix="/admin/archive", tags=["Archive"])
+
+# Dependency to get the AsyncArchiveService instance
+def get_archive_service(db: AsyncSession = Depends(get_async_db)):
+    return AsyncArchiveService(db)
+
+@router.get("/{entity}/{id}", response_model=ArchivedRow)
+async def get_archived(entity: ArchivedEntity, id: int, service: AsyncArchiveService = Depends(get_archive_service)):
+    return await service.get_archived(entity, id)
+
+@router.post("/{entity}/{id}/restore", response_model=RestoredRow)
+async def restore_archived(entity: ArchivedEntity, id: int, service: AsyncArchiveService = Depends(get_archive_service)):
+    return await service.restore(entity, id)
@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse, DoctorAvailability
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from services.async_appointment_service import AsyncAppointmentService
+from services.async_doctor_service import AsyncDoctorService
+from models.async_database import get_async_db
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
+
+# Async counterpart of routers/doctors.py, mounted in its place when DB_MODE=async
+router = APIRouter(prefix="/doctors", tags=["Doctors"], route_class=ProfiledRoute)
+
+# Dependency to get the AsyncDoctorService instance
+def get_doctor_service(db: AsyncSession = Depends(get_async_db)):
+    return AsyncDoctorService(db)
+
+@router.post("/", response_model=DoctorResponse)
+async def create_doctor(
+    doctor: DoctorCreate,
+    service: AsyncDoctorService = Depends(get_doctor_service),
+    response: Response = None
+):
+    result = await service.create_doctor(doctor)
+    response.set_cookie(key="session_id", value=f"session_{result.id}")
+    return result
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_doctors(
+    doctors: List[DoctorCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: AsyncDoctorService = Depends(get_doctor_service)
+):
+    return await service.bulk_create_doctors(doctors)
+
+@router.get("/{doctor_id}", response_model=DoctorResponse)
+async def get_doctor(
+    doctor_id: int,
+    request: Request,
+    service: AsyncDoctorService = Depends(get_doctor_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("doctors", doctor_id, await service.get_doctor_version(doctor_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_doctor(doctor_id)
+    set_validators(response, entity_validators("doctors", result.id, version_of(result)))
+    return result
+
+@router.get("/{doctor_id}/availability", response_model=DoctorAvailability)
+async def get_doctor_availability(
+    doctor_id: int,
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    slot: int = Query(30, ge=5, le=480),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncAppointmentService(db).get_doctor_availability(doctor_id, window_start, window_end, slot)
+
+@router.get("/", response_model=Union[List[DoctorResponse], Page[DoctorResponse], ByIds[DoctorResponse]])
+async def get_all_doctors(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    specialty: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: AsyncDoctorService = Depends(get_doctor_service),
+    response: Response = None
+):
+    if ids is not None:
+        return json_response(await service.get_doctors_by_ids(parse_ids(ids, MAX_IDS)), ByIds[DoctorResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("doctors", await service.get_all_doctors_versions(page, page_size, specialty, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_all_doctors(page, page_size, specialty, cursor)
+    if total is None:
+        set_validators(response, list_validators("doctors", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "id")
+    total_count = await service.count_doctors(specialty, CountStrategy.EXACT) if total else None
+    return list_response(result, DoctorResponse, response, total, total_count)
+
+@router.put("/{doctor_id}", response_model=DoctorResponse)
+async def update_doctor(
+    doctor_id: int,
+    doctor: DoctorUpdate,
+    service: AsyncDoctorService = Depends(get_doctor_service)
+):
+    return await service.update_doctor(doctor_id, doctor)
+
+@router.delete("/{doctor_id}")
+async def delete_doctor(doctor_id: int, service: AsyncDoctorService = Depends(get_doctor_service)):
+    await service.delete_doctor(doctor_id)
+    return {"message": "Doctor deleted successfully"}
@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate, MedicalRecordResponse
+from services.async_medical_record_service import AsyncMedicalRecordService
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from schemas.export import ExportFormat
+from services.async_export_service import AsyncExportService
+from models.async_database import get_async_db
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
+
+# Async counterpart of routers/medical_records.py, mounted in its place when DB_MODE=async
+router = APIRouter(prefix="/medical-records", tags=["Medical Records"], route_class=ProfiledRoute)
+
+# Dependency to get the AsyncMedicalRecordService instance
+def get_medical_record_service(db: AsyncSession = Depends(get_async_db)):
+    return AsyncMedicalRecordService(db)
+
+@router.post("/", response_model=MedicalRecordResponse)
+async def create_medical_record(
+    record: MedicalRecordCreate,
+    service: AsyncMedicalRecordService = Depends(get_medical_record_service),
+    response: Response = None
+):
+    result = await service.create_medical_record(record)
+    response.set_cookie(key="session_id", value=f"session_{result.id}")
+    return result
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_medical_records(
+    records: List[MedicalRecordCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: AsyncMedicalRecordService = Depends(get_medical_record_service)
+):
+    return await service.bulk_create_medical_records(records)
+
+@router.get("/export")
+async def export_medical_records(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    patient_id: Optional[int] = Query(None),
+    treatment_from: Optional[datetime] = Query(None),
+    treatment_to: Optional[datetime] = Query(None)
+):
+    stream = AsyncExportService().export_medical_records(format, patient_id, treatment_from, treatment_to)
+    return StreamingResponse(
+        stream,
+        media_type="text/csv" if format == ExportFormat.CSV else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename=medical_records.{format.value}"}
+    )
+
+@router.get("/{record_id}", response_model=MedicalRecordResponse)
+async def get_medical_record(
+    record_id: int,
+    request: Request,
+    service: AsyncMedicalRecordService = Depends(get_medical_record_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("medical_records", record_id, await service.get_medical_record_version(record_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_medical_record(record_id)
+    set_validators(response, entity_validators("medical_records", result.id, version_of(result)))
+    return result
+
+@router.get("/", response_model=Union[List[MedicalRecordResponse], Page[MedicalRecordResponse], ByIds[MedicalRecordResponse]])
+async def get_all_medical_records(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    patient_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: AsyncMedicalRecordService = Depends(get_medical_record_service),
+    response: Response = None
+):
+    if ids is not None:
+        return json_response(await service.get_medical_records_by_ids(parse_ids(ids, MAX_IDS)), ByIds[MedicalRecordResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("medical_records", await service.get_all_medical_records_versions(page, page_size, patient_id, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_all_medical_records(page, page_size, patient_id, cursor)
+    if total is None:
+        set_validators(response, list_validators("medical_records", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "id")
+    total_count = await service.count_medical_records(patient_id, CountStrategy.AUTO) if total else None
+    return list_response(result, MedicalRecordResponse, response, total, total_count)
+
+@router.put("/{record_id}", response_model=MedicalRecordResponse)
+async def update_medical_record(
+    record_id: int,
+    record: MedicalRecordUpdate,
+    service: AsyncMedicalRecordService = Depends(get_medical_record_service)
+):
+    return await service.update_medical_record(record_id, record)
+
+@router.delete("/{record_id}")
+async def delete_medical_record(record_id: int, service: AsyncMedicalRecordService = Depends(get_medical_record_service)):
+    await service.delete_medical_record(record_id)
+    return {"message": "Medical record deleted successfully"}
@@ -0,0 +1,125 @@
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.patient import PatientCreate, PatientUpdate, PatientResponse
+from schemas.timeline import TimelineEntry
+from schemas.audit import AuditEntryResponse
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from services.async_patient_service import AsyncPatientService
+from models.async_database import get_async_db
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
+
+# Async counterpart of routers/patients.py, mounted in its place when DB_MODE=async.
+# It serves every route of the sync router under the same path templates.
+router = APIRouter(prefix="/patients", tags=["Patients"], route_class=ProfiledRoute)
+
+# Dependency to get the AsyncPatientService instance
+def get_patient_service(db: AsyncSession = Depends(get_async_db)):
+    return AsyncPatientService(db)
+
+@router.post("/", response_model=PatientResponse)
+async def create_patient(
+    patient: PatientCreate,
+    service: AsyncPatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    result = await service.create_patient(patient)
+    response.set_cookie(key="session_id", value=f"session_{result.id}")
+    return result
+
+@router.get("/search", response_model=List[PatientResponse])
+async def search_patients(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=100),
+    service: AsyncPatientService = Depends(get_patient_service)
+):
+    return json_response(await service.search_patients(q, limit), List[PatientResponse])
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def bulk_create_patients(
+    patients: List[PatientCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: AsyncPatientService = Depends(get_patient_service)
+):
+    return await service.bulk_create_patients(patients)
+
+@router.get("/{patient_id}", response_model=PatientResponse)
+async def get_patient(
+    patient_id: int,
+    request: Request,
+    service: AsyncPatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("patients", patient_id, await service.get_patient_version(patient_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_patient(patient_id)
+    set_validators(response, entity_validators("patients", result.id, version_of(result)))
+    return result
+
+@router.get("/{patient_id}/timeline", response_model=List[TimelineEntry])
+async def get_patient_timeline(
+    patient_id: int,
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    service: AsyncPatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    result = await service.get_patient_timeline(patient_id, page_size, cursor)
+    set_next_cursor(response, result, page_size, "time", "kind", "id")
+    return json_response(result, List[TimelineEntry], response)
+
+@router.get("/{patient_id}/audit", response_model=List[AuditEntryResponse])
+async def get_patient_audit(
+    patient_id: int,
+    page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    service: AsyncPatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    result = await service.get_patient_audit(patient_id, page_size, cursor)
+    set_next_cursor(response, result, page_size, "id")
+    return json_response(result, List[AuditEntryResponse], response)
+
+@router.get("/", response_model=Union[List[PatientResponse], Page[PatientResponse], ByIds[PatientResponse]])
+async def get_all_patients(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    name: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: AsyncPatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    if ids is not None:
+        return json_response(await service.get_patients_by_ids(parse_ids(ids, MAX_IDS)), ByIds[PatientResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("patients", await service.get_all_patients_versions(page, page_size, name, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = await service.get_all_patients(page, page_size, name, cursor)
+    if total is None:
+        set_validators(response, list_validators("patients", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "id")
+    total_count = await service.count_patients(name, CountStrategy.AUTO) if total else None
+    return list_response(result, PatientResponse, response, total, total_count)
+
+@router.put("/{patient_id}", response_model=PatientResponse)
+async def update_patient(
+    patient_id: int,
+    patient: PatientUpdate,
+    service: AsyncPatientService = Depends(get_patient_service)
+):
+    return await service.update_patient(patient_id, patient)
+
+@router.delete("/{patient_id}")
+async def delete_patient(patient_id: int, service: AsyncPatientService = Depends(get_patient_service)):
+    await service.delete_patient(patient_id)
+    return {"message": "Patient deleted successfully"}
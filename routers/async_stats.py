@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.stats import AppointmentStats, PatientRecordStats
+from services.async_stats_service import AsyncStatsService
+from models.async_database import get_async_db
+from utils.profiling import ProfiledRoute
+
+# Async counterpart of routers/stats.py, mounted in its place when DB_MODE=async
+router = APIRouter(prefix="/stats", tags=["Statistics"], route_class=ProfiledRoute)
+
+# Dependency to get the AsyncStatsService instance
+def get_stats_service(db: AsyncSession = Depends(get_async_db)):
+    return AsyncStatsService(db)
+
+@router.get("/appointments", response_model=AppointmentStats)
+async def get_appointment_stats(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    service: AsyncStatsService = Depends(get_stats_service)
+):
+    return await service.get_appointment_stats(date_from, date_to)
+
+@router.get("/doctors/{doctor_id}/appointments", response_model=AppointmentStats)
+async def get_doctor_appointment_stats(
+    doctor_id: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    service: AsyncStatsService = Depends(get_stats_service)
+):
+    return await service.get_appointment_stats(date_from, date_to, doctor_id)
+
+@router.get("/patients/{patient_id}/medical-records", response_model=PatientRecordStats)
+async def get_patient_record_stats(patient_id: int, service: AsyncStatsService = Depends(get_stats_service)):
+    return await service.get_patient_record_stats(patient_id)
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, Query, Response
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from datetime import datetime
 from sqlalchemy.orm import Session
-from schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse
+from schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse, DoctorAvailability
+from services.appointment_service import AppointmentService
 from services.doctor_service import DoctorService
-from models.database import get_db
+from models.file_database import get_entity_db
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
 
-router = APIRouter(prefix="/doctors", tags=["Doctors"])
+router = APIRouter(prefix="/doctors", tags=["Doctors"], route_class=ProfiledRoute)
 
 # Dependency to get the DoctorService instance
-def get_doctor_service(db: Session = Depends(get_db)):
+def get_doctor_service(db: Session = Depends(get_entity_db)):
     return DoctorService(db)
 
 # Endpoint to create a new doctor
@@ -22,20 +31,71 @@ def create_doctor(
     response.set_cookie(key="session_id", value=f"session_{result.id}")
     return result
 
+# Endpoint to create a batch of doctors in one transaction
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_doctors(
+    doctors: List[DoctorCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: DoctorService = Depends(get_doctor_service)
+):
+    return service.bulk_create_doctors(doctors)
+
 # Endpoint to retrieve a doctor by ID
+# A conditional request is answered from the row version alone when it is unchanged
 @router.get("/{doctor_id}", response_model=DoctorResponse)
-def get_doctor(doctor_id: int, service: DoctorService = Depends(get_doctor_service)):
-    return service.get_doctor(doctor_id)
+def get_doctor(
+    doctor_id: int,
+    request: Request,
+    service: DoctorService = Depends(get_doctor_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("doctors", doctor_id, service.get_doctor_version(doctor_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_doctor(doctor_id)
+    set_validators(response, entity_validators("doctors", result.id, version_of(result)))
+    return result
+
+# Endpoint to list a doctor's free appointment slots between two times
+# Slots are laid on a grid of slot minutes starting at from
+@router.get("/{doctor_id}/availability", response_model=DoctorAvailability)
+def get_doctor_availability(
+    doctor_id: int,
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    slot: int = Query(30, ge=5, le=480),
+    db: Session = Depends(get_entity_db)
+):
+    return AppointmentService(db).get_doctor_availability(doctor_id, window_start, window_end, slot)
 
 # Endpoint to retrieve all doctors with optional filters
-@router.get("/", response_model=List[DoctorResponse])
+# With total, doctors are always counted exactly; the table stays small
+# Without total, a conditional request is checked against the page's row versions first
+# ids=1,2,3 looks those rows up instead, in that order, and ignores the paging parameters
+@router.get("/", response_model=Union[List[DoctorResponse], Page[DoctorResponse], ByIds[DoctorResponse]])
 def get_all_doctors(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     specialty: Optional[str] = Query(None),
-    service: DoctorService = Depends(get_doctor_service)
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: DoctorService = Depends(get_doctor_service),
+    response: Response = None
 ):
-    return service.get_all_doctors(page, page_size, specialty)
+    if ids is not None:
+        return json_response(service.get_doctors_by_ids(parse_ids(ids, MAX_IDS)), ByIds[DoctorResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("doctors", service.get_all_doctors_versions(page, page_size, specialty, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_all_doctors(page, page_size, specialty, cursor)
+    if total is None:
+        set_validators(response, list_validators("doctors", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "id")
+    total_count = service.count_doctors(specialty, CountStrategy.EXACT) if total else None
+    return list_response(result, DoctorResponse, response, total, total_count)
 
 
 # Endpoint to update an existing doctor
@@ -0,0 +1,68 @@
+import os
+from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from models.database import engine, replicas
+from models.async_database import current_async_engine, current_async_replicas
+from utils.pool_metrics import pool_snapshot
+from utils.replicas import ReplicaSet
+from utils.entity_cache import entity_cache_stats
+from utils.audit_log import audit_writer
+from utils.profiling import folded_stacks, list_profiles, load_profile, require_profile_token
+
+# Router for operational endpoints used to tune and monitor the service
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+# Endpoint to report connection pool usage for this worker process
+# Each worker has its own pools, so the pid identifies which one answered.
+# Read replicas are listed with their health and their own pools.
+@router.get("/db-pool")
+def get_db_pool():
+    pools = {"sync": pool_snapshot(engine.pool)}
+    replica_pools = {"sync": _replica_snapshots(replicas)}
+    async_engine = current_async_engine()
+    if async_engine is not None:
+        pools["async"] = pool_snapshot(async_engine.sync_engine.pool)
+        replica_pools["async"] = _replica_snapshots(current_async_replicas())
+    return {"worker_pid": os.getpid(), "pools": pools, "replicas": replica_pools}
+
+
+def _replica_snapshots(replica_set: ReplicaSet) -> List[Dict]:
+    return [
+        {**health, "pool": pool_snapshot(replica.pool)}
+        for replica, health in zip(replica_set.engines, replica_set.stats())
+    ]
+
+
+# Endpoint to report entity cache hit and miss counters for this worker process
+@router.get("/cache")
+def get_cache_stats():
+    return {"worker_pid": os.getpid(), "caches": entity_cache_stats()}
+
+
+# Endpoint to report the audit writer's queue and throughput for this worker process
+# backpressure_waits counts records whose request waited for room in a full queue.
+@router.get("/audit-log")
+def get_audit_log_stats():
+    return {"worker_pid": os.getpid(), "writer": audit_writer.stats()}
+
+
+# Endpoint to list the recent request profiles, newest first; requires X-Profile-Token
+@router.get("/profiles", dependencies=[Depends(require_profile_token)])
+def get_profiles():
+    return {"profiles": list_profiles()}
+
+
+# Endpoint to download one request profile; requires X-Profile-Token
+# folded is one "frame;frame;frame count" line per stack, for flamegraph.pl or speedscope
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profile_token)])
+def get_profile(profile_id: str, format: str = Query("folded", pattern="^(folded|json)$")):
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "json":
+        return profile
+    return PlainTextResponse(
+        folded_stacks(profile),
+        headers={"Content-Disposition": f"attachment; filename={profile_id}.folded"}
+    )
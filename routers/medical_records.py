@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, Query, Response
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
+from datetime import datetime
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate, MedicalRecordResponse
 from services.medical_record_service import MedicalRecordService
-from models.database import get_db
+from models.file_database import get_entity_db, require_sql_storage
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from schemas.export import ExportFormat
+from services.export_service import ExportService
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
 
-router = APIRouter(prefix="/medical-records", tags=["Medical Records"])
+router = APIRouter(prefix="/medical-records", tags=["Medical Records"], route_class=ProfiledRoute)
 
 # Dependency to get the MedicalRecordService instance
-def get_medical_record_service(db: Session = Depends(get_db)):
+def get_medical_record_service(db: Session = Depends(get_entity_db)):
     return MedicalRecordService(db)
 
 # Endpoint to create a new medical record
@@ -22,20 +33,76 @@ def create_medical_record(
     response.set_cookie(key="session_id", value=f"session_{result.id}")
     return result
 
+# Endpoint to create a batch of medical records in one transaction
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_medical_records(
+    records: List[MedicalRecordCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: MedicalRecordService = Depends(get_medical_record_service)
+):
+    return service.bulk_create_medical_records(records)
+
+# Endpoint to stream every matching medical record as NDJSON or CSV
+# treatment_from is inclusive and treatment_to exclusive
+# Exports read the SQL tables, so they answer 501 with STORAGE_BACKEND=file
+@router.get("/export", dependencies=[Depends(require_sql_storage)])
+def export_medical_records(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    patient_id: Optional[int] = Query(None),
+    treatment_from: Optional[datetime] = Query(None),
+    treatment_to: Optional[datetime] = Query(None)
+):
+    stream = ExportService().export_medical_records(format, patient_id, treatment_from, treatment_to)
+    return StreamingResponse(
+        stream,
+        media_type="text/csv" if format == ExportFormat.CSV else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename=medical_records.{format.value}"}
+    )
+
 # Endpoint to retrieve a medical record by ID
+# A conditional request is answered from the row version alone when it is unchanged
 @router.get("/{record_id}", response_model=MedicalRecordResponse)
-def get_medical_record(record_id: int, service: MedicalRecordService = Depends(get_medical_record_service)):
-    return service.get_medical_record(record_id)
+def get_medical_record(
+    record_id: int,
+    request: Request,
+    service: MedicalRecordService = Depends(get_medical_record_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("medical_records", record_id, service.get_medical_record_version(record_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_medical_record(record_id)
+    set_validators(response, entity_validators("medical_records", result.id, version_of(result)))
+    return result
 
 # Endpoint to retrieve all medical records with optional filters
-@router.get("/", response_model=List[MedicalRecordResponse])
+# With total, one patient's records are counted exactly and large sets are cached
+# Without total, a conditional request is checked against the page's row versions first
+# ids=1,2,3 looks those rows up instead, in that order, and ignores the paging parameters
+@router.get("/", response_model=Union[List[MedicalRecordResponse], Page[MedicalRecordResponse], ByIds[MedicalRecordResponse]])
 def get_all_medical_records(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     patient_id: Optional[int] = Query(None),
-    service: MedicalRecordService = Depends(get_medical_record_service)
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: MedicalRecordService = Depends(get_medical_record_service),
+    response: Response = None
 ):
-    return service.get_all_medical_records(page, page_size, patient_id)
+    if ids is not None:
+        return json_response(service.get_medical_records_by_ids(parse_ids(ids, MAX_IDS)), ByIds[MedicalRecordResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("medical_records", service.get_all_medical_records_versions(page, page_size, patient_id, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_all_medical_records(page, page_size, patient_id, cursor)
+    if total is None:
+        set_validators(response, list_validators("medical_records", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "id")
+    total_count = service.count_medical_records(patient_id, CountStrategy.AUTO) if total else None
+    return list_response(result, MedicalRecordResponse, response, total, total_count)
 
 # Endpoint to update an existing medical record
 @router.put("/{record_id}", response_model=MedicalRecordResponse)
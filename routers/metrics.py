@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from utils.request_metrics import request_metrics
+
+# Router for the Prometheus scrape endpoint
+router = APIRouter(tags=["Internal"])
+
+# Endpoint to expose this worker's request metrics in the Prometheus text format
+# Async so it renders on the event loop that updates the metrics.
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
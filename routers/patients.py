@@ -1,14 +1,28 @@
-from fastapi import APIRouter, Depends, Query, Response
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from typing import List, Optional, Union
 from sqlalchemy.orm import Session
 from schemas.patient import PatientCreate, PatientUpdate, PatientResponse
+from schemas.timeline import TimelineEntry
+from schemas.audit import AuditEntryResponse
 from services.patient_service import PatientService
 from models.database import get_db
+from models.file_database import get_entity_db
+from schemas.bulk import BulkCreateResponse, MAX_BULK_ITEMS
+from utils.pagination import parse_ids, set_next_cursor
+from utils.serialization import json_response
+from utils.total_count import CountStrategy, TotalMode, list_response
+from schemas.page import MAX_IDS, ByIds, Page
+from utils.profiling import ProfiledRoute
+from utils.conditional import entity_validators, is_conditional, list_validators, not_modified, not_modified_response, set_validators, version_of
 
-router = APIRouter(prefix="/patients", tags=["Patients"])
+router = APIRouter(prefix="/patients", tags=["Patients"], route_class=ProfiledRoute)
 
 # Dependency to get the PatientService instance
-def get_patient_service(db: Session = Depends(get_db)):
+def get_patient_service(db: Session = Depends(get_entity_db)):
+    return PatientService(db)
+
+# Dependency to get a PatientService for the audit log, which is always in the SQL database
+def get_patient_audit_service(db: Session = Depends(get_db)):
     return PatientService(db)
 
 # Endpoint to create a new patient
@@ -22,20 +36,98 @@ def create_patient(
     response.set_cookie(key="session_id", value=f"session_{result.id}")
     return result
 
+# Endpoint to search patients by name using the trigram index
+# Declared before /{patient_id} so "search" is not parsed as an ID
+@router.get("/search", response_model=List[PatientResponse])
+def search_patients(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=100),
+    service: PatientService = Depends(get_patient_service)
+):
+    return json_response(service.search_patients(q, limit), List[PatientResponse])
+
+# Endpoint to create a batch of patients in one transaction
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_patients(
+    patients: List[PatientCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    service: PatientService = Depends(get_patient_service)
+):
+    return service.bulk_create_patients(patients)
+
 # Endpoint to retrieve a patient by ID
+# A conditional request is answered from the row version alone when it is unchanged
 @router.get("/{patient_id}", response_model=PatientResponse)
-def get_patient(patient_id: int, service: PatientService = Depends(get_patient_service)):
-    return service.get_patient(patient_id)
+def get_patient(
+    patient_id: int,
+    request: Request,
+    service: PatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    if is_conditional(request):
+        validators = entity_validators("patients", patient_id, service.get_patient_version(patient_id))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_patient(patient_id)
+    set_validators(response, entity_validators("patients", result.id, version_of(result)))
+    return result
+
+# Endpoint to retrieve a patient's appointments and medical records as one stream, newest first
+# Page with the cursor returned in the X-Next-Cursor header
+@router.get("/{patient_id}/timeline", response_model=List[TimelineEntry])
+def get_patient_timeline(
+    patient_id: int,
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    service: PatientService = Depends(get_patient_service),
+    response: Response = None
+):
+    result = service.get_patient_timeline(patient_id, page_size, cursor)
+    set_next_cursor(response, result, page_size, "time", "kind", "id")
+    return json_response(result, List[TimelineEntry], response)
+
+# Endpoint to retrieve the audit log of a patient and their medical records, newest first
+# Entries stay listed after the patient is deleted; cursor pages through older entries.
+# With several workers, a change made through another worker may show up a moment later.
+@router.get("/{patient_id}/audit", response_model=List[AuditEntryResponse])
+def get_patient_audit(
+    patient_id: int,
+    page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    service: PatientService = Depends(get_patient_audit_service),
+    response: Response = None
+):
+    result = service.get_patient_audit(patient_id, page_size, cursor)
+    set_next_cursor(response, result, page_size, "id")
+    return json_response(result, List[AuditEntryResponse], response)
 
 # Endpoint to retrieve all patients with optional filters
-@router.get("/", response_model=List[PatientResponse])
+# With total, small filtered sets are counted exactly and the large unfiltered list is cached
+# Without total, a conditional request is checked against the page's row versions first
+# ids=1,2,3 looks those rows up instead, in that order, and ignores the paging parameters
+@router.get("/", response_model=Union[List[PatientResponse], Page[PatientResponse], ByIds[PatientResponse]])
 def get_all_patients(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     name: Optional[str] = Query(None),
-    service: PatientService = Depends(get_patient_service)
+    cursor: Optional[str] = Query(None),
+    total: Optional[TotalMode] = Query(None),
+    ids: Optional[str] = Query(None),
+    request: Request = None,
+    service: PatientService = Depends(get_patient_service),
+    response: Response = None
 ):
-    return service.get_all_patients(page, page_size, name)
+    if ids is not None:
+        return json_response(service.get_patients_by_ids(parse_ids(ids, MAX_IDS)), ByIds[PatientResponse])
+    if total is None and is_conditional(request):
+        validators = list_validators("patients", service.get_all_patients_versions(page, page_size, name, cursor))
+        if not_modified(request, validators):
+            return not_modified_response(validators)
+    result = service.get_all_patients(page, page_size, name, cursor)
+    if total is None:
+        set_validators(response, list_validators("patients", [(item.id, item.version) for item in result]))
+    set_next_cursor(response, result, page_size, "id")
+    total_count = service.count_patients(name, CountStrategy.AUTO) if total else None
+    return list_response(result, PatientResponse, response, total, total_count)
 
 # Endpoint to update an existing patient
 @router.put("/{patient_id}", response_model=PatientResponse)
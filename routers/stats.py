@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from datetime import date
+from sqlalchemy.orm import Session
+from schemas.stats import AppointmentStats, PatientRecordStats
+from services.stats_service import StatsService
+from models.database import get_db
+from models.file_database import require_sql_storage
+from utils.profiling import ProfiledRoute
+
+# Dashboard statistics read from the summary count tables the repositories maintain,
+# so each answer costs a short index read however many rows it summarises
+# They read the SQL tables, so they answer 501 with STORAGE_BACKEND=file
+router = APIRouter(
+    prefix="/stats", tags=["Statistics"], route_class=ProfiledRoute, dependencies=[Depends(require_sql_storage)]
+)
+
+# Dependency to get the StatsService instance
+def get_stats_service(db: Session = Depends(get_db)):
+    return StatsService(db)
+
+# Endpoint to count appointments of every doctor per day and status
+@router.get("/appointments", response_model=AppointmentStats)
+def get_appointment_stats(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    service: StatsService = Depends(get_stats_service)
+):
+    return service.get_appointment_stats(date_from, date_to)
+
+# Endpoint to count one doctor's appointments per day and status
+@router.get("/doctors/{doctor_id}/appointments", response_model=AppointmentStats)
+def get_doctor_appointment_stats(
+    doctor_id: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    service: StatsService = Depends(get_stats_service)
+):
+    return service.get_appointment_stats(date_from, date_to, doctor_id)
+
+# Endpoint to count a patient's medical records
+@router.get("/patients/{patient_id}/medical-records", response_model=PatientRecordStats)
+def get_patient_record_stats(patient_id: int, service: StatsService = Depends(get_stats_service)):
+    return service.get_patient_record_stats(patient_id)
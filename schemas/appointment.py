@@ -1,8 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from enum import Enum
 from .base import BaseResponse
+from utils.scheduling import DEFAULT_APPOINTMENT_MINUTES, MAX_APPOINTMENT_MINUTES
 
 #class AppointmentStatus to represent an appointment in a healthcare system
 # It includes fields for patient ID, doctor ID, date and time of the appointment, and status of the appointment.
@@ -16,6 +17,7 @@ class AppointmentBase(BaseModel):
     patient_id: int
     doctor_id: int
     date_time: datetime
+    duration_minutes: int = Field(DEFAULT_APPOINTMENT_MINUTES, ge=5, le=MAX_APPOINTMENT_MINUTES)
     status: AppointmentStatus
 
 class AppointmentCreate(AppointmentBase):
@@ -0,0 +1,36 @@
+from enum import Enum
+from typing import Dict, Union
+from datetime import datetime
+from pydantic import BaseModel
+from .appointment import AppointmentResponse
+from .doctor import DoctorResponse
+from .medical_record import MedicalRecordResponse
+from .patient import PatientResponse
+
+# class ArchivedEntity to name the entities whose soft-deleted rows are archived
+class ArchivedEntity(str, Enum):
+    PATIENTS = "patients"
+    DOCTORS = "doctors"
+    APPOINTMENTS = "appointments"
+    MEDICAL_RECORDS = "medical-records"
+
+# Archived rows are the entity's response plus the time the row was archived
+class ArchivedPatient(PatientResponse):
+    archived_at: datetime
+
+class ArchivedDoctor(DoctorResponse):
+    archived_at: datetime
+
+class ArchivedAppointment(AppointmentResponse):
+    archived_at: datetime
+
+class ArchivedMedicalRecord(MedicalRecordResponse):
+    archived_at: datetime
+
+ArchivedRow = Union[ArchivedPatient, ArchivedDoctor, ArchivedAppointment, ArchivedMedicalRecord]
+RestoredRow = Union[PatientResponse, DoctorResponse, AppointmentResponse, MedicalRecordResponse]
+
+# class ArchiveRun to report how many rows one archiver run moved from each table
+class ArchiveRun(BaseModel):
+    cutoff: datetime
+    archived: Dict[str, int]
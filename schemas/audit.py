@@ -0,0 +1,38 @@
+import json
+from enum import Enum
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, field_validator
+
+# class AuditEntity to name the kinds of rows whose changes are audited
+class AuditEntity(str, Enum):
+    PATIENT = "patient"
+    MEDICAL_RECORD = "medical_record"
+
+# class AuditAction to name the audited changes
+class AuditAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    RESTORE = "restore"
+
+# class AuditEntryResponse to represent one entry of the audit log
+# changes is the row after the change (None for deletes); the hashes let a client check the chain.
+class AuditEntryResponse(BaseModel):
+    id: int
+    patient_id: int
+    entity: AuditEntity
+    entity_id: int
+    action: AuditAction
+    changes: Optional[Dict[str, Any]] = None
+    occurred_at: datetime
+    recorded_at: datetime
+    previous_hash: str
+    hash: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("changes", mode="before")
+    @classmethod
+    def parse_changes(cls, value: Any) -> Any:
+        return json.loads(value) if isinstance(value, str) else value
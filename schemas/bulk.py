@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+# Largest batch accepted by the bulk create endpoints
+MAX_BULK_ITEMS = 1000
+
+
+# class BulkItemResult to report the outcome of one item in a bulk request
+# index is the item's position in the request; id is set when it was created.
+class BulkItemResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+# class BulkCreateResponse to summarise a bulk request
+# Valid items are inserted together in one transaction; failed items are reported and skipped.
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+    @classmethod
+    def from_results(cls, results: List[BulkItemResult]) -> "BulkCreateResponse":
+        created = sum(1 for result in results if result.status == "created")
+        return cls(created=created, failed=len(results) - created, results=results)
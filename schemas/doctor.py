@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from .base import BaseResponse
 
@@ -27,6 +27,19 @@ class DoctorUpdate(DoctorBase):
 class DoctorResponse(DoctorBase, BaseResponse):
     pass
 
+# class AvailabilitySlot to represent one free slot in a doctor's schedule
+class AvailabilitySlot(BaseModel):
+    start: datetime
+    end: datetime
+
+# class DoctorAvailability to list a doctor's free slots within a window
+class DoctorAvailability(BaseModel):
+    doctor_id: int
+    window_start: datetime
+    window_end: datetime
+    slot_minutes: int
+    slots: List[AvailabilitySlot]
+
 # class Config to configure the Pydantic model
 # It sets from_attributes to True, which allows the model to be created from attributes.
 class Config:
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+# ExportFormat lists the formats the export endpoints can stream
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
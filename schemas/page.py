@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+# Most distinct IDs one ids lookup may name
+MAX_IDS = 100
+
+
+# class Page to wrap one page of a list endpoint together with the total count
+# total_estimated is true when the total came from the count cache or the table statistics
+# rather than a count made for this request.
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    total: int
+    total_estimated: bool
+
+
+# class ByIds to answer a lookup of several IDs at once
+# items follow the order the IDs were asked in; IDs with no live row are listed in missing.
+class ByIds(BaseModel, Generic[T]):
+    items: List[T]
+    missing: List[int]
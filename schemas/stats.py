@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+from .appointment import AppointmentStatus
+
+# class DailyAppointmentCounts to represent the appointments of one day by status
+class DailyAppointmentCounts(BaseModel):
+    day: date
+    counts: Dict[AppointmentStatus, int]
+    total: int
+
+# class AppointmentStats to represent appointment counts over a date range
+# doctor_id is None when the counts cover every doctor; days without appointments are left out.
+class AppointmentStats(BaseModel):
+    doctor_id: Optional[int] = None
+    date_from: date
+    date_to: date
+    days: List[DailyAppointmentCounts]
+    counts: Dict[AppointmentStatus, int]
+    total: int
+
+# class PatientRecordStats to represent how many medical records a patient has
+class PatientRecordStats(BaseModel):
+    patient_id: int
+    medical_records: int
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Literal, Union
+from datetime import datetime
+from enum import Enum
+from typing_extensions import Annotated
+from .appointment import AppointmentStatus
+
+# class TimelineKind to tell the entries of a patient's timeline apart
+# At equal times entries are ordered by these values.
+class TimelineKind(str, Enum):
+    APPOINTMENT = "appointment"
+    MEDICAL_RECORD = "medical_record"
+
+# class AppointmentTimelineEntry to represent an appointment in a patient's timeline
+# The time of the entry is the time of the appointment.
+class AppointmentTimelineEntry(BaseModel):
+    kind: Literal[TimelineKind.APPOINTMENT] = TimelineKind.APPOINTMENT
+    id: int
+    time: datetime
+    doctor_id: int
+    duration_minutes: int
+    status: AppointmentStatus
+
+# class MedicalRecordTimelineEntry to represent a medical record in a patient's timeline
+# The time of the entry is the treatment date of the record.
+class MedicalRecordTimelineEntry(BaseModel):
+    kind: Literal[TimelineKind.MEDICAL_RECORD] = TimelineKind.MEDICAL_RECORD
+    id: int
+    time: datetime
+    diagnosis: str
+    prescriptions: str
+    doctor_notes: str
+
+# TimelineEntry is either entry type, told apart by its kind field
+TimelineEntry = Annotated[Union[AppointmentTimelineEntry, MedicalRecordTimelineEntry], Field(discriminator="kind")]
+
+# Validates the rows of the timeline query into entries of the right type
+TIMELINE_ENTRIES = TypeAdapter(List[TimelineEntry])
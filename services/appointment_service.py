@@ -1,65 +1,235 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
 from fastapi import HTTPException, Depends
 from sqlalchemy.orm import Session
-from schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentResponse, AppointmentStatus
+from schemas.appointment import AppointmentBase, AppointmentCreate, AppointmentUpdate, AppointmentResponse, AppointmentStatus
+from schemas.doctor import AvailabilitySlot, DoctorAvailability
 from repositories.appointment_repository import AppointmentRepository
 from repositories.patient_repository import PatientRepository
 from repositories.doctor_repository import DoctorRepository
 from models.database import get_db
+from models.file_database import FileSession
+from repositories.file_appointment_repository import FileAppointmentRepository
+from repositories.file_doctor_repository import FileDoctorRepository
+from repositories.file_patient_repository import FilePatientRepository
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.scheduling import MAX_APPOINTMENT_MINUTES, Interval, IntervalIndex, interval_end
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from schemas.page import ByIds
+from utils.conditional import RowVersion
+
+# Longest window the availability endpoint computes slots for
+MAX_AVAILABILITY_WINDOW = timedelta(days=31)
+
+
+# The time windows a batch of appointments books, per doctor
+def booking_windows(appointments_data: List[AppointmentCreate]) -> Dict[int, List[Tuple[datetime, datetime]]]:
+    windows: Dict[int, List[Tuple[datetime, datetime]]] = {}
+    for item in appointments_data:
+        windows.setdefault(item.doctor_id, []).append(
+            (item.date_time, interval_end(item.date_time, item.duration_minutes))
+        )
+    return windows
+
+
+# Sort a batch of appointments into errors and the indexes to insert, checking each
+# against the stored bookings and the bookings accepted earlier in the same batch
+def screen_bookings(
+    appointments_data: List[AppointmentCreate],
+    known_patients: Set[int],
+    known_doctors: Set[int],
+    stored: Dict[int, List[Interval]]
+) -> Tuple[List[BulkItemResult], List[int]]:
+    schedules = {doctor_id: IntervalIndex(intervals) for doctor_id, intervals in stored.items()}
+    results, accepted = [], []
+    for index, item in enumerate(appointments_data):
+        schedule = schedules.setdefault(item.doctor_id, IntervalIndex())
+        end = interval_end(item.date_time, item.duration_minutes)
+        blocks_time = item.status != AppointmentStatus.CANCELLED
+        if item.patient_id not in known_patients:
+            results.append(BulkItemResult(index=index, status="error", detail="Patient not found"))
+        elif item.doctor_id not in known_doctors:
+            results.append(BulkItemResult(index=index, status="error", detail="Doctor not found"))
+        elif blocks_time and schedule.find_overlap(item.date_time, end) is not None:
+            results.append(BulkItemResult(index=index, status="error", detail="Doctor is already booked at this time"))
+        else:
+            if blocks_time:
+                # Negative placeholder ids keep in-batch bookings apart from stored ones
+                schedule.add(item.date_time, end, -index - 1)
+            accepted.append(index)
+    return results, accepted
+
+
+# Reject availability windows that are empty or longer than MAX_AVAILABILITY_WINDOW
+def check_availability_window(window_start: datetime, window_end: datetime) -> None:
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="The window must end after it starts")
+    if window_end - window_start > MAX_AVAILABILITY_WINDOW:
+        raise HTTPException(status_code=400, detail="The window cannot be longer than 31 days")
+
+
+# The free slots of slot_minutes left between a doctor's booked intervals
+def doctor_availability(
+    doctor_id: int, window_start: datetime, window_end: datetime, slot_minutes: int, intervals: List[Interval]
+) -> DoctorAvailability:
+    slots = IntervalIndex(intervals).free_slots(window_start, window_end, slot_minutes)
+    return DoctorAvailability(
+        doctor_id=doctor_id,
+        window_start=window_start,
+        window_end=window_end,
+        slot_minutes=slot_minutes,
+        slots=[AvailabilitySlot(start=start, end=end) for start, end in slots],
+    )
+
 
 # AppointmentService class to handle appointment-related operations
 class AppointmentService:
     def __init__(self, db: Session = Depends(get_db)):
-        self.repository = AppointmentRepository(db)
-        self.patient_repository = PatientRepository(db)
-        self.doctor_repository = DoctorRepository(db)
+        self.db = db
+        if isinstance(db, FileSession):
+            self.repository = FileAppointmentRepository(db)
+            self.patient_repository = FilePatientRepository(db)
+            self.doctor_repository = FileDoctorRepository(db)
+        else:
+            self.repository = AppointmentRepository(db)
+            self.patient_repository = PatientRepository(db)
+            self.doctor_repository = DoctorRepository(db)
 
 # Create a new appointment
     def create_appointment(self, appointment_data: AppointmentCreate) -> AppointmentResponse:
-        if not self.patient_repository.get_by_id(appointment_data.patient_id):
-            raise HTTPException(status_code=404, detail="Patient not found")
-        if not self.doctor_repository.get_by_id(appointment_data.doctor_id):
-            raise HTTPException(status_code=404, detail="Doctor not found")
-        existing_appointment = self.repository.get_by_doctor_and_time(
-            appointment_data.doctor_id, appointment_data.date_time
-        )
-        if existing_appointment:
-            raise HTTPException(status_code=400, detail="Doctor is already booked at this time")
-        appointment = self.repository.create(appointment_data)
-        return AppointmentResponse.model_validate(appointment)
+        with UnitOfWork(self.db):
+            self._validate_booking(appointment_data)
+            appointment = self.repository.create(appointment_data)
+            return AppointmentResponse.model_validate(appointment)
+
+    # Create a batch of appointments in one transaction
+    # Patients, doctors and existing bookings are each loaded for the whole batch with
+    # one set-based query. Items that fail, or that overlap a booking accepted earlier
+    # in the same batch, are reported as errors and the rest are inserted.
+    def bulk_create_appointments(self, appointments_data: List[AppointmentCreate]) -> BulkCreateResponse:
+        with UnitOfWork(self.db):
+            known_patients = self.patient_repository.get_existing_ids(item.patient_id for item in appointments_data)
+            known_doctors = self.doctor_repository.get_existing_ids(item.doctor_id for item in appointments_data)
+            stored = self.repository.get_intervals_for_windows(booking_windows(appointments_data))
+            results, accepted = screen_bookings(appointments_data, known_patients, known_doctors, stored)
+            appointments = self.repository.bulk_create([appointments_data[index] for index in accepted])
+            results.extend(
+                BulkItemResult(index=index, status="created", id=appointment.id)
+                for index, appointment in zip(accepted, appointments)
+            )
+            results.sort(key=lambda result: result.index)
+            return BulkCreateResponse.from_results(results)
 
     # Retrieve an appointment by ID
+    @read_only
     def get_appointment(self, appointment_id: int) -> AppointmentResponse:
         appointment = self.repository.get_by_id(appointment_id)
         if not appointment:
             raise HTTPException(status_code=404, detail="Appointment not found")
         return AppointmentResponse.model_validate(appointment)
 
+    # Version of a live appointment for conditional GETs, read without loading the row
+    @read_only
+    def get_appointment_version(self, appointment_id: int) -> RowVersion:
+        version = self.repository.get_version(appointment_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        return version
+
     # Retrieve all appointments with optional filters
+    # A cursor, when given, takes precedence over the page number
+    @read_only
     def get_all_appointments(
-        self, page: int, page_size: int, status_filter: Optional[AppointmentStatus] = None
+        self,
+        page: int,
+        page_size: int,
+        status_filter: Optional[AppointmentStatus] = None,
+        cursor: Optional[str] = None
     ) -> List[AppointmentResponse]:
-        appointments = self.repository.get_all(page, page_size, status_filter)
+        after = tuple(decode_cursor(cursor, datetime, int)) if cursor else None
+        appointments = self.repository.get_all(page, page_size, status_filter, after)
         return [AppointmentResponse.model_validate(appointment) for appointment in appointments]
 
+    # (id, version) pairs of the rows get_all_appointments would return, for conditional list requests
+    @read_only
+    def get_all_appointments_versions(
+        self,
+        page: int,
+        page_size: int,
+        status_filter: Optional[AppointmentStatus] = None,
+        cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after = tuple(decode_cursor(cursor, datetime, int)) if cursor else None
+        return self.repository.get_all_versions(page, page_size, status_filter, after)
+
+    # Look up several appointments by ID in the order asked, listing the IDs not found
+    @read_only
+    def get_appointments_by_ids(self, ids: List[int]) -> ByIds[AppointmentResponse]:
+        appointments = self.repository.get_many(ids)
+        return ByIds[AppointmentResponse](
+            items=[AppointmentResponse.model_validate(appointments[id]) for id in ids if id in appointments],
+            missing=[id for id in ids if id not in appointments],
+        )
+
+    # Count appointments under the list filter with the endpoint's counting strategy
+    @read_only
+    def count_appointments(self, status_filter: Optional[AppointmentStatus], strategy: CountStrategy) -> TotalCount:
+        return self.repository.count(status_filter, strategy)
+
 # Update an existing appointment
     def update_appointment(self, appointment_id: int, appointment_data: AppointmentUpdate) -> AppointmentResponse:
-        if appointment_data.patient_id and not self.patient_repository.get_by_id(appointment_data.patient_id):
-            raise HTTPException(status_code=404, detail="Patient not found")
-        if appointment_data.doctor_id and not self.doctor_repository.get_by_id(appointment_data.doctor_id):
-            raise HTTPException(status_code=404, detail="Doctor not found")
-        if appointment_data.date_time and appointment_data.doctor_id:
-            existing_appointment = self.repository.get_by_doctor_and_time(
-                appointment_data.doctor_id, appointment_data.date_time
-            )
-            if existing_appointment and existing_appointment.id != appointment_id:
-                raise HTTPException(status_code=400, detail="Doctor is already booked at this time")
-        appointment = self.repository.update(appointment_id, appointment_data)
-        if not appointment:
-            raise HTTPException(status_code=404, detail="Appointment not found")
-        return AppointmentResponse.model_validate(appointment)
+        with UnitOfWork(self.db):
+            self._validate_booking(appointment_data, appointment_id)
+            appointment = self.repository.update(appointment_id, appointment_data)
+            if not appointment:
+                raise HTTPException(status_code=404, detail="Appointment not found")
+            return AppointmentResponse.model_validate(appointment)
 
 # Delete an appointment
     def delete_appointment(self, appointment_id: int) -> None:
-        if not self.repository.delete(appointment_id):
-            raise HTTPException(status_code=404, detail="Appointment not found")
\ No newline at end of file
+        with UnitOfWork(self.db):
+            if not self.repository.delete(appointment_id):
+                raise HTTPException(status_code=404, detail="Appointment not found")
+
+    # Get a doctor's free slots of slot_minutes between window_start and window_end
+    @read_only
+    def get_doctor_availability(
+        self, doctor_id: int, window_start: datetime, window_end: datetime, slot_minutes: int
+    ) -> DoctorAvailability:
+        if not self.doctor_repository.get_by_id(doctor_id):
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        check_availability_window(window_start, window_end)
+        intervals = self.repository.get_doctor_intervals(doctor_id, window_start, window_end)
+        return doctor_availability(doctor_id, window_start, window_end, slot_minutes, intervals)
+
+    # Validate a new or changed booking with one query, raising the matching 404 or 400
+    # Cancelled appointments neither block nor are blocked by other bookings. When an update
+    # omits duration_minutes the stored duration applies, so the window is widened to the
+    # longest allowed appointment and the exact end is computed once it is known.
+    def _validate_booking(self, appointment_data: AppointmentBase, current_id: Optional[int] = None) -> None:
+        start = appointment_data.date_time
+        keep_duration = current_id is not None and "duration_minutes" not in appointment_data.model_fields_set
+        window = None
+        if appointment_data.status != AppointmentStatus.CANCELLED:
+            minutes = MAX_APPOINTMENT_MINUTES if keep_duration else appointment_data.duration_minutes
+            window = (start, interval_end(start, minutes))
+        check = self.repository.check_booking(
+            appointment_data.patient_id, appointment_data.doctor_id, window, current_id
+        )
+        if check is None:
+            # Unknown doctor; the patient is looked up separately only on this error path
+            if not self.patient_repository.get_by_id(appointment_data.patient_id):
+                raise HTTPException(status_code=404, detail="Patient not found")
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        if not check.patient_found:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        if current_id is not None and check.current_duration is None:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        if window is None:
+            return
+        duration = check.current_duration if keep_duration else appointment_data.duration_minutes
+        if IntervalIndex(check.intervals).find_overlap(start, interval_end(start, duration), current_id) is not None:
+            raise HTTPException(status_code=400, detail="Doctor is already booked at this time")
\ No newline at end of file
@@ -0,0 +1,138 @@
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from models.appointment import Appointment
+from models.archive import ARCHIVE_MODELS
+from models.doctor import Doctor
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+from schemas.appointment import AppointmentResponse, AppointmentStatus
+from schemas.archive import (
+    ArchiveRun, ArchivedAppointment, ArchivedDoctor, ArchivedEntity, ArchivedMedicalRecord, ArchivedPatient,
+    ArchivedRow, RestoredRow,
+)
+from schemas.doctor import DoctorResponse
+from schemas.medical_record import MedicalRecordResponse
+from schemas.patient import PatientResponse
+from repositories.appointment_repository import AppointmentRepository, BookingCheck
+from repositories.archive_repository import ArchiveRepository
+from repositories.patient_repository import PatientRepository
+from utils.scheduling import IntervalIndex, interval_end
+from utils.unit_of_work import UnitOfWork
+from utils.audit_log import record_change
+from schemas.audit import AuditAction, AuditEntity
+
+# The archiver moves rows soft-deleted longer than the retention window in batches,
+# each in its own short transaction, pausing between batches so live traffic keeps
+# the database.
+#   ARCHIVE_RETENTION_DAYS  how long soft-deleted rows stay in the live tables (default 90)
+#   ARCHIVE_BATCH_SIZE      rows moved per transaction (default 500)
+#   ARCHIVE_PAUSE_MS        pause between batches (default 200)
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_PAUSE = float(os.getenv("ARCHIVE_PAUSE_MS", "200")) / 1000
+
+# Per entity: the live model, the archived and restored response models and its name in errors
+ENTITY_TYPES = {
+    ArchivedEntity.PATIENTS: (Patient, ArchivedPatient, PatientResponse, "Patient"),
+    ArchivedEntity.DOCTORS: (Doctor, ArchivedDoctor, DoctorResponse, "Doctor"),
+    ArchivedEntity.APPOINTMENTS: (Appointment, ArchivedAppointment, AppointmentResponse, "Appointment"),
+    ArchivedEntity.MEDICAL_RECORDS: (MedicalRecord, ArchivedMedicalRecord, MedicalRecordResponse, "Medical record"),
+}
+
+
+# The time an archived appointment would book again, or None for a cancelled one
+def restore_window(row: Any) -> Optional[Tuple[datetime, datetime]]:
+    if row.status == AppointmentStatus.CANCELLED:
+        return None
+    return (row.date_time, interval_end(row.date_time, row.duration_minutes))
+
+
+# Refuse to restore an appointment whose patient or doctor is gone, or that overlaps a
+# current booking, from the booking check read for restore_window
+def check_restored_booking(row: Any, window: Optional[Tuple[datetime, datetime]], check: Optional[BookingCheck]) -> None:
+    if check is None:
+        raise HTTPException(status_code=409, detail="Doctor of the appointment is not live")
+    if not check.patient_found:
+        raise HTTPException(status_code=409, detail="Patient of the appointment is not live")
+    if window is not None and IntervalIndex(check.intervals).find_overlap(*window) is not None:
+        raise HTTPException(status_code=400, detail="Doctor is already booked at this time")
+
+
+# Stage the audit entry of a restored patient or medical record; like creates, the entry
+# holds the row as it is live again. Doctors and appointments are not audited.
+def record_restore(db: Session, model: Type, restored: RestoredRow) -> None:
+    if model is Patient:
+        record_change(db, restored.id, AuditEntity.PATIENT, restored.id, AuditAction.RESTORE, restored)
+    elif model is MedicalRecord:
+        record_change(db, restored.patient_id, AuditEntity.MEDICAL_RECORD, restored.id, AuditAction.RESTORE, restored)
+
+
+# ArchiveService class to run the archiver and to look up and restore archived rows
+class ArchiveService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = ArchiveRepository(db)
+        self.patient_repository = PatientRepository(db)
+        self.appointment_repository = AppointmentRepository(db)
+
+    # Archive every row soft-deleted before the retention window, batch by batch.
+    # max_batches bounds one run; the next run carries on where it stopped.
+    def archive_deleted(
+        self,
+        retention: timedelta = timedelta(days=ARCHIVE_RETENTION_DAYS),
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        pause: float = ARCHIVE_PAUSE,
+        max_batches: Optional[int] = None,
+        report: Callable[[str], None] = lambda message: None
+    ) -> ArchiveRun:
+        cutoff = datetime.now() - retention
+        archived: Dict[str, int] = {}
+        batches = 0
+        for model in ARCHIVE_MODELS:
+            archived[model.__tablename__] = 0
+            while max_batches is None or batches < max_batches:
+                with UnitOfWork(self.db):
+                    ids = self.repository.expired_ids(model, cutoff, batch_size)
+                    moved = self.repository.archive(model, ids) if ids else 0
+                archived[model.__tablename__] += moved
+                if len(ids) < batch_size:
+                    break
+                batches += 1
+                report(f"Archived {archived[model.__tablename__]} {model.__tablename__}")
+                time.sleep(pause)
+        return ArchiveRun(cutoff=cutoff, archived=archived)
+
+    # Retrieve an archived row by ID
+    def get_archived(self, entity: ArchivedEntity, id: int) -> ArchivedRow:
+        model, archived_type, _, name = ENTITY_TYPES[entity]
+        row = self.repository.get(model, id)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Archived {name.lower()} not found")
+        return archived_type.model_validate(row)
+
+    # Move an archived row back into the live table as a live row.
+    # Appointments and medical records need their patient (and doctor) to be live, and a
+    # restored appointment must not overlap the doctor's current bookings. Restored patients
+    # and medical records get a "restore" entry in the audit log.
+    def restore(self, entity: ArchivedEntity, id: int) -> RestoredRow:
+        model, _, response_type, name = ENTITY_TYPES[entity]
+        with UnitOfWork(self.db):
+            row = self.repository.get(model, id)
+            if row is None:
+                raise HTTPException(status_code=404, detail=f"Archived {name.lower()} not found")
+            if model is Appointment:
+                self._check_booking(row)
+            elif model is MedicalRecord and not self.patient_repository.get_by_id(row.patient_id):
+                raise HTTPException(status_code=409, detail="Patient of the medical record is not live")
+            restored = response_type.model_validate(self.repository.restore(model, id))
+            record_restore(self.db, model, restored)
+            return restored
+
+    def _check_booking(self, row: Any) -> None:
+        window = restore_window(row)
+        check = self.appointment_repository.check_booking(row.patient_id, row.doctor_id, window)
+        check_restored_booking(row, window, check)
@@ -0,0 +1,145 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.appointment import AppointmentBase, AppointmentCreate, AppointmentUpdate, AppointmentResponse, AppointmentStatus
+from repositories.async_appointment_repository import AsyncAppointmentRepository
+from repositories.async_patient_repository import AsyncPatientRepository
+from repositories.async_doctor_repository import AsyncDoctorRepository
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from schemas.doctor import DoctorAvailability
+from services.appointment_service import booking_windows, check_availability_window, doctor_availability, screen_bookings
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.scheduling import MAX_APPOINTMENT_MINUTES, IntervalIndex, interval_end
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from schemas.page import ByIds
+from utils.conditional import RowVersion
+
+
+# AsyncAppointmentService class mirrors AppointmentService for the async database stack
+class AsyncAppointmentService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncAppointmentRepository(db)
+        self.patient_repository = AsyncPatientRepository(db)
+        self.doctor_repository = AsyncDoctorRepository(db)
+
+    async def create_appointment(self, appointment_data: AppointmentCreate) -> AppointmentResponse:
+        async with UnitOfWork(self.db):
+            await self._validate_booking(appointment_data)
+            appointment = await self.repository.create(appointment_data)
+            return AppointmentResponse.model_validate(appointment)
+
+    async def bulk_create_appointments(self, appointments_data: List[AppointmentCreate]) -> BulkCreateResponse:
+        async with UnitOfWork(self.db):
+            known_patients = await self.patient_repository.get_existing_ids(item.patient_id for item in appointments_data)
+            known_doctors = await self.doctor_repository.get_existing_ids(item.doctor_id for item in appointments_data)
+            stored = await self.repository.get_intervals_for_windows(booking_windows(appointments_data))
+            results, accepted = screen_bookings(appointments_data, known_patients, known_doctors, stored)
+            appointments = await self.repository.bulk_create([appointments_data[index] for index in accepted])
+            results.extend(
+                BulkItemResult(index=index, status="created", id=appointment.id)
+                for index, appointment in zip(accepted, appointments)
+            )
+            results.sort(key=lambda result: result.index)
+            return BulkCreateResponse.from_results(results)
+
+    @read_only
+    async def get_appointment(self, appointment_id: int) -> AppointmentResponse:
+        appointment = await self.repository.get_by_id(appointment_id)
+        if not appointment:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        return AppointmentResponse.model_validate(appointment)
+
+    @read_only
+    async def get_appointment_version(self, appointment_id: int) -> RowVersion:
+        version = await self.repository.get_version(appointment_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        return version
+
+    @read_only
+    async def get_all_appointments(
+        self,
+        page: int,
+        page_size: int,
+        status_filter: Optional[AppointmentStatus] = None,
+        cursor: Optional[str] = None
+    ) -> List[AppointmentResponse]:
+        after = tuple(decode_cursor(cursor, datetime, int)) if cursor else None
+        appointments = await self.repository.get_all(page, page_size, status_filter, after)
+        return [AppointmentResponse.model_validate(appointment) for appointment in appointments]
+
+    @read_only
+    async def get_all_appointments_versions(
+        self,
+        page: int,
+        page_size: int,
+        status_filter: Optional[AppointmentStatus] = None,
+        cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after = tuple(decode_cursor(cursor, datetime, int)) if cursor else None
+        return await self.repository.get_all_versions(page, page_size, status_filter, after)
+
+    @read_only
+    async def get_appointments_by_ids(self, ids: List[int]) -> ByIds[AppointmentResponse]:
+        appointments = await self.repository.get_many(ids)
+        return ByIds[AppointmentResponse](
+            items=[AppointmentResponse.model_validate(appointments[id]) for id in ids if id in appointments],
+            missing=[id for id in ids if id not in appointments],
+        )
+
+    @read_only
+    async def count_appointments(self, status_filter: Optional[AppointmentStatus], strategy: CountStrategy) -> TotalCount:
+        return await self.repository.count(status_filter, strategy)
+
+    async def update_appointment(self, appointment_id: int, appointment_data: AppointmentUpdate) -> AppointmentResponse:
+        async with UnitOfWork(self.db):
+            await self._validate_booking(appointment_data, appointment_id)
+            appointment = await self.repository.update(appointment_id, appointment_data)
+            if not appointment:
+                raise HTTPException(status_code=404, detail="Appointment not found")
+            return AppointmentResponse.model_validate(appointment)
+
+    async def delete_appointment(self, appointment_id: int) -> None:
+        async with UnitOfWork(self.db):
+            if not await self.repository.delete(appointment_id):
+                raise HTTPException(status_code=404, detail="Appointment not found")
+
+    @read_only
+    async def get_doctor_availability(
+        self, doctor_id: int, window_start: datetime, window_end: datetime, slot_minutes: int
+    ) -> DoctorAvailability:
+        if not await self.doctor_repository.get_by_id(doctor_id):
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        check_availability_window(window_start, window_end)
+        intervals = await self.repository.get_doctor_intervals(doctor_id, window_start, window_end)
+        return doctor_availability(doctor_id, window_start, window_end, slot_minutes, intervals)
+
+    # Same single-query validation as AppointmentService._validate_booking
+    async def _validate_booking(self, appointment_data: AppointmentBase, current_id: Optional[int] = None) -> None:
+        start = appointment_data.date_time
+        keep_duration = current_id is not None and "duration_minutes" not in appointment_data.model_fields_set
+        window = None
+        if appointment_data.status != AppointmentStatus.CANCELLED:
+            minutes = MAX_APPOINTMENT_MINUTES if keep_duration else appointment_data.duration_minutes
+            window = (start, interval_end(start, minutes))
+        check = await self.repository.check_booking(
+            appointment_data.patient_id, appointment_data.doctor_id, window, current_id
+        )
+        if check is None:
+            # Unknown doctor; the patient is looked up separately only on this error path
+            if not await self.patient_repository.get_by_id(appointment_data.patient_id):
+                raise HTTPException(status_code=404, detail="Patient not found")
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        if not check.patient_found:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        if current_id is not None and check.current_duration is None:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        if window is None:
+            return
+        duration = check.current_duration if keep_duration else appointment_data.duration_minutes
+        if IntervalIndex(check.intervals).find_overlap(start, interval_end(start, duration), current_id) is not None:
+            raise HTTPException(status_code=400, detail="Doctor is already booked at this time")
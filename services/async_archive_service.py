@@ -0,0 +1,47 @@
+from typing import Any
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.appointment import Appointment
+from models.medical_record import MedicalRecord
+from schemas.archive import ArchivedEntity, ArchivedRow, RestoredRow
+from repositories.async_appointment_repository import AsyncAppointmentRepository
+from repositories.async_archive_repository import AsyncArchiveRepository
+from repositories.async_patient_repository import AsyncPatientRepository
+from services.archive_service import ENTITY_TYPES, check_restored_booking, record_restore, restore_window
+from utils.unit_of_work import UnitOfWork
+
+
+# AsyncArchiveService class mirrors the lookup and restore of ArchiveService for the
+# async database stack; the archiver itself runs from manage.py on the sync stack
+class AsyncArchiveService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncArchiveRepository(db)
+        self.patient_repository = AsyncPatientRepository(db)
+        self.appointment_repository = AsyncAppointmentRepository(db)
+
+    async def get_archived(self, entity: ArchivedEntity, id: int) -> ArchivedRow:
+        model, archived_type, _, name = ENTITY_TYPES[entity]
+        row = await self.repository.get(model, id)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Archived {name.lower()} not found")
+        return archived_type.model_validate(row)
+
+    async def restore(self, entity: ArchivedEntity, id: int) -> RestoredRow:
+        model, _, response_type, name = ENTITY_TYPES[entity]
+        async with UnitOfWork(self.db):
+            row = await self.repository.get(model, id)
+            if row is None:
+                raise HTTPException(status_code=404, detail=f"Archived {name.lower()} not found")
+            if model is Appointment:
+                await self._check_booking(row)
+            elif model is MedicalRecord and not await self.patient_repository.get_by_id(row.patient_id):
+                raise HTTPException(status_code=409, detail="Patient of the medical record is not live")
+            restored = response_type.model_validate(await self.repository.restore(model, id))
+            record_restore(self.db.sync_session, model, restored)
+            return restored
+
+    async def _check_booking(self, row: Any) -> None:
+        window = restore_window(row)
+        check = await self.appointment_repository.check_booking(row.patient_id, row.doctor_id, window)
+        check_restored_booking(row, window, check)
@@ -0,0 +1,85 @@
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse
+from repositories.async_doctor_repository import AsyncDoctorRepository
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from schemas.page import ByIds
+from utils.conditional import RowVersion
+
+
+# AsyncDoctorService class mirrors DoctorService for the async database stack
+class AsyncDoctorService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncDoctorRepository(db)
+
+    async def create_doctor(self, doctor_data: DoctorCreate) -> DoctorResponse:
+        async with UnitOfWork(self.db):
+            doctor = await self.repository.create(doctor_data)
+            return DoctorResponse.model_validate(doctor)
+
+    async def bulk_create_doctors(self, doctors_data: List[DoctorCreate]) -> BulkCreateResponse:
+        async with UnitOfWork(self.db):
+            doctors = await self.repository.bulk_create(doctors_data)
+            return BulkCreateResponse.from_results([
+                BulkItemResult(index=index, status="created", id=doctor.id)
+                for index, doctor in enumerate(doctors)
+            ])
+
+    @read_only
+    async def get_doctor(self, doctor_id: int) -> DoctorResponse:
+        doctor = await self.repository.get_by_id(doctor_id)
+        if not doctor:
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        return DoctorResponse.model_validate(doctor)
+
+    @read_only
+    async def get_doctor_version(self, doctor_id: int) -> RowVersion:
+        version = await self.repository.get_version(doctor_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        return version
+
+    @read_only
+    async def get_all_doctors(
+        self, page: int, page_size: int, specialty_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[DoctorResponse]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        doctors = await self.repository.get_all(page, page_size, specialty_filter, after_id)
+        return [DoctorResponse.model_validate(doctor) for doctor in doctors]
+
+    @read_only
+    async def get_all_doctors_versions(
+        self, page: int, page_size: int, specialty_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        return await self.repository.get_all_versions(page, page_size, specialty_filter, after_id)
+
+    @read_only
+    async def get_doctors_by_ids(self, ids: List[int]) -> ByIds[DoctorResponse]:
+        doctors = await self.repository.get_many(ids)
+        return ByIds[DoctorResponse](
+            items=[DoctorResponse.model_validate(doctors[id]) for id in ids if id in doctors],
+            missing=[id for id in ids if id not in doctors],
+        )
+
+    @read_only
+    async def count_doctors(self, specialty_filter: Optional[str], strategy: CountStrategy) -> TotalCount:
+        return await self.repository.count(specialty_filter, strategy)
+
+    async def update_doctor(self, doctor_id: int, doctor_data: DoctorUpdate) -> DoctorResponse:
+        async with UnitOfWork(self.db):
+            doctor = await self.repository.update(doctor_id, doctor_data)
+            if not doctor:
+                raise HTTPException(status_code=404, detail="Doctor not found")
+            return DoctorResponse.model_validate(doctor)
+
+    async def delete_doctor(self, doctor_id: int) -> None:
+        async with UnitOfWork(self.db):
+            if not await self.repository.delete(doctor_id):
+                raise HTTPException(status_code=404, detail="Doctor not found")
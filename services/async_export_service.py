@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.async_database import async_session
+from models.appointment import Appointment
+from models.medical_record import MedicalRecord
+from repositories.async_appointment_repository import AsyncAppointmentRepository
+from repositories.async_medical_record_repository import AsyncMedicalRecordRepository
+from schemas.appointment import AppointmentStatus
+from schemas.export import ExportFormat
+from services.export_service import ExportChunks
+
+
+# AsyncExportService class mirrors ExportService for the async database stack.
+# Rows come from a server-side cursor on the event loop instead of a worker thread.
+class AsyncExportService:
+    def __init__(self, session_factory: Callable[[], AsyncSession] = async_session):
+        self.session_factory = session_factory
+
+    def export_medical_records(
+        self,
+        export_format: ExportFormat,
+        patient_id: Optional[int] = None,
+        treatment_from: Optional[datetime] = None,
+        treatment_to: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        columns = [column.name for column in MedicalRecord.__table__.columns]
+        return self._stream(
+            export_format,
+            columns,
+            lambda db: AsyncMedicalRecordRepository(db).stream(patient_id, treatment_from, treatment_to),
+        )
+
+    def export_appointments(
+        self,
+        export_format: ExportFormat,
+        status_filter: Optional[AppointmentStatus] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        columns = [column.name for column in Appointment.__table__.columns]
+        return self._stream(
+            export_format,
+            columns,
+            lambda db: AsyncAppointmentRepository(db).stream(status_filter, date_from, date_to),
+        )
+
+    async def _stream(self, export_format: ExportFormat, columns: List[str], fetch) -> AsyncIterator[bytes]:
+        async with self.session_factory() as db:
+            chunks = ExportChunks(export_format, columns)
+            async for row in await fetch(db):
+                chunk = chunks.add(row)
+                if chunk is not None:
+                    yield chunk
+            rest = chunks.rest()
+            if rest is not None:
+                yield rest
@@ -0,0 +1,114 @@
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate, MedicalRecordResponse
+from repositories.async_medical_record_repository import AsyncMedicalRecordRepository
+from repositories.async_patient_repository import AsyncPatientRepository
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from utils.audit_log import record_change
+from schemas.audit import AuditAction, AuditEntity
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from schemas.page import ByIds
+from utils.conditional import RowVersion
+
+
+# AsyncMedicalRecordService class mirrors MedicalRecordService for the async database stack
+class AsyncMedicalRecordService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncMedicalRecordRepository(db)
+        self.patient_repository = AsyncPatientRepository(db)
+
+    async def create_medical_record(self, record_data: MedicalRecordCreate) -> MedicalRecordResponse:
+        async with UnitOfWork(self.db):
+            record = await self.repository.create(record_data)
+            if not record:
+                raise HTTPException(status_code=404, detail="Patient not found")
+            record = MedicalRecordResponse.model_validate(record)
+            record_change(self.db.sync_session, record.patient_id, AuditEntity.MEDICAL_RECORD, record.id, AuditAction.CREATE, record)
+            return record
+
+    async def bulk_create_medical_records(self, records_data: List[MedicalRecordCreate]) -> BulkCreateResponse:
+        async with UnitOfWork(self.db):
+            known_patients = await self.patient_repository.get_existing_ids(item.patient_id for item in records_data)
+            results, accepted = [], []
+            for index, item in enumerate(records_data):
+                if item.patient_id not in known_patients:
+                    results.append(BulkItemResult(index=index, status="error", detail="Patient not found"))
+                else:
+                    accepted.append(index)
+            records = await self.repository.bulk_create([records_data[index] for index in accepted])
+            for record in records:
+                record_change(
+                    self.db.sync_session, record.patient_id, AuditEntity.MEDICAL_RECORD, record.id, AuditAction.CREATE,
+                    MedicalRecordResponse.model_validate(record),
+                )
+            results.extend(
+                BulkItemResult(index=index, status="created", id=record.id)
+                for index, record in zip(accepted, records)
+            )
+            results.sort(key=lambda result: result.index)
+            return BulkCreateResponse.from_results(results)
+
+    @read_only
+    async def get_medical_record(self, record_id: int) -> MedicalRecordResponse:
+        record = await self.repository.get_by_id(record_id)
+        if not record:
+            raise HTTPException(status_code=404, detail="Medical record not found")
+        return MedicalRecordResponse.model_validate(record)
+
+    @read_only
+    async def get_medical_record_version(self, record_id: int) -> RowVersion:
+        version = await self.repository.get_version(record_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Medical record not found")
+        return version
+
+    @read_only
+    async def get_all_medical_records(
+        self, page: int, page_size: int, patient_id: Optional[int] = None, cursor: Optional[str] = None
+    ) -> List[MedicalRecordResponse]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        records = await self.repository.get_all(page, page_size, patient_id, after_id)
+        return [MedicalRecordResponse.model_validate(record) for record in records]
+
+    @read_only
+    async def get_all_medical_records_versions(
+        self, page: int, page_size: int, patient_id: Optional[int] = None, cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        return await self.repository.get_all_versions(page, page_size, patient_id, after_id)
+
+    @read_only
+    async def get_medical_records_by_ids(self, ids: List[int]) -> ByIds[MedicalRecordResponse]:
+        records = await self.repository.get_many(ids)
+        return ByIds[MedicalRecordResponse](
+            items=[MedicalRecordResponse.model_validate(records[id]) for id in ids if id in records],
+            missing=[id for id in ids if id not in records],
+        )
+
+    @read_only
+    async def count_medical_records(self, patient_id: Optional[int], strategy: CountStrategy) -> TotalCount:
+        return await self.repository.count(patient_id, strategy)
+
+    async def update_medical_record(self, record_id: int, record_data: MedicalRecordUpdate) -> MedicalRecordResponse:
+        async with UnitOfWork(self.db):
+            record = await self.repository.update(record_id, record_data)
+            if not record:
+                # The update is guarded by the patient; work out which lookup failed
+                if record_data.patient_id and not await self.patient_repository.get_by_id(record_data.patient_id):
+                    raise HTTPException(status_code=404, detail="Patient not found")
+                raise HTTPException(status_code=404, detail="Medical record not found")
+            record = MedicalRecordResponse.model_validate(record)
+            record_change(self.db.sync_session, record.patient_id, AuditEntity.MEDICAL_RECORD, record_id, AuditAction.UPDATE, record)
+            return record
+
+    async def delete_medical_record(self, record_id: int) -> None:
+        async with UnitOfWork(self.db):
+            patient_id = await self.repository.delete(record_id)
+            if patient_id is None:
+                raise HTTPException(status_code=404, detail="Medical record not found")
+            record_change(self.db.sync_session, patient_id, AuditEntity.MEDICAL_RECORD, record_id, AuditAction.DELETE)
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.patient import PatientCreate, PatientUpdate, PatientResponse
+from repositories.async_patient_repository import AsyncPatientRepository
+from schemas.timeline import TIMELINE_ENTRIES, TimelineEntry, TimelineKind
+from repositories.patient_timeline_repository import TimelineCursor
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from utils.audit_log import audit_writer, record_change
+from schemas.audit import AuditAction, AuditEntity, AuditEntryResponse
+from repositories.async_audit_repository import AsyncAuditRepository
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from schemas.page import ByIds
+from utils.conditional import RowVersion
+
+
+# AsyncPatientService class mirrors PatientService for the async database stack
+class AsyncPatientService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncPatientRepository(db)
+        self.audit_repository = AsyncAuditRepository(db)
+
+    async def create_patient(self, patient_data: PatientCreate) -> PatientResponse:
+        async with UnitOfWork(self.db):
+            patient = PatientResponse.model_validate(await self.repository.create(patient_data))
+            record_change(self.db.sync_session, patient.id, AuditEntity.PATIENT, patient.id, AuditAction.CREATE, patient)
+            return patient
+
+    async def bulk_create_patients(self, patients_data: List[PatientCreate]) -> BulkCreateResponse:
+        async with UnitOfWork(self.db):
+            patients = await self.repository.bulk_create(patients_data)
+            for patient in patients:
+                record_change(
+                    self.db.sync_session, patient.id, AuditEntity.PATIENT, patient.id, AuditAction.CREATE,
+                    PatientResponse.model_validate(patient),
+                )
+            return BulkCreateResponse.from_results([
+                BulkItemResult(index=index, status="created", id=patient.id)
+                for index, patient in enumerate(patients)
+            ])
+
+    @read_only
+    async def get_patient(self, patient_id: int) -> PatientResponse:
+        patient = await self.repository.get_by_id(patient_id)
+        if not patient:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return PatientResponse.model_validate(patient)
+
+    @read_only
+    async def get_patient_version(self, patient_id: int) -> RowVersion:
+        version = await self.repository.get_version(patient_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return version
+
+    @read_only
+    async def get_all_patients(
+        self, page: int, page_size: int, name_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[PatientResponse]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        patients = await self.repository.get_all(page, page_size, name_filter, after_id)
+        return [PatientResponse.model_validate(patient) for patient in patients]
+
+    @read_only
+    async def get_all_patients_versions(
+        self, page: int, page_size: int, name_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        return await self.repository.get_all_versions(page, page_size, name_filter, after_id)
+
+    @read_only
+    async def get_patients_by_ids(self, ids: List[int]) -> ByIds[PatientResponse]:
+        patients = await self.repository.get_many(ids)
+        return ByIds[PatientResponse](
+            items=[PatientResponse.model_validate(patients[id]) for id in ids if id in patients],
+            missing=[id for id in ids if id not in patients],
+        )
+
+    @read_only
+    async def count_patients(self, name_filter: Optional[str], strategy: CountStrategy) -> TotalCount:
+        return await self.repository.count(name_filter, strategy)
+
+    @read_only
+    async def get_patient_timeline(
+        self, patient_id: int, page_size: int, cursor: Optional[str] = None
+    ) -> List[TimelineEntry]:
+        after = TimelineCursor(*decode_cursor(cursor, datetime, TimelineKind, int)) if cursor else None
+        if not await self.repository.get_by_id(patient_id):
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return TIMELINE_ENTRIES.validate_python(await self.repository.get_timeline(patient_id, page_size, after))
+
+    # The queued records are written on a worker thread so the event loop keeps serving.
+    # Like the sync service, this only waits for this process's writer.
+    async def get_patient_audit(
+        self, patient_id: int, page_size: int, cursor: Optional[str] = None
+    ) -> List[AuditEntryResponse]:
+        before_id = decode_cursor(cursor, int)[0] if cursor else None
+        await asyncio.to_thread(audit_writer.flush)
+        entries = await self.audit_repository.get_for_patient(patient_id, page_size, before_id)
+        return [AuditEntryResponse.model_validate(entry) for entry in entries]
+
+    @read_only
+    async def search_patients(self, query: str, limit: int) -> List[PatientResponse]:
+        matches = await self.repository.search(query, limit)
+        return [PatientResponse.model_validate(patient) for patient, _ in matches]
+
+    async def update_patient(self, patient_id: int, patient_data: PatientUpdate) -> PatientResponse:
+        async with UnitOfWork(self.db):
+            patient = await self.repository.update(patient_id, patient_data)
+            if not patient:
+                raise HTTPException(status_code=404, detail="Patient not found")
+            patient = PatientResponse.model_validate(patient)
+            record_change(self.db.sync_session, patient_id, AuditEntity.PATIENT, patient_id, AuditAction.UPDATE, patient)
+            return patient
+
+    async def delete_patient(self, patient_id: int) -> None:
+        async with UnitOfWork(self.db):
+            if not await self.repository.delete(patient_id):
+                raise HTTPException(status_code=404, detail="Patient not found")
+            record_change(self.db.sync_session, patient_id, AuditEntity.PATIENT, patient_id, AuditAction.DELETE)
@@ -0,0 +1,37 @@
+from datetime import date
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.stats import AppointmentStats, PatientRecordStats
+from repositories.async_stats_repository import AsyncStatsRepository
+from repositories.async_doctor_repository import AsyncDoctorRepository
+from repositories.async_patient_repository import AsyncPatientRepository
+from services.stats_service import appointment_stats, check_stats_range
+from utils.replicas import read_only
+
+
+# AsyncStatsService class mirrors the reads of StatsService for the async database stack
+class AsyncStatsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = AsyncStatsRepository(db)
+        self.patient_repository = AsyncPatientRepository(db)
+        self.doctor_repository = AsyncDoctorRepository(db)
+
+    @read_only
+    async def get_appointment_stats(
+        self, date_from: date, date_to: date, doctor_id: Optional[int] = None
+    ) -> AppointmentStats:
+        check_stats_range(date_from, date_to)
+        if doctor_id is not None and not await self.doctor_repository.get_by_id(doctor_id):
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        rows = await self.repository.get_appointment_counts(date_from, date_to, doctor_id)
+        return appointment_stats(date_from, date_to, doctor_id, rows)
+
+    @read_only
+    async def get_patient_record_stats(self, patient_id: int) -> PatientRecordStats:
+        if not await self.patient_repository.get_by_id(patient_id):
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return PatientRecordStats(
+            patient_id=patient_id, medical_records=await self.repository.get_patient_record_count(patient_id)
+        )
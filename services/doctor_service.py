@@ -1,38 +1,96 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, Depends
 from sqlalchemy.orm import Session
 from schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse
 from repositories.doctor_repository import DoctorRepository
 from models.database import get_db
+from models.file_database import FileSession
+from repositories.file_doctor_repository import FileDoctorRepository
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from schemas.page import ByIds
+from utils.conditional import RowVersion
 
 # DoctorService class to handle doctor-related operations
 class DoctorService:
     def __init__(self, db: Session = Depends(get_db)):
-        self.repository = DoctorRepository(db)
+        self.db = db
+        self.repository = FileDoctorRepository(db) if isinstance(db, FileSession) else DoctorRepository(db)
 
     def create_doctor(self, doctor_data: DoctorCreate) -> DoctorResponse:
-        doctor = self.repository.create(doctor_data)
-        return DoctorResponse.model_validate(doctor)
+        with UnitOfWork(self.db):
+            doctor = self.repository.create(doctor_data)
+            return DoctorResponse.model_validate(doctor)
+
+    # Create a batch of doctors in one transaction
+    def bulk_create_doctors(self, doctors_data: List[DoctorCreate]) -> BulkCreateResponse:
+        with UnitOfWork(self.db):
+            doctors = self.repository.bulk_create(doctors_data)
+            return BulkCreateResponse.from_results([
+                BulkItemResult(index=index, status="created", id=doctor.id)
+                for index, doctor in enumerate(doctors)
+            ])
 
+    @read_only
     def get_doctor(self, doctor_id: int) -> DoctorResponse:
         doctor = self.repository.get_by_id(doctor_id)
         if not doctor:
             raise HTTPException(status_code=404, detail="Doctor not found")
         return DoctorResponse.model_validate(doctor)
 
+    # Version of a live doctor for conditional GETs, read without loading the row
+    @read_only
+    def get_doctor_version(self, doctor_id: int) -> RowVersion:
+        version = self.repository.get_version(doctor_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        return version
+
 # Retrieve all doctors with optional filters
-    def get_all_doctors(self, page: int, page_size: int, specialty_filter: Optional[str] = None) -> List[DoctorResponse]:
-        doctors = self.repository.get_all(page, page_size, specialty_filter)
+    # A cursor, when given, takes precedence over the page number
+    @read_only
+    def get_all_doctors(
+        self, page: int, page_size: int, specialty_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[DoctorResponse]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        doctors = self.repository.get_all(page, page_size, specialty_filter, after_id)
         return [DoctorResponse.model_validate(doctor) for doctor in doctors]
 
+    # (id, version) pairs of the rows get_all_doctors would return, for conditional list requests
+    @read_only
+    def get_all_doctors_versions(
+        self, page: int, page_size: int, specialty_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        return self.repository.get_all_versions(page, page_size, specialty_filter, after_id)
+
+    # Look up several doctors by ID in the order asked, listing the IDs not found
+    @read_only
+    def get_doctors_by_ids(self, ids: List[int]) -> ByIds[DoctorResponse]:
+        doctors = self.repository.get_many(ids)
+        return ByIds[DoctorResponse](
+            items=[DoctorResponse.model_validate(doctors[id]) for id in ids if id in doctors],
+            missing=[id for id in ids if id not in doctors],
+        )
+
+    # Count doctors under the list filter with the endpoint's counting strategy
+    @read_only
+    def count_doctors(self, specialty_filter: Optional[str], strategy: CountStrategy) -> TotalCount:
+        return self.repository.count(specialty_filter, strategy)
+
     # Update an existing doctor
     def update_doctor(self, doctor_id: int, doctor_data: DoctorUpdate) -> DoctorResponse:
-        doctor = self.repository.update(doctor_id, doctor_data)
-        if not doctor:
-            raise HTTPException(status_code=404, detail="Doctor not found")
-        return DoctorResponse.model_validate(doctor)
+        with UnitOfWork(self.db):
+            doctor = self.repository.update(doctor_id, doctor_data)
+            if not doctor:
+                raise HTTPException(status_code=404, detail="Doctor not found")
+            return DoctorResponse.model_validate(doctor)
 
     # Delete a doctor
     def delete_doctor(self, doctor_id: int) -> None:
-        if not self.repository.delete(doctor_id):
-            raise HTTPException(status_code=404, detail="Doctor not found")
\ No newline at end of file
+        with UnitOfWork(self.db):
+            if not self.repository.delete(doctor_id):
+                raise HTTPException(status_code=404, detail="Doctor not found")
\ No newline at end of file
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Iterator, List, Optional
+from sqlalchemy.orm import Session
+from models.database import SessionLocal
+from models.appointment import Appointment
+from models.medical_record import MedicalRecord
+from repositories.appointment_repository import AppointmentRepository
+from repositories.medical_record_repository import MedicalRecordRepository
+from schemas.appointment import AppointmentStatus
+from schemas.export import ExportFormat
+
+# Rows are buffered and written out in chunks of this many rows
+EXPORT_CHUNK_ROWS = 500
+
+
+# This function converts a column value to something JSON and CSV can write
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+# ExportChunks formats exported rows as NDJSON or CSV lines (CSV with a header row)
+# and hands them back EXPORT_CHUNK_ROWS rows at a time
+class ExportChunks:
+    def __init__(self, export_format: ExportFormat, columns: List[str]):
+        self.columns = columns
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer) if export_format == ExportFormat.CSV else None
+        if self.writer is not None:
+            self.writer.writerow(columns)
+        self.pending = 0
+
+    # Add one row; returns the next chunk once EXPORT_CHUNK_ROWS rows are buffered
+    def add(self, row) -> Optional[bytes]:
+        if self.writer is not None:
+            self.writer.writerow([_plain(row[column]) for column in self.columns])
+        else:
+            self.buffer.write(json.dumps({column: _plain(row[column]) for column in self.columns}))
+            self.buffer.write("\n")
+        self.pending += 1
+        if self.pending < EXPORT_CHUNK_ROWS:
+            return None
+        return self.rest()
+
+    # The rows buffered so far as one chunk, or None when there are none
+    def rest(self) -> Optional[bytes]:
+        if not self.buffer.tell():
+            return None
+        chunk = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.pending = 0
+        return chunk
+
+
+# ExportService class to stream large result sets as NDJSON or CSV
+# Each export opens its own session so the cursor outlives the request dependencies,
+# and memory use stays constant whatever the number of rows.
+class ExportService:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    # Stream medical records matching the list filters plus a treatment date range
+    def export_medical_records(
+        self,
+        export_format: ExportFormat,
+        patient_id: Optional[int] = None,
+        treatment_from: Optional[datetime] = None,
+        treatment_to: Optional[datetime] = None
+    ) -> Iterator[bytes]:
+        columns = [column.name for column in MedicalRecord.__table__.columns]
+        return self._stream(
+            export_format,
+            columns,
+            lambda db: MedicalRecordRepository(db).stream(patient_id, treatment_from, treatment_to),
+        )
+
+    # Stream appointments matching the status filter plus a date range
+    def export_appointments(
+        self,
+        export_format: ExportFormat,
+        status_filter: Optional[AppointmentStatus] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Iterator[bytes]:
+        columns = [column.name for column in Appointment.__table__.columns]
+        return self._stream(
+            export_format,
+            columns,
+            lambda db: AppointmentRepository(db).stream(status_filter, date_from, date_to),
+        )
+
+    def _stream(self, export_format: ExportFormat, columns: List[str], fetch) -> Iterator[bytes]:
+        db = self.session_factory()
+        try:
+            chunks = ExportChunks(export_format, columns)
+            for row in fetch(db):
+                chunk = chunks.add(row)
+                if chunk is not None:
+                    yield chunk
+            rest = chunks.rest()
+            if rest is not None:
+                yield rest
+        finally:
+            db.close()
@@ -0,0 +1,43 @@
+import json
+import os
+from typing import Dict
+from models.file_database import FileSession
+from repositories.file_appointment_repository import FileAppointmentRepository
+from repositories.file_doctor_repository import FileDoctorRepository
+from repositories.file_medical_record_repository import FileMedicalRecordRepository
+from repositories.file_patient_repository import FilePatientRepository
+from schemas.appointment import AppointmentResponse
+from schemas.doctor import DoctorResponse
+from schemas.medical_record import MedicalRecordResponse
+from schemas.patient import PatientResponse
+from utils.unit_of_work import UnitOfWork
+
+# The JSON files written by the old FileManager, parents before the rows that refer to them,
+# with the schema each row is checked against and the repository that stores it
+_FILES = [
+    ("patients.json", PatientResponse, FilePatientRepository),
+    ("doctors.json", DoctorResponse, FileDoctorRepository),
+    ("appointments.json", AppointmentResponse, FileAppointmentRepository),
+    ("medical_records.json", MedicalRecordResponse, FileMedicalRecordRepository),
+]
+
+
+# JsonImportService class to load the old data/*.json files into the file store
+class JsonImportService:
+    def __init__(self, db: FileSession):
+        self.db = db
+
+    # Import every file found in the directory in one transaction, keeping ids and timestamps.
+    # Rows missing newer columns get the schema defaults; ids already stored are skipped,
+    # so running it again imports nothing twice. Returns the rows stored per file.
+    def load(self, directory: str) -> Dict[str, int]:
+        loaded = {}
+        with UnitOfWork(self.db):
+            for file_name, schema, repository in _FILES:
+                path = os.path.join(directory, file_name)
+                if not os.path.exists(path):
+                    continue
+                with open(path) as source:
+                    rows = [schema.model_validate(item).model_dump() for item in json.load(source)]
+                loaded[file_name] = repository(self.db).load(rows)
+        return loaded
@@ -1,49 +1,135 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, Depends
 from sqlalchemy.orm import Session
 from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate, MedicalRecordResponse
 from repositories.medical_record_repository import MedicalRecordRepository
 from repositories.patient_repository import PatientRepository
 from models.database import get_db
+from models.file_database import FileSession
+from repositories.file_medical_record_repository import FileMedicalRecordRepository
+from repositories.file_patient_repository import FilePatientRepository
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from utils.audit_log import record_change
+from schemas.audit import AuditAction, AuditEntity
+from schemas.page import ByIds
+from utils.conditional import RowVersion
 
 
 # MedicalRecordService class to handle medical record-related operations
 class MedicalRecordService:
     def __init__(self, db: Session = Depends(get_db)):
-        self.repository = MedicalRecordRepository(db)
-        self.patient_repository = PatientRepository(db)
+        self.db = db
+        if isinstance(db, FileSession):
+            self.repository = FileMedicalRecordRepository(db)
+            self.patient_repository = FilePatientRepository(db)
+        else:
+            self.repository = MedicalRecordRepository(db)
+            self.patient_repository = PatientRepository(db)
 
     # Create a new medical record
     def create_medical_record(self, record_data: MedicalRecordCreate) -> MedicalRecordResponse:
-        if not self.patient_repository.get_by_id(record_data.patient_id):
-            raise HTTPException(status_code=404, detail="Patient not found")
-        record = self.repository.create(record_data)
-        return MedicalRecordResponse.model_validate(record)
+        with UnitOfWork(self.db):
+            record = self.repository.create(record_data)
+            if not record:
+                raise HTTPException(status_code=404, detail="Patient not found")
+            record = MedicalRecordResponse.model_validate(record)
+            record_change(self.db, record.patient_id, AuditEntity.MEDICAL_RECORD, record.id, AuditAction.CREATE, record)
+            return record
+
+    # Create a batch of medical records in one transaction
+    # Patient existence is checked for the whole batch with one query; records
+    # for unknown patients are reported as errors and the rest are inserted.
+    def bulk_create_medical_records(self, records_data: List[MedicalRecordCreate]) -> BulkCreateResponse:
+        with UnitOfWork(self.db):
+            known_patients = self.patient_repository.get_existing_ids(item.patient_id for item in records_data)
+            results, accepted = [], []
+            for index, item in enumerate(records_data):
+                if item.patient_id not in known_patients:
+                    results.append(BulkItemResult(index=index, status="error", detail="Patient not found"))
+                else:
+                    accepted.append(index)
+            records = self.repository.bulk_create([records_data[index] for index in accepted])
+            for record in records:
+                record_change(
+                    self.db, record.patient_id, AuditEntity.MEDICAL_RECORD, record.id, AuditAction.CREATE,
+                    MedicalRecordResponse.model_validate(record),
+                )
+            results.extend(
+                BulkItemResult(index=index, status="created", id=record.id)
+                for index, record in zip(accepted, records)
+            )
+            results.sort(key=lambda result: result.index)
+            return BulkCreateResponse.from_results(results)
 
     # Retrieve a medical record by ID
+    @read_only
     def get_medical_record(self, record_id: int) -> MedicalRecordResponse:
         record = self.repository.get_by_id(record_id)
         if not record:
             raise HTTPException(status_code=404, detail="Medical record not found")
         return MedicalRecordResponse.model_validate(record)
 
+    # Version of a live medical record for conditional GETs, read without loading the row
+    @read_only
+    def get_medical_record_version(self, record_id: int) -> RowVersion:
+        version = self.repository.get_version(record_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Medical record not found")
+        return version
+
     # Retrieve all medical records with optional filters
+    # A cursor, when given, takes precedence over the page number
+    @read_only
     def get_all_medical_records(
-        self, page: int, page_size: int, patient_id: Optional[int] = None
+        self, page: int, page_size: int, patient_id: Optional[int] = None, cursor: Optional[str] = None
     ) -> List[MedicalRecordResponse]:
-        records = self.repository.get_all(page, page_size, patient_id)
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        records = self.repository.get_all(page, page_size, patient_id, after_id)
         return [MedicalRecordResponse.model_validate(record) for record in records]
 
+    # (id, version) pairs of the rows get_all_medical_records would return, for conditional list requests
+    @read_only
+    def get_all_medical_records_versions(
+        self, page: int, page_size: int, patient_id: Optional[int] = None, cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        return self.repository.get_all_versions(page, page_size, patient_id, after_id)
+
+    # Look up several medical records by ID in the order asked, listing the IDs not found
+    @read_only
+    def get_medical_records_by_ids(self, ids: List[int]) -> ByIds[MedicalRecordResponse]:
+        records = self.repository.get_many(ids)
+        return ByIds[MedicalRecordResponse](
+            items=[MedicalRecordResponse.model_validate(records[id]) for id in ids if id in records],
+            missing=[id for id in ids if id not in records],
+        )
+
+    # Count medical records under the list filter with the endpoint's counting strategy
+    @read_only
+    def count_medical_records(self, patient_id: Optional[int], strategy: CountStrategy) -> TotalCount:
+        return self.repository.count(patient_id, strategy)
+
     # Update an existing medical record
     def update_medical_record(self, record_id: int, record_data: MedicalRecordUpdate) -> MedicalRecordResponse:
-        if record_data.patient_id and not self.patient_repository.get_by_id(record_data.patient_id):
-            raise HTTPException(status_code=404, detail="Patient not found")
-        record = self.repository.update(record_id, record_data)
-        if not record:
-            raise HTTPException(status_code=404, detail="Medical record not found")
-        return MedicalRecordResponse.model_validate(record)
+        with UnitOfWork(self.db):
+            record = self.repository.update(record_id, record_data)
+            if not record:
+                # The update is guarded by the patient; work out which lookup failed
+                if record_data.patient_id and not self.patient_repository.get_by_id(record_data.patient_id):
+                    raise HTTPException(status_code=404, detail="Patient not found")
+                raise HTTPException(status_code=404, detail="Medical record not found")
+            record = MedicalRecordResponse.model_validate(record)
+            record_change(self.db, record.patient_id, AuditEntity.MEDICAL_RECORD, record_id, AuditAction.UPDATE, record)
+            return record
 
     # Delete a medical record
     def delete_medical_record(self, record_id: int) -> None:
-        if not self.repository.delete(record_id):
-            raise HTTPException(status_code=404, detail="Medical record not found")
\ No newline at end of file
+        with UnitOfWork(self.db):
+            patient_id = self.repository.delete(record_id)
+            if patient_id is None:
+                raise HTTPException(status_code=404, detail="Medical record not found")
+            record_change(self.db, patient_id, AuditEntity.MEDICAL_RECORD, record_id, AuditAction.DELETE)
\ No newline at end of file
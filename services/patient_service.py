@@ -1,41 +1,140 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, Depends
 from sqlalchemy.orm import Session
 from schemas.patient import PatientCreate, PatientUpdate, PatientResponse
 from repositories.patient_repository import PatientRepository
 from models.database import get_db
+from models.file_database import FileSession
+from repositories.file_patient_repository import FilePatientRepository
+from schemas.bulk import BulkCreateResponse, BulkItemResult
+from schemas.timeline import TIMELINE_ENTRIES, TimelineEntry, TimelineKind
+from repositories.patient_timeline_repository import TimelineCursor
+from utils.pagination import decode_cursor
+from utils.total_count import CountStrategy, TotalCount
+from utils.unit_of_work import UnitOfWork
+from utils.replicas import read_only
+from utils.audit_log import audit_writer, record_change
+from schemas.audit import AuditAction, AuditEntity, AuditEntryResponse
+from repositories.audit_repository import AuditRepository
+from schemas.page import ByIds
+from utils.conditional import RowVersion
 
 
 # PatientService class to handle patient-related operations
 class PatientService:
     def __init__(self, db: Session = Depends(get_db)):
-        self.repository = PatientRepository(db)
+        self.db = db
+        self.repository = FilePatientRepository(db) if isinstance(db, FileSession) else PatientRepository(db)
+        self.audit_repository = AuditRepository(db)
 
     # Create a new patient
     def create_patient(self, patient_data: PatientCreate) -> PatientResponse:
-        patient = self.repository.create(patient_data)
-        return PatientResponse.model_validate(patient)
+        with UnitOfWork(self.db):
+            patient = PatientResponse.model_validate(self.repository.create(patient_data))
+            record_change(self.db, patient.id, AuditEntity.PATIENT, patient.id, AuditAction.CREATE, patient)
+            return patient
+
+    # Create a batch of patients in one transaction
+    def bulk_create_patients(self, patients_data: List[PatientCreate]) -> BulkCreateResponse:
+        with UnitOfWork(self.db):
+            patients = self.repository.bulk_create(patients_data)
+            for patient in patients:
+                record_change(
+                    self.db, patient.id, AuditEntity.PATIENT, patient.id, AuditAction.CREATE,
+                    PatientResponse.model_validate(patient),
+                )
+            return BulkCreateResponse.from_results([
+                BulkItemResult(index=index, status="created", id=patient.id)
+                for index, patient in enumerate(patients)
+            ])
 
     # Retrieve a patient by ID
+    @read_only
     def get_patient(self, patient_id: int) -> PatientResponse:
         patient = self.repository.get_by_id(patient_id)
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
         return PatientResponse.model_validate(patient)
 
+    # Version of a live patient for conditional GETs, read without loading the row
+    @read_only
+    def get_patient_version(self, patient_id: int) -> RowVersion:
+        version = self.repository.get_version(patient_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return version
+
     # Retrieve all patients with optional filters
-    def get_all_patients(self, page: int, page_size: int, name_filter: Optional[str] = None) -> List[PatientResponse]:
-        patients = self.repository.get_all(page, page_size, name_filter)
+    # A cursor, when given, takes precedence over the page number
+    @read_only
+    def get_all_patients(
+        self, page: int, page_size: int, name_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[PatientResponse]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        patients = self.repository.get_all(page, page_size, name_filter, after_id)
         return [PatientResponse.model_validate(patient) for patient in patients]
 
+    # (id, version) pairs of the rows get_all_patients would return, for conditional list requests
+    @read_only
+    def get_all_patients_versions(
+        self, page: int, page_size: int, name_filter: Optional[str] = None, cursor: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        after_id = decode_cursor(cursor, int)[0] if cursor else None
+        return self.repository.get_all_versions(page, page_size, name_filter, after_id)
+
+    # Look up several patients by ID in the order asked, listing the IDs not found
+    @read_only
+    def get_patients_by_ids(self, ids: List[int]) -> ByIds[PatientResponse]:
+        patients = self.repository.get_many(ids)
+        return ByIds[PatientResponse](
+            items=[PatientResponse.model_validate(patients[id]) for id in ids if id in patients],
+            missing=[id for id in ids if id not in patients],
+        )
+
+    # Count patients under the list filter with the endpoint's counting strategy
+    @read_only
+    def count_patients(self, name_filter: Optional[str], strategy: CountStrategy) -> TotalCount:
+        return self.repository.count(name_filter, strategy)
+
+    # Retrieve the patient's appointments and medical records, newest first
+    @read_only
+    def get_patient_timeline(self, patient_id: int, page_size: int, cursor: Optional[str] = None) -> List[TimelineEntry]:
+        after = TimelineCursor(*decode_cursor(cursor, datetime, TimelineKind, int)) if cursor else None
+        if not self.repository.get_by_id(patient_id):
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return TIMELINE_ENTRIES.validate_python(self.repository.get_timeline(patient_id, page_size, after))
+
+    # Retrieve the audit log of a patient and their medical records, newest first.
+    # Records still queued in this process's writer are written first and the entries are
+    # read from the primary, so every change committed through this worker is listed.
+    # Each worker process has its own writer: a change committed through another worker
+    # is listed once that worker's writer appends it, normally within one batch.
+    def get_patient_audit(self, patient_id: int, page_size: int, cursor: Optional[str] = None) -> List[AuditEntryResponse]:
+        before_id = decode_cursor(cursor, int)[0] if cursor else None
+        audit_writer.flush()
+        entries = self.audit_repository.get_for_patient(patient_id, page_size, before_id)
+        return [AuditEntryResponse.model_validate(entry) for entry in entries]
+
+    # Search patients by name substring or prefix, best matches first
+    @read_only
+    def search_patients(self, query: str, limit: int) -> List[PatientResponse]:
+        matches = self.repository.search_index.search(query, limit)
+        return [PatientResponse.model_validate(patient) for patient, _ in matches]
+
     # Update an existing patient
     def update_patient(self, patient_id: int, patient_data: PatientUpdate) -> PatientResponse:
-        patient = self.repository.update(patient_id, patient_data)
-        if not patient:
-            raise HTTPException(status_code=404, detail="Patient not found")
-        return PatientResponse.model_validate(patient)
+        with UnitOfWork(self.db):
+            patient = self.repository.update(patient_id, patient_data)
+            if not patient:
+                raise HTTPException(status_code=404, detail="Patient not found")
+            patient = PatientResponse.model_validate(patient)
+            record_change(self.db, patient_id, AuditEntity.PATIENT, patient_id, AuditAction.UPDATE, patient)
+            return patient
 
     # Delete a patient
     def delete_patient(self, patient_id: int) -> None:
-        if not self.repository.delete(patient_id):
-            raise HTTPException(status_code=404, detail="Patient not found")
\ No newline at end of file
+        with UnitOfWork(self.db):
+            if not self.repository.delete(patient_id):
+                raise HTTPException(status_code=404, detail="Patient not found")
+            record_change(self.db, patient_id, AuditEntity.PATIENT, patient_id, AuditAction.DELETE)
\ No newline at end of file
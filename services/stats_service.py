@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from schemas.appointment import AppointmentStatus
+from schemas.stats import AppointmentStats, DailyAppointmentCounts, PatientRecordStats
+from repositories.stats_repository import StatsRepository
+from repositories.doctor_repository import DoctorRepository
+from repositories.patient_repository import PatientRepository
+from utils.replicas import read_only
+from utils.unit_of_work import UnitOfWork
+
+# Longest date range the appointment statistics cover in one request
+MAX_STATS_RANGE = timedelta(days=366)
+
+
+# Reject ranges that end before they start or cover more than MAX_STATS_RANGE
+def check_stats_range(date_from: date, date_to: date) -> None:
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="The range must not end before it starts")
+    if date_to - date_from >= MAX_STATS_RANGE:
+        raise HTTPException(status_code=400, detail="The range cannot be longer than 366 days")
+
+
+# Assemble the per-day counts and the totals from (day, status, count) rows in day order
+def appointment_stats(
+    date_from: date, date_to: date, doctor_id: Optional[int], rows: List[Tuple[date, AppointmentStatus, int]]
+) -> AppointmentStats:
+    days: Dict[date, Dict[AppointmentStatus, int]] = {}
+    totals = {status: 0 for status in AppointmentStatus}
+    for day, status, count in rows:
+        days.setdefault(day, {status: 0 for status in AppointmentStatus})[status] = count
+        totals[status] += count
+    return AppointmentStats(
+        doctor_id=doctor_id,
+        date_from=date_from,
+        date_to=date_to,
+        days=[
+            DailyAppointmentCounts(day=day, counts=counts, total=sum(counts.values()))
+            for day, counts in days.items()
+        ],
+        counts=totals,
+        total=sum(totals.values()),
+    )
+
+
+# StatsService class to answer dashboard statistics from the summary count tables
+class StatsService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = StatsRepository(db)
+        self.patient_repository = PatientRepository(db)
+        self.doctor_repository = DoctorRepository(db)
+
+    # Appointment counts per day and status, for every doctor or for one
+    @read_only
+    def get_appointment_stats(self, date_from: date, date_to: date, doctor_id: Optional[int] = None) -> AppointmentStats:
+        check_stats_range(date_from, date_to)
+        if doctor_id is not None and not self.doctor_repository.get_by_id(doctor_id):
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        rows = self.repository.get_appointment_counts(date_from, date_to, doctor_id)
+        return appointment_stats(date_from, date_to, doctor_id, rows)
+
+    # Number of live medical records of a patient
+    @read_only
+    def get_patient_record_stats(self, patient_id: int) -> PatientRecordStats:
+        if not self.patient_repository.get_by_id(patient_id):
+            raise HTTPException(status_code=404, detail="Patient not found")
+        return PatientRecordStats(
+            patient_id=patient_id, medical_records=self.repository.get_patient_record_count(patient_id)
+        )
+
+    # Recompute the summary tables from the live rows
+    def rebuild(self) -> Dict[str, int]:
+        with UnitOfWork(self.db):
+            return self.repository.rebuild()
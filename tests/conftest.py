@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+
+# The tests run on a throwaway SQLite database. The environment is set before anything
+# imports models.database, which creates the engine from DATABASE_URL at import time.
+_DIRECTORY = tempfile.mkdtemp(prefix="patient-tests-")
+DATABASE_PATH = os.path.join(_DIRECTORY, "test.db")
+_TEMPLATE_PATH = os.path.join(_DIRECTORY, "template.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["DB_MODE"] = "sync"
+os.environ["STORAGE_BACKEND"] = "sql"
+os.environ["ENTITY_CACHE_BACKEND"] = "local"
+# Test mode: a request that repeats a statement fails with RepeatedQueryError
+os.environ["QUERY_STATS_STRICT"] = "1"
+os.environ.pop("REPLICA_DATABASE_URLS", None)
+os.environ.pop("PROFILE_TOKEN", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from migrations.runner import upgrade
+from models.database import SessionLocal, engine
+from utils.audit_log import audit_writer
+from utils.entity_cache import LocalCacheBackend, set_cache_backend
+
+# Migrate once; every test then starts from a copy of the migrated database
+upgrade(engine)
+engine.dispose()
+shutil.copyfile(DATABASE_PATH, _TEMPLATE_PATH)
+
+
+# Every test gets a freshly migrated database and empty entity caches
+@pytest.fixture(autouse=True)
+def fresh_database():
+    audit_writer.flush()
+    engine.dispose()
+    shutil.copyfile(_TEMPLATE_PATH, DATABASE_PATH)
+    set_cache_backend(LocalCacheBackend())
+    yield
+    audit_writer.flush()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# The application without its lifespan, which would close the shared audit writer
+@pytest.fixture
+def client():
+    from main import app
+
+    return TestClient(app)
+
+
+PATIENT = {
+    "full_name": "Ama Mensah",
+    "age": 40,
+    "gender": "F",
+    "contact_information": "0200000000",
+    "address": "1 High Street",
+    "emergency_contact": "0200000001",
+}
+
+DOCTOR = {
+    "full_name": "Kofi Boateng",
+    "specialty": "Cardiology",
+    "years_of_experience": 12,
+    "contact_information": "0300000000",
+}
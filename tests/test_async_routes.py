@@ -0,0 +1,87 @@
+from datetime import timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from models.async_database import dispose_async_engine
+from routers import appointments, archive, doctors, medical_records, patients, stats
+from routers import async_appointments, async_archive, async_doctors, async_medical_records, async_patients, async_stats
+from schemas.patient import PatientCreate
+from services.archive_service import ArchiveService
+from services.patient_service import PatientService
+from utils.exceptions import add_exception_handlers
+from conftest import DOCTOR, PATIENT
+
+SYNC_ROUTERS = [patients, doctors, appointments, medical_records, stats, archive]
+ASYNC_ROUTERS = [async_patients, async_doctors, async_appointments, async_medical_records, async_stats, async_archive]
+
+
+def _routes(modules) -> set:
+    return {
+        (method, route.path)
+        for module in modules
+        for route in module.router.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+
+# The async routers on their own, as main.py mounts them when DB_MODE=async
+@pytest.fixture
+def async_client():
+    app = FastAPI()
+    for module in ASYNC_ROUTERS:
+        app.include_router(module.router)
+    add_exception_handlers(app)
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(dispose_async_engine)
+
+
+def test_async_routers_serve_every_sync_route_under_the_same_template():
+    assert _routes(ASYNC_ROUTERS) == _routes(SYNC_ROUTERS)
+
+
+def test_bulk_export_and_stats(async_client):
+    patient_ids = async_client.post("/patients/bulk", json=[PATIENT, PATIENT]).json()["results"]
+    doctor_id = async_client.post("/doctors/bulk", json=[DOCTOR]).json()["results"][0]["id"]
+    booking = {"patient_id": patient_ids[0]["id"], "doctor_id": doctor_id, "date_time": "2025-06-02T10:00:00", "status": "Scheduled"}
+    response = async_client.post("/appointments/bulk", json=[booking, booking]).json()
+    assert [result["status"] for result in response["results"]] == ["created", "error"]
+    record = {
+        "patient_id": patient_ids[1]["id"], "diagnosis": "Flu", "prescriptions": "Rest",
+        "treatment_date": "2025-06-02T09:00:00", "doctor_notes": "Review in a week",
+    }
+    async_client.post("/medical-records/bulk", json=[record, {**record, "patient_id": 999}])
+
+    lines = async_client.get("/appointments/export", params={"format": "csv"}).text.splitlines()
+    assert lines[0].startswith("id,") and len(lines) == 2
+    assert len(async_client.get("/medical-records/export").text.splitlines()) == 1
+
+    slots = async_client.get(
+        f"/doctors/{doctor_id}/availability", params={"from": "2025-06-02T09:00:00", "to": "2025-06-02T11:00:00"}
+    ).json()["slots"]
+    assert [slot["start"] for slot in slots] == ["2025-06-02T09:00:00", "2025-06-02T09:30:00", "2025-06-02T10:30:00"]
+    stats = async_client.get(f"/stats/doctors/{doctor_id}/appointments", params={"from": "2025-06-01", "to": "2025-06-30"})
+    assert stats.json()["total"] == 1
+    assert async_client.get(f"/stats/patients/{patient_ids[1]['id']}/medical-records").json()["medical_records"] == 1
+
+
+def test_audit_and_archive_restore(async_client, db):
+    patient_id = PatientService(db).create_patient(PatientCreate(**PATIENT)).id
+    PatientService(db).delete_patient(patient_id)
+    ArchiveService(db).archive_deleted(retention=timedelta(0), pause=0)
+    assert async_client.get(f"/patients/{patient_id}").status_code == 404
+    assert async_client.get(f"/admin/archive/patients/{patient_id}").status_code == 200
+    assert async_client.post(f"/admin/archive/patients/{patient_id}/restore").status_code == 200
+    assert async_client.get(f"/patients/{patient_id}").json()["full_name"] == PATIENT["full_name"]
+    assert [patient["id"] for patient in async_client.get("/patients/search", params={"q": "mensah"}).json()] == [patient_id]
+    entries = async_client.get(f"/patients/{patient_id}/audit").json()
+    assert [entry["action"] for entry in entries] == ["restore", "delete", "create"]
+
+
+def test_multi_get_order_and_missing(async_client):
+    ids = [result["id"] for result in async_client.post("/patients/bulk", json=[PATIENT] * 3).json()["results"]]
+    async_client.delete(f"/patients/{ids[0]}")
+    async_client.get(f"/patients/{ids[2]}")
+    body = async_client.get("/patients/", params={"ids": f"{ids[2]},999,{ids[0]},{ids[1]},{ids[2]}"}).json()
+    assert ([patient["id"] for patient in body["items"]], body["missing"]) == ([ids[2], ids[1]], [999, ids[0]])
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+from migrations.versions import v0008_audit_log
+from models.audit_event import AuditEvent
+from models.async_database import async_session, dispose_async_engine
+from models.database import SessionLocal
+from repositories.audit_repository import AuditRecord, AuditRepository
+from services.archive_service import ArchiveService
+from schemas.audit import AuditAction, AuditEntity
+from utils.audit_log import AuditWriter, audit_writer, record_change
+from utils.unit_of_work import UnitOfWork
+from conftest import PATIENT
+
+
+def _record(entity_id: int, changes: str = '{"full_name":"Ama Mensah"}') -> AuditRecord:
+    return AuditRecord(1, "patient", entity_id, "update", changes, datetime(2025, 6, 1, 10, 30, 15, 123456))
+
+
+def _count_entries() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(AuditEvent))
+
+
+def test_entries_round_trip_and_verify(db):
+    with UnitOfWork(db):
+        AuditRepository(db).append([_record(1), _record(2, None)])
+    with SessionLocal() as reader:
+        entries = list(reader.scalars(select(AuditEvent).order_by(AuditEvent.id)))
+        assert [entry.occurred_at for entry in entries] == [_record(1).occurred_at] * 2
+        assert entries[0].recorded_at.microsecond == entries[1].recorded_at.microsecond
+        assert AuditRepository(reader).verify() is None
+
+
+def test_verify_reports_the_first_changed_entry(db):
+    with UnitOfWork(db):
+        AuditRepository(db).append([_record(1), _record(2), _record(3)])
+    with UnitOfWork(db):
+        db.execute(update(AuditEvent).where(AuditEvent.id == 2).values(changes='{"full_name":"Someone Else"}'))
+    assert AuditRepository(db).verify() == 2
+
+
+def test_timestamps_keep_microseconds_on_mysql():
+    for table in (AuditEvent.__table__, v0008_audit_log.metadata.tables["audit_events"]):
+        ddl = str(CreateTable(table).compile(dialect=mysql.dialect()))
+        assert "occurred_at DATETIME(6)" in ddl
+        assert "recorded_at DATETIME(6)" in ddl
+
+
+def test_api_changes_are_chained(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    client.put(f"/patients/{patient_id}", json={**PATIENT, "age": 41})
+    entries = client.get(f"/patients/{patient_id}/audit").json()
+    assert [entry["action"] for entry in entries] == ["update", "create"]
+    assert entries[0]["previous_hash"] == entries[1]["hash"]
+    with SessionLocal() as db:
+        assert AuditRepository(db).verify() is None
+
+
+def test_writer_survives_unexpected_errors():
+    calls = []
+
+    # Fails the first batch with an error that is not a database error, then works
+    def session_factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise TypeError("not serializable")
+        return SessionLocal()
+
+    writer = AuditWriter(session_factory)
+    try:
+        writer.submit([_record(1)])
+        writer.flush()
+        writer.submit([_record(2)])
+        writer.flush()
+        assert writer.stats()["dropped"] == 1
+        assert writer.stats()["written"] == 1
+        assert _count_entries() == 1
+    finally:
+        writer.close()
+
+
+def test_async_submit_waits_for_room_without_blocking_the_loop():
+    release = threading.Event()
+
+    # Holds the writer on its first batch so the queue fills up
+    def session_factory():
+        release.wait(5)
+        return SessionLocal()
+
+    writer = AuditWriter(session_factory, queue_size=2, batch_size=1)
+
+    async def submit_while_full():
+        submitting = asyncio.create_task(writer.submit_async([_record(id) for id in range(1, 7)]))
+        # The loop keeps running other work while the submit waits for room
+        await asyncio.sleep(0.1)
+        assert not submitting.done()
+        stats = writer.stats()
+        assert stats["queued"] <= stats["capacity"]
+        assert stats["backpressure_waits"] >= 1
+        release.set()
+        await submitting
+
+    try:
+        asyncio.run(submit_while_full())
+        writer.flush()
+        assert writer.stats()["written"] == 6
+    finally:
+        writer.close()
+    with SessionLocal() as db:
+        entity_ids = db.scalars(select(AuditEvent.entity_id).order_by(AuditEvent.id)).all()
+        assert entity_ids == [1, 2, 3, 4, 5, 6]
+        assert AuditRepository(db).verify() is None
+
+
+def test_async_commits_are_queued_by_the_unit_of_work(monkeypatch):
+    submitted = []
+
+    async def submit_async(records):
+        submitted.extend(records)
+
+    monkeypatch.setattr(audit_writer, "submit_async", submit_async)
+
+    async def commit_change():
+        try:
+            async with async_session() as db:
+                async with UnitOfWork(db):
+                    await db.execute(select(AuditEvent.id).limit(1))
+                    record_change(db.sync_session, 1, AuditEntity.PATIENT, 1, AuditAction.DELETE)
+                assert "audit_committed_records" not in db.info
+        finally:
+            await dispose_async_engine()
+
+    asyncio.run(commit_change())
+    assert [(record.entity_id, record.action) for record in submitted] == [(1, "delete")]
+
+
+def test_restores_are_audited(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    record = {
+        "patient_id": patient_id, "diagnosis": "Flu", "prescriptions": "Rest",
+        "treatment_date": "2025-06-02T09:00:00", "doctor_notes": "Review in a week",
+    }
+    record_id = client.post("/medical-records/", json=record).json()["id"]
+    client.delete(f"/medical-records/{record_id}")
+    client.delete(f"/patients/{patient_id}")
+    with SessionLocal() as db:
+        ArchiveService(db).archive_deleted(retention=timedelta(0), pause=0)
+    assert client.post(f"/admin/archive/patients/{patient_id}/restore").status_code == 200
+    assert client.post(f"/admin/archive/medical-records/{record_id}/restore").status_code == 200
+    entries = client.get(f"/patients/{patient_id}/audit").json()
+    assert [(entry["entity"], entry["action"]) for entry in entries[:2]] == [
+        ("medical_record", "restore"), ("patient", "restore"),
+    ]
+    assert entries[0]["changes"]["diagnosis"] == "Flu" and entries[1]["changes"]["full_name"] == PATIENT["full_name"]
+    with SessionLocal() as db:
+        assert AuditRepository(db).verify() is None
@@ -0,0 +1,60 @@
+from schemas.bulk import MAX_BULK_ITEMS
+from conftest import DOCTOR, PATIENT
+
+
+def _booking(patient_id: int, doctor_id: int, time: str) -> dict:
+    return {"patient_id": patient_id, "doctor_id": doctor_id, "date_time": f"2025-06-02T{time}", "status": "Scheduled"}
+
+
+def test_failed_bookings_are_reported_and_the_rest_created(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    doctor_id = client.post("/doctors/", json=DOCTOR).json()["id"]
+    client.post("/appointments/", json=_booking(patient_id, doctor_id, "09:00:00"))
+
+    response = client.post("/appointments/bulk", json=[
+        _booking(patient_id, doctor_id, "10:00:00"),
+        _booking(patient_id + 1, doctor_id, "11:00:00"),
+        _booking(patient_id, doctor_id + 1, "12:00:00"),
+        # Overlaps the stored booking, then the first item of this batch
+        _booking(patient_id, doctor_id, "09:15:00"),
+        _booking(patient_id, doctor_id, "10:00:00"),
+        _booking(patient_id, doctor_id, "13:00:00"),
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 4)
+    assert [(result["index"], result["status"], result["detail"]) for result in body["results"]] == [
+        (0, "created", None),
+        (1, "error", "Patient not found"),
+        (2, "error", "Doctor not found"),
+        (3, "error", "Doctor is already booked at this time"),
+        (4, "error", "Doctor is already booked at this time"),
+        (5, "created", None),
+    ]
+    created = [result["id"] for result in body["results"] if result["status"] == "created"]
+    assert all(client.get(f"/appointments/{id}").status_code == 200 for id in created)
+    assert len(client.get("/appointments/").json()) == 3
+
+
+def test_records_for_missing_or_deleted_patients_are_reported(client):
+    patient_ids = [result["id"] for result in client.post("/patients/bulk", json=[PATIENT, PATIENT]).json()["results"]]
+    client.delete(f"/patients/{patient_ids[1]}")
+    record = {
+        "diagnosis": "Flu", "prescriptions": "Rest",
+        "treatment_date": "2025-06-02T09:00:00", "doctor_notes": "Review in a week",
+    }
+    body = client.post("/medical-records/bulk", json=[
+        {**record, "patient_id": patient_id} for patient_id in (patient_ids[0], patient_ids[1], 999)
+    ]).json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    assert [result["status"] for result in body["results"]] == ["created", "error", "error"]
+    assert {result["detail"] for result in body["results"][1:]} == {"Patient not found"}
+    assert len(client.get("/medical-records/").json()) == 1
+
+
+def test_a_batch_must_hold_one_to_the_maximum_items(client):
+    assert client.post("/patients/bulk", json=[]).status_code == 422
+    assert client.post("/patients/bulk", json=[PATIENT] * (MAX_BULK_ITEMS + 1)).status_code == 422
+    # An invalid item rejects the whole request before anything is written
+    assert client.post("/patients/bulk", json=[PATIENT, {**PATIENT, "age": "old"}]).status_code == 422
+    assert client.get("/patients/").json() == []
@@ -0,0 +1,39 @@
+from sqlalchemy import update
+from models.database import SessionLocal
+from models.patient import Patient
+from conftest import PATIENT
+
+
+def test_every_write_changes_the_etag(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    first = client.get(f"/patients/{patient_id}")
+    assert first.json()["version"] == 1
+    etags = {first.headers["ETag"]}
+    # Back to back updates usually land in the same second; the version still moves on
+    for age in (41, 42):
+        assert client.put(f"/patients/{patient_id}", json={**PATIENT, "age": age}).json()["version"] == age - 39
+        etags.add(client.get(f"/patients/{patient_id}").headers["ETag"])
+    assert len(etags) == 3
+    stale = client.get(f"/patients/{patient_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert stale.status_code == 200 and stale.json()["age"] == 42
+    current = client.get(f"/patients/{patient_id}", headers={"If-None-Match": stale.headers["ETag"]})
+    assert current.status_code == 304 and current.content == b""
+
+
+def test_conditional_requests_read_the_version_from_the_database(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    etag = client.get(f"/patients/{patient_id}").headers["ETag"]
+    # Another worker's write: this process's cached row is now behind the database
+    with SessionLocal() as db:
+        db.execute(update(Patient).where(Patient.id == patient_id).values(version=Patient.version + 1))
+        db.commit()
+    assert client.get(f"/patients/{patient_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_etags_follow_the_row_versions(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    client.post("/patients/", json=PATIENT)
+    etag = client.get("/patients/").headers["ETag"]
+    assert client.get("/patients/", headers={"If-None-Match": etag}).status_code == 304
+    client.put(f"/patients/{patient_id}", json=PATIENT)
+    assert client.get("/patients/", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import text
+from repositories import counting
+from repositories.counting import table_estimate_statement, wait_for_refreshes
+from utils import total_count
+from utils.total_count import CountCache
+from conftest import DOCTOR, PATIENT
+
+
+# Every set above one row counts as large, against a count cache of this test's own
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CountCache()
+    monkeypatch.setattr(counting, "count_cache", cache)
+    monkeypatch.setattr(counting, "COUNT_EXACT_LIMIT", 1)
+    monkeypatch.setattr(total_count, "COUNT_EXACT_LIMIT", 1)
+    return cache
+
+
+def _total(client, path: str, **params) -> tuple:
+    response = client.get(path, params={**params, "total": "header"})
+    return int(response.headers["X-Total-Count"]), response.headers["X-Total-Count-Estimated"]
+
+
+def test_a_stale_count_is_served_while_it_is_refreshed_in_the_background(client, cache):
+    client.post("/patients/bulk", json=[PATIENT, PATIENT, PATIENT])
+    assert _total(client, "/patients/") == (3, "false")
+    client.post("/patients/", json=PATIENT)
+    assert _total(client, "/patients/") == (3, "true")
+
+    cache.ttl = 0
+    assert _total(client, "/patients/") == (3, "true")
+    wait_for_refreshes()
+    cache.ttl = 60
+    assert _total(client, "/patients/") == (4, "true")
+
+
+def test_a_whole_table_starts_from_the_estimate(client, cache, monkeypatch):
+    monkeypatch.setattr(counting, "table_estimate_statement", lambda dialect, table: text("SELECT 500"))
+    client.post("/patients/bulk", json=[PATIENT, PATIENT])
+    assert _total(client, "/patients/") == (500, "true")
+    wait_for_refreshes()
+    assert _total(client, "/patients/") == (2, "true")
+    # A filtered set has no estimate of its own and is counted
+    assert _total(client, "/patients/", name="ama") == (2, "false")
+
+
+def test_estimate_statements_per_dialect():
+    assert "pg_class" in str(table_estimate_statement("postgresql", "patients"))
+    assert "information_schema.TABLES" in str(table_estimate_statement("mysql", "patients"))
+    assert table_estimate_statement("sqlite", "patients") is None
+
+
+def test_appointment_and_record_totals_come_from_the_summary_tables(client, cache):
+    patient_ids = [result["id"] for result in client.post("/patients/bulk", json=[PATIENT, PATIENT]).json()["results"]]
+    doctor_id = client.post("/doctors/", json=DOCTOR).json()["id"]
+    client.post("/appointments/bulk", json=[
+        {"patient_id": patient_ids[0], "doctor_id": doctor_id, "date_time": f"2025-06-0{day}T10:00:00", "status": status}
+        for day, status in ((2, "Scheduled"), (3, "Scheduled"), (4, "Completed"))
+    ])
+    record = {
+        "patient_id": patient_ids[1], "diagnosis": "Flu", "prescriptions": "Rest",
+        "treatment_date": "2025-06-02T09:00:00", "doctor_notes": "Review in a week",
+    }
+    client.post("/medical-records/bulk", json=[record, record])
+
+    # Exact however large, and never cached
+    assert _total(client, "/appointments/") == (3, "false")
+    assert _total(client, "/appointments/", status="Scheduled") == (2, "false")
+    assert _total(client, "/medical-records/", patient_id=patient_ids[1]) == (2, "false")
+    assert len(cache) == 0
+    envelope = client.get("/appointments/", params={"status": "Completed", "total": "envelope"}).json()
+    assert (envelope["total"], envelope["total_estimated"]) == (1, False)
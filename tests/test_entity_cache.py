@@ -0,0 +1,157 @@
+import json
+from datetime import datetime
+import pytest
+from models.appointment import Appointment
+from models.patient import Patient
+from repositories.patient_repository import PatientRepository
+from schemas.patient import PatientCreate, PatientUpdate
+from services.patient_service import PatientService
+from utils import entity_cache
+from schemas.appointment import AppointmentStatus
+from utils.entity_cache import EntityCache, LocalCacheBackend, RedisCacheBackend, get_entity_cache
+from conftest import PATIENT
+
+
+# A clock the local backend reads instead of time.monotonic
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# The subset of a redis.Redis client the Redis backend uses, on a dict
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.expiries = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, px=None):
+        self.values[key] = value.encode()
+        self.expiries[key] = px
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(entity_cache.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def patient_id(db):
+    return PatientService(db).create_patient(PatientCreate(**PATIENT)).id
+
+
+def test_miss_then_hit(db, patient_id):
+    cache = get_entity_cache(Patient)
+    repository = PatientRepository(db)
+    assert repository.get_by_id(patient_id).full_name == PATIENT["full_name"]
+    assert repository.get_by_id(patient_id).full_name == PATIENT["full_name"]
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_entries_expire_after_the_ttl(clock):
+    backend = LocalCacheBackend(ttl=60)
+    backend.set("patients:1", {"id": 1})
+    clock.now += 59
+    assert backend.get("patients:1") == {"id": 1}
+    clock.now += 2
+    assert backend.get("patients:1") is None
+    assert len(backend) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    backend = LocalCacheBackend(max_entries=2)
+    backend.set("a", {"id": 1})
+    backend.set("b", {"id": 2})
+    backend.get("a")
+    backend.set("c", {"id": 3})
+    assert backend.get("b") is None
+    assert backend.get("a") == {"id": 1} and backend.get("c") == {"id": 3}
+
+
+def test_get_many_reports_the_cached_ids():
+    cache = EntityCache(LocalCacheBackend(), Patient)
+    cache.put(Patient(id=1, **PATIENT))
+    assert list(cache.get_many([1, 2])) == [1]
+    assert cache.stats()["misses"] == 1
+
+
+def test_update_invalidates_again_after_commit(db, patient_id):
+    cache = get_entity_cache(Patient)
+    repository = PatientRepository(db)
+    repository.get_by_id(patient_id)
+    assert cache.get(patient_id) is not None
+    repository.update(patient_id, PatientUpdate(**{**PATIENT, "full_name": "New Name"}))
+    assert cache.get(patient_id) is None
+    # A concurrent reader refills the entry with the row from before the update
+    cache.put(Patient(id=patient_id, **PATIENT))
+    assert cache.get(patient_id).full_name == PATIENT["full_name"]
+    db.commit()
+    assert cache.get(patient_id) is None
+    assert repository.get_by_id(patient_id).full_name == "New Name"
+
+
+def test_rollback_discards_pending_invalidations(db, patient_id):
+    cache = get_entity_cache(Patient)
+    repository = PatientRepository(db)
+    row = repository.get_by_id(patient_id)
+    repository.update(patient_id, PatientUpdate(**{**PATIENT, "full_name": "New Name"}))
+    db.rollback()
+    cache.put(row)
+    db.commit()
+    assert cache.get(patient_id).full_name == PATIENT["full_name"]
+
+
+def test_delete_invalidates(client, patient_id):
+    assert client.get(f"/patients/{patient_id}").status_code == 200
+    assert get_entity_cache(Patient).get(patient_id) is not None
+    client.delete(f"/patients/{patient_id}")
+    assert get_entity_cache(Patient).get(patient_id) is None
+    assert client.get(f"/patients/{patient_id}").status_code == 404
+
+
+def test_redis_backend_stores_rows_as_json():
+    client = FakeRedis()
+    cache = EntityCache(RedisCacheBackend("redis://unused", ttl=30, client=client), Appointment)
+    booked = datetime(2025, 6, 2, 10, 0)
+    cache.put(Appointment(
+        id=1, patient_id=2, doctor_id=3, date_time=booked, duration_minutes=30,
+        status=AppointmentStatus.SCHEDULED, version=1, date_created=booked
+    ))
+    stored = json.loads(client.values["entity:appointments:1"])
+    assert stored["date_time"] == "2025-06-02T10:00:00" and stored["status"] == AppointmentStatus.SCHEDULED.value
+    assert client.expiries["entity:appointments:1"] == 30000
+    cached = cache.get(1)
+    assert (cached.date_time, cached.status, cached.date_updated) == (booked, AppointmentStatus.SCHEDULED, None)
+    assert list(cache.get_many([1, 2])) == [1]
+
+
+def test_redis_backend_invalidates_for_every_worker():
+    client = FakeRedis()
+    first, second = (EntityCache(RedisCacheBackend("redis://unused", client=client), Patient) for _ in range(2))
+    first.put(Patient(id=1, **PATIENT))
+    assert second.get(1).full_name == PATIENT["full_name"]
+    second.invalidate(1)
+    assert first.get(1) is None
+
+
+def test_several_workers_default_to_redis_and_refuse_the_local_backend(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    monkeypatch.setattr(entity_cache, "RedisCacheBackend", lambda url, ttl: ("redis", url))
+    monkeypatch.delenv("ENTITY_CACHE_BACKEND")
+    assert entity_cache._build_backend() == ("redis", "redis://localhost:6379/0")
+    monkeypatch.setenv("ENTITY_CACHE_BACKEND", "local")
+    with pytest.raises(ValueError, match="4 workers"):
+        entity_cache._build_backend()
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from migrations.explain import _full_scans, _non_sargable, check_query_plans
+from models.database import engine
+
+
+@pytest.fixture
+def connection():
+    sqlite = create_engine("sqlite://")
+    with sqlite.connect() as connection:
+        connection.exec_driver_sql("CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, note TEXT)")
+        connection.exec_driver_sql("CREATE INDEX ix_visits_patient_id ON visits (patient_id)")
+        yield connection
+
+
+@pytest.mark.parametrize("statement,scans", [
+    ("SELECT * FROM visits WHERE patient_id = ?", 0),
+    ("SELECT * FROM visits WHERE id = ?", 0),
+    ("SELECT * FROM visits WHERE note = ?", 1),
+    # A full walk of an index is still a full scan
+    ("SELECT patient_id FROM visits ORDER BY patient_id", 1),
+    ("SELECT * FROM visits WHERE patient_id > 0 OR note = ?", 1),
+])
+def test_only_index_seeks_pass(connection, statement, scans):
+    parameters = (1,) if statement.count("?") else ()
+    assert len(_full_scans(connection, statement, parameters, {"visits"})) == scans
+
+
+@pytest.mark.parametrize("statement,pattern,problems", [
+    # ILIKE as SQLite compiles it: the index seeks date_deleted and tests every entry left
+    ("SELECT id FROM staff WHERE date_deleted IS NULL AND lower(staff.specialty) LIKE lower(?)", "%card%", 1),
+    ("SELECT id FROM staff WHERE date_deleted IS NULL AND staff.specialty LIKE ?", "_ard", 1),
+    ("SELECT id FROM staff WHERE date_deleted IS NULL AND staff.specialty LIKE ?", "card%", 0),
+    ("SELECT id FROM staff WHERE date_deleted IS NULL AND staff.specialty LIKE '%card%' AND ? = 1", 1, 1),
+    # A residual test on rows an index seek already narrowed is fine
+    ("SELECT id FROM staff WHERE staff.id = 1 AND staff.note LIKE ?", "%flu%", 0),
+])
+def test_leading_wildcards_on_an_index_column_are_flagged(statement, pattern, problems):
+    sqlite = create_engine("sqlite://")
+    with sqlite.connect() as connection:
+        connection.exec_driver_sql("CREATE TABLE staff (id INTEGER PRIMARY KEY, date_deleted TEXT, specialty TEXT, note TEXT)")
+        connection.exec_driver_sql("CREATE INDEX ix_staff_live_specialty ON staff (date_deleted, specialty)")
+        index_columns = {"ix_staff_live_specialty": {"date_deleted", "specialty"}}
+        assert len(_non_sargable(connection, statement, (pattern,), index_columns)) == problems
+
+
+def test_repository_queries_use_an_index():
+    assert check_query_plans(engine) == []
+
+
+def test_unsupported_dialects_are_refused():
+    postgres = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    with pytest.raises(ValueError, match="support sqlite and mysql, not postgresql"):
+        check_query_plans(postgres)
+    with pytest.raises(ValueError, match="not postgresql"):
+        _full_scans(postgres, "SELECT 1", (), set())
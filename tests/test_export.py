@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from models.appointment import Appointment
+from services import export_service
+from services.export_service import ExportService
+from schemas.export import ExportFormat
+from conftest import DOCTOR, PATIENT
+
+COLUMNS = [column.name for column in Appointment.__table__.columns]
+
+
+# Four bookings, created out of time order, with the 09:00 one deleted again
+def _book(client) -> list:
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    doctor_id = client.post("/doctors/", json=DOCTOR).json()["id"]
+    bookings = [
+        ("2025-06-03T10:00:00", "Scheduled"),
+        ("2025-06-02T10:00:00", "Completed"),
+        ("2025-06-02T09:00:00", "Scheduled"),
+        ("2025-06-04T10:00:00", "Scheduled"),
+    ]
+    results = client.post("/appointments/bulk", json=[
+        {"patient_id": patient_id, "doctor_id": doctor_id, "date_time": time, "status": status} for time, status in bookings
+    ]).json()["results"]
+    ids = [result["id"] for result in results]
+    client.delete(f"/appointments/{ids[2]}")
+    return ids
+
+
+def test_ndjson_has_one_object_per_live_row_in_time_order(client):
+    ids = _book(client)
+    response = client.get("/appointments/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == "attachment; filename=appointments.ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [ids[1], ids[0], ids[3]]
+    assert list(rows[0]) == COLUMNS
+    assert (rows[0]["date_time"], rows[0]["status"], rows[0]["date_deleted"]) == ("2025-06-02T10:00:00", "Completed", None)
+
+
+def test_filters_use_an_inclusive_start_and_exclusive_end(client):
+    ids = _book(client)
+    params = {"date_from": "2025-06-03T10:00:00", "date_to": "2025-06-04T10:00:00"}
+    rows = [json.loads(line) for line in client.get("/appointments/export", params=params).text.splitlines()]
+    assert [row["id"] for row in rows] == [ids[0]]
+    rows = client.get("/appointments/export", params={"status": "Completed"}).text.splitlines()
+    assert [json.loads(line)["id"] for line in rows] == [ids[1]]
+
+
+def test_csv_has_a_header_and_quotes_values(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    notes = 'Rest, fluids and "plenty" of sleep\nReview in a week'
+    client.post("/medical-records/", json={
+        "patient_id": patient_id, "diagnosis": "Flu", "prescriptions": "Rest",
+        "treatment_date": "2025-06-02T09:00:00", "doctor_notes": notes,
+    })
+    response = client.get("/medical-records/export", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    header, row = csv.reader(io.StringIO(response.text))
+    record = dict(zip(header, row))
+    assert (record["doctor_notes"], record["treatment_date"], record["date_updated"]) == (notes, "2025-06-02T09:00:00", "")
+
+
+def test_rows_are_sent_in_chunks(client, monkeypatch):
+    ids = _book(client)
+    monkeypatch.setattr(export_service, "EXPORT_CHUNK_ROWS", 2)
+    chunks = list(ExportService().export_appointments(ExportFormat.CSV))
+    # The header travels with the first chunk; the third live row is the remainder
+    assert [len(chunk.decode().splitlines()) for chunk in chunks] == [3, 1]
+    assert chunks[-1].decode().startswith(f"{ids[3]},")
@@ -0,0 +1,114 @@
+import os
+import pytest
+from models import file_database
+from models.file_database import FileSession, FileStore
+from schemas.appointment import AppointmentCreate
+from schemas.doctor import DoctorCreate
+from schemas.patient import PatientCreate, PatientUpdate
+from services.appointment_service import AppointmentService
+from services.doctor_service import DoctorService
+from services.patient_service import PatientService
+from conftest import DOCTOR, PATIENT
+
+BOOKING = {"patient_id": 1, "doctor_id": 1, "date_time": "2025-06-02T10:00:00", "status": "Scheduled"}
+
+
+# Runs body with a session on a store opened on directory, then closes both
+def _with_store(directory: str, body):
+    store = FileStore(directory)
+    session = FileSession(store)
+    try:
+        return body(session)
+    finally:
+        session.close()
+        store.close()
+
+
+def _patient_names(directory: str) -> list:
+    return _with_store(directory, lambda db: [patient.full_name for patient in PatientService(db).get_all_patients(1, 100)])
+
+
+def test_rows_round_trip_and_survive_a_restart(tmp_path):
+    directory = str(tmp_path)
+
+    def write(db):
+        service = PatientService(db)
+        first = service.create_patient(PatientCreate(**PATIENT))
+        service.create_patient(PatientCreate(**{**PATIENT, "full_name": "Kojo Asante"}))
+        updated = service.update_patient(first.id, PatientUpdate(**{**PATIENT, "age": 41}))
+        assert (updated.age, updated.version) == (41, 2)
+        service.delete_patient(2)
+        assert [patient.id for patient in service.get_all_patients(1, 10)] == [1]
+
+    _with_store(directory, write)
+
+    # The replay rebuilds the latest state of each row and keeps allocating new ids
+    def reopen(db):
+        service = PatientService(db)
+        patient = service.get_patient(1)
+        assert (patient.age, patient.version) == (41, 2)
+        assert [patient.id for patient in service.get_all_patients(1, 10)] == [1]
+        assert service.create_patient(PatientCreate(**PATIENT)).id == 3
+
+    _with_store(directory, reopen)
+
+
+def test_a_torn_tail_is_truncated_on_replay(tmp_path):
+    directory = str(tmp_path)
+    _with_store(directory, lambda db: PatientService(db).create_patient(PatientCreate(**PATIENT)))
+    log_path = os.path.join(directory, "patients.log")
+    size = os.path.getsize(log_path)
+    with open(log_path, "ab") as log:
+        log.write(b'deadbeef {"id":2,"full_name"')
+    assert _patient_names(directory) == [PATIENT["full_name"]]
+    assert os.path.getsize(log_path) == size
+
+
+def test_a_transaction_without_its_commit_record_is_dropped_from_every_table(tmp_path):
+    directory = str(tmp_path)
+
+    def seed(db):
+        PatientService(db).create_patient(PatientCreate(**PATIENT))
+        DoctorService(db).create_doctor(DoctorCreate(**DOCTOR))
+
+    _with_store(directory, seed)
+    commits_path = os.path.join(directory, "commits.log")
+    committed = os.path.getsize(commits_path)
+
+    # One transaction writing a patient and an appointment, i.e. two table logs
+    def write(db):
+        db.for_update()
+        patient = PatientService(db).repository.bulk_create([PatientCreate(**PATIENT)])[0]
+        AppointmentService(db).repository.bulk_create([AppointmentCreate(**{**BOOKING, "patient_id": patient.id})])
+        db.commit()
+
+    _with_store(directory, write)
+    appointments_path = os.path.join(directory, "appointments.log")
+    assert os.path.getsize(appointments_path) > 0
+    # A crash before the commit record reached the disk
+    with open(commits_path, "r+b") as commits:
+        commits.truncate(committed)
+
+    def reopen(db):
+        assert [patient.id for patient in PatientService(db).get_all_patients(1, 10)] == [1]
+        assert AppointmentService(db).get_all_appointments(1, 10) == []
+
+    _with_store(directory, reopen)
+    assert os.path.getsize(appointments_path) == 0
+
+
+def test_a_second_process_cannot_open_the_store(tmp_path):
+    store = FileStore(str(tmp_path))
+    try:
+        with pytest.raises(RuntimeError, match="another process"):
+            FileStore(str(tmp_path))
+    finally:
+        store.close()
+    FileStore(str(tmp_path)).close()
+
+
+def test_sql_only_endpoints_are_refused_in_file_mode(client, monkeypatch):
+    monkeypatch.setattr(file_database, "STORAGE_BACKEND", "file")
+    assert client.get("/stats/patients/1/medical-records").status_code == 501
+    assert client.get("/admin/archive/patients/1").status_code == 501
+    assert client.get("/appointments/export").status_code == 501
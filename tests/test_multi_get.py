@@ -0,0 +1,43 @@
+import pytest
+from models.patient import Patient
+from schemas.page import MAX_IDS
+from utils.entity_cache import get_entity_cache
+from conftest import DOCTOR, PATIENT
+
+
+def _ids(*ids) -> dict:
+    return {"ids": ",".join(str(id) for id in ids)}
+
+
+def test_items_follow_the_requested_order_and_missing_lists_the_rest(client):
+    ids = [result["id"] for result in client.post("/patients/bulk", json=[PATIENT] * 4).json()["results"]]
+    client.delete(f"/patients/{ids[1]}")
+    # A cached row between rows read from the database keeps its place
+    client.get(f"/patients/{ids[0]}")
+    assert get_entity_cache(Patient).get(ids[0]) is not None
+
+    body = client.get("/patients/", params=_ids(ids[3], 999, ids[0], ids[1], ids[2], ids[3])).json()
+    # Repeated IDs are answered once, at their first position
+    assert [patient["id"] for patient in body["items"]] == [ids[3], ids[0], ids[2]]
+    assert body["items"][0]["full_name"] == PATIENT["full_name"]
+    assert body["missing"] == [999, ids[1]]
+
+
+def test_ids_take_precedence_over_paging(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    doctor_ids = [result["id"] for result in client.post("/doctors/bulk", json=[DOCTOR] * 3).json()["results"]]
+    booked = client.post("/appointments/bulk", json=[
+        {"patient_id": patient_id, "doctor_id": doctor_id, "date_time": "2025-06-02T10:00:00", "status": "Scheduled"}
+        for doctor_id in doctor_ids
+    ]).json()["results"]
+    appointments = [result["id"] for result in booked]
+    response = client.get("/appointments/", params={**_ids(appointments[2], appointments[0]), "page_size": 1})
+    assert [appointment["id"] for appointment in response.json()["items"]] == [appointments[2], appointments[0]]
+    assert "X-Next-Cursor" not in response.headers
+    body = client.get("/doctors/", params=_ids(doctor_ids[1], 0)).json()
+    assert ([doctor["id"] for doctor in body["items"]], body["missing"]) == ([doctor_ids[1]], [0])
+
+
+@pytest.mark.parametrize("ids", ["", "1,a", ",", ",".join(str(id) for id in range(1, MAX_IDS + 2))])
+def test_malformed_empty_or_long_lists_are_rejected(client, ids):
+    assert client.get("/patients/", params={"ids": ids}).status_code == 400
@@ -0,0 +1,57 @@
+import pytest
+from utils.pagination import encode_cursor
+from conftest import DOCTOR, PATIENT
+
+SAME_TIME = "2025-06-02T10:00:00"
+
+
+# Five appointments at the same time, one per doctor, so only the id orders them
+@pytest.fixture
+def appointment_ids(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    doctors = client.post("/doctors/bulk", json=[{**DOCTOR, "full_name": f"Doctor {i}"} for i in range(5)]).json()["results"]
+    bookings = [
+        {"patient_id": patient_id, "doctor_id": doctor["id"], "date_time": SAME_TIME, "status": "Scheduled"}
+        for doctor in doctors
+    ]
+    results = client.post("/appointments/bulk", json=bookings).json()["results"]
+    return [result["id"] for result in results]
+
+
+# Follows X-Next-Cursor from the first page, returning the ids of each page
+def _walk(client, path: str, page_size: int) -> list:
+    pages = []
+    response = client.get(path, params={"page_size": page_size})
+    while True:
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        response = client.get(path, params={"page_size": page_size, "cursor": cursor})
+
+
+def test_pages_keep_a_stable_order_when_times_are_equal(client, appointment_ids):
+    pages = _walk(client, "/appointments/", 2)
+    assert pages == [sorted(appointment_ids)[:2], sorted(appointment_ids)[2:4], sorted(appointment_ids)[4:]]
+
+
+def test_the_last_page_has_no_cursor(client, appointment_ids):
+    # A full last page still gets a cursor; the empty page after it does not
+    assert _walk(client, "/appointments/", 5) == [sorted(appointment_ids), []]
+    assert _walk(client, "/appointments/", 6) == [sorted(appointment_ids)]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor(1),
+    encode_cursor("yesterday", 1),
+])
+def test_malformed_cursors_are_rejected(client, cursor):
+    response = client.get("/appointments/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_patient_pages_follow_the_id(client):
+    ids = [result["id"] for result in client.post("/patients/bulk", json=[PATIENT] * 3).json()["results"]]
+    assert _walk(client, "/patients/", 2) == [ids[:2], ids[2:]]
@@ -0,0 +1,55 @@
+import pytest
+from models.file_database import FileSession, FileStore
+from repositories.file_patient_repository import FilePatientRepository
+from schemas.patient import PatientCreate
+from utils.trigrams import query_trigrams
+from conftest import PATIENT
+
+NAMES = ["Anna Brown", "Zed Al", "Alice Mensah", "Kwame Ali", "Ana Nan"]
+
+# Query -> the names it must find, and no others
+CASES = [
+    ("al", ["Zed Al", "Alice Mensah", "Kwame Ali"]),
+    ("an", ["Anna Brown", "Ana Nan"]),
+    ("a", ["Anna Brown", "Zed Al", "Alice Mensah", "Kwame Ali", "Ana Nan"]),
+    # "Ana Nan" has every trigram of "anan" but does not contain it
+    ("anan", []),
+    ("ana nan", ["Ana Nan"]),
+    ("ali", ["Alice Mensah", "Kwame Ali"]),
+    ("men", ["Alice Mensah"]),
+    ("zed al", ["Zed Al"]),
+]
+
+
+@pytest.fixture
+def file_session(tmp_path):
+    store = FileStore(str(tmp_path))
+    session = FileSession(store)
+    try:
+        yield session
+    finally:
+        session.close()
+        store.close()
+
+
+def test_short_words_require_their_word_start_trigram():
+    assert query_trigrams("a") == ({"  a"}, {"  a"})
+    assert query_trigrams("al") == ({"  a", " al"}, {" al"})
+    assert query_trigrams("ali")[1] == {"ali"}
+
+
+@pytest.mark.parametrize("query,expected", CASES)
+def test_search(client, query, expected):
+    response = client.post("/patients/bulk", json=[{**PATIENT, "full_name": name} for name in NAMES])
+    assert response.status_code == 200
+    found = [patient["full_name"] for patient in client.get("/patients/search", params={"q": query}).json()]
+    assert sorted(found) == sorted(expected)
+
+
+@pytest.mark.parametrize("query,expected", CASES)
+def test_file_store_search(file_session, query, expected):
+    repository = FilePatientRepository(file_session)
+    repository.bulk_create([PatientCreate(**{**PATIENT, "full_name": name}) for name in NAMES])
+    file_session.commit()
+    found = [patient.full_name for patient, _ in repository.search_index.search(query)]
+    assert sorted(found) == sorted(expected)
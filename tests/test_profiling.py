@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import pytest
+from middleware import profiling as profiling_middleware
+from utils import profiling
+
+TOKEN = "profile-secret"
+
+
+@pytest.fixture
+def profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", TOKEN)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+
+def _profile(client, request_id: str) -> str:
+    response = client.get("/", headers={"X-Profile-Token": TOKEN, "X-Request-ID": request_id})
+    return response.headers["X-Profile-Id"]
+
+
+def test_profile_endpoints_require_the_token(client, profiles):
+    profile_id = _profile(client, "abc")
+    assert client.get("/internal/profiles").status_code == 403
+    assert client.get(f"/internal/profiles/{profile_id}").status_code == 403
+    assert client.get("/internal/profiles", headers={"X-Profile-Token": "wrong"}).status_code == 403
+    listed = client.get("/internal/profiles", headers={"X-Profile-Token": TOKEN}).json()["profiles"]
+    assert [profile["id"] for profile in listed] == [profile_id]
+    download = client.get(f"/internal/profiles/{profile_id}", params={"format": "json"}, headers={"X-Profile-Token": TOKEN})
+    assert download.json()["id"] == profile_id
+
+
+def test_profile_endpoints_are_off_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", None)
+    assert client.get("/internal/profiles", headers={"X-Profile-Token": ""}).status_code == 403
+
+
+def test_a_reused_request_id_does_not_overwrite_a_profile(client, profiles):
+    first = _profile(client, "same-id")
+    second = _profile(client, "same-id")
+    assert first != second
+    assert first.startswith("same-id-") and second.startswith("same-id-")
+    listed = client.get("/internal/profiles", headers={"X-Profile-Token": TOKEN}).json()["profiles"]
+    assert {profile["id"] for profile in listed} == {first, second}
+
+
+def test_unsafe_request_ids_are_replaced(client, profiles):
+    assert "/" not in _profile(client, "../../etc/passwd")
+
+
+def test_profiles_are_saved_off_the_event_loop(client, profiles, monkeypatch):
+    saved = []
+
+    def save_profile(profile):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        saved.append(profile.id)
+        profiling.save_profile(profile)
+
+    monkeypatch.setattr(profiling_middleware, "save_profile", save_profile)
+    assert saved == [_profile(client, "abc")]
+
+
+def test_requests_past_the_active_limit_are_not_profiled(client, profiles, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(profiling, "_active_slots", slots)
+    slots.acquire()
+    response = client.get("/", headers={"X-Profile-Token": TOKEN})
+    assert response.status_code == 200 and "X-Profile-Id" not in response.headers
+    slots.release()
+    assert _profile(client, "abc")
@@ -0,0 +1,110 @@
+import json
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from middleware.query_stats import track_request_queries
+from models.database import SessionLocal
+from models.patient import Patient
+from repositories.patient_repository import PatientRepository
+from utils.query_stats import QUERY_REPEAT_LIMIT, QUERY_STATS_STRICT, RepeatedQueryError, track_queries
+from conftest import DOCTOR, PATIENT
+
+BATCH = 50
+
+
+def _create_patients(client, count: int) -> list:
+    response = client.post("/patients/bulk", json=[{**PATIENT, "full_name": f"Patient {i}"} for i in range(count)])
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()["results"]]
+
+
+def test_strict_mode_is_on_for_the_tests():
+    assert QUERY_STATS_STRICT
+
+
+def test_select_per_row_is_an_n_plus_one(client, db):
+    ids = _create_patients(client, QUERY_REPEAT_LIMIT + 1)
+    repository = PatientRepository(db)
+    with pytest.raises(RepeatedQueryError):
+        with track_queries(strict=True):
+            for id in ids:
+                repository._get_live(id)
+
+
+def test_insert_per_row_is_an_n_plus_one(db):
+    with pytest.raises(RepeatedQueryError, match="INSERT INTO patients"):
+        with track_queries(strict=True):
+            for i in range(QUERY_REPEAT_LIMIT + 1):
+                db.add(Patient(**PATIENT))
+                db.flush()
+    db.rollback()
+
+
+def test_repeats_are_only_reported_when_not_strict(db):
+    with track_queries(strict=False) as stats:
+        for i in range(QUERY_REPEAT_LIMIT + 1):
+            PatientRepository(db)._get_live(i)
+    assert [count for _, count in stats.repeated()] == [QUERY_REPEAT_LIMIT + 1]
+    assert stats.as_log_fields()["repeated"][0]["count"] == QUERY_REPEAT_LIMIT + 1
+
+
+# The batched paths run through the strict middleware, which fails the request on a repeat
+def test_batched_paths_pass_the_strict_check(client):
+    patient_ids = _create_patients(client, BATCH)
+    doctors = client.post("/doctors/bulk", json=[{**DOCTOR, "full_name": f"Doctor {i}"} for i in range(BATCH)])
+    assert doctors.status_code == 200
+    doctor_id = doctors.json()["results"][0]["id"]
+    appointments = client.post("/appointments/bulk", json=[
+        {"patient_id": patient_id, "doctor_id": doctor_id, "date_time": datetime(2025, 6, 2, 8 + i // 4, i % 4 * 15).isoformat(),
+         "duration_minutes": 15, "status": "Scheduled"}
+        for i, patient_id in enumerate(patient_ids)
+    ])
+    assert appointments.status_code == 200 and appointments.json()["created"] == BATCH
+    records = client.post("/medical-records/bulk", json=[
+        {"patient_id": patient_id, "diagnosis": "Flu", "prescriptions": "Rest",
+         "treatment_date": "2025-06-02T09:00:00", "doctor_notes": "Review in a week"}
+        for patient_id in patient_ids
+    ])
+    assert records.status_code == 200 and records.json()["created"] == BATCH
+    ids = ",".join(str(id) for id in patient_ids)
+    assert len(client.get("/patients/", params={"ids": ids}).json()["items"]) == BATCH
+    assert len(client.get("/patients/", params={"page_size": BATCH}).json()) == BATCH
+    assert client.get(f"/patients/{patient_ids[0]}/timeline").status_code == 200
+
+
+
+# An app whose streamed body runs its queries after the first chunk, as an export does
+# while its cursor is read, so after the response head has gone out
+@pytest.fixture
+def streaming_client():
+    app = FastAPI()
+    app.middleware("http")(track_request_queries)
+
+    @app.get("/stream")
+    def stream(queries: int = 1):
+        def body():
+            yield b"["
+            with SessionLocal() as db:
+                for i in range(queries):
+                    db.execute(select(Patient.id).where(Patient.id == i)).all()
+            yield b"]"
+
+        return StreamingResponse(body())
+
+    return TestClient(app)
+
+
+def test_streamed_queries_are_logged_after_the_body(streaming_client, caplog):
+    with caplog.at_level("INFO", logger="middleware.query_stats"):
+        response = streaming_client.get("/stream")
+    assert response.content == b"[]"
+    logged = [json.loads(record.getMessage()) for record in caplog.records if record.name == "middleware.query_stats"]
+    assert [(entry["route"], entry["queries"]) for entry in logged] == [("/stream", 1)]
+
+
+def test_streamed_queries_are_checked_for_repeats(streaming_client):
+    with pytest.raises(RepeatedQueryError):
+        streaming_client.get("/stream", params={"queries": QUERY_REPEAT_LIMIT + 1})
@@ -0,0 +1,99 @@
+import shutil
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select, update
+from models.database import engine
+from models.patient import Patient
+from schemas.patient import PatientCreate, PatientUpdate
+from services.patient_service import PatientService
+from utils.entity_cache import get_entity_cache
+from utils.replicas import ReplicaSet, RoutingSession
+from conftest import DATABASE_PATH, PATIENT
+
+PRIMARY_NAME = PATIENT["full_name"]
+REPLICA_NAME = "Replica Copy"
+
+
+# A primary with one patient and a replica copied from it, whose copy of the patient is
+# renamed so that reads served by the replica can be told apart
+@pytest.fixture
+def replica_url(tmp_path):
+    with RoutingSession(bind=engine, expire_on_commit=False) as db:
+        PatientService(db).create_patient(PatientCreate(**PATIENT))
+    replica_path = tmp_path / "replica.db"
+    shutil.copyfile(DATABASE_PATH, replica_path)
+    url = f"sqlite:///{replica_path}"
+    replica = create_engine(url)
+    with replica.begin() as connection:
+        connection.execute(update(Patient).values(full_name=REPLICA_NAME))
+    replica.dispose()
+    return url
+
+
+def _session(replicas: ReplicaSet) -> RoutingSession:
+    return RoutingSession(bind=engine, replicas=replicas, expire_on_commit=False, autoflush=False)
+
+
+def test_read_only_methods_read_from_the_replica(replica_url):
+    replicas = ReplicaSet([create_engine(replica_url)])
+    with _session(replicas) as db:
+        assert PatientService(db).get_patient(1).full_name == REPLICA_NAME
+        # Outside a read-only method the session stays on the primary
+        assert db.scalar(select(Patient.full_name).where(Patient.id == 1)) == PRIMARY_NAME
+    assert replicas.stats()[0]["reads"] == 1
+
+
+def test_no_replicas_reads_the_primary(replica_url):
+    with _session(ReplicaSet([])) as db:
+        assert PatientService(db).get_patient(1).full_name == PRIMARY_NAME
+
+
+@pytest.mark.parametrize("write", [
+    pytest.param(lambda db: (db.add(Patient(**PATIENT)), db.flush()), id="flush"),
+    pytest.param(lambda db: db.execute(update(Patient).where(Patient.id == 1).values(age=41)), id="dml"),
+    pytest.param(lambda db: db.execute(select(Patient.id).with_for_update()), id="for-update"),
+])
+def test_writes_pin_the_session_to_the_primary(replica_url, write):
+    with _session(ReplicaSet([create_engine(replica_url)])) as db:
+        write(db)
+        assert PatientService(db).get_patient(1).full_name == PRIMARY_NAME
+
+
+def test_a_request_reads_its_own_writes(replica_url):
+    with _session(ReplicaSet([create_engine(replica_url)])) as db:
+        service = PatientService(db)
+        service.update_patient(1, PatientUpdate(**{**PATIENT, "full_name": "Updated Name"}))
+        assert service.get_patient(1).full_name == "Updated Name"
+
+
+def test_unreachable_replica_falls_back_and_is_marked_down(replica_url, tmp_path):
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet([unreachable], retry_seconds=60)
+    with _session(replicas) as db:
+        assert PatientService(db).get_patient(1).full_name == PRIMARY_NAME
+    stats = replicas.stats()[0]
+    assert not stats["healthy"] and stats["failures"] == 1
+    # While it is down, reads go straight to the primary without trying it
+    get_entity_cache(Patient).invalidate(1)
+    with _session(replicas) as db:
+        assert PatientService(db).get_patient(1).full_name == PRIMARY_NAME
+    assert replicas.stats()[0]["reads"] == 1
+    assert replicas.pick() is None
+
+
+def test_other_errors_do_not_mark_the_replica_down(replica_url):
+    replicas = ReplicaSet([create_engine(replica_url)])
+    with _session(replicas) as db:
+        with pytest.raises(HTTPException):
+            PatientService(db).get_patient(2)
+    assert replicas.stats()[0]["healthy"] and replicas.stats()[0]["failures"] == 0
+
+
+def test_replica_rows_do_not_enter_the_entity_cache(replica_url):
+    cache = get_entity_cache(Patient)
+    with _session(ReplicaSet([create_engine(replica_url)])) as db:
+        PatientService(db).get_patient(1)
+    assert cache.get(1) is None
+    with _session(ReplicaSet([])) as db:
+        PatientService(db).get_patient(1)
+    assert cache.get(1).full_name == PRIMARY_NAME
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from utils.scheduling import MAX_APPOINTMENT_MINUTES, IntervalIndex
+from conftest import DOCTOR, PATIENT
+
+DAY = datetime(2025, 6, 2)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return DAY.replace(hour=hour, minute=minute)
+
+
+# Booked: 9:00-10:00 (1), 10:30-11:00 (2), and a maximal booking starting at 12:00 (3)
+@pytest.fixture
+def index():
+    return IntervalIndex([
+        (_at(10, 30), _at(11), 2),
+        (_at(9), _at(10), 1),
+        (_at(12), _at(12) + timedelta(minutes=MAX_APPOINTMENT_MINUTES), 3),
+    ])
+
+
+@pytest.mark.parametrize("start,end,expected", [
+    # Intervals are half open, so touching ones do not overlap
+    (_at(8), _at(9), None),
+    (_at(10), _at(10, 30), None),
+    (_at(8, 30), _at(9, 1), 1),
+    (_at(9, 15), _at(9, 45), 1),
+    (_at(8), _at(11), 2),
+    # Found although it started the longest allowed booking before this interval
+    (_at(19, 30), _at(20), 3),
+    (_at(20), _at(21), None),
+])
+def test_find_overlap(index, start, end, expected):
+    assert index.find_overlap(start, end) == expected
+
+
+def test_an_update_does_not_overlap_itself(index):
+    assert index.find_overlap(_at(9, 30), _at(10, 30), exclude_id=1) is None
+    assert index.find_overlap(_at(9, 30), _at(10, 45), exclude_id=1) == 2
+
+
+def test_aware_datetimes_compare_as_naive(index):
+    assert index.find_overlap(_at(9, 15).replace(tzinfo=timezone.utc), _at(9, 45).replace(tzinfo=timezone.utc)) == 1
+
+
+def test_free_slots_skip_any_partly_booked_slot(index):
+    index.add(_at(11, 10), _at(11, 20), 4)
+    slots = index.free_slots(_at(8, 30), _at(12, 10), 30)
+    # The 12:00 booking takes 12:00 on; the window's 10 minute tail is not a whole slot
+    assert [start for start, _ in slots] == [_at(8, 30), _at(10), _at(11, 30)]
+    assert all(end - start == timedelta(minutes=30) for start, end in slots)
+
+
+def test_free_slots_of_an_empty_schedule_cover_the_window():
+    slots = IntervalIndex().free_slots(_at(9), _at(10), 20)
+    assert slots == [(_at(9), _at(9, 20)), (_at(9, 20), _at(9, 40)), (_at(9, 40), _at(10))]
+
+
+def test_availability_and_rescheduling_through_the_api(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    doctor_id = client.post("/doctors/", json=DOCTOR).json()["id"]
+    booking = {"patient_id": patient_id, "doctor_id": doctor_id, "date_time": "2025-06-02T10:00:00",
+               "duration_minutes": 60, "status": "Scheduled"}
+    appointment_id = client.post("/appointments/", json=booking).json()["id"]
+    slots = client.get(
+        f"/doctors/{doctor_id}/availability",
+        params={"from": "2025-06-02T09:00:00", "to": "2025-06-02T12:00:00", "slot": 60},
+    ).json()["slots"]
+    assert [slot["start"] for slot in slots] == ["2025-06-02T09:00:00", "2025-06-02T11:00:00"]
+
+    # Moving a booking onto part of its own old time is not a clash
+    moved = client.put(f"/appointments/{appointment_id}", json={**booking, "date_time": "2025-06-02T10:30:00"})
+    assert moved.status_code == 200
+    clash = client.post("/appointments/", json={**booking, "date_time": "2025-06-02T11:00:00"})
+    assert clash.status_code == 400
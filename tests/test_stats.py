@@ -0,0 +1,79 @@
+from sqlalchemy import delete, update
+from models.appointment_count import AppointmentCount
+from models.appointment_day_count import AppointmentDayCount
+from models.patient_record_count import PatientRecordCount
+from services.stats_service import StatsService
+from conftest import DOCTOR, PATIENT
+
+JUNE = {"from": "2025-06-01", "to": "2025-06-30"}
+RECORD = {"diagnosis": "Flu", "prescriptions": "Rest", "treatment_date": "2025-06-02T09:00:00", "doctor_notes": "Rest"}
+
+
+# The non-zero counts of a stats response, per day and status
+def _counts(client, path: str) -> dict:
+    days = client.get(path, params=JUNE).json()["days"]
+    return {(day["day"], status): count for day in days for status, count in day["counts"].items() if count}
+
+
+# Two patients and doctors, three appointments and two records of the first patient
+def _history(client) -> tuple:
+    patients = [result["id"] for result in client.post("/patients/bulk", json=[PATIENT, PATIENT]).json()["results"]]
+    doctors = [result["id"] for result in client.post("/doctors/bulk", json=[DOCTOR, DOCTOR]).json()["results"]]
+    bookings = [
+        {"patient_id": patients[0], "doctor_id": doctor, "date_time": time, "status": status}
+        for doctor, time, status in [
+            (doctors[0], "2025-06-02T10:00:00", "Scheduled"),
+            (doctors[0], "2025-06-02T11:00:00", "Scheduled"),
+            (doctors[1], "2025-06-03T10:00:00", "Completed"),
+        ]
+    ]
+    appointments = [result["id"] for result in client.post("/appointments/bulk", json=bookings).json()["results"]]
+    records = [
+        result["id"]
+        for result in client.post("/medical-records/bulk", json=[{**RECORD, "patient_id": patients[0]}] * 2).json()["results"]
+    ]
+    return patients, doctors, bookings, appointments, records
+
+
+def _record_count(client, patient_id: int) -> int:
+    return client.get(f"/stats/patients/{patient_id}/medical-records").json()["medical_records"]
+
+
+def test_counts_follow_creates_updates_and_deletes(client):
+    patients, doctors, bookings, appointments, records = _history(client)
+    assert _counts(client, "/stats/appointments") == {("2025-06-02", "Scheduled"): 2, ("2025-06-03", "Completed"): 1}
+    assert _record_count(client, patients[0]) == 2
+
+    # Moves to another doctor, day and status at once
+    moved = {**bookings[1], "doctor_id": doctors[1], "date_time": "2025-06-03T11:00:00", "status": "Completed"}
+    assert client.put(f"/appointments/{appointments[1]}", json=moved).status_code == 200
+    assert _counts(client, "/stats/appointments") == {("2025-06-02", "Scheduled"): 1, ("2025-06-03", "Completed"): 2}
+    assert _counts(client, f"/stats/doctors/{doctors[0]}/appointments") == {("2025-06-02", "Scheduled"): 1}
+    client.delete(f"/appointments/{appointments[0]}")
+    stats = client.get("/stats/appointments", params=JUNE).json()
+    assert [day["day"] for day in stats["days"]] == ["2025-06-03"]
+    assert stats["total"] == 2
+
+    client.put(f"/medical-records/{records[1]}", json={**RECORD, "patient_id": patients[1]})
+    assert (_record_count(client, patients[0]), _record_count(client, patients[1])) == (1, 1)
+    client.delete(f"/medical-records/{records[0]}")
+    assert _record_count(client, patients[0]) == 0
+
+
+def test_rebuild_repairs_drifted_counts(client, db):
+    patients, doctors, _, appointments, _ = _history(client)
+    client.delete(f"/appointments/{appointments[0]}")
+    expected = _counts(client, "/stats/appointments")
+    # Drift: a lost row, a wrong total and a stray count
+    db.execute(delete(AppointmentDayCount))
+    db.execute(update(AppointmentCount).values(total=AppointmentCount.total + 5))
+    db.execute(update(PatientRecordCount).values(total=7))
+    db.add(PatientRecordCount(patient_id=patients[1], total=3))
+    db.commit()
+    assert _counts(client, "/stats/appointments") == {}
+
+    rebuilt = StatsService(db).rebuild()
+    assert rebuilt == {"appointment_counts": 2, "appointment_day_counts": 2, "patient_record_counts": 1}
+    assert _counts(client, "/stats/appointments") == expected
+    assert _counts(client, f"/stats/doctors/{doctors[0]}/appointments") == {("2025-06-02", "Scheduled"): 1}
+    assert (_record_count(client, patients[0]), _record_count(client, patients[1])) == (2, 0)
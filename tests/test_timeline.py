@@ -0,0 +1,70 @@
+from conftest import DOCTOR, PATIENT
+
+RECORD = {"diagnosis": "Flu", "prescriptions": "Rest", "doctor_notes": "Review in a week"}
+
+
+# Follows X-Next-Cursor through a patient's timeline, returning (kind, id) per entry
+def _walk(client, patient_id: int, page_size: int) -> list:
+    entries = []
+    params = {"page_size": page_size}
+    while True:
+        response = client.get(f"/patients/{patient_id}/timeline", params=params)
+        entries.extend((entry["kind"], entry["id"]) for entry in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            return entries
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+
+def test_entries_are_newest_first_then_records_then_newest_id(client):
+    patient_id, other_id = [result["id"] for result in client.post("/patients/bulk", json=[PATIENT, PATIENT]).json()["results"]]
+    doctor_ids = [result["id"] for result in client.post("/doctors/bulk", json=[DOCTOR, DOCTOR]).json()["results"]]
+    booked = client.post("/appointments/bulk", json=[
+        {"patient_id": patient, "doctor_id": doctor, "date_time": time, "status": "Scheduled"}
+        for patient, doctor, time in [
+            (patient_id, doctor_ids[0], "2025-06-02T10:00:00"),
+            (patient_id, doctor_ids[1], "2025-06-02T10:00:00"),
+            (patient_id, doctor_ids[0], "2025-06-02T11:00:00"),
+            (other_id, doctor_ids[1], "2025-06-02T12:00:00"),
+        ]
+    ]).json()["results"]
+    appointments = [result["id"] for result in booked]
+    written = client.post("/medical-records/bulk", json=[
+        {**RECORD, "patient_id": patient, "treatment_date": time}
+        for patient, time in [
+            (patient_id, "2025-06-02T10:00:00"),
+            (patient_id, "2025-06-02T10:00:00"),
+            (patient_id, "2025-06-02T09:00:00"),
+            (patient_id, "2025-06-02T13:00:00"),
+        ]
+    ]).json()["results"]
+    records = [result["id"] for result in written]
+    client.delete(f"/medical-records/{records[3]}")
+
+    expected = [
+        ("appointment", appointments[2]),
+        # At equal times records come before appointments, each newest id first
+        ("medical_record", records[1]),
+        ("medical_record", records[0]),
+        ("appointment", appointments[1]),
+        ("appointment", appointments[0]),
+        ("medical_record", records[2]),
+    ]
+    assert _walk(client, patient_id, 100) == expected
+    # Page boundaries falling inside the run of equal times lose and repeat nothing
+    for page_size in (1, 2, 4):
+        assert _walk(client, patient_id, page_size) == expected
+
+
+def test_entries_carry_the_fields_of_their_kind(client):
+    patient_id = client.post("/patients/", json=PATIENT).json()["id"]
+    doctor_id = client.post("/doctors/", json=DOCTOR).json()["id"]
+    client.post("/appointments/", json={
+        "patient_id": patient_id, "doctor_id": doctor_id, "date_time": "2025-06-02T10:00:00", "status": "Scheduled",
+    })
+    client.post("/medical-records/", json={**RECORD, "patient_id": patient_id, "treatment_date": "2025-06-01T10:00:00"})
+    appointment, record = client.get(f"/patients/{patient_id}/timeline").json()
+    assert appointment["kind"] == "appointment" and appointment["doctor_id"] == doctor_id
+    assert "diagnosis" not in appointment
+    assert record["kind"] == "medical_record" and record["diagnosis"] == "Flu"
+    assert "doctor_id" not in record
+    assert client.get("/patients/999/timeline").status_code == 404
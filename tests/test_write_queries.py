@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from models.async_database import async_session, dispose_async_engine
+from models.database import SessionLocal, engine
+from models.doctor import Doctor
+from models.patient import Patient
+from repositories.write_path import consecutive_ids, insert_many
+from schemas.appointment import AppointmentCreate, AppointmentUpdate
+from schemas.doctor import DoctorCreate
+from schemas.medical_record import MedicalRecordCreate, MedicalRecordUpdate
+from schemas.patient import PatientCreate
+from services.appointment_service import AppointmentService
+from services.doctor_service import DoctorService
+from services.medical_record_service import MedicalRecordService
+from services.patient_service import PatientService
+from utils.query_stats import track_queries
+from utils.unit_of_work import UnitOfWork
+from conftest import DOCTOR, PATIENT
+
+# Statements each write runs on SQLite, which has INSERT/UPDATE ... RETURNING.
+# The summary count upserts (one per count table touched) are included.
+
+
+@pytest.fixture
+def people(db):
+    patient_id = PatientService(db).create_patient(PatientCreate(**PATIENT)).id
+    doctor_id = DoctorService(db).create_doctor(DoctorCreate(**DOCTOR)).id
+    return patient_id, doctor_id
+
+
+def _statements(call) -> int:
+    with track_queries(strict=True) as stats:
+        call()
+    return stats.count
+
+
+def _appointment(patient_id: int, doctor_id: int, hour: int) -> dict:
+    return {"patient_id": patient_id, "doctor_id": doctor_id, "date_time": datetime(2025, 6, 2, hour), "status": "Scheduled"}
+
+
+def test_appointment_writes(db, people):
+    service = AppointmentService(db)
+    created = []
+    # Booking check, INSERT, appointment_counts and appointment_day_counts upserts
+    assert _statements(
+        lambda: created.append(service.create_appointment(AppointmentCreate(**_appointment(*people, 10))))
+    ) == 4
+    id = created[0].id
+    # Booking check, count key read, UPDATE ... RETURNING; the counts stay on the same day and status
+    assert _statements(lambda: service.update_appointment(id, AppointmentUpdate(**_appointment(*people, 11)))) == 3
+    # Count key read, UPDATE, two count upserts
+    assert _statements(lambda: service.delete_appointment(id)) == 4
+
+
+def test_rejected_booking_stops_after_the_check(db, people):
+    service = AppointmentService(db)
+    service.create_appointment(AppointmentCreate(**_appointment(*people, 10)))
+    with track_queries() as stats:
+        with pytest.raises(HTTPException) as error:
+            service.create_appointment(AppointmentCreate(**_appointment(*people, 10)))
+    assert error.value.status_code == 400
+    assert stats.count == 1
+
+
+def test_medical_record_writes(db, people):
+    service = MedicalRecordService(db)
+    record = {
+        "patient_id": people[0],
+        "diagnosis": "Flu",
+        "prescriptions": "Rest",
+        "treatment_date": datetime(2025, 6, 2),
+        "doctor_notes": "Review in a week",
+    }
+    created = []
+    # INSERT ... SELECT guarded by the patient, patient_record_counts upsert
+    assert _statements(lambda: created.append(service.create_medical_record(MedicalRecordCreate(**record)))) == 2
+    id = created[0].id
+    # Old patient read, UPDATE ... RETURNING with the patient guard; the patient is unchanged
+    assert _statements(lambda: service.update_medical_record(id, MedicalRecordUpdate(**{**record, "diagnosis": "Cold"}))) == 2
+    # Old patient read, UPDATE, patient_record_counts upsert
+    assert _statements(lambda: service.delete_medical_record(id)) == 3
+
+
+def test_medical_record_for_a_missing_patient(db, people):
+    service = MedicalRecordService(db)
+    record = MedicalRecordCreate(
+        patient_id=people[0] + 1, diagnosis="Flu", prescriptions="Rest",
+        treatment_date=datetime(2025, 6, 2), doctor_notes="Review in a week",
+    )
+    with track_queries() as stats:
+        with pytest.raises(HTTPException) as error:
+            service.create_medical_record(record)
+    assert error.value.status_code == 404
+    assert stats.count == 1
+
+
+@pytest.mark.parametrize("variables,expected", [
+    ({"auto_increment_increment": "1", "innodb_autoinc_lock_mode": "1"}, True),
+    ({"auto_increment_increment": "1", "innodb_autoinc_lock_mode": "0", "wsrep_on": "OFF"}, True),
+    ({"auto_increment_increment": "2", "innodb_autoinc_lock_mode": "1"}, False),
+    ({"auto_increment_increment": "1", "innodb_autoinc_lock_mode": "2"}, False),
+    ({"auto_increment_increment": "1", "innodb_autoinc_lock_mode": "1", "wsrep_on": "ON"}, False),
+])
+def test_multi_row_ids_need_consecutive_mysql_ids(variables, expected):
+    assert consecutive_ids(variables) is expected
+
+
+# Without RETURNING or known consecutive ids, each row gets an INSERT of its own
+def test_insert_many_without_returning_inserts_one_row_at_a_time(db, monkeypatch):
+    monkeypatch.setattr(engine.dialect, "insert_returning", False)
+    doctors = [{**DOCTOR, "full_name": name} for name in ("Kofi Boateng", "Esi Owusu", "Yaw Darko")]
+    with track_queries(strict=False) as stats:
+        inserted = insert_many(db, Doctor, doctors)
+    db.commit()
+    assert stats.count == 3
+    names = dict(db.execute(select(Doctor.id, Doctor.full_name)).all())
+    assert [names[doctor.id] for doctor in inserted] == ["Kofi Boateng", "Esi Owusu", "Yaw Darko"]
+
+
+def test_nested_units_of_work_commit_once(db):
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+    with UnitOfWork(db):
+        PatientService(db).create_patient(PatientCreate(**PATIENT))
+        DoctorService(db).create_doctor(DoctorCreate(**DOCTOR))
+        assert commits == []
+    assert len(commits) == 1
+
+
+def test_an_error_rolls_back_the_whole_unit_of_work(db):
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(db):
+            PatientService(db).create_patient(PatientCreate(**PATIENT))
+            raise RuntimeError("later step failed")
+    with SessionLocal() as reader:
+        assert reader.scalars(select(Patient.id)).all() == []
+
+
+def test_async_units_of_work_commit_once_or_roll_back():
+    async def write():
+        try:
+            async with async_session() as db:
+                commits = []
+                event.listen(db.sync_session, "after_commit", lambda session: commits.append(session))
+                async with UnitOfWork(db):
+                    async with UnitOfWork(db):
+                        db.add(Patient(**PATIENT))
+                    assert commits == []
+                assert len(commits) == 1
+                with pytest.raises(RuntimeError):
+                    async with UnitOfWork(db):
+                        db.add(Patient(**{**PATIENT, "full_name": "Kojo Asante"}))
+                        await db.flush()
+                        raise RuntimeError("later step failed")
+                assert len(commits) == 1
+        finally:
+            await dispose_async_engine()
+
+    asyncio.run(write())
+    with SessionLocal() as reader:
+        assert reader.scalars(select(Patient.full_name)).all() == [PATIENT["full_name"]]
@@ -0,0 +1,239 @@
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_session
+from sqlalchemy.orm import Session
+from models.database import SessionLocal
+from repositories.audit_repository import AuditRecord, AuditRepository
+from schemas.audit import AuditAction, AuditEntity
+from utils.unit_of_work import UnitOfWork, after_async_commit
+
+logger = logging.getLogger(__name__)
+
+# Changes are written to the audit log off the request path. Services stage a record in
+# the transaction that makes the change; once it commits the records join a bounded
+# queue, and one background writer appends whatever has queued up in a single
+# transaction (group commit), so a burst of writes costs one audit commit, not one each.
+# When the queue is full, committing requests wait for the writer to catch up instead
+# of dropping records or growing the queue without bound. Commits of an AsyncSession
+# (DB_MODE=async) wait too, but in a worker thread awaited after the unit of work
+# commits, so the event loop keeps serving other requests meanwhile.
+# The queue and writer belong to one process: with several workers each has its own, and
+# their entries join the shared chain in the order the writers append them.
+#   AUDIT_QUEUE_SIZE      records the queue holds before requests wait (default 10000)
+#   AUDIT_BATCH_SIZE      most records appended per transaction (default 500)
+#   AUDIT_RETRY_SECONDS   pause before retrying a batch whose write failed (default 1)
+#   AUDIT_WRITE_ATTEMPTS  attempts per batch before its records are logged and dropped (default 5)
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_RETRY_SECONDS = float(os.getenv("AUDIT_RETRY_SECONDS", "1"))
+AUDIT_WRITE_ATTEMPTS = int(os.getenv("AUDIT_WRITE_ATTEMPTS", "5"))
+
+# Session.info key holding the records staged in the session's current transaction
+_PENDING_RECORDS = "audit_pending_records"
+# Session.info key holding committed records of an AsyncSession that wait to be queued
+_COMMITTED_RECORDS = "audit_committed_records"
+
+# Queued after the last record to stop the writer
+_STOP = object()
+
+
+# AuditWriter owns the queue and the background writer thread. The thread starts with the
+# first record and close() drains the queue before it stops; it also runs at interpreter
+# exit for processes that never shut the application down.
+class AuditWriter:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._written = 0
+        self._batches = 0
+        self._waits = 0
+        self._dropped = 0
+
+    # Queue committed records, waiting for room while the queue is full.
+    # After close() there is no writer, so records are written in the caller's thread.
+    def submit(self, records: List[AuditRecord]) -> None:
+        if not self._start():
+            self._write(records)
+            return
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._waits += 1
+                self._queue.put(record)
+
+    # Async counterpart of submit: while the queue is full it waits for room in a worker
+    # thread, so the event loop is not blocked and the queue keeps its bound
+    async def submit_async(self, records: List[AuditRecord]) -> None:
+        if not self._start():
+            await asyncio.to_thread(self._write, records)
+            return
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._waits += 1
+                await asyncio.to_thread(self._queue.put, record)
+
+    # Wait until every record this process queued so far is written
+    def flush(self) -> None:
+        if self._thread is not None:
+            self._queue.join()
+
+    # Write out the queued records and stop the writer
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+        # Records a request queued while the writer was stopping
+        leftover = []
+        while not self._queue.empty():
+            leftover.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if leftover:
+            self._write(leftover)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "written": self._written,
+            "batches": self._batches,
+            "backpressure_waits": self._waits,
+            "dropped": self._dropped,
+        }
+
+    # Start the writer thread if needed; False once the writer has been closed
+    def _start(self) -> bool:
+        if self._thread is not None and not self._closed:
+            return True
+        with self._lock:
+            if self._closed:
+                return False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            return True
+
+    # Block for the first record, then take whatever else has queued up meanwhile
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            records = batch[:-1] if stop else batch
+            try:
+                if records:
+                    self._write(records)
+            except Exception:
+                # An error _write does not handle must not stop the writer: flush() and
+                # waiting submits would then hang forever
+                self._dropped += len(records)
+                logger.exception("Audit writer failed on a batch of %d records; they are dropped", len(records))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    # Append one batch in its own transaction, retrying failed writes. The records of a
+    # batch that keeps failing are logged in full so the entries can be replayed.
+    def _write(self, records: List[AuditRecord]) -> None:
+        for attempt in range(1, AUDIT_WRITE_ATTEMPTS + 1):
+            try:
+                with self.session_factory() as db, UnitOfWork(db):
+                    AuditRepository(db).append(records)
+                self._written += len(records)
+                self._batches += 1
+                return
+            except SQLAlchemyError:
+                logger.exception("Audit batch of %d records failed (attempt %d)", len(records), attempt)
+                if attempt < AUDIT_WRITE_ATTEMPTS:
+                    time.sleep(AUDIT_RETRY_SECONDS)
+        self._dropped += len(records)
+        for record in records:
+            logger.error("Audit record dropped: %s", json.dumps(record._asdict(), default=str))
+
+
+# This function stages a change made in db's current transaction. The record is queued
+# for the writer when the transaction commits and discarded if it rolls back.
+# changes is the row after the change; deletes pass None.
+def record_change(
+    db: Session,
+    patient_id: int,
+    entity: AuditEntity,
+    entity_id: int,
+    action: AuditAction,
+    changes: Optional[BaseModel] = None
+) -> None:
+    content = None
+    if changes is not None:
+        content = json.dumps(changes.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    record = AuditRecord(patient_id, entity.value, entity_id, action.value, content, datetime.now())
+    db.info.setdefault(_PENDING_RECORDS, []).append(record)
+
+
+# The process's audit writer; it appends on the primary database
+audit_writer = AuditWriter(SessionLocal)
+
+
+# These functions queue the records of a committed transaction and drop those of a
+# rolled back one. SQLAlchemy sessions call them from their events; the file store's
+# sessions call them from their own commit and rollback. The commit event of an
+# AsyncSession runs on the event loop and cannot wait, so its records are kept on the
+# session until the async unit of work hands them over with submit_committed.
+def queue_committed(db: Any) -> None:
+    records = db.info.pop(_PENDING_RECORDS, None)
+    if not records:
+        return
+    if isinstance(db, Session) and async_session(db) is not None:
+        db.info.setdefault(_COMMITTED_RECORDS, []).extend(records)
+    else:
+        audit_writer.submit(records)
+
+
+def discard_rolled_back(db: Any) -> None:
+    db.info.pop(_PENDING_RECORDS, None)
+
+
+# Queue the records an AsyncSession committed, waiting for room without blocking the loop
+@after_async_commit
+async def submit_committed(db: AsyncSession) -> None:
+    records = db.info.pop(_COMMITTED_RECORDS, None)
+    if records:
+        await audit_writer.submit_async(records)
+
+
+event.listen(Session, "after_commit", queue_committed)
+event.listen(Session, "after_rollback", discard_rolled_back)
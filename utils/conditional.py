@@ -0,0 +1,106 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+from fastapi import Request, Response
+
+# Conditional GET support. A row's validators come from its version: the ETag hashes the
+# table, id and version counter, which every write increments, and Last-Modified is the
+# time it last changed (date_updated, or date_created if it was never updated). Two
+# writes within one second, the precision of the date columns on MySQL and of HTTP
+# dates, still give different ETags. Clients revalidate
+# with If-None-Match / If-Modified-Since and get a 304 without a body when nothing changed.
+# ETags are weak: they follow the row version, not the bytes of one particular encoding.
+
+# Responses may be stored, but must be revalidated before each reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+# Validators of one response; last_modified is None where a date cannot be trusted
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+
+# A row's version counter and the time it last changed
+class RowVersion(NamedTuple):
+    number: int
+    changed_at: datetime
+
+
+# The version of a row or response model that has version, date_created and date_updated
+def version_of(row: Any) -> RowVersion:
+    return RowVersion(row.version, row.date_updated or row.date_created)
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return f'W/"{digest.hexdigest()}"'
+
+
+# Validators of one row. Change times are naive local times, as the columns store them.
+def entity_validators(table: str, id: int, version: RowVersion) -> Validators:
+    return Validators(_etag(table, id, version.number), version.changed_at)
+
+
+# Validators of one page of a list, from the (id, version counter) pairs of its rows in order.
+# A list has no Last-Modified: a soft-deleted row leaves the page without making any
+# remaining row newer, so only a change in the set of ids and versions shows it.
+def list_validators(table: str, rows: Iterable[Tuple[int, int]]) -> Validators:
+    return Validators(_etag(table, *(f"{id}@{version}" for id, version in rows)), None)
+
+
+# Whether the request carries a validator to check
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+# This function evaluates the request's preconditions against the current validators.
+# If-None-Match takes precedence over If-Modified-Since, as RFC 9110 requires, and is
+# compared weakly; If-Modified-Since is compared at the one second precision of HTTP dates.
+def not_modified(request: Request, validators: Validators) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque(validators.etag)
+        return any(_opaque(tag) == current for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _http_time(validators.last_modified) <= since
+
+
+# The opaque part of an entity tag, for weak comparison
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+# A naive local version as an aware UTC time, truncated to what an HTTP date can hold
+def _http_time(version: datetime) -> datetime:
+    return version.astimezone(timezone.utc).replace(microsecond=0)
+
+
+# This function puts the validators on a response
+def set_validators(response: Response, validators: Validators) -> None:
+    response.headers["ETag"] = validators.etag
+    if validators.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_http_time(validators.last_modified), usegmt=True)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+# A 304 Not Modified response carrying the current validators and no body
+def not_modified_response(validators: Validators) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, validators)
+    return response
@@ -0,0 +1,290 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+from sqlalchemy import DateTime, Enum, event
+from sqlalchemy.orm import Session
+from utils.replicas import read_from_replica
+
+# Session.info key holding cache entries to invalidate once the transaction commits
+_PENDING_INVALIDATIONS = "entity_cache_pending"
+
+
+# CacheBackend is the interface every entity cache backend implements.
+# Values are JSON-compatible dicts of column values, so backends that store them out of
+# process serialize them as JSON.
+class CacheBackend:
+    def get(self, key: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    # Values of several keys in one call, None for the missing ones; backends with a
+    # batch read override it so a multi-get costs one round trip
+    def get_many(self, keys: List[str]) -> List[Optional[Dict]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: Dict) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+# LocalCacheBackend keeps entries in process memory with LRU eviction and a TTL
+class LocalCacheBackend(CacheBackend):
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# RedisCacheBackend shares entries between worker processes through Redis, so a write
+# through one worker invalidates the entry for all of them. Entries are stored as JSON;
+# nothing read from Redis is unpickled. The redis package is only needed when this
+# backend is selected; client replaces the connection to url, as tests do.
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str, ttl: float = 60.0, prefix: str = "entity:", client: Any = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict]]:
+        raws = self.client.mget([self.prefix + key for key in keys])
+        return [json.loads(raw) if raw is not None else None for raw in raws]
+
+    def set(self, key: str, value: Dict) -> None:
+        raw = json.dumps(value, separators=(",", ":"))
+        self.client.set(self.prefix + key, raw, px=int(self.ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+# EntityCache caches one model's live rows by primary key on top of a backend.
+# Hits return a transient instance built from the cached columns; it is not attached
+# to any session, so callers must not modify it expecting the change to be saved.
+# Columns are cached as JSON values: datetimes in ISO format and enums by value.
+class EntityCache:
+    def __init__(self, backend: CacheBackend, model: Type):
+        self.backend = backend
+        self.model = model
+        self.namespace = model.__tablename__
+        columns = model.__table__.columns
+        self._columns = [column.key for column in columns]
+        self._datetimes = [column.key for column in columns if isinstance(column.type, DateTime)]
+        self._enums = {column.key: column.type.enum_class for column in columns if isinstance(column.type, Enum)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, id: int) -> str:
+        return f"{self.namespace}:{id}"
+
+    def get(self, id: int) -> Optional[Any]:
+        values = self.backend.get(self._key(id))
+        with self._lock:
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return self._instance(values) if values is not None else None
+
+    # Cached rows of several ids, by id; ids that are not cached are left out
+    def get_many(self, ids: List[int]) -> Dict[int, Any]:
+        found = {
+            id: self._instance(values)
+            for id, values in zip(ids, self.backend.get_many([self._key(id) for id in ids]))
+            if values is not None
+        }
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(ids) - len(found)
+        return found
+
+    # Rows read from a replica are not cached: a lagging replica could refill an entry
+    # that a write on the primary has just invalidated with the old row
+    def put(self, obj: Any) -> None:
+        if read_from_replica(obj):
+            return
+        self.backend.set(self._key(obj.id), self._values(obj))
+
+    def invalidate(self, id: int) -> None:
+        self.backend.delete(self._key(id))
+
+    # Drop the entry now and again after the session commits, so a reader that
+    # repopulates it before the commit cannot leave the pre-update row cached
+    def invalidate_on_commit(self, db: Session, id: int) -> None:
+        self.invalidate(id)
+        db.info.setdefault(_PENDING_INVALIDATIONS, []).append((self, id))
+
+    # The row's columns as a cache value
+    def _values(self, obj: Any) -> Dict:
+        values = {key: getattr(obj, key) for key in self._columns}
+        for key in self._datetimes:
+            if values[key] is not None:
+                values[key] = values[key].isoformat()
+        for key, enum_class in self._enums.items():
+            if values[key] is not None:
+                values[key] = enum_class(values[key]).value
+        return values
+
+    # A cache value as a transient instance
+    def _instance(self, values: Dict) -> Any:
+        values = dict(values)
+        for key in self._datetimes:
+            if values.get(key) is not None:
+                values[key] = datetime.fromisoformat(values[key])
+        for key, enum_class in self._enums.items():
+            if values.get(key) is not None:
+                values[key] = enum_class(values[key])
+        return self.model(**values)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# NullCache is used when caching is disabled; every lookup is a miss
+class NullCache(EntityCache):
+    def __init__(self, model: Type):
+        super().__init__(CacheBackend(), model)
+
+    def get(self, id: int) -> Optional[Any]:
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get_many(self, ids: List[int]) -> Dict[int, Any]:
+        with self._lock:
+            self.misses += len(ids)
+        return {}
+
+    def put(self, obj: Any) -> None:
+        pass
+
+    def invalidate(self, id: int) -> None:
+        pass
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(db: Session) -> None:
+    for cache, id in db.info.pop(_PENDING_INVALIDATIONS, []):
+        cache.invalidate(id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(db: Session) -> None:
+    db.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+# This function builds the backend selected by the environment.
+#   ENTITY_CACHE_BACKEND      local, redis or none. The default is local for one worker
+#                             process and redis when WEB_CONCURRENCY, the worker count
+#                             uvicorn and gunicorn read, asks for more. A local backend
+#                             cannot invalidate other workers' entries, so it is refused
+#                             with several workers.
+#   ENTITY_CACHE_TTL          seconds an entry stays valid (default 60)
+#   ENTITY_CACHE_MAX_ENTRIES  local backend capacity (default 10000)
+#   ENTITY_CACHE_REDIS_URL    Redis URL for the redis backend
+def _build_backend() -> Optional[CacheBackend]:
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    kind = os.getenv("ENTITY_CACHE_BACKEND", "redis" if workers > 1 else "local").lower()
+    ttl = float(os.getenv("ENTITY_CACHE_TTL", "60"))
+    if kind == "none":
+        return None
+    if kind == "redis":
+        return RedisCacheBackend(os.getenv("ENTITY_CACHE_REDIS_URL", "redis://localhost:6379/0"), ttl)
+    if kind == "local":
+        if workers > 1:
+            raise ValueError(f"ENTITY_CACHE_BACKEND=local cannot serve {workers} workers; use redis or none")
+        return LocalCacheBackend(int(os.getenv("ENTITY_CACHE_MAX_ENTRIES", "10000")), ttl)
+    raise ValueError(f"Unknown ENTITY_CACHE_BACKEND {kind!r}")
+
+
+_backend: Optional[CacheBackend] = None
+_backend_built = False
+_caches: Dict[str, EntityCache] = {}
+_caches_lock = threading.Lock()
+
+
+# This function builds the configured backend if it is not built yet. The application
+# calls it at startup, so a misconfigured backend fails there rather than on a request.
+def init_entity_cache() -> None:
+    with _caches_lock:
+        _init_backend()
+
+
+def _init_backend() -> None:
+    global _backend, _backend_built
+    if not _backend_built:
+        _backend = _build_backend()
+        _backend_built = True
+
+
+# This function returns the shared cache for a model, creating it on first use
+def get_entity_cache(model: Type) -> EntityCache:
+    cache = _caches.get(model.__tablename__)
+    if cache is not None:
+        return cache
+    with _caches_lock:
+        _init_backend()
+        cache = _caches.get(model.__tablename__)
+        if cache is None:
+            cache = EntityCache(_backend, model) if _backend is not None else NullCache(model)
+            _caches[model.__tablename__] = cache
+        return cache
+
+
+# This function reports hit and miss counters for every cache created so far
+def entity_cache_stats() -> Dict[str, Dict]:
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+# This function replaces the backend, used to plug in a custom or shared backend at startup
+def set_cache_backend(backend: Optional[CacheBackend]) -> None:
+    global _backend, _backend_built
+    with _caches_lock:
+        _backend, _backend_built = backend, True
+        _caches.clear()
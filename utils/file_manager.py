@@ -1,54 +1,260 @@
-# import json
-# import os
-# from datetime import datetime
-# from typing import List, Dict, Optional
-
-
-# # FileManager is a utility class for managing JSON files
-# # It provides methods to read, write, and manipulate data in a JSON file.
-# class FileManager:
-#     def __init__(self, file_path: str):
-#         self.file_path = file_path
-#         if not os.path.exists(file_path):
-#             with open(file_path, 'w') as f:
-#                 json.dump([], f)
-
-#     # This method reads data from the JSON file and returns it as a list of dictionaries.
-#     # It handles file reading and JSON parsing.
-#     def read_data(self) -> List[Dict]:
-#         with open(self.file_path, 'r') as f:
-#             return json.load(f)
-
-#     # This method writes data to the JSON file.
-#     # It takes a list of dictionaries and saves it to the file.
-#     def write_data(self, data: List[Dict]) -> None:
-#         with open(self.file_path, 'w') as f:
-#             json.dump(data, f, indent=4)
-
-#     # This method generates a new unique ID for a record.
-#     # It reads the existing data from the file and finds the maximum ID.
-#     def generate_id(self) -> int:
-#         data = self.read_data()
-#         if not data:
-#             return 1
-#         return max(record['id'] for record in data) + 1
-
-#     # This method creates a new record in the JSON file.
-#     # It generates a unique ID, adds the current timestamp, and appends the record to the file.
-#     def find_by_id(self, id: int) -> Optional[Dict]:
-#         data = self.read_data()
-#         for record in data:
-#             if record['id'] == id and record.get('date_deleted') is None:
-#                 return record
-#         return None
-
-#     # This method updates an existing record in the JSON file.
-#     # It finds the record by ID, updates its fields, and writes the updated data back to the file.
-#     def delete(self, id: int) -> bool:
-#         data = self.read_data()
-#         for record in data:
-#             if record['id'] == id and record.get('date_deleted') is None:
-#                 record['date_deleted'] = datetime.utcnow().isoformat()
-#                 self.write_data(data)
-#                 return True
-#         return False
\ No newline at end of file
+import json
+import os
+import threading
+import zlib
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# FileManager is an append-only record log holding one table of the embedded file backend.
+# Every write appends the row's whole new state as one line, "<crc32> <json>\n", and an
+# in-memory index maps each id to the offset and length of its latest line, so a lookup
+# is one positioned read and a write never rewrites what is already on disk.
+# Each append ends with a batch line, "<crc32> #<count> <txid>\n", closing its batch of
+# rows and naming the transaction that wrote it (logs from before transaction ids have
+# "#<count>" alone, read as transaction 0). Opening the log replays it to rebuild the
+# index, applying only complete batches of transactions up to last_commit, the last one
+# the store's CommitLog recorded; None applies every complete batch. A line whose
+# checksum does not match, the unterminated line a crash can leave at the end, or a
+# batch of a later transaction ends the replay and the log is truncated after the last
+# applied batch, so a torn write loses its whole transaction and nothing before it.
+# Superseded lines stay on disk until compact() rewrites the log with the latest line of
+# each id; the rewrite goes to a temporary file that atomically replaces the log.
+class FileManager:
+    def __init__(self, file_path: str, last_commit: Optional[int] = None):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._index: Dict[int, Tuple[int, int]] = {}
+        self._ids: List[int] = []
+        self._next_id = 1
+        self._size = 0
+        self._dead_bytes = 0
+        self._dirty = False
+        self._fd = os.open(file_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._replay(last_commit)
+
+    # Retrieve the latest state of a row by ID, deleted or not
+    def read(self, id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._index.get(id)
+            if entry is None:
+                return None
+            line = os.pread(self._fd, entry[1], entry[0])
+        return json.loads(line[9:])
+
+    # The ids in the log in ascending order, optionally only those above after_id
+    def ids(self, after_id: Optional[int] = None) -> List[int]:
+        with self._lock:
+            if after_id is None:
+                return list(self._ids)
+            return self._ids[bisect_right(self._ids, after_id):]
+
+    # Reserve count new ids; ids of writes that are never appended are not reused
+    def allocate_ids(self, count: int) -> range:
+        with self._lock:
+            first = self._next_id
+            self._next_id += count
+            return range(first, first + count)
+
+    # Append transaction txid's new state of each row in a single write; fsync=True also
+    # makes it durable before returning, otherwise sync() does so later
+    def append(self, rows: Iterable[Dict], txid: int, fsync: bool = True) -> None:
+        lines = [_encode(row) for row in rows]
+        if not lines:
+            return
+        batch_line = _batch_line(len(lines), txid)
+        with self._lock:
+            offset = self._size
+            os.write(self._fd, b"".join(line for _, line in lines) + batch_line)
+            for id, line in lines:
+                self._place(id, offset, len(line))
+                offset += len(line)
+            self._size = offset + len(batch_line)
+            self._dirty = True
+            if fsync:
+                os.fsync(self._fd)
+                self._dirty = False
+
+    # Flush appended lines to disk if any are not yet durable
+    def sync(self) -> None:
+        with self._lock:
+            if self._dirty:
+                os.fsync(self._fd)
+                self._dirty = False
+
+    # Whether superseded lines take up at least ratio of the log and min_bytes
+    def should_compact(self, ratio: float, min_bytes: int) -> bool:
+        with self._lock:
+            return self._dead_bytes >= min_bytes and self._dead_bytes >= self._size * ratio
+
+    # Rewrite the log with only the latest line of each id, as one batch of transaction
+    # txid, which must already be recorded as committed
+    def compact(self, txid: int) -> None:
+        with self._lock:
+            index, offset = {}, 0
+            with _rewrite(self.file_path) as temp:
+                for id in self._ids:
+                    position, length = self._index[id]
+                    temp.write(os.pread(self._fd, length, position))
+                    index[id] = (offset, length)
+                    offset += length
+                batch_line = _batch_line(len(self._ids), txid)
+                temp.write(batch_line)
+                offset += len(batch_line)
+            os.close(self._fd)
+            self._fd = os.open(self.file_path, os.O_RDWR | os.O_APPEND)
+            self._index, self._size, self._dead_bytes, self._dirty = index, offset, 0, False
+
+    def close(self) -> None:
+        self.sync()
+        with self._lock:
+            os.close(self._fd)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"rows": len(self._ids), "bytes": self._size, "dead_bytes": self._dead_bytes}
+
+    def _replay(self, last_commit: Optional[int]) -> None:
+        offset = committed = 0
+        pending: List[Tuple[int, int, int]] = []
+        with open(self.file_path, "rb") as log:
+            for line in log:
+                body = _checked_body(line)
+                if body is None:
+                    break
+                if body.startswith(b"#"):
+                    count, txid = _batch(body)
+                    if count != len(pending) or (last_commit is not None and txid > last_commit):
+                        break
+                    for id, position, length in pending:
+                        self._place(id, position, length)
+                    pending = []
+                    committed = offset + len(line)
+                else:
+                    pending.append((json.loads(body)["id"], offset, len(line)))
+                offset += len(line)
+        if committed < os.fstat(self._fd).st_size:
+            os.ftruncate(self._fd, committed)
+            os.fsync(self._fd)
+        self._size = committed
+
+    def _place(self, id: int, offset: int, length: int) -> None:
+        previous = self._index.get(id)
+        if previous is None:
+            if self._ids and id < self._ids[-1]:
+                self._ids.insert(bisect_right(self._ids, id), id)
+            else:
+                self._ids.append(id)
+            self._next_id = max(self._next_id, id + 1)
+        else:
+            self._dead_bytes += previous[1]
+        self._index[id] = (offset, length)
+
+
+# CommitLog records which transactions of a file store committed, one line per
+# transaction, "<crc32> <txid>\n". A transaction can write batches to several table
+# logs; its line is appended only once all of them are durable, so it is the single
+# commit record of the whole transaction, and replay applies a table's batches only up
+# to the last transaction recorded here. A torn line at the end is truncated. Callers
+# serialize appends; the store holds its commit lock around them.
+class CommitLog:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._fd = os.open(file_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self.last, self._size = self._replay()
+
+    # Record transaction txid as committed; fsync=True makes the record durable first
+    def append(self, txid: int, fsync: bool = True) -> None:
+        line = _line(b"%d" % txid)
+        os.write(self._fd, line)
+        if fsync:
+            os.fsync(self._fd)
+        self.last = txid
+        self._size += len(line)
+
+    # Whether the log has grown to at least min_bytes
+    def should_compact(self, min_bytes: int) -> bool:
+        return self._size >= min_bytes
+
+    # Rewrite the log as the record of the last committed transaction alone
+    def compact(self) -> None:
+        line = _line(b"%d" % self.last)
+        with _rewrite(self.file_path) as temp:
+            temp.write(line)
+        os.close(self._fd)
+        self._fd = os.open(self.file_path, os.O_RDWR | os.O_APPEND)
+        self._size = len(line)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    # The last committed transaction, 0 for a new log, and the size of the intact lines
+    def _replay(self) -> Tuple[int, int]:
+        last = size = 0
+        with open(self.file_path, "rb") as log:
+            for line in log:
+                body = _checked_body(line)
+                if body is None:
+                    break
+                last = int(body)
+                size += len(line)
+        if size < os.fstat(self._fd).st_size:
+            os.ftruncate(self._fd, size)
+            os.fsync(self._fd)
+        return last, size
+
+
+# One log line for a row: the CRC-32 of its JSON as 8 hex digits, a space, the JSON
+def _encode(row: Dict) -> Tuple[int, bytes]:
+    body = json.dumps(row, separators=(",", ":")).encode()
+    return row["id"], _line(body)
+
+
+# The line closing a batch of count rows written by transaction txid
+def _batch_line(count: int, txid: int) -> bytes:
+    return _line(b"#%d %d" % (count, txid))
+
+
+# The row count and transaction id of a batch line's body
+def _batch(body: bytes) -> Tuple[int, int]:
+    count, _, txid = body[1:].partition(b" ")
+    return int(count), int(txid or 0)
+
+
+# A log line carrying body: its CRC-32 as 8 hex digits, a space, the body
+def _line(body: bytes) -> bytes:
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+
+# The body of a complete, intact log line, or None for a torn or corrupt one
+def _checked_body(line: bytes) -> Optional[bytes]:
+    if not line.endswith(b"\n") or len(line) < 10:
+        return None
+    body = line[9:-1]
+    try:
+        return body if int(line[:8], 16) == zlib.crc32(body) else None
+    except ValueError:
+        return None
+
+
+# Write the replacement of a file to a temporary file, which atomically and durably
+# replaces the file once the block completes
+@contextmanager
+def _rewrite(file_path: str) -> Iterator[BinaryIO]:
+    temp_path = f"{file_path}.compact"
+    with open(temp_path, "wb") as temp:
+        yield temp
+        temp.flush()
+        os.fsync(temp.fileno())
+    os.replace(temp_path, file_path)
+    _fsync_directory(file_path)
+
+
+# Make a rename in the file's directory durable
+def _fsync_directory(file_path: str) -> None:
+    fd = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response
+
+# Header used to hand the opaque keyset cursor for the next page back to the client
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+# This function encodes the keyset values of the last row of a page into an opaque cursor.
+# Datetimes are stored as ISO strings so the cursor survives the JSON round trip.
+def encode_cursor(*values: Any) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+# This function decodes a cursor produced by encode_cursor back into its keyset values.
+# The caller passes the expected types so a tampered cursor is rejected with a 400.
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor has the wrong shape")
+        return [
+            datetime.fromisoformat(value) if expected is datetime else expected(value)
+            for value, expected in zip(payload, types)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# This function sets the next cursor header when the page is full.
+# A short page means the client reached the end, so no cursor is sent.
+def set_next_cursor(response: Response, items: Sequence[Any], page_size: int, *key_fields: str) -> Optional[str]:
+    if len(items) < page_size or not items:
+        return None
+    last = items[-1]
+    cursor = encode_cursor(*(getattr(last, field) for field in key_fields))
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
+
+
+# This function parses a comma separated list of IDs, dropping repeats but keeping the order.
+# More than limit distinct IDs, or anything that is not an ID, is rejected with a 400.
+def parse_ids(value: str, limit: int) -> List[int]:
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of integers")
+    if not ids:
+        raise HTTPException(status_code=400, detail="ids must name at least one ID")
+    if len(ids) > limit:
+        raise HTTPException(status_code=400, detail=f"ids cannot name more than {limit} IDs")
+    return ids
@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+# PoolMetrics collects checkout wait times and failures for one connection pool.
+# Counters are cumulative for the life of the worker process.
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_overflow_used = 0
+
+    # Record how long one checkout waited for a connection
+    def record_wait(self, pool: Pool, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self.max_overflow_used = max(self.max_overflow_used, max(pool.overflow(), 0))
+
+    # Snapshot of the counters together with the pool's live state
+    def snapshot(self, pool: Pool) -> Dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "max_overflow_used": self.max_overflow_used,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+# Mixin that times how long each checkout waits on the queue.
+# The metrics object is carried over when the pool is recreated by engine.dispose().
+class _TimedCheckoutMixin:
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(self, time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# This function reads an integer setting from the environment with a default
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+# This function reads a boolean setting from the environment with a default
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# This function builds the create_engine pool options from the environment.
+#   DB_POOL_SIZE       connections kept open per worker (default 5)
+#   DB_MAX_OVERFLOW    extra connections allowed under burst load (default 10)
+#   DB_POOL_TIMEOUT    seconds to wait for a free connection (default 30)
+#   DB_POOL_RECYCLE    seconds before a connection is replaced (default 1800, below MySQL's wait_timeout)
+#   DB_POOL_PRE_PING   test connections on checkout (default on)
+# In-memory SQLite keeps its single shared connection and only gets pre-ping.
+def engine_options(url, use_async: bool = False) -> Dict:
+    options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+    )
+    return options
+
+
+# This function attaches a fresh PoolMetrics to an engine's pool when it is instrumented
+def instrument_pool(pool: Pool) -> None:
+    if isinstance(pool, _TimedCheckoutMixin):
+        pool.metrics = PoolMetrics()
+
+
+# This function reports a pool's metrics, or only its class when it is not instrumented
+def pool_snapshot(pool: Pool) -> Dict:
+    if isinstance(pool, _TimedCheckoutMixin) and pool.metrics is not None:
+        return pool.metrics.snapshot(pool)
+    return {"pool_class": type(pool).__name__}
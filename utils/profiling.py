@@ -0,0 +1,267 @@
+import asyncio
+import functools
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+
+# Profiling is opt-in per request. A request is profiled when it sends PROFILE_TOKEN in
+# the X-Profile-Token header, or when it is picked by PROFILE_SAMPLE_RATE (0 to 1).
+#   PROFILE_TOKEN        shared secret that enables the header trigger and the profile
+#                        endpoints under /internal/profiles (unset disables both)
+#   PROFILE_SAMPLE_RATE  fraction of requests profiled without the header (default 0)
+#   PROFILE_INTERVAL_MS  stack sampling interval (default 2)
+#   PROFILE_DIR          where profiles are written (default <tmp>/patient-api-profiles)
+#   PROFILE_KEEP         how many recent profiles are kept (default 50)
+#   PROFILE_MAX_ACTIVE   how many requests one worker profiles at once (default 2); each
+#                        runs a sampler thread, so further requests go unprofiled
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "2")) / 1000
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "patient-api-profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_MAX_ACTIVE = int(os.getenv("PROFILE_MAX_ACTIVE", "2"))
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_active: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+# Code objects of the endpoint wrappers, used by the sampler to find a request's frames
+_WRAPPER_CODES = set()
+
+# Held by each profile from begin_profile until save_profile has written it
+_active_slots = threading.BoundedSemaphore(PROFILE_MAX_ACTIVE)
+
+
+# RequestProfile samples the call stacks of one request from a background thread.
+# Only frames below the profiled endpoint wrapper that belongs to this request are
+# kept, so concurrent requests on the same threads do not leak into the profile.
+# An async endpoint that is suspended is on no thread's stack; it is sampled through
+# its await chain instead, ending in an "(awaiting)" frame, so the profile shows wall
+# time spent waiting on the database too. Stacks are counted in the folded format
+# (root;...;leaf) that flamegraph.pl and speedscope read, starting at the router function.
+class RequestProfile:
+    def __init__(self, request_id: str, method: str, path: str):
+        self.id = request_id
+        self.method = method
+        self.path = path
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.awaiting = None
+        self.started_at = datetime.now()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{request_id}", daemon=True)
+        self._token = None
+        self._began = 0.0
+        self.duration = 0.0
+
+    # Make this the current request's profile and start sampling
+    def start(self) -> None:
+        self._token = _active.set(self)
+        self._began = time.perf_counter()
+        self._thread.start()
+
+    # Stop sampling and leave the request's context; the sampler thread ends on its own
+    def stop(self) -> None:
+        self.duration = time.perf_counter() - self._began
+        self._stop.set()
+        _active.reset(self._token)
+
+    # Wait for the sampler thread to finish after stop
+    def join(self) -> None:
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(PROFILE_INTERVAL):
+            self._sample()
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                if frame.f_code in _WRAPPER_CODES and frame.f_locals.get("profile") is self:
+                    self._record(reversed(stack))
+                    return
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+        if self.awaiting is not None:
+            stack = _await_chain(self.awaiting)
+            if stack:
+                self._record(stack + ["(awaiting)"])
+
+    def _record(self, stack) -> None:
+        self.stacks[";".join(stack)] += 1
+        self.samples += 1
+
+    def as_dict(self, with_stacks: bool = True) -> Dict:
+        data = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "created": self.started_at.isoformat(timespec="seconds"),
+            "duration_ms": round(self.duration * 1000, 3),
+            "interval_ms": PROFILE_INTERVAL * 1000,
+            "samples": self.samples,
+        }
+        if with_stacks:
+            data["stacks"] = dict(self.stacks.most_common())
+        return data
+
+
+# The frames of a suspended coroutine, outermost first, following what each one awaits
+def _await_chain(awaitable) -> List[str]:
+    stack = []
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        stack.append(_frame_label(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return stack
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    root = os.getcwd()
+    if path.startswith(root):
+        path = os.path.relpath(path, root)
+    return f"{code.co_qualname} ({path}:{code.co_firstlineno})".replace(";", ",")
+
+
+# This function wraps an endpoint so the sampler can recognise the frames of the
+# request being profiled. The wrapper's local named profile marks its frame; when no
+# profile is active it only costs a context variable lookup.
+def _profiled(endpoint: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def run_profiled(*args, **kwargs):
+            profile = _active.get()
+            awaitable = endpoint(*args, **kwargs)
+            if profile is not None:
+                profile.awaiting = awaitable
+            return await awaitable
+    else:
+        @functools.wraps(endpoint)
+        def run_profiled(*args, **kwargs):
+            profile = _active.get()
+            return endpoint(*args, **kwargs)
+    _WRAPPER_CODES.add(run_profiled.__code__)
+    return run_profiled
+
+
+# ProfiledRoute is the route class of the API routers; it wraps every endpoint with
+# _profiled so the endpoint can be sampled when its request opts in
+class ProfiledRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+# This function checks the request's X-Profile-Token against PROFILE_TOKEN
+def has_profile_token(request: Request) -> bool:
+    token = request.headers.get(PROFILE_TOKEN_HEADER)
+    return token is not None and bool(PROFILE_TOKEN) and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+# Dependency that guards the profile endpoints: profiles show code paths and request
+# paths, so only holders of PROFILE_TOKEN may list or download them
+def require_profile_token(request: Request) -> None:
+    if not has_profile_token(request):
+        raise HTTPException(status_code=403, detail="A valid X-Profile-Token is required")
+
+
+# This function decides whether a request is profiled
+def should_profile(request: Request) -> bool:
+    if has_profile_token(request):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+# This function starts profiling the current request; the caller must stop and save it.
+# Returns None when PROFILE_MAX_ACTIVE profiles are already running in this worker.
+# The profile id is generated here: a safe X-Request-ID only prefixes it, so a client
+# cannot pick the name of an existing profile and overwrite it.
+def begin_profile(request: Request) -> Optional[RequestProfile]:
+    if not _active_slots.acquire(blocking=False):
+        return None
+    profile_id = uuid.uuid4().hex
+    request_id = request.headers.get(REQUEST_ID_HEADER, "")
+    if _SAFE_ID.match(request_id):
+        profile_id = f"{request_id[:31]}-{profile_id}"
+    profile = RequestProfile(profile_id, request.method, request.url.path)
+    profile.start()
+    return profile
+
+
+# This function waits for a stopped profile's sampler, writes the profile to PROFILE_DIR,
+# prunes old profiles and frees its slot. It blocks on the thread and the disk, so the
+# middleware runs it in a worker thread rather than on the event loop.
+def save_profile(profile: RequestProfile) -> None:
+    try:
+        profile.join()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(PROFILE_DIR, f"{profile.id}.json"), "w") as output:
+            json.dump(profile.as_dict(), output)
+        for stale in _profile_files()[PROFILE_KEEP:]:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+    finally:
+        _active_slots.release()
+
+
+# Profile files, newest first; the directory is shared by every worker process
+def _profile_files() -> List[str]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    paths = [os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith(".json")]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+# This function lists the saved profiles without their stacks, newest first
+def list_profiles() -> List[Dict]:
+    profiles = []
+    for path in _profile_files():
+        try:
+            with open(path) as source:
+                data = json.load(source)
+        except (FileNotFoundError, ValueError):
+            continue
+        data.pop("stacks", None)
+        profiles.append(data)
+    return profiles
+
+
+# This function loads one saved profile, or returns None when it does not exist
+def load_profile(profile_id: str) -> Optional[Dict]:
+    if not _SAFE_ID.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.json")) as source:
+            return json.load(source)
+    except FileNotFoundError:
+        return None
+
+
+# This function renders saved stacks in the folded format, one "stack count" per line
+def folded_stacks(profile: Dict) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in profile["stacks"].items())
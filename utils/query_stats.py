@@ -0,0 +1,102 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# QUERY_STATS_STRICT=1 (test mode) raises when a unit of work repeats a statement,
+# instead of only logging it; QUERY_REPEAT_LIMIT is how often one may run before that
+QUERY_STATS_STRICT = os.getenv("QUERY_STATS_STRICT", "0") == "1"
+QUERY_REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", "3"))
+
+# Connection.info key holding the start times of the statements in progress
+_STARTED = "query_stats_started"
+
+
+# RepeatedQueryError flags an N+1 pattern: the same SQL run many times in one unit of work
+class RepeatedQueryError(AssertionError):
+    pass
+
+
+# QueryStats accumulates the statements executed while it is the current collector.
+# Statements are also counted by their SQL text, so a loop that runs one query per row
+# shows up as a single statement with a high count whatever its parameters. Writes are
+# counted like reads: a flush that inserts one row per statement is as much an N+1 as
+# a loop of SELECTs, and batched paths send one multi-row or executemany statement.
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.statements[statement] += 1
+        if seconds > self.slowest:
+            self.slowest, self.slowest_statement = seconds, statement
+
+    # Statements run more than limit times, most repeated first
+    def repeated(self, limit: int = QUERY_REPEAT_LIMIT) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.most_common() if count > limit]
+
+    # Server-Timing header value; durations are in milliseconds
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest * 1000:.2f}"
+        )
+
+    def as_log_fields(self) -> dict:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.total * 1000, 3),
+            "slowest_ms": round(self.slowest * 1000, 3),
+            "slowest_statement": (self.slowest_statement or "")[:200],
+            "repeated": [{"statement": statement[:200], "count": count} for statement, count in self.repeated()],
+        }
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+# This function collects the statements run inside the block, on any engine.
+# The collector lives in a context variable, so it follows the request into the
+# threadpool and the async session's greenlets. With strict it raises
+# RepeatedQueryError on exit when a statement repeats more than QUERY_REPEAT_LIMIT times.
+@contextmanager
+def track_queries(strict: bool = QUERY_STATS_STRICT) -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    check_repeats(stats, strict)
+
+
+# This function raises RepeatedQueryError, with strict, when stats holds a statement
+# repeated more than QUERY_REPEAT_LIMIT times
+def check_repeats(stats: QueryStats, strict: bool = QUERY_STATS_STRICT) -> None:
+    repeated = stats.repeated()
+    if strict and repeated:
+        statement, count = repeated[0]
+        raise RepeatedQueryError(f"Statement ran {count} times in one unit of work (N+1?): {statement[:200]}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and conn.info.get(_STARTED):
+        stats.record(statement, time.perf_counter() - conn.info[_STARTED].pop())
@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session, object_session
+
+# Read replicas take the read-only service methods off the primary.
+#   REPLICA_DATABASE_URLS    comma separated replica URLs (unset keeps every query on the primary)
+#   REPLICA_RETRY_SECONDS    how long a replica that failed is skipped (default 30)
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+# Session.info keys: the replica set of the session, the replica the current read-only
+# call is routed to, and whether the session has written (which pins it to the primary)
+_REPLICAS = "replicas"
+_ROUTED = "replica_routed"
+_WROTE = "replica_wrote"
+
+# Errors that mean the replica could not serve the read, as opposed to a bad query
+_REPLICA_FAILURES = (OperationalError, InterfaceError)
+
+
+# This function reads the replica URLs from the environment
+def replica_urls() -> List[str]:
+    return [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()]
+
+
+# ReplicaSet hands out replica engines round robin, skipping the ones that failed
+# recently. A replica whose read failed is marked down for REPLICA_RETRY_SECONDS and
+# then tried again by the next read that reaches it; nothing polls the replicas.
+class ReplicaSet:
+    def __init__(self, engines: List[Engine], retry_seconds: float = REPLICA_RETRY_SECONDS):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until = [0.0] * len(engines)
+        self._reads = [0] * len(engines)
+        self._failures = [0] * len(engines)
+
+    # The next healthy replica, or None when there is none and reads stay on the primary
+    def pick(self) -> Optional[Engine]:
+        if not self.engines:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            for _ in range(len(self.engines)):
+                index = self._next
+                self._next = (index + 1) % len(self.engines)
+                if self._down_until[index] <= now:
+                    self._reads[index] += 1
+                    return self.engines[index]
+        return None
+
+    def mark_down(self, engine: Engine) -> None:
+        index = self.engines.index(engine)
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+            self._failures[index] += 1
+
+    def stats(self) -> List[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "healthy": self._down_until[index] <= now,
+                    "reads": self._reads[index],
+                    "failures": self._failures[index],
+                }
+                for index, engine in enumerate(self.engines)
+            ]
+
+
+# RoutingSession sends the statements of a read-only call to the replica picked for it
+# and everything else to the primary bind. Once the session flushes or runs an INSERT,
+# UPDATE, DELETE or SELECT ... FOR UPDATE it is pinned to the primary for the rest of
+# its life, so a request reads its own writes. The async sessions use it as their
+# sync_session_class; for them the replicas are the sync_engine of each async engine.
+class RoutingSession(Session):
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.info[_REPLICAS] = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or _writes(clause):
+            self.info[_WROTE] = True
+        routed = self.info.get(_ROUTED)
+        if routed is not None and not self.info.get(_WROTE):
+            return routed
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def _writes(clause: Any) -> bool:
+    if clause is None:
+        return False
+    return getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None
+
+
+# This function picks a replica for a read-only call on db and routes the session to it.
+# Returns None, leaving the session on the primary, when there are no healthy replicas,
+# the session has written or an outer read-only call already routed it.
+def _route(db: Any) -> Optional[Engine]:
+    info = db.info
+    replicas = info.get(_REPLICAS)
+    if replicas is None or info.get(_WROTE) or info.get(_ROUTED) is not None:
+        return None
+    replica = replicas.pick()
+    info[_ROUTED] = replica
+    return replica
+
+
+# Whether a failure inside a routed call came from the replica: until the session
+# writes, every statement of the call went to it
+def _replica_failed(db: Any, replica: Engine) -> bool:
+    if db.info.get(_WROTE):
+        return False
+    db.info[_REPLICAS].mark_down(replica)
+    return True
+
+
+# This decorator marks a service method as read-only so it may run on a replica.
+# The service's session must be a RoutingSession. If the replica fails the read, it
+# is marked down and the method runs again on the primary.
+def read_only(method: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def run_read_only(self, *args, **kwargs):
+            replica = _route(self.db)
+            if replica is None:
+                return await method(self, *args, **kwargs)
+            try:
+                return await method(self, *args, **kwargs)
+            except _REPLICA_FAILURES:
+                if not _replica_failed(self.db, replica):
+                    raise
+                await self.db.rollback()
+            finally:
+                self.db.info.pop(_ROUTED, None)
+            return await method(self, *args, **kwargs)
+    else:
+        @functools.wraps(method)
+        def run_read_only(self, *args, **kwargs):
+            replica = _route(self.db)
+            if replica is None:
+                return method(self, *args, **kwargs)
+            try:
+                return method(self, *args, **kwargs)
+            except _REPLICA_FAILURES:
+                if not _replica_failed(self.db, replica):
+                    raise
+                self.db.rollback()
+            finally:
+                self.db.info.pop(_ROUTED, None)
+            return method(self, *args, **kwargs)
+    return run_read_only
+
+
+# Whether an ORM instance was loaded by a call routed to a replica. A replica may lag
+# the primary, so such rows must not fill shared caches that writes invalidate.
+def read_from_replica(obj: Any) -> bool:
+    db = object_session(obj)
+    return db is not None and db.info.get(_ROUTED) is not None
@@ -0,0 +1,78 @@
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route, so unknown paths cannot grow the label set
+UNMATCHED_ROUTE = "unmatched"
+
+
+# Histogram counts observations into fixed buckets, Prometheus style.
+# Counts are stored per bucket and made cumulative only when rendered.
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+# RequestMetrics holds latency histograms per (method, route template, status) and
+# in-flight gauges per method for this worker process.
+# It is only updated from the event loop by the HTTP middleware, so plain integer
+# updates need no lock; the route template keeps the label set bounded.
+class RequestMetrics:
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self.in_flight: Dict[str, int] = {}
+
+    def started(self, method: str) -> None:
+        self.in_flight[method] = self.in_flight.get(method, 0) + 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        self.in_flight[method] -= 1
+        key = (method, route, str(status))
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram()
+        histogram.observe(seconds)
+
+    # Render every metric in the Prometheus text exposition format
+    def render(self) -> str:
+        lines = [
+            "# HELP http_request_duration_seconds Time spent handling HTTP requests.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in sorted(self.latency.items()):
+            labels = f'method="{_escape(method)}",route="{_escape(route)}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.total}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        lines += [
+            f'http_requests_in_flight{{method="{_escape(method)}"}} {count}'
+            for method, count in sorted(self.in_flight.items())
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# The metrics of this worker process
+request_metrics = RequestMetrics()
@@ -0,0 +1,75 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+# Longest appointment the API accepts. Any booking that overlaps a new interval
+# must start less than this long before the interval ends, which bounds every
+# conflict lookup to a short index range.
+MAX_APPOINTMENT_MINUTES = 480
+
+# Default appointment length when a client does not send one
+DEFAULT_APPOINTMENT_MINUTES = 30
+
+# A booked interval: (start, end, appointment id)
+Interval = Tuple[datetime, datetime, int]
+
+
+# This function drops timezone information so API values compare with stored naive datetimes
+def naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+# This function returns the end of an appointment from its start and duration
+def interval_end(start: datetime, duration_minutes: int) -> datetime:
+    return naive(start) + timedelta(minutes=duration_minutes)
+
+
+# IntervalIndex holds one doctor's booked intervals sorted by start time.
+# Lookups bisect on the start and only inspect bookings that began within
+# MAX_APPOINTMENT_MINUTES of the query's end, so they cost O(log n + k) where k
+# is the handful of bookings in that window.
+class IntervalIndex:
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._intervals: List[Interval] = sorted((naive(s), naive(e), i) for s, e, i in intervals)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    # Add a booking, keeping the index sorted
+    def add(self, start: datetime, end: datetime, id: int) -> None:
+        insort(self._intervals, (naive(start), naive(end), id))
+
+    # Return the id of a booking that overlaps [start, end), ignoring exclude_id
+    def find_overlap(self, start: datetime, end: datetime, exclude_id: Optional[int] = None) -> Optional[int]:
+        start, end = naive(start), naive(end)
+        earliest = start - timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+        position = bisect_left(self._intervals, (end,))
+        while position > 0:
+            position -= 1
+            booked_start, booked_end, booked_id = self._intervals[position]
+            if booked_start <= earliest:
+                break
+            if booked_end > start and booked_id != exclude_id:
+                return booked_id
+        return None
+
+    # Return the free slots of slot_minutes on a grid starting at window_start
+    # A slot is free when no booking overlaps any part of it.
+    def free_slots(self, window_start: datetime, window_end: datetime, slot_minutes: int) -> List[Tuple[datetime, datetime]]:
+        window_start, window_end = naive(window_start), naive(window_end)
+        step = timedelta(minutes=slot_minutes)
+        slots = []
+        cursor = 0
+        busy_until = None
+        slot_start = window_start
+        while slot_start + step <= window_end:
+            slot_end = slot_start + step
+            # Advance past bookings that start before this slot ends, tracking the latest end
+            while cursor < len(self._intervals) and self._intervals[cursor][0] < slot_end:
+                booked_end = self._intervals[cursor][1]
+                busy_until = booked_end if busy_until is None else max(busy_until, booked_end)
+                cursor += 1
+            if busy_until is None or busy_until <= slot_start:
+                slots.append((slot_start, slot_end))
+            slot_start = slot_end
+        return slots
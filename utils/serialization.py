@@ -0,0 +1,32 @@
+import os
+from functools import lru_cache
+from typing import Any, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# JSON_FAST_PATH=0 turns the fast path off so FastAPI's response_model handling runs instead
+JSON_FAST_PATH = os.getenv("JSON_FAST_PATH", "1") != "0"
+
+
+# One TypeAdapter per response type; building the serializer is the expensive part
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+# This function encodes response models the service already validated straight to JSON bytes.
+# FastAPI would otherwise validate them again against response_model, convert them to
+# dicts and hand those to the stdlib json encoder; pydantic-core serializes in one pass.
+# Headers and cookies set on the injected response are carried over, since FastAPI
+# ignores them once an endpoint returns its own Response.
+def json_response(content: Any, response_type: Any, response: Optional[Response] = None) -> Any:
+    if not JSON_FAST_PATH:
+        return content
+    fast = Response(content=_adapter(response_type).dump_json(content), media_type="application/json")
+    if response is not None:
+        fast.headers.raw.extend(
+            (name, value) for name, value in response.headers.raw if name != b"content-length"
+        )
+        if response.status_code is not None:
+            fast.status_code = response.status_code
+    return fast
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Hashable, List, NamedTuple, Optional, Tuple
+from fastapi import Response
+from schemas.page import Page
+from utils.serialization import json_response
+
+# Sets of at most COUNT_EXACT_LIMIT rows are counted exactly on every request;
+# larger ones are served from the cache and counted again in the background once their
+# count is COUNT_CACHE_SECONDS old (see repositories/counting.py).
+COUNT_EXACT_LIMIT = int(os.getenv("COUNT_EXACT_LIMIT", "1000"))
+COUNT_CACHE_SECONDS = float(os.getenv("COUNT_CACHE_SECONDS", "60"))
+COUNT_CACHE_ENTRIES = int(os.getenv("COUNT_CACHE_ENTRIES", "1024"))
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+
+# TotalMode is how a list endpoint returns its total when the client asks for one
+class TotalMode(str, Enum):
+    HEADER = "header"
+    ENVELOPE = "envelope"
+
+
+# CountStrategy is how a list endpoint counts its rows; each router picks one per endpoint
+#   EXACT   COUNT(*) under the filter on every request
+#   CACHED  the cached count of the filter, refreshed in the background once it is
+#           COUNT_CACHE_SECONDS old; a whole table starts from the database's estimate
+#   AUTO    the summary count tables where they cover the filter; otherwise exact while
+#           the filtered set has at most COUNT_EXACT_LIMIT rows, CACHED beyond
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    AUTO = "auto"
+
+
+# TotalCount is a row count and whether it is estimated: served from the cache or the
+# database's table statistics instead of counted for this request
+class TotalCount(NamedTuple):
+    value: int
+    estimated: bool
+
+
+# CountCache keeps recent full counts per (table, filter) key with LRU eviction.
+# The first request that sees a stale count is asked to refresh it and still serves
+# it; requests arriving while that refresh runs get the stale count too.
+class CountCache:
+    def __init__(self, ttl: float = COUNT_CACHE_SECONDS, max_entries: int = COUNT_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    # Whether the key's last full count was above COUNT_EXACT_LIMIT
+    def known_large(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > COUNT_EXACT_LIMIT
+
+    # The cached count to serve, or None if there is none, and whether the caller must
+    # count and then store (or abandon) it. Only one caller at a time is asked to
+    # refresh a stale count; a missing one is counted by every caller that needs it.
+    def lookup(self, key: Hashable) -> Tuple[Optional[int], bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._refreshing.add(key)
+                return None, True
+            self._entries.move_to_end(key)
+            counted_at, value = entry
+            if counted_at + self.ttl > time.monotonic() or key in self._refreshing:
+                return value, False
+            self._refreshing.add(key)
+            return value, True
+
+    def store(self, key: Hashable, value: int) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def abandon(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# The count cache of this worker process
+count_cache = CountCache()
+
+
+# This function builds a list endpoint's response with its total, when one was asked for.
+# The header mode keeps the bare array and adds X-Total-Count; the envelope mode
+# returns a Page. Without a mode the response is the plain list, as before.
+def list_response(
+    items: List[Any], item_type: Any, response: Response, mode: Optional[TotalMode], total: Optional[TotalCount]
+) -> Any:
+    if mode is TotalMode.ENVELOPE:
+        page = Page[item_type](items=items, total=total.value, total_estimated=total.estimated)
+        return json_response(page, Page[item_type], response)
+    if mode is TotalMode.HEADER:
+        response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+        response.headers[TOTAL_ESTIMATED_HEADER] = "true" if total.estimated else "false"
+    return json_response(items, List[item_type], response)
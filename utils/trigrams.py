@@ -0,0 +1,45 @@
+import re
+from typing import List, Set, Tuple
+
+_WORD = re.compile(r"\w+")
+
+
+# This function splits a name into lowercase words, ignoring punctuation.
+def _words(text: str):
+    return _WORD.findall(text.lower())
+
+
+# This function returns the trigrams stored in the index for a name.
+# Each word is padded with two leading spaces and one trailing space, so word
+# starts produce their own trigrams ("  j", " jo") and prefixes can be matched.
+def name_trigrams(name: str) -> Set[str]:
+    grams = set()
+    for word in _words(name):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# This function returns the trigrams to look up for a search query.
+# The first set holds the word-start trigrams that only match names where a word
+# begins with the query; the second holds the trigrams every match must contain.
+# Those are the inner trigrams of each word. A word of one or two letters has none,
+# so its word-start trigram is required instead ("  a" or " al"): such a word only
+# matches names where a word begins with all of it.
+def query_trigrams(query: str) -> Tuple[Set[str], Set[str]]:
+    prefix, required = set(), set()
+    for word in _words(query):
+        padded = f"  {word}"
+        starts = [padded[i:i + 3] for i in range(min(2, len(word)))]
+        prefix.update(starts)
+        if len(word) < 3:
+            required.add(starts[-1])
+        required.update(word[i:i + 3] for i in range(len(word) - 2))
+    return prefix, required
+
+
+# This function returns the words a matching name must contain, lowercase.
+# Sharing the query's trigrams does not make a name contain it: the trigrams of "anan"
+# ("ana", "nan") are also those of "Ana Nan". Searches check these words last.
+def query_words(query: str) -> List[str]:
+    return _words(query)
@@ -0,0 +1,60 @@
+from typing import Awaitable, Callable, List, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Session.info key counting how many units of work are open on the session
+_DEPTH = "unit_of_work_depth"
+
+# Coroutines awaited with the session after an async unit of work commits. SQLAlchemy's
+# after_commit event is synchronous, so work that must wait without blocking the event
+# loop (such as queueing audit records) registers here instead.
+_async_commit_hooks: List[Callable[[AsyncSession], Awaitable[None]]] = []
+
+
+# Register a coroutine function to run after every committed async unit of work
+def after_async_commit(hook: Callable[[AsyncSession], Awaitable[None]]) -> Callable[[AsyncSession], Awaitable[None]]:
+    _async_commit_hooks.append(hook)
+    return hook
+
+
+# UnitOfWork groups the repository writes of a service call into one transaction.
+# Repositories only flush; the outermost unit of work on the request's session
+# commits once on success or rolls back on error, so nested service calls share it.
+# Use "with UnitOfWork(db)" for a Session and "async with UnitOfWork(db)" for an AsyncSession.
+class UnitOfWork:
+    def __init__(self, db: Union[Session, AsyncSession]):
+        self.db = db
+
+    def _enter(self) -> None:
+        self.db.info[_DEPTH] = self.db.info.get(_DEPTH, 0) + 1
+
+    def _leave(self) -> bool:
+        depth = self.db.info[_DEPTH] - 1
+        self.db.info[_DEPTH] = depth
+        return depth == 0
+
+    def __enter__(self) -> "UnitOfWork":
+        self._enter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if not self._leave():
+            return
+        if exc_type is None:
+            self.db.commit()
+        else:
+            self.db.rollback()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._enter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        if not self._leave():
+            return
+        if exc_type is None:
+            await self.db.commit()
+            for hook in _async_commit_hooks:
+                await hook(self.db)
+        else:
+            await self.db.rollback()